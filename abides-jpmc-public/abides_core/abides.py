@@ -46,6 +46,11 @@ def run(
                 "agent_latency_model",
                 "default_computation_delay",
                 "custom_properties",
+                "event_queue",
+                "event_queue_kwargs",
+                "log_policy",
+                "profile_kernel",
+                "log_writer",
             ],
         ),
     )
@@ -1,11 +1,13 @@
 import logging
 from copy import deepcopy
-from typing import Any, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
 from . import NanosecondTime
+from .agent_log import AgentEventLog
+from .log_policy import LogPolicy
 from .message import Message, MessageBatch
 from .utils import fmt_ts
 
@@ -58,17 +60,19 @@ class Agent:
         # CANONICAL TIME.)
         self.current_time: NanosecondTime = 0
 
-        # Agents may choose to maintain a log.  During simulation,
-        # it should be stored as a list of dictionaries.  The expected
-        # keys by default are: EventTime, EventType, Event.  Other
-        # Columns may be added, but will then require specializing
-        # parsing and will increase output dataframe size.  If there
-        # is a non-empty log, it will be written to disk as a Dataframe
-        # at kernel termination.
+        # Agents may choose to maintain a log.  During simulation, it is
+        # stored as a sequence of (EventTime, EventType, Event) entries, in
+        # typed columns for the event types with a registered schema (see
+        # abides_core.agent_log).  If there is a non-empty log, it will be
+        # written to disk as a Dataframe at kernel termination.
+        self.log: AgentEventLog = AgentEventLog()
 
-        # It might, or might not, make sense to formalize these log Events
-        # as a class, with enumerated EventTypes and so forth.
-        self.log: List[Tuple[NanosecondTime, str, Any]] = []
+        # Optional per event type selection of the logged events, set by the kernel
+        # (see set_log_policy). log_rates caches the policy's rate of each event
+        # type seen so far and log_counts counts the events of sampled types.
+        self.log_policy: Optional[LogPolicy] = None
+        self.log_rates: Dict[str, int] = {}
+        self.log_counts: Dict[str, int] = {}
 
         self.logEvent("AGENT_TYPE", type)
 
@@ -135,8 +139,10 @@ class Agent:
         # If this agent has been maintaining a log, convert it to a Dataframe
         # and request that the Kernel write it to disk before terminating.
         if self.log and self.log_to_file:
-            df_log = pd.DataFrame(self.log, columns=("EventTime", "EventType", "Event"))
-            df_log.set_index("EventTime", inplace=True)
+            df_log = self.log.to_dataframe()
+            # Lets log readers (see abides_core.log_loader) identify the agent.
+            df_log.attrs["agent_id"] = self.id
+            df_log.attrs["agent_type"] = self.type
             self.write_log(df_log)
 
     ### Methods for internal use by agents (e.g. bookkeeping).
@@ -153,6 +159,8 @@ class Agent:
 
         The deepcopy of the Event field, often an object, ensures later state
         changes to the object will not retroactively update the logged event.
+        Events of a type with a registered schema are stored as values in typed
+        columns instead, which needs no copy.
 
         Arguments:
             event_type: label of the event (e.g., Order submitted, order accepted last trade etc....)
@@ -161,21 +169,89 @@ class Agent:
             deepcopy_event: Set to False to skip deepcopying the event object.
         """
 
+        if self.log_enabled(event_type):
+            self.record_event(event_type, event, append_summary_log, deepcopy_event)
+
+    def log_enabled(self, event_type: str) -> bool:
+        """
+        Returns whether the next event of the given type should be logged, according
+        to the log_events flag and the log policy. Callers building an expensive
+        event (e.g. with ``to_dict()``) can check this first and then log the event
+        with ``record_event``.
+
+        Each call counts as one event for the 1 in N sampling of the event type.
+
+        Arguments:
+            event_type: label of the event.
+        """
+
         if not self.log_events:
-            return
+            return False
+
+        rate = self.log_rates.get(event_type)
+        if rate is None:
+            rate = self.log_policy.rate(event_type) if self.log_policy else 1
+            self.log_rates[event_type] = rate
+
+        if rate == 1:
+            return True
+        if rate == 0:
+            return False
+
+        count = self.log_counts.get(event_type, 0)
+        self.log_counts[event_type] = count + 1
+        return count % rate == 0
+
+    def record_event(
+        self,
+        event_type: str,
+        event: Any = "",
+        append_summary_log: bool = False,
+        deepcopy_event: bool = True,
+    ) -> None:
+        """
+        Adds an event to this agent's log without checking ``log_enabled``, for callers
+        that already did. See ``logEvent`` for the arguments.
+        """
 
         # We can make a single copy of the object (in case it is an arbitrary
         # class instance) for both potential log targets, because we don't
         # alter logs once recorded.
-        if deepcopy_event:
+        if append_summary_log and deepcopy_event:
             event = deepcopy(event)
+            deepcopy_event = False
 
-        self.log.append((self.current_time, event_type, event))
+        self.log.add(self.current_time, event_type, event, copy=deepcopy_event)
 
         if append_summary_log:
             assert self.kernel is not None
             self.kernel.append_summary_log(self.id, event_type, event)
 
+    def set_log_policy(self, log_policy: Optional[LogPolicy]) -> None:
+        """
+        Sets the policy selecting the event types this agent logs.
+
+        Arguments:
+            log_policy: The policy, already resolved for this agent's type.
+        """
+
+        self.log_policy = log_policy
+        self.log_rates = {}
+        self.log_counts = {}
+
+    def log_event_values(self, event_type: str, *values: Any) -> None:
+        """
+        Adds an event of a type with a registered schema to this agent's log from its
+        field values, without building the event object (e.g. formatting a string).
+
+        Arguments:
+            event_type: label of the event, with a registered ``EventSchema``.
+            values: the field values of the event, in schema order.
+        """
+
+        if self.log_enabled(event_type):
+            self.log.add_values(self.current_time, event_type, values)
+
     ### Methods required for communication from other agents.
     ### The kernel will _not_ call these methods on its own behalf,
     ### only to pass traffic from other agents..
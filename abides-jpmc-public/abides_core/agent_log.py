@@ -0,0 +1,349 @@
+from array import array
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import NanosecondTime
+
+# Storage of each column type: array typecode and numpy dtype.
+COLUMN_TYPES = {
+    "int": ("q", np.int64),
+    "float": ("d", np.float64),
+    # Any hashable value, interned in a table shared by the log and stored as its
+    # int32 index in that table.
+    "code": ("i", np.int32),
+}
+
+
+@dataclass(frozen=True)
+class EventSchema:
+    """
+    Describes how the events of one event type are stored in the columns of an
+    ``AgentEventLog`` and turned back into the logged event object.
+
+    Arguments:
+        fields: Names of the values making up the event, in order.
+        types: Column type of each field, one of "int", "float" or "code".
+        format: If given, the event is the string ``format.format(*values)``.
+        scalar: If True, the event is its single value. Otherwise (and without a
+            format) the event is a dict of the fields.
+    """
+
+    fields: Tuple[str, ...]
+    types: Tuple[str, ...]
+    format: Optional[str] = None
+    scalar: bool = False
+
+    def __post_init__(self) -> None:
+        if len(self.fields) != len(self.types):
+            raise ValueError(
+                "Event schema needs one type per field.",
+                "fields:",
+                self.fields,
+                "types:",
+                self.types,
+            )
+        for column_type in self.types:
+            if column_type not in COLUMN_TYPES:
+                raise ValueError(
+                    "Unknown event schema column type.", "type:", column_type
+                )
+        if self.scalar and len(self.fields) != 1:
+            raise ValueError(
+                "Scalar event schemas must have a single field.", "fields:", self.fields
+            )
+
+    def extract(self, event: Any) -> Optional[Tuple[Any, ...]]:
+        """
+        Returns the field values of an event logged with ``Agent.logEvent``, or None
+        if the event does not match the schema (it is then logged as an object).
+
+        Arguments:
+            event: The logged event.
+        """
+        if self.format is not None:
+            return None
+
+        if self.scalar:
+            values = (event,)
+        elif type(event) is dict and len(event) == len(self.fields):
+            try:
+                values = tuple(event[field] for field in self.fields)
+            except KeyError:
+                return None
+        else:
+            return None
+
+        for value, column_type in zip(values, self.types):
+            if column_type == "int":
+                if not (type(value) is int or isinstance(value, np.integer)):
+                    return None
+            elif column_type == "float":
+                if not (type(value) is float or isinstance(value, np.floating)):
+                    return None
+
+        return values
+
+    def to_event(self, values: Sequence[Any]) -> Any:
+        """
+        Rebuilds the logged event from its field values.
+
+        Arguments:
+            values: The field values, in order.
+        """
+        if self.format is not None:
+            return self.format.format(*values)
+
+        if self.scalar:
+            return values[0]
+
+        return dict(zip(self.fields, values))
+
+
+# Registered schemas by event type.
+EVENT_SCHEMAS: Dict[str, EventSchema] = {}
+
+
+def register_event_schema(
+    event_type: str,
+    fields: Sequence[str],
+    types: Sequence[str],
+    format: Optional[str] = None,
+    scalar: bool = False,
+) -> None:
+    """
+    Registers the schema of an event type, so that agents store its events in typed
+    columns instead of as python objects. See ``EventSchema``.
+
+    Arguments:
+        event_type: The event type, as passed to ``Agent.logEvent``.
+        fields: Names of the values making up the event, in order.
+        types: Column type of each field, one of "int", "float" or "code".
+        format: If given, the event is the string ``format.format(*values)``.
+        scalar: If True, the event is its single value.
+    """
+    EVENT_SCHEMAS[event_type] = EventSchema(tuple(fields), tuple(types), format, scalar)
+
+
+class AgentEventLog:
+    """
+    The log of an agent: a sequence of (time, event type, event) entries.
+
+    Entries are not stored as tuples. The times go in an int64 column, the event
+    types in an int32 column of codes into a table of the distinct event types, and
+    the events of types with a registered ``EventSchema`` in typed columns per
+    event type, holding their field values. Only the events of other types (or not
+    matching their schema) are kept as python objects.
+
+    Iterating over the log or converting it to a DataFrame rebuilds the original
+    (time, event type, event) entries.
+    """
+
+    def __init__(self) -> None:
+        self.times: array = array("q")
+        self.type_codes: array = array("i")
+        # Row of each entry in the columns of its event type, or -1 - index in
+        # self.objects for events stored as objects.
+        self.rows: array = array("q")
+
+        self.event_types: List[str] = []
+        self.event_type_codes: Dict[str, int] = {}
+
+        # Typed columns by event type code.
+        self.columns: Dict[int, List[array]] = {}
+
+        self.objects: List[Any] = []
+
+        # Values of "code" columns, interned by (type, value) so that e.g. 1 and True
+        # get different codes.
+        self.values: List[Any] = []
+        self.value_codes: Dict[Tuple[type, Any], int] = {}
+
+    def _type_code(self, event_type: str) -> int:
+        code = self.event_type_codes.get(event_type)
+        if code is None:
+            code = self.event_type_codes[event_type] = len(self.event_types)
+            self.event_types.append(event_type)
+        return code
+
+    def add(
+        self, time: NanosecondTime, event_type: str, event: Any, copy: bool = False
+    ) -> bool:
+        """
+        Adds an entry to the log, in typed columns if the event type has a schema the
+        event matches.
+
+        Arguments:
+            time: The time of the event.
+            event_type: The type of the event.
+            event: The event.
+            copy: If True, events stored as objects are deepcopied first, so later
+                changes to the event object do not alter the log.
+
+        Returns:
+            True if the event was stored in typed columns, in which case no reference
+            to the event object is kept.
+        """
+        schema = EVENT_SCHEMAS.get(event_type)
+        values = schema.extract(event) if schema is not None else None
+
+        if values is None:
+            self.times.append(time)
+            self.type_codes.append(self._type_code(event_type))
+            self.rows.append(-1 - len(self.objects))
+            self.objects.append(deepcopy(event) if copy else event)
+            return False
+
+        self.add_values(time, event_type, values)
+        return True
+
+    def add_values(
+        self, time: NanosecondTime, event_type: str, values: Sequence[Any]
+    ) -> None:
+        """
+        Adds an entry to the log given the field values of an event type with a
+        registered schema, without building the event object.
+
+        Arguments:
+            time: The time of the event.
+            event_type: The type of the event.
+            values: The field values of the event, in schema order.
+        """
+        code = self._type_code(event_type)
+
+        columns = self.columns.get(code)
+        if columns is None:
+            schema = EVENT_SCHEMAS.get(event_type)
+            if schema is None:
+                raise ValueError(
+                    "No event schema registered for event type.",
+                    "event_type:",
+                    event_type,
+                )
+            columns = self.columns[code] = [
+                array(COLUMN_TYPES[column_type][0]) for column_type in schema.types
+            ]
+
+        self.times.append(time)
+        self.type_codes.append(code)
+        self.rows.append(len(columns[0]))
+
+        for column, value in zip(columns, values):
+            if column.typecode == "i":
+                key = (type(value), value)
+                value_code = self.value_codes.get(key)
+                if value_code is None:
+                    value_code = self.value_codes[key] = len(self.values)
+                    self.values.append(value)
+                value = value_code
+            column.append(value)
+
+    def append(self, entry: Tuple[NanosecondTime, str, Any]) -> None:
+        """
+        Adds a (time, event type, event) entry, as if the log was a list.
+
+        Arguments:
+            entry: The entry to add.
+        """
+        self.add(*entry)
+
+    def select(self, event_types: Optional[Iterable[str]] = None) -> np.ndarray:
+        """
+        Returns the indices of the entries of the given event types.
+
+        Arguments:
+            event_types: The event types to select, or None to select all entries.
+        """
+        if event_types is None:
+            return np.arange(len(self.times))
+
+        codes = [
+            self.event_type_codes[event_type]
+            for event_type in event_types
+            if event_type in self.event_type_codes
+        ]
+        type_codes = np.frombuffer(self.type_codes, dtype=np.int32)
+        return np.flatnonzero(np.isin(type_codes, codes))
+
+    def events(self, entries: Optional[np.ndarray] = None) -> List[Any]:
+        """
+        Returns the event of each entry, rebuilding those stored in columns.
+
+        Arguments:
+            entries: Indices of the entries to return (see ``select``), or None for
+                all entries. The events of the other entries are not rebuilt.
+        """
+        type_codes = np.frombuffer(self.type_codes, dtype=np.int32)
+        rows = np.frombuffer(self.rows, dtype=np.int64)
+        if entries is not None:
+            type_codes = type_codes[entries]
+            rows = rows[entries]
+
+        events = [None] * len(rows)
+
+        object_entries = np.flatnonzero(rows < 0)
+        for i, row in zip(object_entries.tolist(), rows[object_entries].tolist()):
+            events[i] = self.objects[-1 - row]
+
+        for code, columns in self.columns.items():
+            typed_entries = np.flatnonzero((type_codes == code) & (rows >= 0))
+            if len(typed_entries) == 0:
+                continue
+
+            schema = EVENT_SCHEMAS[self.event_types[code]]
+            typed_rows = rows[typed_entries]
+            field_values = []
+            for column, column_type in zip(columns, schema.types):
+                values = np.frombuffer(column, dtype=COLUMN_TYPES[column_type][1])
+                values = values[typed_rows].tolist()
+                if column_type == "code":
+                    values = [self.values[v] for v in values]
+                field_values.append(values)
+
+            for i, values in zip(typed_entries.tolist(), zip(*field_values)):
+                events[i] = schema.to_event(values)
+
+        return events
+
+    def to_dataframe(self, event_types: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Returns the log as a DataFrame indexed by EventTime, with EventType and Event
+        columns.
+
+        Arguments:
+            event_types: If given, only the entries of these event types are included.
+        """
+        entries = self.select(event_types) if event_types is not None else None
+
+        times = np.frombuffer(self.times, dtype=np.int64)
+        type_codes = np.frombuffer(self.type_codes, dtype=np.int32)
+        if entries is not None:
+            times = times[entries]
+            type_codes = type_codes[entries]
+
+        event_types = np.array(self.event_types, dtype=object)
+        df_log = pd.DataFrame(
+            {
+                "EventTime": times,
+                "EventType": event_types[type_codes],
+                "Event": pd.Series(self.events(entries), dtype=object),
+            }
+        )
+        df_log.set_index("EventTime", inplace=True)
+        return df_log
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __bool__(self) -> bool:
+        return len(self.times) > 0
+
+    def __iter__(self) -> Iterator[Tuple[NanosecondTime, str, Any]]:
+        return zip(
+            self.times.tolist(),
+            (self.event_types[code] for code in self.type_codes),
+            self.events(),
+        )
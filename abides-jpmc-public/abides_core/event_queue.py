@@ -0,0 +1,224 @@
+import heapq
+import queue
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Tuple
+
+from . import NanosecondTime
+from .message import Message
+
+# An event as handed back to the Kernel: (delivery time, (sender, recipient, message)).
+Event = Tuple[NanosecondTime, Tuple[int, int, Message]]
+
+
+class EventQueue(ABC):
+    """
+    Abstract base class for the Kernel's event queue. This class is not used directly
+    and is instead inherited from child classes.
+
+    Events are ordered by delivery time. Ties are broken by sender ID, then recipient
+    ID, then by the message's creation order (``Message.message_id``), which is exactly
+    the ordering the Kernel has always produced by pushing
+    ``(deliver_at, (sender_id, recipient_id, message))`` tuples into a
+    ``queue.PriorityQueue``. All implementations must preserve this ordering so that
+    simulation results do not depend on the chosen backend.
+    """
+
+    @abstractmethod
+    def put(
+        self,
+        deliver_at: NanosecondTime,
+        sender_id: int,
+        recipient_id: int,
+        message: Message,
+    ) -> None:
+        """
+        Schedules a message for delivery.
+
+        Arguments:
+            deliver_at: The simulation time at which the message must be delivered.
+            sender_id: ID of the agent sending the message.
+            recipient_id: ID of the agent receiving the message.
+            message: The ``Message`` class instance to deliver.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self) -> Event:
+        """
+        Removes and returns the next event to deliver as a
+        ``(deliver_at, (sender_id, recipient_id, message))`` tuple.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def empty(self) -> bool:
+        """Returns True if there are no more events to deliver."""
+        return len(self) == 0
+
+
+class PriorityEventQueue(EventQueue):
+    """
+    Legacy event queue backed by a thread-safe ``queue.PriorityQueue``.
+
+    Every ``put``/``get`` takes a lock and ties are resolved through ``Message.__lt__``.
+    Kept for backwards compatibility and as a reference implementation.
+    """
+
+    def __init__(self) -> None:
+        self.queue: queue.PriorityQueue = queue.PriorityQueue()
+
+    def put(
+        self,
+        deliver_at: NanosecondTime,
+        sender_id: int,
+        recipient_id: int,
+        message: Message,
+    ) -> None:
+        self.queue.put((deliver_at, (sender_id, recipient_id, message)))
+
+    def get(self) -> Event:
+        return self.queue.get()
+
+    def __len__(self) -> int:
+        return self.queue.qsize()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The lock of the queue cannot be pickled: only its items are saved (e.g. in
+        # kernel snapshots).
+        return {"items": list(self.queue.queue)}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.queue = queue.PriorityQueue()
+        self.queue.queue.extend(state["items"])
+
+
+class HeapEventQueue(EventQueue):
+    """
+    Lock-free event queue backed by a plain ``heapq`` list.
+
+    Each entry carries a precomputed integer sort key
+    ``(deliver_at, sender_id, recipient_id, message_id)`` so that heap operations only
+    ever compare integers and never fall back to ``Message.__lt__``. Only suitable for
+    single-threaded use (which is how the Kernel runs).
+    """
+
+    def __init__(self) -> None:
+        self.heap: List[Tuple[NanosecondTime, int, int, int, Message]] = []
+
+    def put(
+        self,
+        deliver_at: NanosecondTime,
+        sender_id: int,
+        recipient_id: int,
+        message: Message,
+    ) -> None:
+        heapq.heappush(
+            self.heap,
+            (deliver_at, sender_id, recipient_id, message.message_id, message),
+        )
+
+    def get(self) -> Event:
+        deliver_at, sender_id, recipient_id, _, message = heapq.heappop(self.heap)
+        return deliver_at, (sender_id, recipient_id, message)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+
+class BucketEventQueue(EventQueue):
+    """
+    Calendar (bucket) event queue for dense nanosecond timestamps.
+
+    Events are grouped into fixed-width time buckets. A small heap of bucket indices
+    gives the earliest non-empty bucket and each bucket is itself a heap ordered by the
+    same integer key as ``HeapEventQueue``. When most traffic falls within a few
+    microseconds of the current time, the per-event heaps stay short and the bucket
+    heap only has to be touched when a bucket is created or drained.
+
+    Arguments:
+        bucket_width: Width of each time bucket in nanoseconds.
+    """
+
+    def __init__(self, bucket_width: int = 1_000) -> None:
+        if bucket_width <= 0:
+            raise ValueError(
+                "Bucket width must be a positive number of nanoseconds.",
+                "bucket_width:",
+                bucket_width,
+            )
+
+        self.bucket_width: int = bucket_width
+        self.bucket_heap: List[NanosecondTime] = []
+        self.buckets: Dict[
+            NanosecondTime, List[Tuple[NanosecondTime, int, int, int, Message]]
+        ] = {}
+        self.size: int = 0
+
+    def put(
+        self,
+        deliver_at: NanosecondTime,
+        sender_id: int,
+        recipient_id: int,
+        message: Message,
+    ) -> None:
+        index = deliver_at // self.bucket_width
+
+        bucket = self.buckets.get(index)
+        if bucket is None:
+            bucket = self.buckets[index] = []
+            heapq.heappush(self.bucket_heap, index)
+
+        heapq.heappush(
+            bucket, (deliver_at, sender_id, recipient_id, message.message_id, message)
+        )
+        self.size += 1
+
+    def get(self) -> Event:
+        if self.size == 0:
+            raise IndexError("get from an empty event queue")
+
+        index = self.bucket_heap[0]
+        bucket = self.buckets[index]
+
+        deliver_at, sender_id, recipient_id, _, message = heapq.heappop(bucket)
+
+        if not bucket:
+            del self.buckets[index]
+            heapq.heappop(self.bucket_heap)
+
+        self.size -= 1
+
+        return deliver_at, (sender_id, recipient_id, message)
+
+    def __len__(self) -> int:
+        return self.size
+
+
+EVENT_QUEUES = {
+    "priority": PriorityEventQueue,
+    "heap": HeapEventQueue,
+    "bucket": BucketEventQueue,
+}
+
+
+def make_event_queue(event_queue: str = "heap", **kwargs) -> EventQueue:
+    """
+    Instantiates one of the available event queue backends by name.
+
+    Arguments:
+        event_queue: One of 'priority', 'heap' or 'bucket'.
+        kwargs: Extra arguments forwarded to the backend constructor (e.g.
+            ``bucket_width`` for the 'bucket' backend).
+    """
+
+    if event_queue not in EVENT_QUEUES:
+        raise ValueError(
+            f"Config error: unknown event queue requested ({event_queue})",
+            "available:",
+            list(EVENT_QUEUES),
+        )
+
+    return EVENT_QUEUES[event_queue](**kwargs)
@@ -1,16 +1,20 @@
 import logging
-import queue
 import os
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple, Type
+from time import perf_counter_ns
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
 import numpy as np
 import pandas as pd
 
 from . import NanosecondTime
 from .agent import Agent
+from .event_queue import EventQueue, make_event_queue
+from .kernel_profiler import KernelProfiler
 from .message import Message, MessageBatch, WakeupMsg
 from .latency_model import LatencyModel
+from .log_policy import LogPolicy
+from .log_writer import LogWriter
 from .utils import fmt_ts, str_to_ns
 
 
@@ -36,6 +40,20 @@ class Kernel:
         log_dir: directory where data is store.
         custom_properties: Different attributes that can be added to the simulation
             (e.g., the oracle).
+        event_queue: Backend of the message queue, one of 'heap' (lock-free heapq),
+            'bucket' (calendar queue for dense timestamps) or 'priority' (legacy
+            thread-safe queue.PriorityQueue). All produce the same delivery order.
+        event_queue_kwargs: Extra arguments for the event queue backend (e.g.
+            {"bucket_width": 1000} for the 'bucket' backend).
+        log_policy: Optional LogPolicy (or dict of its arguments) selecting the
+            event types logged by the agents, see abides_core.log_policy.
+        profile_kernel: If True, the wall clock time of every agent wakeup and
+            message dispatch is accounted per agent type and message class, see
+            abides_core.kernel_profiler. The report is returned in the end state
+            under "kernel_profile" and written to kernel_profile.bz2.
+        log_writer: Optional LogWriter (or dict of its arguments) selecting the
+            format, compression and threading of the written logs, see
+            abides_core.log_writer. Defaults to synchronous bz2 pickles.
     """
 
     def __init__(
@@ -53,6 +71,11 @@ class Kernel:
         log_dir: Optional[str] = None,
         custom_properties: Optional[Dict[str, Any]] = None,
         random_state: Optional[np.random.RandomState] = None,
+        event_queue: str = "heap",
+        event_queue_kwargs: Optional[Dict[str, Any]] = None,
+        log_policy: Union[LogPolicy, Dict[str, Any], None] = None,
+        profile_kernel: bool = False,
+        log_writer: Union[LogWriter, Dict[str, Any], None] = None,
     ) -> None:
         custom_properties = custom_properties or {}
 
@@ -65,7 +88,9 @@ class Kernel:
 
         # A single message queue to keep everything organized by increasing
         # delivery timestamp.
-        self.messages: queue.PriorityQueue[(int, str, Message)] = queue.PriorityQueue()
+        self.messages: EventQueue = make_event_queue(
+            event_queue, **(event_queue_kwargs or {})
+        )
 
         # Timestamp at which the Kernel was created.  Primarily used to
         # create a unique log directory for this run.  Also used to
@@ -91,6 +116,19 @@ class Kernel:
         #        based on class agent.Agent
         self.agents: List[Agent] = agents
 
+        # Output of the agent and summary logs.
+        self.log_writer: LogWriter = LogWriter.from_config(log_writer)
+
+        # Optional selection of the events logged by the agents, per event type
+        # and agent type.
+        self.log_policy: Optional[LogPolicy] = LogPolicy.from_config(log_policy)
+        if self.log_policy is not None:
+            agent_policies: Dict[str, LogPolicy] = {}
+            for agent in self.agents:
+                if agent.type not in agent_policies:
+                    agent_policies[agent.type] = self.log_policy.for_agent(agent.type)
+                agent.set_log_policy(agent_policies[agent.type])
+
         # Filter for any ABIDES-Gym agents - does not require dependency on ABIDES-gym.
         self.gym_agents: List[Agent] = list(
             filter(
@@ -189,6 +227,11 @@ class Kernel:
 
         self.show_trace_messages: bool = False
 
+        # Optional accounting of the time spent in each dispatch, created by
+        # initialize().
+        self.profile_kernel: bool = profile_kernel
+        self.profiler: Optional[KernelProfiler] = None
+
         logger.debug(f"Kernel initialized")
 
     def run(self) -> Dict[str, Any]:
@@ -223,8 +266,8 @@ class Kernel:
         logger.debug("Simulation started!")
 
         # Note that num_simulations has not yet been really used or tested
-        # for anything.  Instead we have been running multiple simulations
-        # with coarse parallelization from a shell script
+        # for anything.  Multiple simulations are instead run in separate
+        # processes, see abides_core.sweep.
 
         # Event notification for kernel init (agents should not try to
         # communicate with other agents, as order is unknown).  Agents
@@ -264,7 +307,7 @@ class Kernel:
         logger.debug("--- Kernel Event Queue begins ---")
         logger.debug(
             "Kernel will start processing messages. Queue length: {}".format(
-                len(self.messages.queue)
+                len(self.messages)
             )
         )
 
@@ -272,6 +315,8 @@ class Kernel:
         self.event_queue_wall_clock_start = datetime.now()
         self.ttl_messages = 0
 
+        self.profiler = KernelProfiler() if self.profile_kernel else None
+
     def runner(
         self, agent_actions: Optional[Tuple[Agent, List[Dict[str, Any]]]] = None
     ) -> Dict[str, Any]:
@@ -294,6 +339,8 @@ class Kernel:
             exp_agent, action_list = agent_actions
             exp_agent.apply_actions(action_list)
 
+        profiler = self.profiler
+
         # Process messages until there aren't any (at which point there never can
         # be again, because agents only "wake" in response to messages), or until
         # the kernel stop time is reached.
@@ -308,6 +355,9 @@ class Kernel:
 
             sender_id, recipient_id, message = event
 
+            if profiler is not None:
+                profiler.record_queue_length(len(self.messages))
+
             # Periodically print the simulation time and total messages, even if muted.
             if self.ttl_messages % 100000 == 0:
                 logger.info(
@@ -340,11 +390,15 @@ class Kernel:
                 if self.agent_current_times[recipient_id] > self.current_time:
                     # Push the wakeup call back into the PQ with a new time.
                     self.messages.put(
-                        (
-                            self.agent_current_times[recipient_id],
-                            (sender_id, recipient_id, message),
-                        )
+                        self.agent_current_times[recipient_id],
+                        sender_id,
+                        recipient_id,
+                        message,
                     )
+                    if profiler is not None:
+                        profiler.record_requeue(
+                            self.agents[recipient_id].type, type(message)
+                        )
                     if self.show_trace_messages:
                         logger.debug(
                             "After wakeup return, agent {} delayed from {} to {}".format(
@@ -360,7 +414,16 @@ class Kernel:
                 self.agent_current_times[recipient_id] = self.current_time
 
                 # Wake the agent and get value passed to kernel to listen for kernel interruption signal
-                wakeup_result = self.agents[recipient_id].wakeup(self.current_time)
+                if profiler is None:
+                    wakeup_result = self.agents[recipient_id].wakeup(self.current_time)
+                else:
+                    start = perf_counter_ns()
+                    wakeup_result = self.agents[recipient_id].wakeup(self.current_time)
+                    profiler.record_dispatch(
+                        self.agents[recipient_id].type,
+                        WakeupMsg,
+                        perf_counter_ns() - start,
+                    )
 
                 # Delay the agent by its computation delay plus any transient additional delay requested.
                 self.agent_current_times[recipient_id] += (
@@ -385,11 +448,15 @@ class Kernel:
                 if self.agent_current_times[recipient_id] > self.current_time:
                     # Push the message back into the PQ with a new time.
                     self.messages.put(
-                        (
-                            self.agent_current_times[recipient_id],
-                            (sender_id, recipient_id, message),
-                        )
+                        self.agent_current_times[recipient_id],
+                        sender_id,
+                        recipient_id,
+                        message,
                     )
+                    if profiler is not None:
+                        profiler.record_requeue(
+                            self.agents[recipient_id].type, type(message)
+                        )
                     if self.show_trace_messages:
                         logger.debug(
                             "Agent in future: message requeued for {}".format(
@@ -424,9 +491,20 @@ class Kernel:
                             )
                         )
 
-                    self.agents[recipient_id].receive_message(
-                        self.current_time, sender_id, message
-                    )
+                    if profiler is None:
+                        self.agents[recipient_id].receive_message(
+                            self.current_time, sender_id, message
+                        )
+                    else:
+                        start = perf_counter_ns()
+                        self.agents[recipient_id].receive_message(
+                            self.current_time, sender_id, message
+                        )
+                        profiler.record_dispatch(
+                            self.agents[recipient_id].type,
+                            type(message),
+                            perf_counter_ns() - start,
+                        )
 
         if self.messages.empty():
             logger.debug("--- Kernel Event Queue empty ---")
@@ -497,6 +575,22 @@ class Kernel:
         # log itself.
         self.write_summary_log()
 
+        # Wait for the logs being written in the background.
+        self.log_writer.close()
+
+        if self.profiler is not None:
+            profile = self.profiler.report()
+            self.custom_state["kernel_profile"] = profile
+            self.write_kernel_profile(profile)
+
+            logger.info(
+                "Kernel profile (top 10 of {} dispatch types):\n{}".format(
+                    len(profile),
+                    profile.drop(columns="histogram_ns").head(10).to_string(),
+                )
+            )
+            logger.info("Kernel queue: {}".format(profile.attrs))
+
         # This should perhaps be elsewhere, as it is explicitly financial, but it
         # is convenient to have a quick summary of the results for now.
         logger.info("Mean ending value by agent type:")
@@ -604,7 +698,7 @@ class Kernel:
                 )
 
         # Finally drop the message in the queue with priority == delivery time.
-        self.messages.put((deliver_at, (sender_id, recipient_id, message)))
+        self.messages.put(deliver_at, sender_id, recipient_id, message)
 
         if self.show_trace_messages:
             logger.debug(
@@ -651,7 +745,7 @@ class Kernel:
                 )
             )
 
-        self.messages.put((requested_time, (sender_id, sender_id, WakeupMsg())))
+        self.messages.put(requested_time, sender_id, sender_id, WakeupMsg())
 
     def get_agent_compute_delay(self, sender_id: int) -> int:
         """
@@ -755,10 +849,9 @@ class Kernel:
         directory per run, with one filename per agent, also decided by the Kernel using
         agent type, id, etc.
 
-        If there are too many agents, placing all these files in a directory might be
-        unfortunate. Also if there are too many agents, or if the logs are too large,
-        memory could become an issue. In this case, we might have to take a speed hit to
-        write logs incrementally.
+        The format, compression and threading of the writes are decided by the
+        kernel's log writer, which can also group the logs of all agents of a type
+        into a single file when there are too many agents for one file per agent.
 
         If filename is not None, it will be used as the filename. Otherwise, the Kernel
         will construct a filename based on the name of the Agent requesting log archival.
@@ -775,14 +868,12 @@ class Kernel:
         path = os.path.join(".", "log", self.log_dir)
 
         if filename:
-            file = "{}.bz2".format(filename)
+            self.log_writer.write(df_log, path, filename)
         else:
-            file = "{}.bz2".format(self.agents[sender_id].name.replace(" ", ""))
-
-        if not os.path.exists(path):
-            os.makedirs(path)
-
-        df_log.to_pickle(os.path.join(path, file), compression="bz2")
+            agent = self.agents[sender_id]
+            self.log_writer.write_agent_log(
+                df_log, path, agent.name.replace(" ", ""), agent.id, agent.type
+            )
 
     def append_summary_log(self, sender_id: int, event_type: str, event: Any) -> None:
         """
@@ -805,14 +896,25 @@ class Kernel:
 
     def write_summary_log(self) -> None:
         path = os.path.join(".", "log", self.log_dir)
-        file = "summary_log.bz2"
+
+        df_log = pd.DataFrame(self.summary_log)
+
+        self.log_writer.write(df_log, path, "summary_log")
+
+    def write_kernel_profile(self, profile: pd.DataFrame) -> None:
+        """
+        Writes the report of the kernel profiler next to the summary log.
+
+        Arguments:
+            profile: The report, see KernelProfiler.report.
+        """
+
+        path = os.path.join(".", "log", self.log_dir)
 
         if not os.path.exists(path):
             os.makedirs(path)
 
-        df_log = pd.DataFrame(self.summary_log)
-
-        df_log.to_pickle(os.path.join(path, file), compression="bz2")
+        profile.to_pickle(os.path.join(path, "kernel_profile.bz2"), compression="bz2")
 
     def update_agent_state(self, agent_id: int, state: Any) -> None:
         """
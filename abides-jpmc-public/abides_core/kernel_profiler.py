@@ -0,0 +1,171 @@
+from typing import Any, Dict, List, Tuple, Type
+
+import pandas as pd
+
+# Number of histogram buckets: bucket b holds the dispatches that took between
+# 2**(b-1) and 2**b - 1 nanoseconds, the last bucket everything longer.
+N_BUCKETS = 48
+
+
+class DispatchStats:
+    """
+    Accumulated statistics of the dispatches of one message class to the agents of
+    one type.
+    """
+
+    __slots__ = ("count", "total_ns", "max_ns", "histogram", "requeues")
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total_ns: int = 0
+        self.max_ns: int = 0
+        self.histogram: List[int] = [0] * N_BUCKETS
+        self.requeues: int = 0
+
+    def quantile_ns(self, q: float) -> int:
+        """
+        Returns an upper bound of the q-quantile of the dispatch times: the upper
+        bound of the histogram bucket it falls in (capped at the maximum).
+
+        Arguments:
+            q: The quantile, between 0 and 1.
+        """
+        target = q * self.count
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count > 0 and seen >= target:
+                return min(2**bucket - 1, self.max_ns)
+
+        return self.max_ns
+
+
+class KernelProfiler:
+    """
+    Wall clock time accounting of the kernel's dispatches, enabled with the
+    ``profile_kernel`` argument of the kernel.
+
+    For every (agent type, message class) pair, the kernel records the number of
+    ``wakeup`` / ``receive_message`` calls, their total and maximum duration, a
+    histogram of their durations in power of 2 nanosecond buckets, and how many
+    messages were requeued because the recipient was still busy ("agent in the
+    future"). The length of the event queue is sampled at every message.
+    """
+
+    def __init__(self) -> None:
+        self.stats: Dict[Tuple[str, Type], DispatchStats] = {}
+
+        self.queue_length_samples: int = 0
+        self.queue_length_total: int = 0
+        self.queue_length_max: int = 0
+
+    def _stats(self, agent_type: str, message_class: Type) -> DispatchStats:
+        key = (agent_type, message_class)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = DispatchStats()
+        return stats
+
+    def record_dispatch(
+        self, agent_type: str, message_class: Type, elapsed_ns: int
+    ) -> None:
+        """
+        Records one call to an agent's wakeup or receive_message.
+
+        Arguments:
+            agent_type: The type of the agent.
+            message_class: The class of the message delivered.
+            elapsed_ns: The wall clock duration of the call, in nanoseconds.
+        """
+        stats = self._stats(agent_type, message_class)
+        stats.count += 1
+        stats.total_ns += elapsed_ns
+        if elapsed_ns > stats.max_ns:
+            stats.max_ns = elapsed_ns
+        stats.histogram[min(elapsed_ns.bit_length(), N_BUCKETS - 1)] += 1
+
+    def record_requeue(self, agent_type: str, message_class: Type) -> None:
+        """
+        Records a message put back in the queue because its recipient was busy.
+
+        Arguments:
+            agent_type: The type of the agent.
+            message_class: The class of the message.
+        """
+        self._stats(agent_type, message_class).requeues += 1
+
+    def record_queue_length(self, length: int) -> None:
+        """
+        Records a sample of the length of the event queue.
+
+        Arguments:
+            length: The number of messages in the queue.
+        """
+        self.queue_length_samples += 1
+        self.queue_length_total += length
+        if length > self.queue_length_max:
+            self.queue_length_max = length
+
+    def report(self) -> pd.DataFrame:
+        """
+        Returns one row per (agent type, message class) pair, sorted by decreasing
+        total time, with the dispatch count, total time, mean / approximate
+        median and 99th percentile / maximum duration, number of requeues and the
+        non empty buckets of the duration histogram ({upper bound in ns: count}).
+
+        The queue length statistics are in the ``attrs`` of the DataFrame.
+        """
+        rows = []
+        for (agent_type, message_class), stats in self.stats.items():
+            rows.append(
+                {
+                    "agent_type": agent_type,
+                    "message_type": message_class.__name__,
+                    "count": stats.count,
+                    "total_seconds": stats.total_ns / 1e9,
+                    "mean_us": (
+                        stats.total_ns / stats.count / 1e3 if stats.count else 0.0
+                    ),
+                    "p50_us": stats.quantile_ns(0.5) / 1e3,
+                    "p99_us": stats.quantile_ns(0.99) / 1e3,
+                    "max_us": stats.max_ns / 1e3,
+                    "requeues": stats.requeues,
+                    "histogram_ns": {
+                        2**bucket - 1: count
+                        for bucket, count in enumerate(stats.histogram)
+                        if count > 0
+                    },
+                }
+            )
+
+        columns = [
+            "agent_type",
+            "message_type",
+            "count",
+            "total_seconds",
+            "mean_us",
+            "p50_us",
+            "p99_us",
+            "max_us",
+            "requeues",
+            "histogram_ns",
+        ]
+        report = pd.DataFrame(rows, columns=columns)
+        report.sort_values("total_seconds", ascending=False, inplace=True)
+        report.reset_index(drop=True, inplace=True)
+
+        report.attrs.update(self.queue_stats())
+
+        return report
+
+    def queue_stats(self) -> Dict[str, Any]:
+        """Returns the mean and maximum sampled queue length and total requeues."""
+        return {
+            "queue_length_mean": (
+                self.queue_length_total / self.queue_length_samples
+                if self.queue_length_samples
+                else 0.0
+            ),
+            "queue_length_max": self.queue_length_max,
+            "requeues": sum(stats.requeues for stats in self.stats.values()),
+        }
@@ -1,4 +1,4 @@
-from typing import Union
+from typing import List, Optional, Union
 
 import numpy as np
 
@@ -31,6 +31,10 @@ class LatencyModel:
             first agent pair will have 50th percentile (median) jitter of 133.3ns and
             90th percentile jitter of 16.65us, and the second agent pair will have 50th
             percentile (median) jitter of 5.2ms and 90th percentile jitter of 650ms.
+        batch_size: If given, the uniform draws for the cubic jitter are generated
+            ``batch_size`` at a time and served from a buffer instead of with one
+            ``random_state`` call per message. Latencies are unchanged provided the
+            random state is not shared with other users.
 
     All values except min_latency may be specified as a single scalar for simplicity,
     and have defaults to allow ease of use as:
@@ -85,22 +89,55 @@ class LatencyModel:
         jitter: float = 0.5,
         jitter_clip: float = 0.1,
         jitter_unit: float = 10.0,
+        batch_size: Optional[int] = None,
     ) -> None:
         self.latency_model: str = latency_model.lower()
         self.random_state: np.random.RandomState = random_state
-        self.min_latency: np.ndarray = min_latency
 
         if self.latency_model not in ["cubic", "deterministic"]:
             raise Exception(
                 f"Config error: unknown latency model requested ({self.latency_model})"
             )
 
+        if batch_size is not None and batch_size <= 0:
+            raise ValueError(
+                "Config error: latency batch size must be positive.",
+                "batch_size:",
+                batch_size,
+            )
+
         # Check required parameters and apply defaults for the selected model.
         if self.latency_model == "cubic":
-            self.connected = connected
-            self.jitter = jitter
-            self.jitter_clip = jitter_clip
-            self.jitter_unit = jitter_unit
+            params = [min_latency, connected, jitter, jitter_clip, jitter_unit]
+        else:
+            params = [min_latency]
+
+        # Per-pair constants are resolved once here rather than on every message.
+        # When every parameter is a scalar they are kept as scalars, otherwise they are
+        # all broadcast to dense (sender, recipient) arrays indexed directly by agent id.
+        n_agents = max(
+            (np.shape(param)[0] for param in params if np.ndim(param)), default=0
+        )
+        self.pairwise: bool = n_agents > 0
+
+        self._min_latency = self._to_pairwise(min_latency, n_agents)
+
+        if self.latency_model == "cubic":
+            self._connected = self._to_pairwise(connected, n_agents)
+            self._jitter = self._to_pairwise(jitter, n_agents)
+            self._jitter_clip = self._to_pairwise(jitter_clip, n_agents)
+            # Jitter is measured in units of min_latency / jitter_unit.
+            self._jitter_scale = self._min_latency / self._to_pairwise(
+                jitter_unit, n_agents
+            )
+
+        # In batched mode the uniform draws for the jitter are taken from a buffer
+        # refilled with batch_size draws at a time. The buffer is filled from the same
+        # random state, so the draws (and latencies) are identical to the unbatched
+        # mode as long as nothing else draws from this random state.
+        self.batch_size: Optional[int] = batch_size
+        self._uniforms: List[float] = []
+        self._next_uniform: int = 0
 
     def get_latency(self, sender_id: int, recipient_id: int) -> float:
         """LatencyModel.get_latency() samples and returns the final latency for a single
@@ -110,48 +147,126 @@ class LatencyModel:
           sender_id: Simulation agent_id for the agent sending the message.
           recipient_id: Simulation agent_id for the agent receiving the message.
         """
+        if self.pairwise:
+            pair = (sender_id, recipient_id)
+            min_latency = self._min_latency[pair]
 
-        min_latency = self._extract(self.min_latency, sender_id, recipient_id)
-
-        if self.latency_model == "cubic":
-            # Generate latency for a single message using the cubic model.
+            if self.latency_model == "deterministic":
+                return min_latency
 
             # If agents cannot communicate in this direction, return special latency -1.
-            if not self._extract(self.connected, sender_id, recipient_id):
+            if not self._connected[pair]:
+                return -1
+
+            a = self._jitter[pair]
+            clip = self._jitter_clip[pair]
+            scale = self._jitter_scale[pair]
+        else:
+            min_latency = self._min_latency
+
+            if self.latency_model == "deterministic":
+                return min_latency
+
+            if not self._connected:
                 return -1
 
-            # Extract the cubic parameters and compute the final latency.
-            a = self._extract(self.jitter, sender_id, recipient_id)
-            clip = self._extract(self.jitter_clip, sender_id, recipient_id)
-            unit = self._extract(self.jitter_unit, sender_id, recipient_id)
-            # Jitter requires a uniform random draw.
+            a = self._jitter
+            clip = self._jitter_clip
+            scale = self._jitter_scale
+
+        # Jitter requires a uniform random draw from [clip, 1).
+        if self.batch_size is None:
             x = self.random_state.uniform(low=clip, high=1.0)
+        else:
+            if self._next_uniform == len(self._uniforms):
+                self._uniforms = self.random_state.random_sample(
+                    self.batch_size
+                ).tolist()
+                self._next_uniform = 0
 
-            # Now apply the cubic model to compute jitter and the final message latency.
-            latency = min_latency + ((a / x ** 3) * (min_latency / unit))
-            return latency
+            x = clip + (1.0 - clip) * self._uniforms[self._next_uniform]
+            self._next_uniform += 1
 
-        else:  # self.latency_model == 'deterministic'
-            return min_latency
+        # Now apply the cubic model to compute jitter and the final message latency.
+        return min_latency + ((a / x ** 3) * scale)
 
-    def _extract(self, param: Union[float, np.ndarray], sid: int, rid: int):
-        """Internal function to extract correct values for a sender->recipient
-        pair from parameters that can be specified as scalar, 1-D ndarray, or 2-D ndarray.
+    def get_latencies(
+        self, sender_ids: Union[int, np.ndarray], recipient_ids: Union[int, np.ndarray]
+    ) -> np.ndarray:
+        """Samples the latencies of several messages at once, e.g. for a message sent by
+        one agent to many recipients. The result is the same as calling ``get_latency``
+        for each (sender, recipient) pair in order.
 
         Arguments:
-            param: The parameter (not parameter name) from which to extract a value.
-            sid: The simulation sender_id agent id.
-            rid: The simulation recipient agent id.
+          sender_ids: Simulation agent_ids of the senders (or a single sender id).
+          recipient_ids: Simulation agent_ids of the recipients (or a single recipient id).
         """
+        sender_ids, recipient_ids = np.broadcast_arrays(
+            np.asarray(sender_ids), np.asarray(recipient_ids)
+        )
+
+        def pairwise(param):
+            if self.pairwise:
+                return param[sender_ids, recipient_ids]
+            return np.full(sender_ids.shape, param)
+
+        min_latency = pairwise(self._min_latency)
+
+        if self.latency_model == "deterministic":
+            return min_latency
+
+        connected = pairwise(self._connected).astype(bool)
+
+        latencies = np.full(sender_ids.shape, -1.0)
+
+        clip = pairwise(self._jitter_clip)[connected]
+        x = clip + (1.0 - clip) * self._draw_uniforms(np.count_nonzero(connected))
+
+        # float_power matches the scalar x ** 3 bit for bit, unlike ``**`` on arrays.
+        latencies[connected] = min_latency[connected] + (
+            (pairwise(self._jitter)[connected] / np.float_power(x, 3))
+            * pairwise(self._jitter_scale)[connected]
+        )
+
+        return latencies
+
+    def _draw_uniforms(self, n: int) -> np.ndarray:
+        """Internal function returning the next n uniform draws on [0, 1) from the
+        buffer in batched mode, or directly from the random state otherwise."""
+        if self.batch_size is None:
+            return self.random_state.random_sample(n)
+
+        buffered = self._uniforms[self._next_uniform : self._next_uniform + n]
+        self._next_uniform += len(buffered)
+
+        if len(buffered) < n:
+            # Refill whole batches so the buffer stays aligned with the unbatched stream.
+            n_missing = n - len(buffered)
+            n_batches = -(-n_missing // self.batch_size)
+            draws = self.random_state.random_sample(n_batches * self.batch_size)
+            buffered += draws[:n_missing].tolist()
+            self._uniforms = draws.tolist()
+            self._next_uniform = n_missing
+
+        return np.array(buffered, dtype=float)
 
+    @staticmethod
+    def _to_pairwise(
+        param: Union[float, np.ndarray], n_agents: int
+    ) -> Union[float, np.ndarray]:
+        """Internal function converting a parameter specified as scalar, 1-D ndarray, or
+        2-D ndarray to a dense (n_agents, n_agents) array, or leaving it as a scalar if
+        all parameters are scalars (n_agents is 0)."""
         if np.isscalar(param):
-            return param
+            if n_agents == 0:
+                return param
+            return np.full((n_agents, n_agents), param)
 
         if isinstance(param, np.ndarray):
             if param.ndim == 1:
-                return param[sid]
+                return np.broadcast_to(param[:, None], (len(param), n_agents))
             elif param.ndim == 2:
-                return param[sid, rid]
+                return param
 
         raise Exception(
             "Config error: LatencyModel parameter is not scalar, 1-D ndarray, or 2-D ndarray."
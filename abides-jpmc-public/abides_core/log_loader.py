@@ -0,0 +1,266 @@
+"""
+Loading of the agents' event logs into one table per event type.
+
+The events of each type are flattened column-wise (dict events get one column per
+key) from either the agents of an end state or the log files written by the kernel,
+the latter being decoded in parallel over a pool of worker processes. Only
+the requested event types are ever rebuilt and flattened.
+"""
+
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .log_writer import AGENTS_DATASET, log_extension, read_log
+
+ColumnSelection = Union[Sequence[str], Dict[str, Sequence[str]], None]
+
+
+def load_logs(
+    source: Union[Dict[str, Any], str],
+    event_types: Optional[Iterable[str]] = None,
+    columns: ColumnSelection = None,
+    workers: Optional[int] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Loads the logs of all the agents of a simulation as one DataFrame per event type.
+
+    Each table has the EventTime and EventType columns, one column per field of the
+    events (or a ScalarEventValue column for events that are not dicts, and an
+    EmptyEvent column for None events), and the agent_id and agent_type of the agent
+    that logged the event (the agent_id field of the event, if it has one, takes
+    precedence as in ``parse_logs_df``).
+
+    Arguments:
+        source: The end state returned by ``abides.run``, or the directory of the log
+            files of a run (``./log/<log_dir>``).
+        event_types: The event types to load, or None to load all of them.
+        columns: The event fields to keep, either as a list applying to all event
+            types or as a dict from event type to list. None keeps all fields.
+        workers: Number of worker processes decoding the log files (defaults to the
+            number of CPUs). With one worker the files are decoded in the current
+            process. Not used when loading from an end state.
+    """
+    return _merge(_load(source, event_types, columns, workers, False))
+
+
+def load_logs_df(
+    source: Union[Dict[str, Any], str],
+    event_types: Optional[Iterable[str]] = None,
+    columns: ColumnSelection = None,
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Loads the logs of all the agents of a simulation as a single DataFrame, in the
+    layout of ``parse_logs_df``: the events of each agent in log order, agent after
+    agent, indexed by the position of the event in the agent's log. See
+    ``load_logs`` for the arguments.
+    """
+    agents_tables = _load(source, event_types, columns, workers, True)
+
+    dfs = [
+        pd.concat(tables.values(), sort=False).sort_index(kind="stable")
+        for tables in agents_tables
+        if tables
+    ]
+    if not dfs:
+        return pd.DataFrame(columns=["EventTime", "EventType"])
+
+    return pd.concat(dfs, sort=False)
+
+
+def _load(
+    source: Union[Dict[str, Any], str],
+    event_types: Optional[Iterable[str]],
+    columns: ColumnSelection,
+    workers: Optional[int],
+    keep_position: bool,
+) -> List[Dict[str, pd.DataFrame]]:
+    # Returns the event tables of each agent.
+    if event_types is not None:
+        event_types = list(event_types)
+
+    if isinstance(source, dict):
+        return [
+            agent_tables(
+                agent.log.to_dataframe(event_types),
+                agent.id,
+                agent.type,
+                event_types,
+                columns,
+                keep_position,
+            )
+            for agent in source["agents"]
+        ]
+
+    if not os.path.isdir(source):
+        raise ValueError("Log directory does not exist.", "source:", source)
+
+    paths = sorted(
+        glob.glob(os.path.join(source, "*"))
+        + glob.glob(os.path.join(source, AGENTS_DATASET, "agent_type=*", "*"))
+    )
+    paths = [path for path in paths if log_extension(path) is not None]
+    args = (repeat(event_types), repeat(columns), repeat(keep_position))
+
+    if workers == 1:
+        files_tables = list(map(_load_file, paths, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            files_tables = list(executor.map(_load_file, paths, *args))
+
+    return [tables for file_tables in files_tables for tables in file_tables]
+
+
+def _load_file(
+    path: str,
+    event_types: Optional[List[str]],
+    columns: ColumnSelection,
+    keep_position: bool,
+) -> List[Dict[str, pd.DataFrame]]:
+    # Decodes one log file, holding the log of one agent or, in a dataset grouped by
+    # agent type, of all the agents of a type. Files that are not agent event logs
+    # (e.g. the summary log) are skipped.
+    df_log = read_log(path)
+    if df_log.index.name != "EventTime" or "Event" not in df_log.columns:
+        return []
+
+    if "agent_id" in df_log.columns:
+        partition = os.path.basename(os.path.dirname(path))
+        agent_type = partition[len("agent_type=") :]
+        return [
+            agent_tables(
+                agent_log.drop(columns="agent_id"),
+                agent_id,
+                agent_type,
+                event_types,
+                columns,
+                keep_position,
+            )
+            for agent_id, agent_log in df_log.groupby("agent_id", sort=False)
+        ]
+
+    agent_id = df_log.attrs.get("agent_id")
+    agent_type = df_log.attrs.get("agent_type")
+    if agent_type is None:
+        agent_types = df_log.loc[df_log["EventType"] == "AGENT_TYPE", "Event"]
+        if len(agent_types) > 0:
+            agent_type = agent_types.iloc[0]
+
+    return [
+        agent_tables(df_log, agent_id, agent_type, event_types, columns, keep_position)
+    ]
+
+
+def agent_tables(
+    df_log: pd.DataFrame,
+    agent_id: Optional[int],
+    agent_type: Optional[str],
+    event_types: Optional[Iterable[str]] = None,
+    columns: ColumnSelection = None,
+    keep_position: bool = False,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Splits the log DataFrame of one agent (as written by ``Agent.kernel_terminating``)
+    into one flattened table per event type.
+
+    Arguments:
+        df_log: The log of the agent, indexed by EventTime with EventType and Event
+            columns.
+        agent_id: The id of the agent.
+        agent_type: The type of the agent.
+        event_types: The event types to keep, or None to keep all of them.
+        columns: The event fields to keep, see ``load_logs``.
+        keep_position: If True, the tables are indexed by the position of their
+            events in the agent's log.
+    """
+    if event_types is not None:
+        df_log = df_log[df_log["EventType"].isin(list(event_types))]
+
+    times = df_log.index.to_numpy()
+    events = df_log["Event"].to_numpy()
+    codes, types = pd.factorize(df_log["EventType"].to_numpy())
+
+    # Positions of the events of each type, in log order.
+    order = np.argsort(codes, kind="stable")
+    splits = np.flatnonzero(np.diff(codes[order])) + 1
+
+    tables = {}
+    for event_type, entries in zip(types, np.split(order, splits)):
+        if len(entries) == 0:
+            continue
+
+        fields = columns.get(event_type) if isinstance(columns, dict) else columns
+        table = event_table(events[entries].tolist(), fields)
+
+        table.insert(0, "EventTime", times[entries])
+        table.insert(1, "EventType", event_type)
+        if "agent_id" in table.columns:
+            table["agent_id"] = table["agent_id"].where(
+                table["agent_id"].notna(), agent_id
+            )
+        else:
+            table["agent_id"] = agent_id
+        table["agent_type"] = agent_type
+
+        if keep_position:
+            table.index = entries
+
+        tables[event_type] = table
+
+    return tables
+
+
+def event_table(
+    events: List[Any], fields: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Flattens a list of events into a DataFrame, with one column per key of the dict
+    events. Other events are stored in a ScalarEventValue column and None events are
+    marked in an EmptyEvent column.
+
+    Arguments:
+        events: The events to flatten.
+        fields: The columns to keep, or None to keep all of them. The agent_id field
+            is always kept if present.
+    """
+    if not all(type(event) is dict for event in events):
+        events = [
+            (
+                event
+                if isinstance(event, dict)
+                else (
+                    {"EmptyEvent": True}
+                    if event is None
+                    else {"ScalarEventValue": event}
+                )
+            )
+            for event in events
+        ]
+
+    if fields is None:
+        return pd.DataFrame.from_records(events)
+
+    fields = list(fields)
+    if "agent_id" not in fields and any("agent_id" in event for event in events):
+        fields.append("agent_id")
+
+    return pd.DataFrame.from_records(events, columns=fields)
+
+
+def _merge(agents_tables: List[Dict[str, pd.DataFrame]]) -> Dict[str, pd.DataFrame]:
+    # Concatenates the tables of all agents, per event type.
+    tables_by_type: Dict[str, List[pd.DataFrame]] = {}
+    for tables in agents_tables:
+        for event_type, table in tables.items():
+            tables_by_type.setdefault(event_type, []).append(table)
+
+    return {
+        event_type: pd.concat(tables, ignore_index=True, sort=False)
+        for event_type, tables in tables_by_type.items()
+    }
@@ -0,0 +1,114 @@
+from typing import Any, Dict, Iterable, Optional, Union
+
+
+class LogPolicy:
+    """
+    Selects which events agents keep in their logs, per event type.
+
+    An event type is logged if it is in ``include`` (or ``include`` is None) and not
+    in ``exclude``. Event types in ``sample`` are only logged 1 in N times: the 1st,
+    (N+1)th, (2N+1)th... event of that type logged by each agent, so sampling is
+    deterministic and does not draw from any random state.
+
+    ``agent_types`` overrides any of these rules for the agents of a type: for
+    example ``{"ExchangeAgent": {"include": None}}`` keeps all the events of the
+    exchange while the other agents follow the top level rules.
+
+    A policy is passed to the kernel with the ``log_policy`` key of the config
+    (either as a ``LogPolicy`` or as a dict of its arguments). It is applied on top
+    of the agents' ``log_events`` flag, which still disables all logging, and only
+    to the events logged once the kernel has been created.
+
+    Arguments:
+        include: Event types to log, or None to log all event types.
+        exclude: Event types never to log.
+        sample: Mapping from event type to N, to log only 1 in N events of that type.
+        agent_types: Mapping from agent type to a dict of ``include``, ``exclude``
+            and/or ``sample`` replacing the top level rules for that agent type.
+    """
+
+    def __init__(
+        self,
+        include: Optional[Iterable[str]] = None,
+        exclude: Iterable[str] = (),
+        sample: Optional[Dict[str, int]] = None,
+        agent_types: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        self.include: Optional[frozenset] = (
+            frozenset(include) if include is not None else None
+        )
+        self.exclude: frozenset = frozenset(exclude)
+        self.sample: Dict[str, int] = dict(sample or {})
+        self.agent_types: Dict[str, Dict[str, Any]] = dict(agent_types or {})
+
+        for event_type, rate in self.sample.items():
+            if int(rate) != rate or rate < 1:
+                raise ValueError(
+                    "Config error: sampling rate must be a positive integer.",
+                    "event_type:",
+                    event_type,
+                    "rate:",
+                    rate,
+                )
+
+        for agent_type, overrides in self.agent_types.items():
+            unknown = set(overrides) - {"include", "exclude", "sample"}
+            if unknown:
+                raise ValueError(
+                    "Config error: unknown log policy override.",
+                    "agent_type:",
+                    agent_type,
+                    "keys:",
+                    sorted(unknown),
+                )
+
+    @classmethod
+    def from_config(
+        cls, policy: Union["LogPolicy", Dict[str, Any], None]
+    ) -> Optional["LogPolicy"]:
+        """
+        Returns the policy given by the ``log_policy`` config value.
+
+        Arguments:
+            policy: A LogPolicy, a dict of LogPolicy arguments or None.
+        """
+        if policy is None or isinstance(policy, LogPolicy):
+            return policy
+
+        return cls(**policy)
+
+    def for_agent(self, agent_type: str) -> "LogPolicy":
+        """
+        Returns the policy followed by the agents of a type, with its overrides
+        applied.
+
+        Arguments:
+            agent_type: The type of the agent.
+        """
+        overrides = self.agent_types.get(agent_type)
+        if overrides is None:
+            return self
+
+        return LogPolicy(
+            **{
+                "include": self.include,
+                "exclude": self.exclude,
+                "sample": self.sample,
+                **overrides,
+            }
+        )
+
+    def rate(self, event_type: str) -> int:
+        """
+        Returns N if 1 in N events of the given type are logged, or 0 if none are.
+
+        Arguments:
+            event_type: The event type.
+        """
+        if self.include is not None and event_type not in self.include:
+            return 0
+
+        if event_type in self.exclude:
+            return 0
+
+        return int(self.sample.get(event_type, 1))
@@ -0,0 +1,297 @@
+"""
+Output of the logs written by the kernel: file format, compression and background
+writing.
+"""
+
+import importlib.util
+import os
+import pickle
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+# File extension of each format (for pickle, of each compression method).
+PICKLE_EXTENSIONS = {
+    "bz2": ".bz2",
+    "gzip": ".pkl.gz",
+    "xz": ".pkl.xz",
+    "zip": ".pkl.zip",
+    "zstd": ".pkl.zst",
+    None: ".pkl",
+}
+FORMAT_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# Directory of the logs of all agents, partitioned by agent type, when agent logs
+# are grouped.
+AGENTS_DATASET = "agents"
+
+# Objects column of the agent and summary logs, pickled to bytes in columnar
+# formats.
+OBJECT_COLUMN = "Event"
+
+# Arrow files cannot store an index: these index columns are restored on reading.
+INDEX_COLUMNS = ("EventTime", "FundamentalTime")
+
+
+class LogWriter:
+    """
+    Writes the DataFrames of the agent logs, summary log and other kernel logs.
+
+    The default writes one bz2 compressed pickle per log, synchronously, as the
+    kernel always did. Otherwise:
+
+    - ``format`` can be "parquet" or "arrow" (Arrow IPC / Feather V2 files), both
+      requiring pyarrow, in which case ``compression`` is a codec such as "zstd",
+      "lz4" or "snappy". The Event column, which holds arbitrary python objects, is
+      stored as pickled bytes (``read_log`` restores it). Arrow files do not keep
+      the index, other than the EventTime and FundamentalTime indexes of the logs.
+    - With ``workers`` > 0 the files are written by a pool of background threads, so
+      that compression overlaps with the teardown of the other agents. At most
+      ``max_pending`` logs wait to be written at any time, further writes block.
+    - With ``group_by_agent_type`` the logs of all agents of a type are written as a
+      single file, with an agent_id column, in a dataset partitioned by agent type
+      (``agents/agent_type=<type>/part-0.<ext>``), instead of one file per agent.
+
+    A log writer is passed to the kernel with the ``log_writer`` key of the config,
+    either as a ``LogWriter`` or as a dict of its arguments.
+
+    Arguments:
+        format: "pickle", "parquet" or "arrow".
+        compression: Compression method, or None for no compression. Defaults to
+            "bz2" for pickle and "zstd" for parquet and arrow. For pickle it can also
+            be a dict, e.g. {"method": "gzip", "compresslevel": 1}.
+        workers: Number of background writer threads, 0 to write synchronously.
+        max_pending: Maximum number of logs waiting to be written (defaults to twice
+            the number of workers).
+        group_by_agent_type: Write the agent logs as one file per agent type.
+    """
+
+    def __init__(
+        self,
+        format: str = "pickle",
+        compression: Union[str, Dict[str, Any], None] = "default",
+        workers: int = 0,
+        max_pending: Optional[int] = None,
+        group_by_agent_type: bool = False,
+    ) -> None:
+        if format not in ("pickle", "parquet", "arrow"):
+            raise ValueError("Config error: unknown log format.", "format:", format)
+
+        if format != "pickle" and importlib.util.find_spec("pyarrow") is None:
+            raise ValueError(
+                "Config error: log format requires pyarrow to be installed.",
+                "format:",
+                format,
+            )
+
+        if compression == "default":
+            compression = "bz2" if format == "pickle" else "zstd"
+
+        if format == "pickle":
+            method = (
+                compression.get("method")
+                if isinstance(compression, dict)
+                else compression
+            )
+            if method not in PICKLE_EXTENSIONS:
+                raise ValueError(
+                    "Config error: unknown pickle compression.",
+                    "compression:",
+                    compression,
+                )
+
+        if workers < 0:
+            raise ValueError(
+                "Config error: number of writer threads must be >= 0.",
+                "workers:",
+                workers,
+            )
+
+        self.format: str = format
+        self.compression: Union[str, Dict[str, Any], None] = compression
+        self.workers: int = workers
+        self.max_pending: int = max_pending or 2 * workers
+        self.group_by_agent_type: bool = group_by_agent_type
+
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.pending: Optional[threading.BoundedSemaphore] = None
+        self.futures: List[Future] = []
+
+        # Agent logs waiting to be written by close(), by (directory, agent type).
+        self.agent_logs: Dict[Tuple[str, str], List[pd.DataFrame]] = {}
+
+    @classmethod
+    def from_config(
+        cls, log_writer: Union["LogWriter", Dict[str, Any], None]
+    ) -> "LogWriter":
+        """
+        Returns the log writer given by the ``log_writer`` config value.
+
+        Arguments:
+            log_writer: A LogWriter, a dict of LogWriter arguments, or None for the
+                default writer.
+        """
+        if isinstance(log_writer, LogWriter):
+            return log_writer
+
+        return cls(**(log_writer or {}))
+
+    @property
+    def extension(self) -> str:
+        """File extension of the written logs."""
+        if self.format == "pickle":
+            method = (
+                self.compression.get("method")
+                if isinstance(self.compression, dict)
+                else self.compression
+            )
+            return PICKLE_EXTENSIONS[method]
+
+        return FORMAT_EXTENSIONS[self.format]
+
+    def write(self, df_log: pd.DataFrame, path: str, name: str) -> None:
+        """
+        Writes a log DataFrame (in the background when using writer threads).
+
+        Arguments:
+            df_log: The log to write.
+            path: The directory to write the log to, created if needed.
+            name: The name of the file, without extension.
+        """
+        self._submit(self._write_file, df_log, path, name)
+
+    def write_agent_log(
+        self, df_log: pd.DataFrame, path: str, name: str, agent_id: int, agent_type: str
+    ) -> None:
+        """
+        Writes the log of an agent, or keeps it to write it with the logs of the other
+        agents of its type on close when grouping agent logs by type.
+
+        Arguments:
+            df_log: The log of the agent.
+            path: The directory of the logs of the simulation.
+            name: The name of the file of the agent, when not grouping.
+            agent_id: The id of the agent.
+            agent_type: The type of the agent.
+        """
+        if not self.group_by_agent_type:
+            self.write(df_log, path, name)
+            return
+
+        df_log = df_log.assign(agent_id=agent_id)
+        self.agent_logs.setdefault((path, agent_type), []).append(df_log)
+
+    def close(self) -> None:
+        """
+        Writes the grouped agent logs and waits for all the writes to complete. The
+        writer can be used again afterwards.
+        """
+        agent_logs, self.agent_logs = self.agent_logs, {}
+        for (path, agent_type), dfs in agent_logs.items():
+            self._submit(self._write_partition, dfs, path, agent_type)
+
+        futures, self.futures = self.futures, []
+        try:
+            for future in futures:
+                future.result()
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
+
+    def _submit(self, fn: Callable, *args: Any) -> None:
+        if self.workers == 0:
+            fn(*args)
+            return
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="abides-log-writer"
+            )
+            self.pending = threading.BoundedSemaphore(self.max_pending)
+
+        self.pending.acquire()
+        future = self.executor.submit(fn, *args)
+        future.add_done_callback(lambda _: self.pending.release())
+        self.futures.append(future)
+
+    def _write_partition(self, dfs: List[pd.DataFrame], path: str, agent_type: str):
+        partition = os.path.join(
+            path, AGENTS_DATASET, "agent_type={}".format(agent_type.replace(" ", ""))
+        )
+        self._write_file(pd.concat(dfs), partition, "part-0")
+
+    def _write_file(self, df_log: pd.DataFrame, path: str, name: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        file = os.path.join(path, name + self.extension)
+
+        if self.format == "pickle":
+            df_log.to_pickle(file, compression=self.compression)
+            return
+
+        df_log = _pickle_objects(df_log)
+        if self.format == "parquet":
+            df_log.to_parquet(file, compression=self.compression)
+        else:
+            df_log = df_log.reset_index(drop=df_log.index.name is None)
+            df_log.to_feather(file, compression=self.compression)
+
+
+def _pickle_objects(df_log: pd.DataFrame) -> pd.DataFrame:
+    if OBJECT_COLUMN not in df_log.columns:
+        return df_log
+
+    df_log = df_log.copy()
+    df_log[OBJECT_COLUMN] = [
+        pickle.dumps(event, protocol=pickle.HIGHEST_PROTOCOL)
+        for event in df_log[OBJECT_COLUMN]
+    ]
+    return df_log
+
+
+def log_extension(path: str) -> Optional[str]:
+    """
+    Returns the extension of a log file written by a LogWriter, or None if the file
+    is not a log.
+
+    Arguments:
+        path: The path of the file.
+    """
+    for extension in sorted(
+        list(PICKLE_EXTENSIONS.values()) + list(FORMAT_EXTENSIONS.values()),
+        key=len,
+        reverse=True,
+    ):
+        if path.endswith(extension):
+            return extension
+
+    return None
+
+
+def read_log(path: str) -> pd.DataFrame:
+    """
+    Reads a log file written by a LogWriter in any format.
+
+    Arguments:
+        path: The path of the file.
+    """
+    extension = log_extension(path)
+
+    if extension == ".parquet":
+        df_log = pd.read_parquet(path)
+    elif extension == ".arrow":
+        df_log = pd.read_feather(path)
+        if len(df_log.columns) > 0 and df_log.columns[0] in INDEX_COLUMNS:
+            df_log = df_log.set_index(df_log.columns[0])
+    else:
+        return pd.read_pickle(path, compression="infer")
+
+    if OBJECT_COLUMN in df_log.columns:
+        df_log[OBJECT_COLUMN] = [
+            pickle.loads(event) if isinstance(event, bytes) else event
+            for event in df_log[OBJECT_COLUMN]
+        ]
+
+    return df_log
@@ -0,0 +1,255 @@
+"""
+Batch runner for ABIDES simulations: runs the configuration built by a
+``build_config`` function for every combination of seeds and parameter values in a
+pool of worker processes, and merges the compact per-run metrics into one table.
+"""
+
+import hashlib
+import importlib
+import importlib.util
+import inspect
+import itertools
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from . import abides
+
+logger = logging.getLogger(__name__)
+
+
+def load_config_module(config: str) -> Any:
+    """
+    Loads a configuration module, either from a python file or from a module name
+    (e.g. ``abides_markets.configs.rmsc04``). The module must define ``build_config``
+    and may define ``compute_metrics(end_state) -> Dict[str, Any]``.
+
+    Arguments:
+        config: Path of a python file or name of an importable module.
+    """
+    if config.endswith(".py"):
+        if not os.path.exists(config):
+            raise ValueError("Config file does not exist.", "config:", config)
+
+        module_name = os.path.basename(config)[:-3]
+        spec = importlib.util.spec_from_file_location(module_name, config)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(config)
+
+    if not callable(getattr(module, "build_config", None)):
+        raise ValueError(
+            "Config module has no callable 'build_config'.", "config:", config
+        )
+
+    return module
+
+
+def expand_grid(
+    seeds: Sequence[int], params: Optional[Dict[str, Sequence[Any]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Returns the keyword arguments of ``build_config`` for every run of a sweep: the
+    cartesian product of the parameter values, each repeated for every seed.
+
+    Arguments:
+        seeds: Seeds to run each parameter combination with.
+        params: Mapping from ``build_config`` argument name to the values to try.
+    """
+    params = params or {}
+    names = list(params)
+
+    return [
+        dict(zip(names, values), seed=int(seed))
+        for values in itertools.product(*(params[name] for name in names))
+        for seed in seeds
+    ]
+
+
+def config_key(config: str, module: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Returns what identifies a configuration in the run identifiers: the hash of the
+    source of its file or module, and the default values of the ``build_config``
+    arguments. Editing the configuration thus changes the identifiers of its runs
+    (changes to the agents it imports do not).
+
+    Arguments:
+        config: Path of a python file or name of an importable module.
+        module: The configuration module, loaded from ``config`` if not given.
+    """
+    if module is None:
+        module = load_config_module(config)
+
+    path = config if config.endswith(".py") else getattr(module, "__file__", None)
+    if path is not None:
+        with open(path, "rb") as f:
+            source_hash = hashlib.sha1(f.read()).hexdigest()
+    else:
+        source_hash = config
+
+    defaults = {
+        name: parameter.default
+        for name, parameter in inspect.signature(module.build_config).parameters.items()
+        if parameter.default is not inspect.Parameter.empty
+    }
+
+    return {"source": source_hash, "defaults": defaults}
+
+
+def config_hash(
+    config: str, run_params: Dict[str, Any], key: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Returns a stable identifier for one run, used to name its result file and to skip
+    runs that have already completed. It depends on the source of the configuration
+    and on the ``build_config`` arguments of the run, defaults included.
+
+    Arguments:
+        config: The configuration (file or module) of the run.
+        run_params: The ``build_config`` keyword arguments of the run.
+        key: The ``config_key`` of the configuration, computed if not given.
+    """
+    if key is None:
+        key = config_key(config)
+
+    params = dict(key["defaults"], **run_params)
+    run_key = json.dumps(
+        {"config": key["source"], "params": params}, sort_keys=True, default=str
+    )
+    return hashlib.sha1(run_key.encode()).hexdigest()
+
+
+def default_metrics(end_state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compact metrics available for any simulation: wall clock time, number of
+    messages and the mean ending value of each agent type.
+
+    Arguments:
+        end_state: The end state returned by ``abides.run``.
+    """
+    kernel = end_state["agents"][0].kernel
+
+    metrics = {
+        "wallclock_seconds": end_state[
+            "kernel_event_queue_elapsed_wallclock"
+        ].total_seconds(),
+        "messages": kernel.ttl_messages,
+    }
+
+    for agent_type, value in kernel.mean_result_by_agent_type.items():
+        metrics[f"mean_result_{agent_type}"] = (
+            value / kernel.agent_count_by_type[agent_type]
+        )
+
+    return metrics
+
+
+def run_single(config: str, run_params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Builds and runs one simulation and returns its metrics. This is the function
+    executed in the worker processes, so only the compact metrics dict is sent back
+    to the parent rather than the end state with all agents.
+
+    The kernel is seeded with the run's seed, so a run only depends on its
+    parameters and not on which worker executes it or in which order.
+
+    Arguments:
+        config: The configuration (file or module) to run.
+        run_params: The ``build_config`` keyword arguments, including ``seed``.
+    """
+    module = load_config_module(config)
+    compute_metrics: Callable = getattr(module, "compute_metrics", default_metrics)
+
+    run_id = config_hash(config, run_params, config_key(config, module))
+
+    end_state = abides.run(
+        module.build_config(**run_params),
+        log_dir=run_id,
+        kernel_seed=run_params["seed"],
+    )
+
+    return dict(run_params, run_id=run_id, **compute_metrics(end_state))
+
+
+def sweep(
+    config: str,
+    seeds: Sequence[int],
+    params: Optional[Dict[str, Sequence[Any]]] = None,
+    workers: Optional[int] = None,
+    results_dir: str = "sweep_results",
+) -> pd.DataFrame:
+    """
+    Runs a configuration for every combination of seeds and parameter values over a
+    process pool and returns the merged metrics, one row per run.
+
+    The metrics of each finished run are written to ``<results_dir>/runs/<hash>.json``
+    as soon as it completes; runs whose file already exists are skipped, so an
+    interrupted sweep can simply be started again. The file names depend on the
+    source of the configuration, so the runs of an edited configuration are run
+    again. The merged table is also written
+    to ``<results_dir>/results.csv``.
+
+    Arguments:
+        config: Path of a config file or name of a config module.
+        seeds: Seeds to run each parameter combination with.
+        params: Mapping from ``build_config`` argument name to the values to try.
+        workers: Number of worker processes (defaults to the number of CPUs). With
+            one worker the runs are executed in the current process.
+        results_dir: Directory where the per-run and merged results are stored.
+    """
+    runs_dir = os.path.join(results_dir, "runs")
+    os.makedirs(runs_dir, exist_ok=True)
+
+    key = config_key(config)
+
+    def result_path(run_params: Dict[str, Any]) -> str:
+        return os.path.join(runs_dir, config_hash(config, run_params, key) + ".json")
+
+    def save(result: Dict[str, Any]) -> None:
+        path = os.path.join(runs_dir, result["run_id"] + ".json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(result, f, default=_to_json)
+        os.replace(path + ".tmp", path)
+
+    all_runs = expand_grid(seeds, params)
+    pending = [p for p in all_runs if not os.path.exists(result_path(p))]
+
+    logger.info(
+        f"Sweep of {len(all_runs)} runs: {len(all_runs) - len(pending)} already done, "
+        f"{len(pending)} to run."
+    )
+
+    if workers == 1:
+        for run_params in pending:
+            save(run_single(config, run_params))
+    elif pending:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(run_single, config, run_params)
+                for run_params in pending
+            ]
+            for future in as_completed(futures):
+                save(future.result())
+
+    rows = []
+    for run_params in all_runs:
+        with open(result_path(run_params)) as f:
+            rows.append(json.load(f))
+
+    results = pd.DataFrame(rows)
+    results.to_csv(os.path.join(results_dir, "results.csv"), index=False)
+
+    return results
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+
+    return str(value)
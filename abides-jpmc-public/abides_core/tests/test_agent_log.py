@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from abides_core.agent_log import AgentEventLog, register_event_schema
+
+register_event_schema(
+    "TEST_QUOTE", ("symbol", "price", "quantity"), ("code", "int", "int"), "{},{},{}"
+)
+register_event_schema(
+    "TEST_FILL", ("order_id", "price", "side"), ("int", "float", "code")
+)
+register_event_schema("TEST_VALUE", ("value",), ("int",), scalar=True)
+
+
+ENTRIES = [
+    (1, "AGENT_TYPE", "TestAgent"),
+    (2, "TEST_FILL", {"order_id": 1, "price": 100.5, "side": "BID"}),
+    (2, "TEST_VALUE", 7),
+    (3, "TEST_FILL", {"order_id": np.int64(2), "price": 99.0, "side": None}),
+    # Events not matching their schema are stored as objects.
+    (4, "TEST_FILL", {"order_id": 3, "price": 101.0}),
+    (4, "TEST_FILL", {"order_id": 3, "price": "101", "side": "ASK"}),
+    (5, "TEST_VALUE", 7.5),
+    (5, "TEST_VALUE", True),
+    (6, "TEST_FILL", {"order_id": 4, "price": 98.25, "side": 1}),
+    (6, "OTHER", [1, 2, 3]),
+]
+
+
+def build_log(entries):
+    log = AgentEventLog()
+    for entry in entries:
+        log.append(entry)
+    return log
+
+
+def test_typed_and_object_events():
+    log = build_log(ENTRIES)
+
+    assert len(log) == len(ENTRIES)
+    assert len(log.objects) == 6
+    assert list(log) == ENTRIES
+
+
+def test_to_dataframe_matches_tuple_list():
+    expected = pd.DataFrame(ENTRIES, columns=("EventTime", "EventType", "Event"))
+    expected.set_index("EventTime", inplace=True)
+
+    pd.testing.assert_frame_equal(build_log(ENTRIES).to_dataframe(), expected)
+
+
+def test_add_values_formats_event():
+    log = AgentEventLog()
+    log.add_values(1, "TEST_QUOTE", ("ABM", 10000, 50))
+    log.add_values(2, "TEST_QUOTE", ("ABM", 10001, 20))
+
+    assert list(log) == [
+        (1, "TEST_QUOTE", "ABM,10000,50"),
+        (2, "TEST_QUOTE", "ABM,10001,20"),
+    ]
+    assert log.values == ["ABM"]
+
+    with pytest.raises(ValueError):
+        log.add_values(3, "NO_SCHEMA", (1,))
+
+
+def test_copy_of_object_events():
+    event = {"a": [1]}
+    log = AgentEventLog()
+    log.add(1, "OTHER", event, copy=True)
+    log.add(2, "OTHER", event)
+    event["a"].append(2)
+
+    assert log.events() == [{"a": [1]}, {"a": [1, 2]}]
+
+
+def test_empty_log():
+    log = AgentEventLog()
+
+    assert not log
+    assert len(log.to_dataframe()) == 0
@@ -0,0 +1,140 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from abides_core import Agent, Kernel, Message
+from abides_core.event_queue import (
+    BucketEventQueue,
+    HeapEventQueue,
+    PriorityEventQueue,
+    make_event_queue,
+)
+
+
+def drain(q):
+    out = []
+    while not q.empty():
+        time, (sender_id, recipient_id, message) = q.get()
+        out.append((time, sender_id, recipient_id, message.message_id))
+    return out
+
+
+@pytest.mark.parametrize("queue_class", [HeapEventQueue, BucketEventQueue])
+def test_same_order_as_priority_queue(queue_class):
+    random_state = np.random.RandomState(seed=1)
+
+    reference = PriorityEventQueue()
+    q = queue_class()
+
+    for _ in range(5000):
+        # Narrow ranges to force many ties on time, sender and recipient.
+        time = int(random_state.randint(0, 50_000))
+        sender_id = int(random_state.randint(0, 5))
+        recipient_id = int(random_state.randint(0, 5))
+        message = Message()
+
+        reference.put(time, sender_id, recipient_id, message)
+        q.put(time, sender_id, recipient_id, message)
+
+    assert len(q) == len(reference) == 5000
+    assert drain(q) == drain(reference)
+
+
+def test_interleaved_put_get():
+    random_state = np.random.RandomState(seed=2)
+
+    queues = [PriorityEventQueue(), HeapEventQueue(), BucketEventQueue(100)]
+    results = [[] for _ in queues]
+
+    now = 0
+    for _ in range(2000):
+        time = now + int(random_state.randint(0, 1000))
+        sender_id = int(random_state.randint(0, 3))
+        message = Message()
+        for q in queues:
+            q.put(time, sender_id, 0, message)
+
+        if random_state.rand() < 0.5:
+            for q, result in zip(queues, results):
+                now, (_, _, m) = q.get()
+                result.append((now, m.message_id))
+
+    for q, result in zip(queues, results):
+        result.extend(drain(q))
+
+    assert results[1] == results[0]
+    assert results[2] == results[0]
+
+
+@pytest.mark.parametrize(
+    "queue_class", [PriorityEventQueue, HeapEventQueue, BucketEventQueue]
+)
+def test_pickle(queue_class):
+    q = queue_class()
+    for time in [30, 10, 20, 10]:
+        q.put(time, 0, 1, Message())
+
+    copy = pickle.loads(pickle.dumps(q))
+    copy.put(15, 0, 1, Message())
+
+    assert [t for t, *_ in drain(copy)] == [10, 10, 15, 20, 30]
+    assert [t for t, *_ in drain(q)] == [10, 10, 20, 30]
+
+
+def test_make_event_queue():
+    assert isinstance(make_event_queue("heap"), HeapEventQueue)
+    assert isinstance(make_event_queue("priority"), PriorityEventQueue)
+
+    q = make_event_queue("bucket", bucket_width=10)
+    assert isinstance(q, BucketEventQueue)
+    assert q.bucket_width == 10
+
+    with pytest.raises(ValueError):
+        make_event_queue("unknown")
+
+    with pytest.raises(IndexError):
+        BucketEventQueue().get()
+
+
+class PingAgent(Agent):
+    def __init__(self, id, n_agents, random_state):
+        super().__init__(id, random_state=random_state, log_events=False)
+        self.n_agents = n_agents
+        self.received = []
+
+    def wakeup(self, current_time):
+        super().wakeup(current_time)
+        for recipient_id in range(self.n_agents):
+            self.send_message(recipient_id, Message())
+        if current_time < 1_000:
+            self.set_wakeup(current_time + int(self.random_state.randint(1, 50)))
+
+    def receive_message(self, current_time, sender_id, message):
+        super().receive_message(current_time, sender_id, message)
+        self.received.append((current_time, sender_id))
+        if self.random_state.rand() < 0.3:
+            self.send_message(sender_id, Message())
+
+
+def run_kernel(event_queue):
+    agents = [PingAgent(i, 4, np.random.RandomState(seed=i)) for i in range(4)]
+    kernel = Kernel(
+        agents=agents,
+        start_time=1,
+        stop_time=2_000,
+        default_computation_delay=3,
+        random_state=np.random.RandomState(seed=0),
+        event_queue=event_queue,
+    )
+    kernel.initialize()
+    kernel.runner()
+    return kernel.ttl_messages, [agent.received for agent in agents]
+
+
+def test_kernel_backends_identical():
+    reference = run_kernel("priority")
+
+    assert reference[0] > 0
+    assert run_kernel("heap") == reference
+    assert run_kernel("bucket") == reference
@@ -0,0 +1,50 @@
+import copy
+import pickle
+from collections import deque
+
+import numpy as np
+import pytest
+
+from abides_core.utils import freeze
+
+
+def test_freeze_is_read_only_snapshot():
+    orders = [1, 2]
+    state = {
+        "orders": orders,
+        "buffer": deque([{"bids": [(100, 5)]}]),
+        "prices": np.arange(3),
+    }
+    frozen = freeze(state)
+
+    with pytest.raises(TypeError):
+        frozen["orders"] = []
+
+    with pytest.raises(TypeError):
+        frozen["buffer"][0]["bids"] = []
+
+    with pytest.raises(ValueError):
+        frozen["prices"][0] = 10
+
+    orders.append(3)
+    state["prices"][0] = 10
+
+    assert frozen["orders"] == (1, 2)
+    assert frozen["buffer"][0]["bids"] == ((100, 5),)
+    # arrays are views, not copies
+    assert frozen["prices"][0] == 10
+
+
+def test_freeze_shares_frozen_parts():
+    frozen = freeze({"a": (1, 2), "b": [{"c": 3}]})
+
+    assert freeze(frozen) is frozen
+    assert freeze([frozen])[0] is frozen
+    assert freeze((1, 2)) == (1, 2)
+
+
+def test_frozen_can_be_copied():
+    frozen = freeze({"a": [1, {"b": 2}]})
+
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    assert copy.deepcopy(frozen) == frozen
@@ -0,0 +1,77 @@
+import numpy as np
+
+from abides_core import Agent, Kernel, Message
+from abides_core.kernel_profiler import DispatchStats, KernelProfiler
+from abides_core.message import WakeupMsg
+
+
+class PingAgent(Agent):
+    def __init__(self, id, n_agents, random_state):
+        super().__init__(id, random_state=random_state, log_events=False)
+        self.n_agents = n_agents
+        self.received = []
+
+    def wakeup(self, current_time):
+        super().wakeup(current_time)
+        for recipient_id in range(self.n_agents):
+            self.send_message(recipient_id, Message())
+        if current_time < 1_000:
+            self.set_wakeup(current_time + int(self.random_state.randint(1, 50)))
+
+    def receive_message(self, current_time, sender_id, message):
+        super().receive_message(current_time, sender_id, message)
+        self.received.append((current_time, sender_id))
+
+
+def run_kernel(tmp_path, monkeypatch, profile_kernel):
+    monkeypatch.chdir(tmp_path)
+    agents = [PingAgent(i, 3, np.random.RandomState(seed=i)) for i in range(3)]
+    kernel = Kernel(
+        agents=agents,
+        start_time=1,
+        stop_time=2_000,
+        default_computation_delay=5,
+        random_state=np.random.RandomState(seed=0),
+        log_dir="profile",
+        profile_kernel=profile_kernel,
+    )
+    end_state = kernel.run()
+    return kernel, end_state, [agent.received for agent in agents]
+
+
+def test_profiled_run(tmp_path, monkeypatch):
+    kernel, end_state, received = run_kernel(tmp_path, monkeypatch, True)
+    _, reference_state, reference = run_kernel(tmp_path, monkeypatch, False)
+
+    # Profiling does not change the simulation.
+    assert received == reference
+    assert "kernel_profile" not in reference_state
+
+    profile = end_state["kernel_profile"]
+    assert set(profile["message_type"]) == {"WakeupMsg", "Message"}
+    assert set(profile["agent_type"]) == {"PingAgent"}
+
+    # Every popped message was either dispatched or requeued.
+    assert profile["count"].sum() + profile["requeues"].sum() == kernel.ttl_messages
+    assert profile.attrs["requeues"] == profile["requeues"].sum() > 0
+    assert profile.attrs["queue_length_max"] > 0
+    assert (profile["p50_us"] <= profile["p99_us"]).all()
+    assert (profile["p99_us"] <= profile["max_us"]).all()
+    assert (
+        profile["histogram_ns"].map(lambda h: sum(h.values())) == profile["count"]
+    ).all()
+
+    assert (tmp_path / "log" / "profile" / "kernel_profile.bz2").exists()
+
+
+def test_histogram_quantiles():
+    profiler = KernelProfiler()
+    for elapsed_ns in [100] * 90 + [5_000] * 9 + [1_000_000]:
+        profiler.record_dispatch("Agent", WakeupMsg, elapsed_ns)
+
+    stats = profiler.stats[("Agent", WakeupMsg)]
+    assert stats.count == 100
+    assert stats.quantile_ns(0.5) == 127
+    assert stats.quantile_ns(0.99) == 8191
+    assert stats.quantile_ns(1.0) == 1_000_000
+    assert DispatchStats().quantile_ns(0.5) == 0
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from abides_core.latency_model import LatencyModel
+
+N_AGENTS = 6
+
+
+def extract(param, sender_id, recipient_id):
+    # Value of a parameter given as a scalar, 1-D or 2-D array for one agent pair.
+    if np.isscalar(param):
+        return param
+    if param.ndim == 1:
+        return param[sender_id]
+    return param[sender_id, recipient_id]
+
+
+def reference_latency(params, random_state, sender_id, recipient_id):
+    # Per-message computation of the original implementation.
+    min_latency = extract(params["min_latency"], sender_id, recipient_id)
+    if params.get("latency_model") == "deterministic":
+        return min_latency
+    if not extract(params.get("connected", True), sender_id, recipient_id):
+        return -1
+    a = extract(params.get("jitter", 0.5), sender_id, recipient_id)
+    clip = extract(params.get("jitter_clip", 0.1), sender_id, recipient_id)
+    unit = extract(params.get("jitter_unit", 10.0), sender_id, recipient_id)
+    x = random_state.uniform(low=clip, high=1.0)
+    return min_latency + ((a / x**3) * (min_latency / unit))
+
+
+def make_model(params, seed=1, **kwargs):
+    return LatencyModel(random_state=np.random.RandomState(seed), **params, **kwargs)
+
+
+rs = np.random.RandomState(0)
+PARAMS = [
+    dict(min_latency=1000, latency_model="deterministic"),
+    dict(
+        min_latency=rs.randint(1, 10_000, (N_AGENTS, N_AGENTS)),
+        latency_model="deterministic",
+    ),
+    dict(min_latency=1000, jitter=0.3, jitter_clip=0.2, jitter_unit=5.0),
+    dict(
+        min_latency=rs.randint(1, 10_000, (N_AGENTS, N_AGENTS)),
+        connected=rs.rand(N_AGENTS, N_AGENTS) < 0.8,
+        jitter=rs.rand(N_AGENTS),
+        jitter_clip=0.1,
+        jitter_unit=rs.uniform(1, 20, (N_AGENTS, N_AGENTS)),
+    ),
+]
+
+
+@pytest.mark.parametrize("params", PARAMS)
+@pytest.mark.parametrize("batch_size", [None, 1, 7, 1024])
+def test_same_latencies(params, batch_size):
+    pairs = np.random.RandomState(2).randint(0, N_AGENTS, (500, 2))
+
+    reference = np.random.RandomState(1)
+    model = make_model(params, batch_size=batch_size)
+
+    for sender_id, recipient_id in pairs:
+        assert model.get_latency(sender_id, recipient_id) == reference_latency(
+            params, reference, sender_id, recipient_id
+        )
+
+
+@pytest.mark.parametrize("params", PARAMS)
+@pytest.mark.parametrize("batch_size", [None, 3, 1024])
+def test_get_latencies(params, batch_size):
+    reference = np.random.RandomState(1)
+    model = make_model(params, batch_size=batch_size)
+
+    for sender_id in range(N_AGENTS):
+        # Mix single and bulk calls so bulk draws continue the same stream.
+        assert model.get_latency(sender_id, 0) == reference_latency(
+            params, reference, sender_id, 0
+        )
+
+        recipient_ids = np.arange(N_AGENTS)
+        latencies = model.get_latencies(sender_id, recipient_ids)
+
+        assert latencies.shape == (N_AGENTS,)
+        assert latencies.tolist() == [
+            reference_latency(params, reference, sender_id, recipient_id)
+            for recipient_id in recipient_ids
+        ]
+
+
+def test_invalid_batch_size():
+    with pytest.raises(ValueError):
+        make_model(PARAMS[0], batch_size=0)
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from abides_core import Agent, Kernel
+from abides_core.log_loader import load_logs, load_logs_df
+from abides_core.utils import parse_logs_df
+
+
+def reference_parse_logs_df(end_state):
+    # Per-event implementation parse_logs_df used to have.
+    dfs = []
+    for agent in end_state["agents"]:
+        messages = []
+        for m in agent.log:
+            m = {"EventTime": m[0], "EventType": m[1], "Event": m[2]}
+            event = m.pop("Event")
+            if event is None:
+                event = {"EmptyEvent": True}
+            elif not isinstance(event, dict):
+                event = {"ScalarEventValue": event}
+            m.update(event)
+            if m.get("agent_id") is None:
+                m["agent_id"] = agent.id
+            m["agent_type"] = agent.type
+            messages.append(m)
+        dfs.append(pd.DataFrame(messages))
+
+    return pd.concat(dfs)
+
+
+class TraderAgent(Agent):
+    pass
+
+
+def make_end_state():
+    random_state = np.random.RandomState(0)
+    agents = [Agent(0, type="ExchangeAgent"), TraderAgent(1), TraderAgent(2)]
+
+    for t in range(1, 200):
+        agent = agents[random_state.randint(3)]
+        agent.current_time = t
+        kind = random_state.randint(5)
+        if kind == 0:
+            agent.logEvent(
+                "ORDER_SUBMITTED",
+                {"agent_id": agent.id, "order_id": t, "quantity": 10},
+                deepcopy_event=False,
+            )
+        elif kind == 1:
+            agent.logEvent(
+                "ORDER_EXECUTED",
+                {"order_id": t, "fill_price": 100 + t, "agent_id": None},
+            )
+        elif kind == 2:
+            agent.logEvent("HOLDINGS_UPDATED", {"CASH": t, "ABM": -t})
+        elif kind == 3:
+            agent.logEvent("MARKED_TO_MARKET", t * 10)
+        else:
+            agent.logEvent("MKT_CLOSED", None)
+
+    return {"agents": agents}
+
+
+def assert_same_rows(df, expected):
+    df = df[sorted(df.columns)]
+    expected = expected[sorted(expected.columns)]
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+
+
+def test_parse_logs_df_matches_reference():
+    end_state = make_end_state()
+
+    assert_same_rows(parse_logs_df(end_state), reference_parse_logs_df(end_state))
+
+
+def test_load_logs_by_event_type():
+    end_state = make_end_state()
+    expected = reference_parse_logs_df(end_state)
+
+    tables = load_logs(end_state, event_types=["ORDER_EXECUTED", "MARKED_TO_MARKET"])
+
+    assert set(tables) == {"ORDER_EXECUTED", "MARKED_TO_MARKET"}
+
+    executed = expected[expected["EventType"] == "ORDER_EXECUTED"]
+    executed = executed.dropna(axis=1, how="all").reset_index(drop=True)
+    assert_same_rows(tables["ORDER_EXECUTED"], executed)
+
+    marked = tables["MARKED_TO_MARKET"]
+    assert list(marked.columns) == [
+        "EventTime",
+        "EventType",
+        "ScalarEventValue",
+        "agent_id",
+        "agent_type",
+    ]
+    assert (marked["ScalarEventValue"] == marked["EventTime"] * 10).all()
+
+
+def test_load_logs_columns():
+    end_state = make_end_state()
+
+    tables = load_logs(
+        end_state,
+        event_types=["ORDER_SUBMITTED", "HOLDINGS_UPDATED"],
+        columns={"ORDER_SUBMITTED": ["order_id"], "HOLDINGS_UPDATED": ["CASH"]},
+    )
+
+    assert list(tables["ORDER_SUBMITTED"].columns) == [
+        "EventTime",
+        "EventType",
+        "order_id",
+        "agent_id",
+        "agent_type",
+    ]
+    assert list(tables["HOLDINGS_UPDATED"].columns) == [
+        "EventTime",
+        "EventType",
+        "CASH",
+        "agent_id",
+        "agent_type",
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_load_logs_from_files(tmp_path, monkeypatch, workers):
+    monkeypatch.chdir(tmp_path)
+    end_state = make_end_state()
+    kernel = Kernel(
+        agents=end_state["agents"],
+        start_time=1,
+        skip_log=False,
+        log_dir="run",
+        random_state=np.random.RandomState(seed=0),
+    )
+    for agent in end_state["agents"]:
+        agent.kernel = kernel
+        agent.kernel_terminating()
+    kernel.write_summary_log()
+
+    from_files = load_logs("log/run", workers=workers)
+    in_memory = load_logs(end_state)
+
+    assert set(from_files) == set(in_memory)
+    for event_type, table in in_memory.items():
+        table = table.sort_values(["agent_id", "EventTime"], kind="stable")
+        expected = from_files[event_type].sort_values(
+            ["agent_id", "EventTime"], kind="stable"
+        )
+        assert_same_rows(table.reset_index(drop=True), expected.reset_index(drop=True))
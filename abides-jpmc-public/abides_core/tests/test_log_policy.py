@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from abides_core import Agent, Kernel
+from abides_core.log_policy import LogPolicy
+
+
+class DummyAgent(Agent):
+    pass
+
+
+class OtherAgent(Agent):
+    pass
+
+
+def test_rates():
+    policy = LogPolicy(
+        include=["ORDER_SUBMITTED", "ORDER_EXECUTED", "ENDING_CASH"],
+        exclude=["ENDING_CASH"],
+        sample={"ORDER_SUBMITTED": 10},
+    )
+
+    assert policy.rate("ORDER_SUBMITTED") == 10
+    assert policy.rate("ORDER_EXECUTED") == 1
+    assert policy.rate("ENDING_CASH") == 0
+    assert policy.rate("BEST_BID") == 0
+
+    assert LogPolicy().rate("BEST_BID") == 1
+
+
+def test_agent_type_overrides():
+    policy = LogPolicy(
+        include=["ORDER_EXECUTED"],
+        agent_types={"ExchangeAgent": {"include": None, "exclude": ["BEST_ASK"]}},
+    )
+    exchange_policy = policy.for_agent("ExchangeAgent")
+
+    assert policy.for_agent("NoiseAgent") is policy
+    assert exchange_policy.rate("BEST_BID") == 1
+    assert exchange_policy.rate("BEST_ASK") == 0
+
+
+def test_invalid_policies():
+    with pytest.raises(ValueError):
+        LogPolicy(sample={"ORDER_SUBMITTED": 0})
+
+    with pytest.raises(ValueError):
+        LogPolicy(agent_types={"ExchangeAgent": {"includes": []}})
+
+
+def test_agent_sampling_is_deterministic():
+    agent = DummyAgent(0)
+    agent.set_log_policy(LogPolicy(exclude=["DROPPED"], sample={"SAMPLED": 3}))
+
+    for i in range(10):
+        agent.logEvent("SAMPLED", i)
+        agent.logEvent("DROPPED", i)
+        agent.logEvent("KEPT", i)
+
+    events = [(event_type, event) for _, event_type, event in agent.log]
+
+    assert events.count(("DROPPED", 0)) == 0
+    assert [e for t, e in events if t == "SAMPLED"] == [0, 3, 6, 9]
+    assert [e for t, e in events if t == "KEPT"] == list(range(10))
+
+
+def test_kernel_applies_policy():
+    agents = [DummyAgent(0), OtherAgent(1)]
+    Kernel(
+        agents=agents,
+        start_time=1,
+        random_state=np.random.RandomState(seed=0),
+        log_policy={"include": [], "agent_types": {"OtherAgent": {"include": None}}},
+    )
+
+    assert not agents[0].log_enabled("ORDER_SUBMITTED")
+    assert agents[1].log_enabled("ORDER_SUBMITTED")
+
+    agents[0].log_events = False
+    assert not agents[0].log_enabled("ORDER_SUBMITTED")
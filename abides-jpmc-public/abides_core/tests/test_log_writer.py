@@ -0,0 +1,139 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from abides_core import Agent, Kernel, abides
+from abides_core.log_loader import load_logs
+from abides_core.log_writer import LogWriter, read_log
+
+
+class TraderAgent(Agent):
+    pass
+
+
+def write_logs(log_writer):
+    agents = [Agent(0, type="ExchangeAgent"), TraderAgent(1), TraderAgent(2)]
+    kernel = Kernel(
+        agents=agents,
+        start_time=1,
+        skip_log=False,
+        log_dir="run",
+        random_state=np.random.RandomState(seed=0),
+        log_writer=log_writer,
+    )
+    for agent in agents:
+        agent.kernel = kernel
+
+    for t in range(1, 50):
+        agent = agents[t % 3]
+        agent.current_time = t
+        agent.logEvent("ORDER_SUBMITTED", {"order_id": t, "quantity": t % 7})
+        agent.logEvent("MARKED_TO_MARKET", t * 10, append_summary_log=t > 45)
+
+    for agent in agents:
+        agent.kernel_terminating()
+    kernel.write_summary_log()
+    kernel.log_writer.close()
+
+    return {"agents": agents}
+
+
+def assert_same_tables(tables, expected):
+    assert set(tables) == set(expected)
+    for event_type, table in expected.items():
+        loaded = tables[event_type][table.columns]
+        pd.testing.assert_frame_equal(
+            loaded.sort_values(["agent_id", "EventTime"]).reset_index(drop=True),
+            table.sort_values(["agent_id", "EventTime"]).reset_index(drop=True),
+            check_dtype=False,
+        )
+
+
+def test_default_writer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    end_state = write_logs(None)
+
+    assert sorted(os.listdir("log/run")) == [
+        "ExchangeAgent_0.bz2",
+        "TraderAgent_1.bz2",
+        "TraderAgent_2.bz2",
+        "summary_log.bz2",
+    ]
+    pd.testing.assert_frame_equal(
+        read_log("log/run/TraderAgent_1.bz2"),
+        end_state["agents"][1].log.to_dataframe(),
+    )
+    assert_same_tables(load_logs("log/run", workers=1), load_logs(end_state))
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_grouped_background_writer(tmp_path, monkeypatch, workers):
+    monkeypatch.chdir(tmp_path)
+    log_writer = {
+        "compression": {"method": "gzip", "compresslevel": 1},
+        "workers": workers,
+        "max_pending": 1,
+        "group_by_agent_type": True,
+    }
+    end_state = write_logs(log_writer)
+
+    assert sorted(os.listdir("log/run")) == ["agents", "summary_log.pkl.gz"]
+    assert sorted(os.listdir("log/run/agents")) == [
+        "agent_type=ExchangeAgent",
+        "agent_type=TraderAgent",
+    ]
+    traders = read_log("log/run/agents/agent_type=TraderAgent/part-0.pkl.gz")
+    assert sorted(traders["agent_id"].unique()) == [1, 2]
+
+    summary = read_log("log/run/summary_log.pkl.gz")
+    assert len(summary) == 4
+
+    assert_same_tables(load_logs("log/run", workers=1), load_logs(end_state))
+
+
+@pytest.mark.parametrize("log_format", ["parquet", "arrow"])
+def test_columnar_formats(tmp_path, monkeypatch, log_format):
+    pytest.importorskip("pyarrow")
+    monkeypatch.chdir(tmp_path)
+    end_state = write_logs({"format": log_format, "workers": 2})
+
+    extension = ".parquet" if log_format == "parquet" else ".arrow"
+    pd.testing.assert_frame_equal(
+        read_log("log/run/TraderAgent_1" + extension),
+        end_state["agents"][1].log.to_dataframe(),
+        check_index_type=False,
+    )
+
+
+def test_invalid_writers():
+    with pytest.raises(ValueError):
+        LogWriter(format="csv")
+
+    with pytest.raises(ValueError):
+        LogWriter(compression="lzma")
+
+    with pytest.raises(ValueError):
+        LogWriter(workers=-1)
+
+
+def test_writer_from_config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def build_config(seed=0):
+        return {
+            "seed": seed,
+            "start_time": 1,
+            "stop_time": 100,
+            "agents": [TraderAgent(0, log_events=False)],
+            "stdout_log_level": "WARNING",
+            "log_writer": {"format": "pickle", "compression": "gzip", "workers": 2},
+        }
+
+    end_state = abides.run(build_config())
+    log_writer = end_state["agents"][0].kernel.log_writer
+
+    assert log_writer.format == "pickle"
+    assert log_writer.compression == "gzip"
+    assert log_writer.workers == 2
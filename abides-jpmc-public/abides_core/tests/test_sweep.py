@@ -0,0 +1,124 @@
+import json
+import os
+
+from abides_core.sweep import config_hash, expand_grid, sweep
+
+CONFIG = """
+import numpy as np
+
+from abides_core import Agent, Message
+
+
+class PingAgent(Agent):
+    def __init__(self, id, n_agents, n_pings, random_state):
+        super().__init__(id, random_state=random_state, log_events=False)
+        self.n_agents = n_agents
+        self.n_pings = n_pings
+
+    def wakeup(self, current_time):
+        super().wakeup(current_time)
+        for _ in range(self.n_pings):
+            recipient_id = self.random_state.randint(0, self.n_agents)
+            self.send_message(recipient_id, Message())
+        if current_time < 1_000:
+            self.set_wakeup(current_time + int(self.random_state.randint(1, 50)))
+
+
+def build_config(seed=0, n_agents=3, n_pings=1):
+    random_state = np.random.RandomState(seed=seed)
+    return {
+        "seed": seed,
+        "start_time": 1,
+        "stop_time": 2_000,
+        "agents": [
+            PingAgent(
+                i,
+                n_agents,
+                n_pings,
+                np.random.RandomState(seed=random_state.randint(0, 2 ** 31)),
+            )
+            for i in range(n_agents)
+        ],
+        "stdout_log_level": "WARNING",
+    }
+
+
+def compute_metrics(end_state):
+    return {"messages": end_state["agents"][0].kernel.ttl_messages}
+"""
+
+
+def test_expand_grid():
+    assert expand_grid([1, 2]) == [dict(seed=1), dict(seed=2)]
+    assert expand_grid([1, 2], {"a": [10, 20], "b": ["x"]}) == [
+        dict(a=10, b="x", seed=1),
+        dict(a=10, b="x", seed=2),
+        dict(a=20, b="x", seed=1),
+        dict(a=20, b="x", seed=2),
+    ]
+
+
+def test_config_hash(tmp_path):
+    config = tmp_path / "c.py"
+    other_config = tmp_path / "other" / "c.py"
+    other_config.parent.mkdir()
+
+    config.write_text("def build_config(seed=0, a=1):\n    return {}\n")
+    other_config.write_text("def build_config(seed=0, a=2):\n    return {}\n")
+
+    run_id = config_hash(str(config), dict(a=1, seed=2))
+    assert run_id == config_hash(str(config), dict(seed=2, a=1))
+    assert run_id != config_hash(str(config), dict(a=1, seed=3))
+    # Default values are part of the parameters.
+    assert run_id == config_hash(str(config), dict(seed=2))
+
+    # Configurations with the same name but different sources do not collide.
+    assert config_hash(str(other_config), dict(seed=2)) != config_hash(
+        str(config), dict(seed=2)
+    )
+
+    # Editing a configuration changes its run identifiers.
+    config.write_text("def build_config(seed=0, a=1):\n    return {'x': 1}\n")
+    assert config_hash(str(config), dict(a=1, seed=2)) != run_id
+
+
+def test_sweep(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    config = str(tmp_path / "ping_config.py")
+    with open(config, "w") as f:
+        f.write(CONFIG)
+
+    params = {"n_pings": [1, 3]}
+
+    results = sweep(config, seeds=[1, 2], params=params, workers=2)
+
+    assert list(results.columns) == ["n_pings", "seed", "run_id", "messages"]
+    assert results[["n_pings", "seed"]].values.tolist() == [
+        [1, 1],
+        [1, 2],
+        [3, 1],
+        [3, 2],
+    ]
+    assert (results.messages > 0).all()
+    assert results.run_id.nunique() == 4
+    assert os.path.exists(tmp_path / "sweep_results" / "results.csv")
+
+    # Runs are deterministic whichever process executes them.
+    serial = sweep(config, [1, 2], params, workers=1, results_dir="serial")
+    assert serial.equals(results)
+
+    # Completed runs are not executed again.
+    run_file = tmp_path / "sweep_results" / "runs" / (results.run_id[0] + ".json")
+    with open(run_file) as f:
+        result = json.load(f)
+    result["messages"] = -1
+    with open(run_file, "w") as f:
+        json.dump(result, f)
+
+    resumed = sweep(config, seeds=[1, 2, 3], params=params, workers=2)
+
+    assert len(resumed) == 6
+    assert resumed.messages[0] == -1
+    assert resumed.run_id[[0, 1, 3, 4]].tolist() == results.run_id.tolist()
+    assert resumed.messages[[1, 3, 4]].tolist() == results.messages[1:].tolist()
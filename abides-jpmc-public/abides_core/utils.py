@@ -3,11 +3,14 @@ General purpose utility functions for the simulator, attached to no particular c
 Available to any agent or other module/utility.  Should not require references to
 any simulator object (kernel, agent, etc).
 """
+import copyreg
 import inspect
 import hashlib
 import os
 import pickle
-from typing import List, Dict, Any, Callable
+from collections import deque
+from types import MappingProxyType
+from typing import List, Dict, Any, Callable, Iterable, Optional, Sequence
 
 import numpy as np
 import pandas as pd
@@ -40,6 +43,46 @@ def restrictdict(d: Dict[str, Any], keys: List[str]) -> Dict[str, Any]:
     return subdict(d, inter)
 
 
+def freeze(obj: Any) -> Any:
+    """
+    Returns a read-only view of a nested structure of dicts, lists, deques, tuples and
+    numpy arrays, so that it can be shared instead of being deep copied.
+
+    Dicts become mappingproxies (of a shallow copy), lists and deques become tuples and
+    arrays become non writeable views of the same data. Any other object, including
+    already frozen mappingproxies, is returned as is and is not copied.
+
+    Arguments:
+        - obj: the structure to freeze
+    Returns:
+        - read-only view of the structure, a snapshot of its containers
+    """
+    if isinstance(obj, dict):
+        return MappingProxyType({k: freeze(v) for k, v in obj.items()})
+
+    if isinstance(obj, (list, deque)):
+        return tuple([freeze(v) for v in obj])
+
+    if type(obj) is tuple:
+        frozen = tuple([freeze(v) for v in obj])
+        return obj if all(f is v for f, v in zip(frozen, obj)) else frozen
+
+    if isinstance(obj, np.ndarray) and obj.flags.writeable:
+        view = obj.view()
+        view.flags.writeable = False
+        return view
+
+    return obj
+
+
+def _mappingproxy(d: Dict[Any, Any]) -> MappingProxyType:
+    return MappingProxyType(d)
+
+
+# Frozen structures may be pickled or deep copied (e.g. sent to another process).
+copyreg.pickle(MappingProxyType, lambda proxy: (_mappingproxy, (dict(proxy),)))
+
+
 def custom_eq(a: Any, b: Any) -> bool:
     """returns a==b or True if both a and b are null"""
     return (a == b) | ((a != a) & (b != b))
@@ -120,42 +163,28 @@ def ns_date(ns_datetime: NanosecondTime) -> NanosecondTime:
     return ns_datetime - (ns_datetime % (24 * 3600 * int(1e9)))
 
 
-def parse_logs_df(end_state: dict) -> pd.DataFrame:
+def parse_logs_df(
+    end_state: dict,
+    event_types: Optional[Iterable[str]] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
     """
     Takes the end_state dictionnary returned by an ABIDES simulation goes through all
     the agents, extracts their log, and un-nest them returns a single dataframe with the
     logs from all the agents warning: this is meant to be used for debugging and
     exploration.
+
+    The events are flattened per event type by abides_core.log_loader, whose
+    load_logs is faster when one table per event type is enough.
+
+    Arguments:
+        end_state: The end state returned by ``abides.run``.
+        event_types: If given, only the events of these types are parsed.
+        columns: If given, only these event fields are kept.
     """
-    agents = end_state["agents"]
-    dfs = []
-    for agent in agents:
-        messages = []
-        for m in agent.log:
-            m = {
-                "EventTime": m[0] if isinstance(m[0], (int, np.int64)) else 0,
-                "EventType": m[1],
-                "Event": m[2],
-            }
-            event = m.get("Event", None)
-            if event == None:
-                event = {"EmptyEvent": True}
-            elif not isinstance(event, dict):
-                event = {"ScalarEventValue": event}
-            else:
-                pass
-            try:
-                del m["Event"]
-            except:
-                pass
-            m.update(event)
-            if m.get("agent_id") == None:
-                m["agent_id"] = agent.id
-            m["agent_type"] = agent.type
-            messages.append(m)
-        dfs.append(pd.DataFrame(messages))
-
-    return pd.concat(dfs)
+    from .log_loader import load_logs_df
+
+    return load_logs_df(end_state, event_types, columns)
 
 
 # caching utils: not used by abides but useful to have
@@ -1,2 +1,3 @@
 from .markets_daily_investor_environment_v0 import SubGymMarketsDailyInvestorEnv_v0
 from .markets_execution_environment_v0 import SubGymMarketsExecutionEnv_v0
+from .vector_env import AbidesVectorEnv, make_vector_env
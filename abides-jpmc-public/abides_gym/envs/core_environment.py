@@ -1,4 +1,3 @@
-from copy import deepcopy
 from abc import abstractmethod, ABC
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
@@ -8,13 +7,29 @@ from gym.utils import seeding
 
 from abides_core import Kernel, NanosecondTime
 from abides_core.generators import InterArrivalTimeGenerator
-from abides_core.utils import subdict
+from abides_core.utils import freeze, subdict
 from abides_markets.utils import config_add_agents
+from .warm_start import (
+    WARM_START_MODES,
+    ForkedKernel,
+    ForkServer,
+    KernelSnapshots,
+    reseed_kernel,
+)
 
 
 class AbidesGymCoreEnv(gym.Env, ABC):
     """
     Abstract class for core gym to inherit from to create usable specific ABIDES Gyms
+
+    Arguments:
+        - background_config_pair: tuple consisting in the background builder function and the inputs to use
+        - wakeup_interval_generator: generator used to compute delta time wakeup for the gym experimental agent
+        - state_buffer_length: length of the raw state buffer
+        - first_interval: how long the simulation is run before the first wake up of the gym experimental agent
+        - gymAgentConstructor: constructor of the gym experimental agent
+        - warm_start: None to simulate the market from the open at every reset, "snapshot" to restore a pickled checkpoint of the market at the first wake up of the gym experimental agent, or "fork" to fork a process holding the market at that time (Unix only), see abides_gym.envs.warm_start. The order book event logs are then kept in memory, even if the exchange is configured to stream them to disk, as the episodes started from a warm-up would share their files
+        - warm_start_buckets: number of warm-ups simulated (and kept) with warm_start, episodes are assigned a warm-up by seed
     """
 
     def __init__(
@@ -24,7 +39,20 @@ class AbidesGymCoreEnv(gym.Env, ABC):
         state_buffer_length: int,
         first_interval: Optional[NanosecondTime] = None,
         gymAgentConstructor=None,
+        warm_start: Optional[str] = None,
+        warm_start_buckets: int = 1,
     ) -> None:
+        if warm_start is not None and warm_start not in WARM_START_MODES:
+            raise ValueError(
+                "Config error: unknown warm start mode.", "warm_start:", warm_start
+            )
+
+        if warm_start_buckets < 1:
+            raise ValueError(
+                "Config error: number of warm start buckets must be >= 1.",
+                "warm_start_buckets:",
+                warm_start_buckets,
+            )
 
         self.background_config_pair: Tuple[
             Callable, Optional[Dict[str, Any]]
@@ -38,6 +66,13 @@ class AbidesGymCoreEnv(gym.Env, ABC):
         self.first_interval = first_interval
         self.state_buffer_length: int = state_buffer_length
         self.gymAgentConstructor = gymAgentConstructor
+        self.warm_start: Optional[str] = warm_start
+        self.warm_start_buckets: int = warm_start_buckets
+
+        # Warmed-up kernels, by seed bucket
+        self.snapshots: KernelSnapshots = KernelSnapshots()
+        self.fork_servers: Dict[int, ForkServer] = {}
+        self.kernel = None
 
         self.seed()  # fix random seed if no seed specified
 
@@ -57,6 +92,46 @@ class AbidesGymCoreEnv(gym.Env, ABC):
 
         # get seed to initialize random states for ABIDES
         seed = self.np_random.randint(low=0, high=2 ** 32, dtype="uint64")
+
+        if self.warm_start is None:
+            kernel, raw_state = self.build_kernel(seed)
+        elif self.warm_start == "snapshot":
+            bucket = int(seed) % self.warm_start_buckets
+            if bucket in self.snapshots:
+                kernel, raw_state = self.snapshots.restore(bucket)
+            else:
+                kernel, raw_state = self.build_kernel(seed)
+                self.snapshots.save(bucket, kernel, raw_state)
+            reseed_kernel(kernel, seed)
+        else:
+            bucket = int(seed) % self.warm_start_buckets
+            self._close_kernel()
+            if bucket not in self.fork_servers:
+                self.fork_servers[bucket] = ForkServer(
+                    lambda: self.build_kernel(seed)
+                )
+            kernel = self.fork_servers[bucket].fork(seed)
+            raw_state = self.fork_servers[bucket].raw_state
+
+        # the gym agent of a forked episode lives in the episode process
+        self.gym_agent = kernel.gym_agents[0] if isinstance(kernel, Kernel) else None
+        state = self.raw_state_to_state(freeze(raw_state["result"]))
+        # attach kernel
+        self.kernel = kernel
+        return state
+
+    def build_kernel(self, seed: int) -> Tuple[Kernel, Dict[str, Any]]:
+        """
+        Builds the background config and the kernel of an episode, and runs the
+        simulation until the gym experimental agent has to take its first action.
+
+        Arguments:
+            - seed: seed of the episode
+
+        Returns:
+            - kernel: the kernel, stopped at the first wake up of the gym experimental agent
+            - raw_state: the raw state returned by the kernel runner
+        """
         # instanciate back ground config state
         background_config_args = self.background_config_pair[1]
         background_config_args.update(
@@ -76,7 +151,14 @@ class AbidesGymCoreEnv(gym.Env, ABC):
             **self.extra_gym_agent_kvargs,
         )
         config_state = config_add_agents(background_config_state, [gym_agent])
-        self.gym_agent = config_state["agents"][-1]
+        if self.warm_start is not None:
+            # The episodes started from a warm-up would all append to the files of
+            # its streamed order book event logs: the logs are kept in memory, and
+            # the files already created by the exchange are deleted.
+            for agent in config_state["agents"]:
+                for order_book in getattr(agent, "order_books", {}).values():
+                    if order_book.streamed_logs:
+                        order_book.set_event_log_path(None)
         # KERNEL
         # instantiate the kernel object
         kernel = Kernel(
@@ -90,16 +172,18 @@ class AbidesGymCoreEnv(gym.Env, ABC):
                     "agent_latency_model",
                     "default_computation_delay",
                     "custom_properties",
+                    "event_queue",
+                    "event_queue_kwargs",
+                    "log_policy",
+                    "profile_kernel",
+                    "log_writer",
                 ],
             ),
         )
         kernel.initialize()
         # kernel will run until GymAgent has to take an action
         raw_state = kernel.runner()
-        state = self.raw_state_to_state(deepcopy(raw_state["result"]))
-        # attach kernel
-        self.kernel = kernel
-        return state
+        return kernel, raw_state
 
     def step(self, action: int) -> Tuple[np.ndarray, float, bool, Dict[str, Any]]:
         """
@@ -141,23 +225,21 @@ class AbidesGymCoreEnv(gym.Env, ABC):
         abides_action = self._map_action_space_to_ABIDES_SIMULATOR_SPACE(action)
 
         raw_state = self.kernel.runner((self.gym_agent, abides_action))
-        self.state = self.raw_state_to_state(deepcopy(raw_state["result"]))
+        # read-only view of the raw state, shared by all the transforms below
+        result = freeze(raw_state["result"])
+        self.state = self.raw_state_to_state(result)
 
         assert self.observation_space.contains(
             self.state
         ), f"INVALID STATE {self.state}"
 
-        self.reward = self.raw_state_to_reward(deepcopy(raw_state["result"]))
-        self.done = raw_state["done"] or self.raw_state_to_done(
-            deepcopy(raw_state["result"])
-        )
+        self.reward = self.raw_state_to_reward(result)
+        self.done = raw_state["done"] or self.raw_state_to_done(result)
 
         if self.done:
-            self.reward += self.raw_state_to_update_reward(
-                deepcopy(raw_state["result"])
-            )
+            self.reward += self.raw_state_to_update_reward(result)
 
-        self.info = self.raw_state_to_info(deepcopy(raw_state["result"]))
+        self.info = self.raw_state_to_info(result)
 
         return (self.state, self.reward, self.done, self.info)
 
@@ -212,6 +294,16 @@ class AbidesGymCoreEnv(gym.Env, ABC):
         """
         # kernel.termination()
         ##TODO: look at whether some cleaning functions needed for abides
+        self._close_kernel()
+        for fork_server in self.fork_servers.values():
+            fork_server.close()
+        self.fork_servers = {}
+
+    def _close_kernel(self) -> None:
+        # ends the process of the current episode when it was forked
+        if isinstance(self.kernel, ForkedKernel):
+            self.kernel.close()
+        self.kernel = None
 
     @abstractmethod
     def raw_state_to_state(self, raw_state: Dict[str, Any]) -> np.ndarray:
@@ -219,7 +311,7 @@ class AbidesGymCoreEnv(gym.Env, ABC):
         abstract method that transforms a raw state into a state representation
 
         Arguments:
-            - raw_state: dictionnary that contains raw simulation information obtained from the gym experimental agent
+            - raw_state: dictionnary that contains raw simulation information obtained from the gym experimental agent (read-only view shared by all the transforms of a step, see abides_core.utils.freeze)
 
         Returns:
             - state: state representation defining the MDP
@@ -232,7 +324,7 @@ class AbidesGymCoreEnv(gym.Env, ABC):
         abstract method that transforms a raw state into the reward obtained during the step
 
         Arguments:
-            - raw_state: dictionnary that contains raw simulation information obtained from the gym experimental agent
+            - raw_state: dictionnary that contains raw simulation information obtained from the gym experimental agent (read-only view shared by all the transforms of a step, see abides_core.utils.freeze)
 
         Returns:
             - reward: immediate reward computed at each step
@@ -245,7 +337,7 @@ class AbidesGymCoreEnv(gym.Env, ABC):
         abstract method that transforms a raw state into the flag if an episode is done
 
         Arguments:
-            - raw_state: dictionnary that contains raw simulation information obtained from the gym experimental agent
+            - raw_state: dictionnary that contains raw simulation information obtained from the gym experimental agent (read-only view shared by all the transforms of a step, see abides_core.utils.freeze)
 
         Returns:
             - done: flag that describes if the episode is terminated or not
@@ -258,7 +350,7 @@ class AbidesGymCoreEnv(gym.Env, ABC):
         abstract method that transforms a raw state into the final step reward update (if needed)
 
         Arguments:
-            - raw_state: dictionnary that contains raw simulation information obtained from the gym experimental agent
+            - raw_state: dictionnary that contains raw simulation information obtained from the gym experimental agent (read-only view shared by all the transforms of a step, see abides_core.utils.freeze)
 
         Returns:
             - reward: update reward computed at the end of the episode
@@ -271,7 +363,7 @@ class AbidesGymCoreEnv(gym.Env, ABC):
         abstract method that transforms a raw state into an info dictionnary
 
         Arguments:
-            - raw_state: dictionnary that contains raw simulation information obtained from the gym experimental agent
+            - raw_state: dictionnary that contains raw simulation information obtained from the gym experimental agent (read-only view shared by all the transforms of a step, see abides_core.utils.freeze)
 
         Returns:
             - reward: info dictionnary computed at each step
@@ -1,5 +1,5 @@
 import importlib
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import gym
 import numpy as np
@@ -31,6 +31,8 @@ class SubGymMarketsDailyInvestorEnv_v0(AbidesGymMarketsEnv):
         - reward_mode: can use a dense of sparse reward formulation
         - done_ratio: ratio (mark2market_t/starting_cash) that defines when an episode is done (if agent has lost too much mark to market value)
         - debug_mode: arguments to change the info dictionnary (lighter version if performance is an issue)
+        - warm_start: None, "snapshot" or "fork" to start the episodes from a warmed-up market instead of simulating the market from the open at every reset, see AbidesGymCoreEnv
+        - warm_start_buckets: number of warmed-up markets the episodes are started from
 
     Execution V0:
         - Action Space:
@@ -64,6 +66,8 @@ class SubGymMarketsDailyInvestorEnv_v0(AbidesGymMarketsEnv):
         done_ratio: float = 0.3,
         debug_mode: bool = False,
         background_config_extra_kvargs={},
+        warm_start: Optional[str] = None,
+        warm_start_buckets: int = 1,
     ) -> None:
         self.background_config: Any = importlib.import_module(
             "abides_markets.configs.{}".format(background_config), package=None
@@ -147,6 +151,8 @@ class SubGymMarketsDailyInvestorEnv_v0(AbidesGymMarketsEnv):
             state_buffer_length=self.state_history_length,
             market_data_buffer_length=self.market_data_buffer_length,
             first_interval=self.first_interval,
+            warm_start=warm_start,
+            warm_start_buckets=warm_start_buckets,
         )
 
         # Action Space
@@ -28,6 +28,8 @@ class AbidesGymMarketsEnv(AbidesGymCoreEnv, ABC):
         - market_data_buffer_length: length of the market data buffer
         - first_interval: how long the simulation is run before the first wake up of the gym experimental agent
         - raw_state_pre_process: decorator used to pre-process raw_state
+        - warm_start: None, "snapshot" or "fork" to start the episodes from a warmed-up market, see AbidesGymCoreEnv
+        - warm_start_buckets: number of warmed-up markets the episodes are started from
 
     """
 
@@ -42,6 +44,8 @@ class AbidesGymMarketsEnv(AbidesGymCoreEnv, ABC):
         market_data_buffer_length: int,
         first_interval: Optional[NanosecondTime] = None,
         raw_state_pre_process=markets_agent_utils.identity_decorator,
+        warm_start: Optional[str] = None,
+        warm_start_buckets: int = 1,
     ) -> None:
         super().__init__(
             background_config_pair,
@@ -49,6 +53,8 @@ class AbidesGymMarketsEnv(AbidesGymCoreEnv, ABC):
             state_buffer_length,
             first_interval=first_interval,
             gymAgentConstructor=FinancialGymAgent,
+            warm_start=warm_start,
+            warm_start_buckets=warm_start_buckets,
         )
         self.starting_cash: int = starting_cash
         self.market_data_buffer_length: int = market_data_buffer_length
@@ -1,6 +1,6 @@
 import importlib
 from dataclasses import asdict, dataclass, field
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from abc import ABC
 
 import gym
@@ -40,6 +40,8 @@ class SubGymMarketsExecutionEnv_v0(AbidesGymMarketsEnv):
         - done_ratio: ratio (mark2market_t/starting_cash) that defines when an episode is done (if agent has lost too much mark to market value)
         - debug_mode: arguments to change the info dictionnary (lighter version if performance is an issue)
         - background_config_extra_kvargs: dictionary of extra key value  arguments passed to the background config builder function
+        - warm_start: None, "snapshot" or "fork" to start the episodes from a warmed-up market instead of simulating the market from the open at every reset, see AbidesGymCoreEnv
+        - warm_start_buckets: number of warmed-up markets the episodes are started from
 
     Daily Investor V0:
         - Action Space:
@@ -105,6 +107,8 @@ class SubGymMarketsExecutionEnv_v0(AbidesGymMarketsEnv):
         just_quantity_reward_update: int = 0,
         debug_mode: bool = False,
         background_config_extra_kvargs: Dict[str, Any] = {},
+        warm_start: Optional[str] = None,
+        warm_start_buckets: int = 1,
     ) -> None:
         self.background_config: Any = importlib.import_module(
             "abides_markets.configs.{}".format(background_config), package=None
@@ -213,6 +217,8 @@ class SubGymMarketsExecutionEnv_v0(AbidesGymMarketsEnv):
             state_buffer_length=self.state_history_length,
             market_data_buffer_length=self.market_data_buffer_length,
             first_interval=self.first_interval,
+            warm_start=warm_start,
+            warm_start_buckets=warm_start_buckets,
         )
 
         # Action Space
@@ -0,0 +1,348 @@
+"""
+Vectorized ABIDES gym environments: several simulations stepped in parallel, each in
+its own worker process, without depending on Ray.
+"""
+
+import atexit
+import functools
+import multiprocessing
+import weakref
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import gym
+import numpy as np
+
+
+class AbidesVectorEnv(gym.vector.VectorEnv):
+    """
+    Runs N ABIDES gym environments (e.g. ``SubGymMarketsExecutionEnv_v0`` or
+    ``SubGymMarketsDailyInvestorEnv_v0``) in N worker processes, so that the kernels
+    run on as many cores. The observations are written by the workers in a shared
+    memory buffer, only the rewards, dones and infos are sent through pipes.
+
+    The environments can be stepped in two ways:
+
+    - ``step(actions)``, gym's batched step: all the environments step, those whose
+      episode is done are reset in their worker and the first observation of their
+      next episode is returned, their last observation being in
+      ``info["terminal_observation"]``.
+    - ``send(actions, env_ids)`` and ``recv(batch_size)``: asynchronous stepping,
+      ``recv`` returning the results of the first environments done stepping. The
+      worker of an environment whose episode is done resets it right after sending
+      the last step, while the other environments keep stepping, and the next action
+      sent to that environment returns the first observation of the new episode
+      instead (the action is ignored and ``info["reset"]`` is True). A slow warm-up
+      in one worker never blocks the others.
+
+    Arguments:
+        env_fns: Functions creating the environments, e.g. ``functools.partial`` of
+            an environment class with its arguments. The first one is also called in
+            the current process to read the observation and action spaces.
+        context: Multiprocessing start method of the workers ("fork", "spawn" or
+            "forkserver"), defaults to the platform default. The functions must be
+            picklable unless the workers are forked.
+    """
+
+    def __init__(
+        self,
+        env_fns: Sequence[Callable[[], gym.Env]],
+        context: Optional[str] = None,
+    ) -> None:
+        env = env_fns[0]()
+        observation_space, action_space = env.observation_space, env.action_space
+        env.close()
+
+        if not isinstance(observation_space, gym.spaces.Box):
+            raise ValueError(
+                "Config error: vectorized environments need Box observations.",
+                "observation_space:",
+                observation_space,
+            )
+
+        super().__init__(len(env_fns), observation_space, action_space)
+
+        ctx = multiprocessing.get_context(context)
+        dtype = np.dtype(observation_space.dtype)
+        shape = observation_space.shape
+
+        # One row of observations per environment.
+        self.buffer = ctx.RawArray(
+            "b", len(env_fns) * int(np.prod(shape)) * dtype.itemsize
+        )
+        self.observations: np.ndarray = np.frombuffer(self.buffer, dtype=dtype).reshape(
+            (len(env_fns),) + shape
+        )
+
+        self.connections: List[Connection] = []
+        self.processes: List[multiprocessing.Process] = []
+        for env_id, env_fn in enumerate(env_fns):
+            connection, worker_connection = ctx.Pipe()
+            # Not daemonic so that the environments can start processes themselves
+            # (e.g. fork warm-starts), open environments are closed at exit instead.
+            process = ctx.Process(
+                target=_worker,
+                name="AbidesVectorEnvWorker-{}".format(env_id),
+                args=(env_id, env_fn, worker_connection, self.buffer, dtype, shape),
+            )
+            process.start()
+            worker_connection.close()
+
+            self.connections.append(connection)
+            self.processes.append(process)
+
+        # Environments sent an action and whose result was not received yet.
+        self.pending: List[int] = []
+
+        _open_envs.add(self)
+
+    def seed(self, seeds: Optional[Any] = None) -> List[Any]:
+        """
+        Seeds the environments.
+
+        Arguments:
+            seeds: None, a seed (the i-th environment being seeded with seed + i) or
+                a list of seeds, one per environment.
+        """
+        if seeds is None or isinstance(seeds, int):
+            seeds = [
+                seeds + env_id if seeds is not None else None
+                for env_id in range(self.num_envs)
+            ]
+
+        self._check_idle()
+        for connection, seed in zip(self.connections, seeds):
+            connection.send(("seed", seed))
+
+        return [self._receive(env_id) for env_id in range(self.num_envs)]
+
+    def reset_async(self) -> None:
+        self._check_idle()
+        for connection in self.connections:
+            connection.send(("reset", None))
+        self.pending = list(range(self.num_envs))
+
+    def reset_wait(self, **kwargs) -> np.ndarray:
+        self._receive_all()
+        return self.observations.copy()
+
+    def step_async(self, actions: Sequence[Any]) -> None:
+        self._check_idle()
+        for connection, action in zip(self.connections, actions):
+            connection.send(("step", action))
+        self.pending = list(range(self.num_envs))
+
+    def step_wait(
+        self, **kwargs
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        rewards, dones, infos = zip(*self._receive_all())
+        return (
+            self.observations.copy(),
+            np.array(rewards),
+            np.array(dones, dtype=bool),
+            list(infos),
+        )
+
+    def send(
+        self, actions: Sequence[Any], env_ids: Optional[Sequence[int]] = None
+    ) -> None:
+        """
+        Sends actions to some of the environments, without waiting for their
+        results (see ``recv``).
+
+        Arguments:
+            actions: The actions, one per environment of env_ids.
+            env_ids: The environments to step, defaults to all of them.
+        """
+        if env_ids is None:
+            env_ids = range(self.num_envs)
+
+        for env_id, action in zip(env_ids, actions):
+            if env_id in self.pending:
+                raise ValueError(
+                    "Environment already stepping, recv its result first.",
+                    "env_id:",
+                    env_id,
+                )
+
+            self.connections[env_id].send(("send", action))
+            self.pending.append(env_id)
+
+    def recv(
+        self, batch_size: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]], np.ndarray]:
+        """
+        Waits for the results of the first environments done stepping, and returns
+        their observations, rewards, dones, infos and ids.
+
+        Arguments:
+            batch_size: Number of results to wait for, defaults to all the
+                environments sent an action.
+        """
+        if batch_size is None or batch_size > len(self.pending):
+            batch_size = len(self.pending)
+
+        env_ids: List[int] = []
+        while len(env_ids) < batch_size:
+            waiting = [env_id for env_id in self.pending if env_id not in env_ids]
+            ready = wait([self.connections[env_id] for env_id in waiting])
+            for env_id in waiting:
+                if self.connections[env_id] in ready and len(env_ids) < batch_size:
+                    env_ids.append(env_id)
+
+        results = [self._receive(env_id) for env_id in env_ids]
+        rewards, dones, infos = zip(*results) if results else ((), (), ())
+
+        return (
+            self.observations[env_ids].copy(),
+            np.array(rewards),
+            np.array(dones, dtype=bool),
+            list(infos),
+            np.array(env_ids, dtype=int),
+        )
+
+    def close_extras(self, **kwargs) -> None:
+        # Results still pending are dropped.
+        for connection, process in zip(self.connections, self.processes):
+            if process.is_alive():
+                try:
+                    connection.send(("close", None))
+                except OSError:
+                    pass
+
+        for connection, process in zip(self.connections, self.processes):
+            process.join()
+            connection.close()
+
+        self.pending = []
+        _open_envs.discard(self)
+
+    def _check_idle(self) -> None:
+        if self.pending:
+            raise ValueError(
+                "Environments still stepping, recv their results first.",
+                "env_ids:",
+                list(self.pending),
+            )
+
+    def _receive_all(self) -> List[Any]:
+        # All the results are received before raising the first error, so that the
+        # environments can still be used afterwards.
+        results = []
+        error = None
+        for env_id in list(self.pending):
+            try:
+                results.append(self._receive(env_id))
+            except Exception as e:
+                error = error or e
+
+        if error is not None:
+            raise error
+
+        return results
+
+    def _receive(self, env_id: int) -> Any:
+        result = self.connections[env_id].recv()
+        if env_id in self.pending:
+            self.pending.remove(env_id)
+
+        if isinstance(result, BaseException):
+            raise result
+
+        return result
+
+
+def make_vector_env(
+    env_id: str, num_envs: int, context: Optional[str] = None, **kwargs
+) -> AbidesVectorEnv:
+    """
+    Creates a vectorized environment of a registered ABIDES gym environment.
+
+    Arguments:
+        env_id: Id of the environment, e.g. "markets-execution-v0".
+        num_envs: Number of environments (and worker processes).
+        context: Multiprocessing start method of the workers.
+        kwargs: Arguments of the environments.
+    """
+    env_fn = functools.partial(gym.make, env_id, **kwargs)
+    return AbidesVectorEnv([env_fn] * num_envs, context=context)
+
+
+def _worker(
+    env_id: int,
+    env_fn: Callable[[], gym.Env],
+    connection: Connection,
+    buffer: Any,
+    dtype: np.dtype,
+    shape: Tuple[int, ...],
+) -> None:
+    # Steps one environment, writing its observations in its row of the buffer.
+    size = int(np.prod(shape))
+    observation = np.frombuffer(
+        buffer, dtype=dtype, count=size, offset=env_id * size * dtype.itemsize
+    ).reshape(shape)
+
+    env = env_fn()
+    # First observation of the next episode (or the error of the reset), when reset
+    # after an asynchronous step.
+    next_observation = None
+
+    try:
+        while True:
+            command, data = connection.recv()
+
+            try:
+                if command == "close":
+                    return
+
+                if command == "seed":
+                    connection.send(env.seed(data))
+
+                elif command == "reset":
+                    observation[...] = env.reset()
+                    next_observation = None
+                    connection.send(None)
+
+                elif next_observation is not None:
+                    state, next_observation = next_observation, None
+                    if isinstance(state, Exception):
+                        raise state
+
+                    observation[...] = state
+                    connection.send((0.0, False, {"reset": True}))
+
+                else:
+                    state, reward, done, info = env.step(data)
+                    if done and command == "step":
+                        info = dict(info, terminal_observation=state)
+                        state = env.reset()
+
+                    observation[...] = state
+                    connection.send((reward, done, info))
+
+                    if done and command == "send":
+                        # Errors of the reset are sent with the next result.
+                        try:
+                            next_observation = env.reset()
+                        except Exception as e:
+                            next_observation = e
+
+            except Exception as e:
+                connection.send(e)
+
+    except (EOFError, KeyboardInterrupt):
+        pass
+
+    finally:
+        env.close()
+
+
+# Vectorized environments not closed yet, closed at exit since their workers are not
+# daemonic.
+_open_envs: "weakref.WeakSet[AbidesVectorEnv]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_envs() -> None:
+    for env in list(_open_envs):
+        env.close()
@@ -0,0 +1,240 @@
+"""
+Warm-start of the gym environments: the market is simulated from the open until the
+first decision of the gym agent once per seed bucket, and later episodes of the bucket
+start from a snapshot of that warmed-up kernel instead of replaying the warm-up.
+
+Two kinds of snapshots are available:
+
+- ``KernelSnapshots`` keeps a pickled checkpoint of the kernel of each bucket, restored
+  in the current process at every reset.
+- ``ForkServer`` keeps the warmed-up kernel alive in a server process which forks a
+  copy-on-write child process per episode (Unix only). The episode is then stepped in
+  the child through a ``ForkedKernel``.
+
+In both cases the random states of the kernel and of the agents are reseeded with the
+episode seed once the warm-up is done, so that the episodes of a bucket share their
+warm-up but diverge afterwards.
+
+The episodes of a bucket would also share the files of the order book event logs
+streamed to disk (see ``ExchangeAgent``'s ``event_log_dir``), each appending its own
+events to them. The environment therefore keeps these logs in memory when warm-starting,
+and deletes the files the exchange created for them.
+"""
+
+import multiprocessing
+import os
+import pickle
+import signal
+from multiprocessing.connection import Connection
+from multiprocessing.reduction import recv_handle, send_handle
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from abides_core import Agent, Kernel
+
+WARM_START_MODES = ("snapshot", "fork")
+
+
+def reseed_kernel(kernel: Kernel, seed: int) -> None:
+    """
+    Reseeds in place the random states of a kernel and of all its agents.
+
+    The random states are reseeded rather than replaced, so that the objects sharing
+    the random state of an agent are reseeded too. Note that the oracle keeps its own
+    random state, so the fundamental value path stays the one of the warm-up.
+
+    Arguments:
+        kernel: The kernel to reseed.
+        seed: The seed of the episode.
+    """
+    kernel.random_state.seed(seed)
+    for agent in kernel.agents:
+        agent.random_state.seed(
+            kernel.random_state.randint(low=0, high=2**32, dtype="uint64")
+        )
+
+
+class KernelSnapshots:
+    """
+    Pickled checkpoints of warmed-up kernels, by seed bucket.
+    """
+
+    def __init__(self) -> None:
+        self.snapshots: Dict[int, bytes] = {}
+
+    def __contains__(self, bucket: int) -> bool:
+        return bucket in self.snapshots
+
+    def save(self, bucket: int, kernel: Kernel, raw_state: Dict[str, Any]) -> None:
+        """
+        Saves a checkpoint of a kernel.
+
+        Arguments:
+            bucket: The seed bucket of the kernel.
+            kernel: The kernel, stopped at the first decision of the gym agent.
+            raw_state: The raw state returned by the kernel runner.
+        """
+        self.snapshots[bucket] = pickle.dumps(
+            (kernel, raw_state), protocol=pickle.HIGHEST_PROTOCOL
+        )
+
+    def restore(self, bucket: int) -> Tuple[Kernel, Dict[str, Any]]:
+        """
+        Returns a new copy of the kernel and raw state saved for a bucket.
+
+        Arguments:
+            bucket: The seed bucket of the kernel.
+        """
+        return pickle.loads(self.snapshots[bucket])
+
+
+class ForkedKernel:
+    """
+    Stand-in for the kernel of an episode running in a process forked by a
+    ``ForkServer``: ``runner`` applies the actions of the gym agent and returns the
+    next raw state from the child process.
+
+    Arguments:
+        connection: The connection to the episode process.
+    """
+
+    def __init__(self, connection: Connection) -> None:
+        self.connection: Connection = connection
+
+    def runner(
+        self, agent_actions: Optional[Tuple[Agent, List[Dict[str, Any]]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Runs the episode until the next decision of the gym agent, see
+        ``Kernel.runner``. The agent of ``agent_actions`` is ignored: the actions are
+        applied to the gym agent of the episode process.
+        """
+        self.connection.send(
+            ("step", agent_actions[1] if agent_actions is not None else None)
+        )
+        result = self.connection.recv()
+        if isinstance(result, BaseException):
+            raise result
+
+        return result
+
+    def close(self) -> None:
+        """Ends the episode process."""
+        try:
+            self.connection.send(("close", None))
+        except OSError:
+            pass
+        self.connection.close()
+
+
+class ForkServer:
+    """
+    Server process holding a warmed-up kernel, which forks a new copy-on-write
+    process for each episode. Forking avoids copying the kernel altogether, only the
+    memory pages modified by the episode are ever copied.
+
+    Arguments:
+        build_kernel: Function building the kernel and running it until the first
+            decision of the gym agent, returning the kernel and the raw state. It is
+            called in the server process.
+    """
+
+    def __init__(self, build_kernel: Callable[[], Tuple[Kernel, Dict[str, Any]]]):
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise ValueError(
+                "Config error: fork warm-start is not available on this platform."
+            )
+
+        context = multiprocessing.get_context("fork")
+        self.connection, server_connection = context.Pipe()
+        self.process = context.Process(
+            target=_serve, args=(server_connection, build_kernel), daemon=True
+        )
+        self.process.start()
+        server_connection.close()
+
+        result = self.connection.recv()
+        if isinstance(result, BaseException):
+            raise result
+
+        # Raw state at the first decision of the gym agent, the same for all the
+        # episodes.
+        self.raw_state: Dict[str, Any] = result
+
+    def fork(self, seed: int) -> ForkedKernel:
+        """
+        Starts an episode in a new process forked from the warmed-up kernel.
+
+        Arguments:
+            seed: The seed of the episode.
+        """
+        connection, episode_connection = multiprocessing.Pipe()
+        self.connection.send(("fork", seed))
+        send_handle(self.connection, episode_connection.fileno(), self.process.pid)
+        episode_connection.close()
+
+        return ForkedKernel(connection)
+
+    def close(self) -> None:
+        """Stops the server process. Running episodes are not affected."""
+        # Processes forked from this one afterwards hold a copy of the connection,
+        # so the server is stopped explicitly rather than on end of file.
+        self.connection.send(("close", None))
+        self.connection.close()
+        self.process.join()
+
+
+def _serve(
+    connection: Connection, build_kernel: Callable[[], Tuple[Kernel, Dict[str, Any]]]
+) -> None:
+    # Main loop of the server process: forks one episode process per seed received.
+    try:
+        kernel, raw_state = build_kernel()
+    except BaseException as e:
+        connection.send(e)
+        return
+
+    # Episode processes are reaped automatically.
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    connection.send(raw_state)
+
+    while True:
+        try:
+            command, seed = connection.recv()
+            if command == "close":
+                return
+            fd = recv_handle(connection)
+        except EOFError:
+            return
+
+        if os.fork() == 0:
+            connection.close()
+            try:
+                _run_episode(Connection(fd), kernel, seed)
+            finally:
+                os._exit(0)
+
+        os.close(fd)
+
+
+def _run_episode(connection: Connection, kernel: Kernel, seed: int) -> None:
+    # Steps the episode of a forked process until the environment closes it.
+    reseed_kernel(kernel, seed)
+    gym_agent = kernel.gym_agents[0]
+
+    while True:
+        try:
+            command, actions = connection.recv()
+        except EOFError:
+            return
+
+        if command == "close":
+            return
+
+        try:
+            result = kernel.runner(
+                (gym_agent, actions) if actions is not None else None
+            )
+        except Exception as e:
+            result = e
+
+        connection.send(result)
@@ -1,11 +1,10 @@
 from collections import deque
-from copy import deepcopy
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
 from abides_core import NanosecondTime
-from abides_core.utils import str_to_ns
+from abides_core.utils import freeze, str_to_ns
 from abides_core.generators import ConstantTimeGenerator, InterArrivalTimeGenerator
 from abides_markets.agents.background_v2.core_background_agent import (
     CoreBackgroundAgent,
@@ -123,7 +122,7 @@ class FinancialGymAgent(CoreBackgroundAgent, CoreGymAgent):
         )  # generates next wakeup time
         self.set_wakeup(wake_time)
         self.update_raw_state()
-        raw_state = deepcopy(self.get_raw_state())
+        raw_state = freeze(self.get_raw_state())
         self.new_step_reset()
         # return non None value so the kernel catches it and stops
         return raw_state
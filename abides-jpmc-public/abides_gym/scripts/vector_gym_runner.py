@@ -0,0 +1,26 @@
+import os
+
+from tqdm import tqdm
+
+# Import to register environments
+import abides_gym
+from abides_gym.envs import make_vector_env
+
+if __name__ == "__main__":
+
+    num_envs = os.cpu_count()
+    env = make_vector_env(
+        "markets-execution-v0",
+        num_envs,
+        background_config="rmsc04",
+    )
+
+    env.seed(0)
+    states = env.reset()
+
+    # asynchronous stepping: act on the first half of the environments ready
+    env.send([0] * num_envs)
+    for i in tqdm(range(100)):
+        states, rewards, dones, infos, env_ids = env.recv(max(num_envs // 2, 1))
+        env.send([0] * len(env_ids), env_ids)
+    env.close()
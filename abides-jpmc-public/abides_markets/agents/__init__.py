@@ -21,6 +21,7 @@ from .new_exchange_agent import NewExchangeAgent
 from .new_trading_agent import NewTradingAgent
 from .dual_value_agent import DualValueAgent
 from .intermarket_spread_arbitrage_machine import IntermarketSpreadArbitrageMachine
+from .consolidated_quote_agent import ConsolidatedQuoteAgent
 from .dual_momentum_agent import DualMomentumAgent
 from .dual_noise_agent_0 import NoiseAgent_0
 from .dual_noise_agent_1 import NoiseAgent_1
@@ -1,12 +1,11 @@
 from collections import deque
-from copy import deepcopy
 from typing import Any, Deque, Dict, List, Optional, Tuple
 
 import numpy as np
 
 from abides_core import Message, NanosecondTime
 from abides_core.generators import ConstantTimeGenerator, InterArrivalTimeGenerator
-from abides_core.utils import str_to_ns
+from abides_core.utils import freeze, str_to_ns
 from abides_markets.agents.trading_agent import TradingAgent
 from abides_markets.messages.marketdata import (
     MarketDataMsg,
@@ -199,18 +198,22 @@ class CoreBackgroundAgent(TradingAgent):
                 raise ValueError(f"Action Type {action['type']} is not supported")
 
     def update_raw_state(self) -> None:
+        # the raw state is a read-only snapshot of the buffers and internal data, so
+        # it is shared as is rather than deep copied
         # mkt data
-        parsed_mkt_data_buffer = deepcopy(self.parsed_mkt_data_buffer)
+        parsed_mkt_data_buffer = freeze(self.parsed_mkt_data_buffer)
         # internal data
-        internal_data = self.get_internal_data()
+        internal_data = freeze(self.get_internal_data())
         # volume data
-        parsed_volume_data_buffer = deepcopy(self.parsed_volume_data_buffer)
+        parsed_volume_data_buffer = freeze(self.parsed_volume_data_buffer)
 
-        new = {
-            "parsed_mkt_data": parsed_mkt_data_buffer,
-            "internal_data": internal_data,
-            "parsed_volume_data": parsed_volume_data_buffer,
-        }
+        new = freeze(
+            {
+                "parsed_mkt_data": parsed_mkt_data_buffer,
+                "internal_data": internal_data,
+                "parsed_volume_data": parsed_volume_data_buffer,
+            }
+        )
         self.raw_state.append(new)
 
     def get_raw_state(self) -> Dict:
@@ -0,0 +1,330 @@
+import heapq
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from abides_core import Message, NanosecondTime
+
+from ..messages.marketdata import L2DataMsg, L2SubReqMsg, NBBODataMsg, NBBOSubReqMsg
+from .exchange_agent import ExchangeAgent
+from .financial_agent import FinancialAgent
+from .new_exchange_agent import NewExchangeAgent
+
+logger = logging.getLogger(__name__)
+
+
+class ConsolidatedQuoteAgent(FinancialAgent):
+    """
+    A securities information processor (SIP): the agent subscribes once to the L2 data
+    of every exchange, maintains the national best bid and offer (NBBO) and the
+    consolidated depth of each symbol, and pushes them to its subscribers whenever
+    they change.
+
+    Updates are conflated: the first change of a symbol schedules a publication
+    ``sip_latency`` later, which sends the quotes as of that time to the subscribers
+    whose view of the books (at their depth) changed. Subscribers with a ``freq``
+    receive at most one update per ``freq`` nanoseconds, the last changes being sent
+    at the end of the period.
+
+    Agents routing orders between several exchanges subscribe to it with an
+    ``NBBOSubReqMsg`` and read the quotes of all the exchanges from their local state,
+    instead of querying the spread of every exchange at every decision.
+
+    Arguments:
+        id: The agent ID.
+        symbols: The symbols to consolidate.
+        exchange_ids: The IDs of the exchanges to consolidate, defaults to all the
+            exchange agents of the simulation.
+        depth: The number of price levels of each exchange kept in the consolidated
+            book (subscribers can request fewer).
+        sip_latency: Processing delay between an exchange update and the publication
+            of the consolidated quotes, on top of the latency of the network.
+        name: The agent name.
+        type: The agent type.
+        random_state: The agent random state.
+    """
+
+    @dataclass
+    class NBBOSubscription:
+        """
+        A subscription to the consolidated quotes of a symbol.
+        """
+
+        agent_id: int
+        depth: int
+        freq: int
+        # State:
+        last_message: Optional[NBBODataMsg] = None
+        next_update_ts: NanosecondTime = 0
+
+    def __init__(
+        self,
+        id: int,
+        symbols: List[str],
+        exchange_ids: Optional[List[int]] = None,
+        depth: int = 10,
+        sip_latency: NanosecondTime = 0,
+        name: Optional[str] = None,
+        type: Optional[str] = None,
+        random_state: Optional[np.random.RandomState] = None,
+    ) -> None:
+        super().__init__(id, name, type, random_state)
+
+        if depth < 1:
+            raise ValueError(
+                "Config error: consolidated depth must be >= 1.", "depth:", depth
+            )
+
+        if sip_latency < 0:
+            raise ValueError(
+                "Config error: SIP latency must be >= 0.", "sip_latency:", sip_latency
+            )
+
+        self.symbols: List[str] = symbols
+        self.exchange_ids: Optional[List[int]] = exchange_ids
+        self.depth: int = depth
+        self.sip_latency: NanosecondTime = sip_latency
+
+        # Latest L2 data of each exchange, by symbol then exchange ID.
+        self.exchange_bids: Dict[str, Dict[int, List[Tuple[int, int]]]] = {
+            symbol: {} for symbol in symbols
+        }
+        self.exchange_asks: Dict[str, Dict[int, List[Tuple[int, int]]]] = {
+            symbol: {} for symbol in symbols
+        }
+        self.last_trade: Dict[str, Optional[int]] = {symbol: None for symbol in symbols}
+
+        # Subscriptions of each symbol, by agent ID.
+        self.subscriptions: Dict[
+            str, Dict[int, ConsolidatedQuoteAgent.NBBOSubscription]
+        ] = {symbol: {} for symbol in symbols}
+
+        # Time from which each symbol with changes or deferred updates to send is
+        # published, and the symbols whose changes were not published yet.
+        self.publish_times: Dict[str, NanosecondTime] = {}
+        self.changed_symbols: Set[str] = set()
+        # Heap of the times of the wakeups requested.
+        self.wakeup_times: List[NanosecondTime] = []
+        self.subscribed: bool = False
+
+    def kernel_starting(self, start_time: NanosecondTime) -> None:
+        assert self.kernel is not None
+
+        if self.exchange_ids is None:
+            self.exchange_ids = self.kernel.find_agents_by_type(
+                (ExchangeAgent, NewExchangeAgent)
+            )
+
+        # Wakes up at the start of the simulation to subscribe to the exchanges.
+        super().kernel_starting(start_time)
+
+    def wakeup(self, current_time: NanosecondTime) -> None:
+        super().wakeup(current_time)
+
+        if not self.subscribed:
+            for exchange_id in self.exchange_ids:
+                for symbol in self.symbols:
+                    self.send_message(
+                        exchange_id,
+                        L2SubReqMsg(symbol=symbol, freq=0, depth=self.depth),
+                    )
+            self.subscribed = True
+
+        # Wakeups can be delivered later than requested (e.g. if the agent was busy):
+        # all the wakeups requested until now are served by this one.
+        while self.wakeup_times and self.wakeup_times[0] <= current_time:
+            heapq.heappop(self.wakeup_times)
+
+        due_symbols = sorted(
+            symbol
+            for symbol, publish_time in self.publish_times.items()
+            if publish_time <= current_time
+        )
+        for symbol in due_symbols:
+            del self.publish_times[symbol]
+            self.changed_symbols.discard(symbol)
+            self.publish(symbol)
+
+        if self.publish_times:
+            self.request_wakeup(min(self.publish_times.values()))
+
+    def receive_message(
+        self, current_time: NanosecondTime, sender_id: int, message: Message
+    ) -> None:
+        super().receive_message(current_time, sender_id, message)
+
+        if isinstance(message, NBBOSubReqMsg):
+            if message.symbol not in self.subscriptions:
+                return
+
+            logger.debug(
+                "{} received NBBO subscription request from agent {}".format(
+                    self.name, sender_id
+                )
+            )
+
+            subscriptions = self.subscriptions[message.symbol]
+            if message.cancel:
+                subscriptions.pop(sender_id, None)
+            else:
+                subscriptions[sender_id] = self.NBBOSubscription(
+                    sender_id, min(message.depth, self.depth), message.freq
+                )
+
+                # New subscribers receive the current quotes straight away.
+                if self.exchange_bids[message.symbol]:
+                    self.publish(message.symbol, [subscriptions[sender_id]])
+
+        elif isinstance(message, L2DataMsg) and message.symbol in self.subscriptions:
+            symbol = message.symbol
+            self.last_trade[symbol] = message.last_transaction
+
+            bids = self.exchange_bids[symbol].get(sender_id)
+            asks = self.exchange_asks[symbol].get(sender_id)
+            if bids == message.bids and asks == message.asks:
+                # Only levels deeper than the consolidated depth changed.
+                return
+
+            self.exchange_bids[symbol][sender_id] = message.bids
+            self.exchange_asks[symbol][sender_id] = message.asks
+
+            # The first change since the last publication schedules the next one,
+            # which also carries the later changes. It replaces an update deferred
+            # for the freq of a subscriber, which is sent along with it if due.
+            if symbol not in self.changed_symbols:
+                self.changed_symbols.add(symbol)
+                self.schedule_publication(symbol, current_time + self.sip_latency)
+
+    def schedule_publication(
+        self, symbol: str, publish_time: NanosecondTime, replace: bool = True
+    ) -> None:
+        """
+        Schedules the publication of a symbol.
+
+        Arguments:
+            symbol: The symbol.
+            publish_time: The time of the publication.
+            replace: If False, an earlier publication already scheduled is kept.
+        """
+        if not replace and symbol in self.publish_times:
+            publish_time = min(publish_time, self.publish_times[symbol])
+
+        self.publish_times[symbol] = publish_time
+        self.request_wakeup(publish_time)
+
+    def request_wakeup(self, requested_time: NanosecondTime) -> None:
+        """
+        Requests a wakeup to publish the consolidated quotes, unless one was already
+        requested for that time or earlier.
+
+        Arguments:
+            requested_time: The latest time of the publication.
+        """
+        if not self.wakeup_times or self.wakeup_times[0] > requested_time:
+            heapq.heappush(self.wakeup_times, requested_time)
+            self.set_wakeup(requested_time)
+
+    def publish(
+        self,
+        symbol: str,
+        subscriptions: Optional[
+            Iterable["ConsolidatedQuoteAgent.NBBOSubscription"]
+        ] = None,
+    ) -> None:
+        """
+        Sends the current consolidated quotes of a symbol to the subscribers whose view
+        changed since their last update. Subscribers updated less than ``freq`` ago
+        are updated later instead.
+
+        Arguments:
+            symbol: The symbol.
+            subscriptions: The subscriptions to update, defaults to all the
+                subscriptions of the symbol.
+        """
+        if subscriptions is None:
+            subscriptions = self.subscriptions[symbol].values()
+
+        bids: Optional[List[Tuple[int, int]]] = None
+        asks: Optional[List[Tuple[int, int]]] = None
+
+        # Subscribers requesting the same depth share the same message.
+        messages: Dict[int, NBBODataMsg] = {}
+        for subscription in sorted(subscriptions, key=lambda sub: sub.agent_id):
+            depth = subscription.depth
+            if depth not in messages:
+                if bids is None:
+                    bids = consolidate(self.exchange_bids[symbol].values(), True)
+                    asks = consolidate(self.exchange_asks[symbol].values(), False)
+
+                messages[depth] = NBBODataMsg(
+                    symbol,
+                    self.last_trade[symbol],
+                    self.current_time,
+                    bids[:depth],
+                    asks[:depth],
+                    {
+                        exchange_id: exchange_bids[:depth]
+                        for exchange_id, exchange_bids in self.exchange_bids[
+                            symbol
+                        ].items()
+                    },
+                    {
+                        exchange_id: exchange_asks[:depth]
+                        for exchange_id, exchange_asks in self.exchange_asks[
+                            symbol
+                        ].items()
+                    },
+                )
+
+            message = messages[depth]
+            if subscription.last_message is not None and same_quotes(
+                message, subscription.last_message
+            ):
+                continue
+
+            if self.current_time < subscription.next_update_ts:
+                self.schedule_publication(
+                    symbol, subscription.next_update_ts, replace=False
+                )
+                continue
+
+            self.send_message(subscription.agent_id, message)
+            subscription.last_message = message
+            subscription.next_update_ts = self.current_time + subscription.freq
+
+
+def consolidate(
+    books: Iterable[List[Tuple[int, int]]], reverse: bool
+) -> List[Tuple[int, int]]:
+    """
+    Merges the price levels of one side of several books, summing the volumes
+    available at the same price.
+
+    Arguments:
+        books: The (price, volume) levels of each book.
+        reverse: True for bids (best price first is highest), False for asks.
+    """
+    volumes: Dict[int, int] = {}
+    for book in books:
+        for price, volume in book:
+            volumes[price] = volumes.get(price, 0) + volume
+
+    return sorted(volumes.items(), reverse=reverse)
+
+
+def same_quotes(message: NBBODataMsg, other: NBBODataMsg) -> bool:
+    """
+    Returns whether two consolidated quote messages hold the same books.
+
+    Arguments:
+        message: A message.
+        other: The other message.
+    """
+    return message is other or (
+        message.bids == other.bids
+        and message.asks == other.asks
+        and message.exchange_bids == other.exchange_bids
+        and message.exchange_asks == other.exchange_asks
+    )
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Optional
 
 import numpy as np
 
@@ -7,6 +7,7 @@ from abides_core.utils import str_to_ns
 
 from ..messages.marketdata import MarketDataMsg, L2SubReqMsg
 from ..messages.query import QuerySpreadResponseMsg
+from ..indicators import SimpleMovingAverage
 from ..orders import Side
 from .new_trading_agent import NewTradingAgent
 
@@ -35,6 +36,7 @@ class DualMomentumAgent(NewTradingAgent):
         order_size_model=None,
         subscribe=False,
         log_orders=False,
+        nbbo_freq: NanosecondTime = 0,
     ) -> None:
 
         super().__init__(id, name, type, random_state, starting_cash, log_orders)
@@ -54,19 +56,16 @@ class DualMomentumAgent(NewTradingAgent):
 
         self.subscribe = subscribe  # Flag to determine whether to subscribe to data or use polling mechanism
         self.subscription_requested = False
-        self.mid_list: List[float] = []
-        self.avg_20_list: List[float] = []
-        self.avg_50_list: List[float] = []
+        self.ma_20 = SimpleMovingAverage(20)
+        self.ma_50 = SimpleMovingAverage(50)
+        self.avg_20: Optional[float] = None
+        self.avg_50: Optional[float] = None
         self.log_orders = log_orders
         self.state = "AWAITING_WAKEUP"
-        global best_bid_ex0
-        best_bid_ex0 = None
-        global best_ask_ex0
-        best_ask_ex0 = None 
-        global best_bid_ex1
-        best_bid_ex1 = None 
-        global best_ask_ex1
-        best_ask_ex1 = None 
+        # Whether the agent subscribed to the consolidated quotes of the exchanges,
+        # and the minimum time between two updates of the quotes.
+        self.nbbo_requested = False
+        self.nbbo_freq = nbbo_freq
 
     def kernel_starting(self, start_time: NanosecondTime) -> None:
         super().kernel_starting(start_time)
@@ -84,6 +83,16 @@ class DualMomentumAgent(NewTradingAgent):
             )
             self.subscription_requested = True
             self.state = "AWAITING_MARKET_DATA"
+        elif self.sip_id is not None and not self.subscribe:
+            # The quotes of both exchanges are pushed by the consolidated quote agent,
+            # the agent trades on the NBBO instead of querying a spread.
+            if not self.nbbo_requested:
+                self.request_nbbo_subscription(self.symbol, freq=self.nbbo_freq)
+                self.nbbo_requested = True
+            if can_trade:
+                bid, ask = self.get_nbbo(self.symbol)
+                self.place_orders(bid, ask)
+                self.set_wakeup(current_time + self.get_wake_frequency())
         elif can_trade and not self.subscribe:
             self.get_current_spread(self.symbol, exchange_id=0)
             self.state = "AWAITING_SPREAD"
@@ -102,20 +111,6 @@ class DualMomentumAgent(NewTradingAgent):
             self.place_orders(bid, ask)
             self.set_wakeup(current_time + self.get_wake_frequency())
             self.state = "AWAITING_WAKEUP"
-            if sender_id == 0:
-                if message.bids:
-                    global best_bid_ex0 
-                    best_bid_ex0 = message.bids[0][0]
-                if message.asks:
-                    global best_ask_ex0
-                    best_ask_ex0 = message.asks[0][0]
-            elif sender_id == 1:
-                if message.bids:
-                    global best_bid_ex1
-                    best_bid_ex1 = message.bids[0][0]
-                if message.asks:
-                    global best_ask_ex1
-                    best_ask_ex1 = message.asks[0][0]
         elif (
             self.subscribe
             and self.state == "AWAITING_MARKET_DATA"
@@ -129,26 +124,26 @@ class DualMomentumAgent(NewTradingAgent):
     def place_orders(self, bid: int, ask: int) -> None:
         """Momentum Agent actions logic"""
         if bid and ask:
-            self.mid_list.append((bid + ask) / 2)
-            if len(self.mid_list) > 20:
-                self.avg_20_list.append(
-                    DualMomentumAgent.ma(self.mid_list, n=20)[-1].round(2)
-                )
-            if len(self.mid_list) > 50:
-                self.avg_50_list.append(
-                    DualMomentumAgent.ma(self.mid_list, n=50)[-1].round(2)
-                )
-            if len(self.avg_20_list) > 0 and len(self.avg_50_list) > 0:
+            mid = (bid + ask) / 2
+            self.ma_20.update(mid)
+            self.ma_50.update(mid)
+            if self.ma_20.count > 20:
+                self.avg_20 = np.round(self.ma_20.value, 2)
+            if self.ma_50.count > 50:
+                self.avg_50 = np.round(self.ma_50.value, 2)
+            if self.avg_20 is not None and self.avg_50 is not None:
                 if self.order_size_model is not None:
                     self.size = self.order_size_model.sample(
                         random_state=self.random_state
                     )
+                bb0, ba0 = self.get_exchange_bid_ask(self.symbol, 0)
+                bb1, ba1 = self.get_exchange_bid_ask(self.symbol, 1)
                 if self.size > 0:
-                    if self.avg_20_list[-1] >= self.avg_50_list[-1]:
+                    if self.avg_20 >= self.avg_50:
                         if(MIND_FEES == True):
                             fee_fix = Fees.get_fixed_market_fee(self)
                             fee_mt = Fees.cal_maker_taker_market_fee_static(self, type=1)
-                            exchange_id = Fees.exchange_fee_decision_model(self, fee0=fee_fix, fee1=fee_mt, side=Side.BID, bb0=best_bid_ex0, ba0=best_ask_ex0, bb1=best_bid_ex1, ba1=best_ask_ex1)
+                            exchange_id = Fees.exchange_fee_decision_model(self, fee0=fee_fix, fee1=fee_mt, side=Side.BID, bb0=bb0, ba0=ba0, bb1=bb1, ba1=ba1)
                             fee = fee_fix * self.size if exchange_id == 0 else fee_mt * self.size
                             self.place_market_order(
                                     self.symbol,
@@ -158,7 +153,7 @@ class DualMomentumAgent(NewTradingAgent):
                                     exchange_id=exchange_id
                                     )
                         else:
-                            exchange_id = Fees.exchange_fee_decision_model(self, fee0=0, fee1=0, side=Side.BID, bb0=best_bid_ex0, ba0=best_ask_ex0, bb1=best_bid_ex1, ba1=best_ask_ex1)
+                            exchange_id = Fees.exchange_fee_decision_model(self, fee0=0, fee1=0, side=Side.BID, bb0=bb0, ba0=ba0, bb1=bb1, ba1=ba1)
                             self.place_market_order(
                                     self.symbol,
                                     quantity=self.size,
@@ -170,7 +165,7 @@ class DualMomentumAgent(NewTradingAgent):
                         if(MIND_FEES == True):
                             fee_fix = Fees.get_fixed_market_fee(self)
                             fee_mt = Fees.cal_maker_taker_market_fee_static(self, type=1)
-                            exchange_id = Fees.exchange_fee_decision_model(self, fee0=fee_fix, fee1=fee_mt, side=Side.ASK, bb0=best_bid_ex0, ba0=best_ask_ex0, bb1=best_bid_ex1, ba1=best_ask_ex1)
+                            exchange_id = Fees.exchange_fee_decision_model(self, fee0=fee_fix, fee1=fee_mt, side=Side.ASK, bb0=bb0, ba0=ba0, bb1=bb1, ba1=ba1)
                             fee = fee_fix * self.size if exchange_id == 0 else fee_mt * self.size
                             self.place_market_order(
                                     self.symbol,
@@ -180,7 +175,7 @@ class DualMomentumAgent(NewTradingAgent):
                                     exchange_id=exchange_id
                                     )
                         else:
-                            exchange_id = Fees.exchange_fee_decision_model(self, fee0=0, fee1=0, side=Side.ASK, bb0=best_bid_ex0, ba0=best_ask_ex0, bb1=best_bid_ex1, ba1=best_ask_ex1)
+                            exchange_id = Fees.exchange_fee_decision_model(self, fee0=0, fee1=0, side=Side.ASK, bb0=bb0, ba0=ba0, bb1=bb1, ba1=ba1)
                             self.place_market_order(
                                     self.symbol,
                                     quantity=self.size,
@@ -195,9 +190,3 @@ class DualMomentumAgent(NewTradingAgent):
         else:
             delta_time = self.random_state.exponential(scale=self.arrival_rate)
             return int(round(delta_time))
-
-    @staticmethod
-    def ma(a, n=20):
-        ret = np.cumsum(a, dtype=float)
-        ret[n:] = ret[n:] - ret[:-n]
-        return ret[n - 1 :] / n
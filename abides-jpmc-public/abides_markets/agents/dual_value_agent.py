@@ -30,6 +30,7 @@ class DualValueAgent(NewTradingAgent):
         order_size_model=None,
         lambda_a: float = 0.005,
         log_orders: float = False,
+        nbbo_freq: NanosecondTime = 0,
     ) -> None:
         # Base class init.
         super().__init__(id, name, type, random_state, starting_cash, log_orders)
@@ -68,14 +69,10 @@ class DualValueAgent(NewTradingAgent):
 
         self.depth_spread: int = 2
 
-        global best_bid_ex0
-        best_bid_ex0 = None
-        global best_ask_ex0
-        best_ask_ex0 = None 
-        global best_bid_ex1
-        best_bid_ex1 = None 
-        global best_ask_ex1
-        best_ask_ex1 = None 
+        # Whether the agent subscribed to the consolidated quotes of the exchanges,
+        # and the minimum time between two updates of the quotes.
+        self.nbbo_requested: bool = False
+        self.nbbo_freq: NanosecondTime = nbbo_freq
 
     def kernel_starting(self, start_time: NanosecondTime) -> None:
         # self.kernel is set in Agent.kernel_initializing()
@@ -125,6 +122,12 @@ class DualValueAgent(NewTradingAgent):
 
         self.state = "INACTIVE"
 
+        if self.sip_id is not None and not self.nbbo_requested:
+            # The quotes of both exchanges are then pushed by the consolidated quote
+            # agent, instead of querying both spreads at every wakeup.
+            self.request_nbbo_subscription(self.symbol, freq=self.nbbo_freq)
+            self.nbbo_requested = True
+
         if not self.mkt_open or not self.mkt_close:
             # TradingAgent handles discovery of exchange times.
             return
@@ -155,7 +158,10 @@ class DualValueAgent(NewTradingAgent):
         self.cancel_all_orders(exchange_id=0)
         self.cancel_all_orders(exchange_id=1)
 
-        if type(self) == DualValueAgent:
+        if type(self) == DualValueAgent and self.sip_id is not None:
+            self.placeOrder()
+            self.state = "AWAITING_WAKEUP"
+        elif type(self) == DualValueAgent:
             self.get_current_spread(self.symbol, 0)
             self.get_current_spread(self.symbol, 1)
             self.state = "AWAITING_SPREAD"
@@ -243,11 +249,18 @@ class DualValueAgent(NewTradingAgent):
         r_T = self.updateEstimates()
 
 
-        bid, bid_vol, ask, ask_vol = self.get_known_bid_ask(self.symbol)
+        if self.sip_id is not None:
+            bid, ask = self.get_nbbo(self.symbol)
+        else:
+            bid, bid_vol, ask, ask_vol = self.get_known_bid_ask(self.symbol)
+
+        bb0, ba0 = self.get_exchange_bid_ask(self.symbol, 0)
+        bb1, ba1 = self.get_exchange_bid_ask(self.symbol, 1)
 
         if bid and ask:
             mid = int((ask + bid) / 2)
-            spread = abs(ask - bid)
+            # The NBBO can be locked across exchanges, spread at least one tick.
+            spread = max(abs(ask - bid), 1)
 
             if self.random_state.rand() < self.percent_aggr:
                 adjust_int = 0
@@ -286,10 +299,10 @@ class DualValueAgent(NewTradingAgent):
             if(MIND_FEES == True):
                 # static 9 cents per security
                 fee_fix = Fees.get_fixed_market_fee(self)
-                b_maker_taker = Fees.cal_maker_taker_order(self, price=p, current_best_bid=best_bid_ex1, current_best_ask=best_ask_ex1, side=side)
+                b_maker_taker = Fees.cal_maker_taker_order(self, price=p, current_best_bid=bb1, current_best_ask=ba1, side=side)
                 # static 0.3 or -0.2 per security
                 fee_mt = Fees.cal_maker_taker_market_fee_static(self, type=b_maker_taker)
-                exchange_id = Fees.exchange_fee_decision_model(self, fee0=fee_fix, fee1=fee_mt, side=side, bb0=best_bid_ex0, ba0=best_ask_ex0, bb1=best_bid_ex1, ba1=best_ask_ex1)
+                exchange_id = Fees.exchange_fee_decision_model(self, fee0=fee_fix, fee1=fee_mt, side=side, bb0=bb0, ba0=ba0, bb1=bb1, ba1=ba1)
                 fee = fee_fix * self.size if exchange_id == 0 else fee_mt * self.size
                 self.place_limit_order(symbol=self.symbol,
                                         quantity=self.size,
@@ -299,7 +312,7 @@ class DualValueAgent(NewTradingAgent):
                                         exchange_id=exchange_id
                                         )
             else:
-                exchange_id = Fees.exchange_fee_decision_model(self, fee0=0, fee1=0, side=side, bb0=best_bid_ex0, ba0=best_ask_ex0, bb1=best_bid_ex1, ba1=best_ask_ex1)
+                exchange_id = Fees.exchange_fee_decision_model(self, fee0=0, fee1=0, side=side, bb0=bb0, ba0=ba0, bb1=bb1, ba1=ba1)
                 self.place_limit_order(symbol=self.symbol,
                                         quantity=self.size,
                                         side=side,
@@ -329,22 +342,6 @@ class DualValueAgent(NewTradingAgent):
                 if self.mkt_closed:
                     return
 
-                # Get the information from sender id 1 and 0
-                if sender_id == 0:
-                    if message.bids:
-                        global best_bid_ex0 
-                        best_bid_ex0 = message.bids[0][0]
-                    if message.asks:
-                        global best_ask_ex0
-                        best_ask_ex0 = message.asks[0][0]
-                elif sender_id == 1:
-                    if message.bids:
-                        global best_bid_ex1
-                        best_bid_ex1 = message.bids[0][0]
-                    if message.asks:
-                        global best_ask_ex1
-                        best_ask_ex1 = message.asks[0][0]
-                
                 # We now have the information needed to place a limit order with the eta
                 # strategic threshold parameter.
                 self.placeOrder()
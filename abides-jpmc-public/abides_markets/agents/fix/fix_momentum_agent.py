@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Optional
 
 import numpy as np
 
@@ -7,6 +7,7 @@ from abides_core.utils import str_to_ns
 
 from ...messages.marketdata import MarketDataMsg, L2SubReqMsg
 from ...messages.query import QuerySpreadResponseMsg
+from ...indicators import SimpleMovingAverage
 from ...orders import Side
 from .fix_trading_agent import FixTradingAgent
 from ...fees import Fees
@@ -55,9 +56,10 @@ class FixMomentumAgent(FixTradingAgent):
 
         self.subscribe = subscribe  # Flag to determine whether to subscribe to data or use polling mechanism
         self.subscription_requested = False
-        self.mid_list: List[float] = []
-        self.avg_20_list: List[float] = []
-        self.avg_50_list: List[float] = []
+        self.ma_20 = SimpleMovingAverage(20)
+        self.ma_50 = SimpleMovingAverage(50)
+        self.avg_20: Optional[float] = None
+        self.avg_50: Optional[float] = None
         self.log_orders = log_orders
         self.state = "AWAITING_WAKEUP"
 
@@ -108,16 +110,14 @@ class FixMomentumAgent(FixTradingAgent):
     def place_orders(self, bid: int, ask: int) -> None:
         """Momentum Agent actions logic"""
         if bid and ask:
-            self.mid_list.append((bid + ask) / 2)
-            if len(self.mid_list) > 20:
-                self.avg_20_list.append(
-                    FixMomentumAgent.ma(self.mid_list, n=20)[-1].round(2)
-                )
-            if len(self.mid_list) > 50:
-                self.avg_50_list.append(
-                    FixMomentumAgent.ma(self.mid_list, n=50)[-1].round(2)
-                )
-            if len(self.avg_20_list) > 0 and len(self.avg_50_list) > 0:
+            mid = (bid + ask) / 2
+            self.ma_20.update(mid)
+            self.ma_50.update(mid)
+            if self.ma_20.count > 20:
+                self.avg_20 = np.round(self.ma_20.value, 2)
+            if self.ma_50.count > 50:
+                self.avg_50 = np.round(self.ma_50.value, 2)
+            if self.avg_20 is not None and self.avg_50 is not None:
                 if self.order_size_model is not None:
                     self.size = self.order_size_model.sample(
                         random_state=self.random_state
@@ -129,11 +129,11 @@ class FixMomentumAgent(FixTradingAgent):
                 # check current spread, calculate maker taker,
                 self.logEvent("SPREAD", spread)
                 if self.size > 0:
-                    if self.avg_20_list[-1] >= self.avg_50_list[-1]:
+                    if self.avg_20 >= self.avg_50:
                         if(MIND_FEES == True):
                             # incl fee. must be positive
                             fee = Fees.get_fixed_market_fee(self)
-                            diff = self.avg_20_list[-1] - self.avg_50_list[-1]
+                            diff = self.avg_20 - self.avg_50
                             if(diff - fee >= 0):
                                 self.place_limit_order(
                                     self.symbol,
@@ -174,7 +174,7 @@ class FixMomentumAgent(FixTradingAgent):
                         if(MIND_FEES == True):
                             # incl fee. must be negative
                             fee = Fees.get_fixed_market_fee(self)
-                            diff = self.avg_20_list[-1] - self.avg_50_list[-1]
+                            diff = self.avg_20 - self.avg_50
                             if(diff + fee <= 0):         
                                 self.place_limit_order(
                                     self.symbol,
@@ -219,9 +219,3 @@ class FixMomentumAgent(FixTradingAgent):
         else:
             delta_time = self.random_state.exponential(scale=self.arrival_rate)
             return int(round(delta_time))
-
-    @staticmethod
-    def ma(a, n=20):
-        ret = np.cumsum(a, dtype=float)
-        ret[n:] = ret[n:] - ret[:-n]
-        return ret[n - 1 :] / n
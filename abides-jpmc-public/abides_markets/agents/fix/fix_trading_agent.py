@@ -570,8 +570,10 @@ class FixTradingAgent(FinancialAgent):
             # Add order to the executed_orders list log
             self.executed_orders.append(order)
 
-            if self.log_orders:
-                self.logEvent("ORDER_SUBMITTED", order.to_dict(), deepcopy_event=False)
+            if self.log_orders and self.log_enabled("ORDER_SUBMITTED"):
+                self.record_event(
+                    "ORDER_SUBMITTED", order.to_dict(), deepcopy_event=False
+                )
 
     def place_market_order(
         self,
@@ -624,8 +626,10 @@ class FixTradingAgent(FinancialAgent):
                     return
             self.orders[order.order_id] = deepcopy(order)
             self.send_message(self.exchange_id, MarketOrderMsg(order))
-            if self.log_orders:
-                self.logEvent("ORDER_SUBMITTED", order.to_dict(), deepcopy_event=False)
+            if self.log_orders and self.log_enabled("ORDER_SUBMITTED"):
+                self.record_event(
+                    "ORDER_SUBMITTED", order.to_dict(), deepcopy_event=False
+                )
 
         else:
             warnings.warn(
@@ -662,8 +666,10 @@ class FixTradingAgent(FinancialAgent):
             # Add order to the executed_orders list log
             self.executed_orders.append(order)
 
-            if self.log_orders:
-                self.logEvent("ORDER_SUBMITTED", order.to_dict(), deepcopy_event=False)
+            if self.log_orders and self.log_enabled("ORDER_SUBMITTED"):
+                self.record_event(
+                    "ORDER_SUBMITTED", order.to_dict(), deepcopy_event=False
+                )
 
         if len(messages) > 0:
             self.send_message_batch(self.exchange_id, messages)
@@ -684,8 +690,10 @@ class FixTradingAgent(FinancialAgent):
 
         if isinstance(order, LimitOrder):
             self.send_message(self.exchange_id, CancelOrderMsg(order, tag, metadata))
-            if self.log_orders:
-                self.logEvent("CANCEL_SUBMITTED", order.to_dict(), deepcopy_event=False)
+            if self.log_orders and self.log_enabled("CANCEL_SUBMITTED"):
+                self.record_event(
+                    "CANCEL_SUBMITTED", order.to_dict(), deepcopy_event=False
+                )
         else:
             warnings.warn(f"Order {order} of type, {type(order)} cannot be cancelled")
 
@@ -720,8 +728,10 @@ class FixTradingAgent(FinancialAgent):
             self.exchange_id, PartialCancelOrderMsg(order, quantity, tag, metadata)
         )
 
-        if self.log_orders:
-            self.logEvent("CANCEL_PARTIAL_ORDER", order.to_dict(), deepcopy_event=False)
+        if self.log_orders and self.log_enabled("CANCEL_PARTIAL_ORDER"):
+            self.record_event(
+                "CANCEL_PARTIAL_ORDER", order.to_dict(), deepcopy_event=False
+            )
 
     def modify_order(self, order: LimitOrder, new_order: LimitOrder) -> None:
         """
@@ -738,8 +748,8 @@ class FixTradingAgent(FinancialAgent):
 
         self.send_message(self.exchange_id, ModifyOrderMsg(order, new_order))
 
-        if self.log_orders:
-            self.logEvent("MODIFY_ORDER", order.to_dict(), deepcopy_event=False)
+        if self.log_orders and self.log_enabled("MODIFY_ORDER"):
+            self.record_event("MODIFY_ORDER", order.to_dict(), deepcopy_event=False)
 
     def replace_order(self, order: LimitOrder, new_order: LimitOrder) -> None:
         """
@@ -756,8 +766,8 @@ class FixTradingAgent(FinancialAgent):
 
         self.send_message(self.exchange_id, ReplaceOrderMsg(self.id, order, new_order))
 
-        if self.log_orders:
-            self.logEvent("REPLACE_ORDER", order.to_dict(), deepcopy_event=False)
+        if self.log_orders and self.log_enabled("REPLACE_ORDER"):
+            self.record_event("REPLACE_ORDER", order.to_dict(), deepcopy_event=False)
 
     def order_executed(self, order: Order) -> None:
         """
@@ -772,7 +782,7 @@ class FixTradingAgent(FinancialAgent):
 
         logger.debug(f"Received notification of execution for: {order}")
 
-        if self.log_orders:
+        if self.log_orders and self.log_enabled("ORDER_EXECUTED"):
             """
             Logging order execution and calulating market fee for stock exchange
             """
@@ -780,7 +790,7 @@ class FixTradingAgent(FinancialAgent):
             # get the current time
             __order["time_executed"] = self.current_time
             
-            self.logEvent("ORDER_EXECUTED", __order, deepcopy_event=False)
+            self.record_event("ORDER_EXECUTED", __order, deepcopy_event=False)
 
         # At the very least, we must update CASH and holdings at execution time.
         qty = order.quantity if order.side.is_bid() else -1 * order.quantity
@@ -832,8 +842,8 @@ class FixTradingAgent(FinancialAgent):
 
         logger.debug(f"Received notification of acceptance for: {order}")
 
-        if self.log_orders:
-            self.logEvent("ORDER_ACCEPTED", order.to_dict(), deepcopy_event=False)
+        if self.log_orders and self.log_enabled("ORDER_ACCEPTED"):
+            self.record_event("ORDER_ACCEPTED", order.to_dict(), deepcopy_event=False)
 
         # We may later wish to add a status to the open orders so an agent can tell whether
         # a given order has been accepted or not (instead of needing to override this method).
@@ -850,8 +860,8 @@ class FixTradingAgent(FinancialAgent):
 
         logger.debug(f"Received notification of cancellation for: {order}")
 
-        if self.log_orders:
-            self.logEvent("ORDER_CANCELLED", order.to_dict(), deepcopy_event=False)
+        if self.log_orders and self.log_enabled("ORDER_CANCELLED"):
+            self.record_event("ORDER_CANCELLED", order.to_dict(), deepcopy_event=False)
 
         # Remove the cancelled order from the open orders list.  We may of course wish to have
         # additional logic here later, so agents can easily "look for" cancelled orders.  Of
@@ -875,8 +885,8 @@ class FixTradingAgent(FinancialAgent):
 
         logger.debug(f"Received notification of partial cancellation for: {order}")
 
-        if self.log_orders:
-            self.logEvent("PARTIAL_CANCELLED", order.to_dict())
+        if self.log_orders and self.log_enabled("PARTIAL_CANCELLED"):
+            self.record_event("PARTIAL_CANCELLED", order.to_dict())
 
         # if orders still in the list of agent's order update agent's knowledge of
         # current state of the order
@@ -906,8 +916,8 @@ class FixTradingAgent(FinancialAgent):
 
         logger.debug(f"Received notification of modification for: {order}")
 
-        if self.log_orders:
-            self.logEvent("ORDER_MODIFIED", order.to_dict())
+        if self.log_orders and self.log_enabled("ORDER_MODIFIED"):
+            self.record_event("ORDER_MODIFIED", order.to_dict())
 
         # if orders still in the list of agent's order update agent's knowledge of
         # current state of the order
@@ -933,8 +943,8 @@ class FixTradingAgent(FinancialAgent):
 
         logger.debug(f"Received notification of replacement for: {old_order}")
 
-        if self.log_orders:
-            self.logEvent("ORDER_REPLACED", old_order.to_dict())
+        if self.log_orders and self.log_enabled("ORDER_REPLACED"):
+            self.record_event("ORDER_REPLACED", old_order.to_dict())
 
         # if orders still in the list of agent's order update agent's knowledge of
         # current state of the order
@@ -4,6 +4,7 @@
 # https://www.mdpi.com/1911-8074/3/1/63
 # https://books.google.de/books?hl=en&lr=&id=PIpxrK3LLUMC&oi=fnd&pg=PA17&dq=Intermarket+Spread+trading+strategy&ots=7REtaF4kZP&sig=B0PUQLtPjQ6SWhp6JXti3RQDX7s&redir_esc=y#v=onepage&q=Intermarket%20Spread%20trading%20strategy&f=false
 import logging
+import sys
 from math import floor, ceil
 from typing import Dict, List, Optional, Tuple
 
@@ -23,6 +24,7 @@ from ..fees import Fees
 from ..messages.marketdata import (
     L2SubReqMsg,
     L2DataMsg,
+    NBBODataMsg,
 )
 
 import logging
@@ -84,14 +86,9 @@ class IntermarketSpreadArbitrageMachine(NewTradingAgent):
         # handling pre-market tasks.
         self.trading: bool = False
 
-        global best_bid_ex0
-        best_bid_ex0 = None
-        global best_ask_ex0
-        best_ask_ex0 = None 
-        global best_bid_ex1
-        best_bid_ex1 = None 
-        global best_ask_ex1
-        best_ask_ex1 = None 
+        # Last bids and asks received from each exchange, cleared after arbitraging.
+        self.best_bids: Dict[int, Optional[List[Tuple[int, int]]]] = {0: None, 1: None}
+        self.best_asks: Dict[int, Optional[List[Tuple[int, int]]]] = {0: None, 1: None}
 
     def kernel_starting(self, start_time: NanosecondTime) -> None:
         super().kernel_starting(start_time)
@@ -101,22 +98,22 @@ class IntermarketSpreadArbitrageMachine(NewTradingAgent):
 
         can_trade = super().wakeup(current_time)
 
-        super().request_data_subscription(
-            L2SubReqMsg(
-                symbol=self.symbol,
-                cancel=True,
-                freq=10e9, # 10 seconds
-            ),
-            exchange_id=0
-        )
-        super().request_data_subscription(
-            L2SubReqMsg(
-                symbol=self.symbol,
-                cancel=True,
-                freq=10e9, # 10 seconds
-            ),
-            exchange_id=1
-        )
+        if not self.subscription_requested:
+            if self.sip_id is not None:
+                # The books of both exchanges are pushed by the consolidated quote
+                # agent on every change.
+                self.request_nbbo_subscription(self.symbol, depth=sys.maxsize)
+            else:
+                for exchange_id in (0, 1):
+                    super().request_data_subscription(
+                        L2SubReqMsg(
+                            symbol=self.symbol,
+                            freq=10e9, # 10 seconds
+                        ),
+                        exchange_id=exchange_id
+                    )
+            self.subscription_requested = True
+
         if can_trade:
             self.cancel_all_orders(exchange_id=0)
             self.cancel_all_orders(exchange_id=1)
@@ -126,22 +123,21 @@ class IntermarketSpreadArbitrageMachine(NewTradingAgent):
 
         super().receive_message(current_time, sender_id, message)
 
-        if sender_id == 0:
-            # get current prices 
-            # Codes: MarketHoursMsg, L1DataMsg
-            if isinstance(message, L2DataMsg):
-                if(message.asks and message.bids):
-                    global best_bid_ex0 
-                    best_bid_ex0 = message.bids
-                    global best_ask_ex0
-                    best_ask_ex0 = message.asks
-        elif sender_id == 1:
-            if isinstance(message, L2DataMsg):
-                if(message.asks and message.bids):
-                    global best_bid_ex1
-                    best_bid_ex1 = message.bids
-                    global best_ask_ex1
-                    best_ask_ex1 = message.asks
+        # get current prices 
+        if isinstance(message, NBBODataMsg):
+            for exchange_id in (0, 1):
+                bids = message.exchange_bids.get(exchange_id)
+                asks = message.exchange_asks.get(exchange_id)
+                if asks and bids:
+                    self.best_bids[exchange_id] = bids
+                    self.best_asks[exchange_id] = asks
+        elif isinstance(message, L2DataMsg) and sender_id in (0, 1):
+            if(message.asks and message.bids):
+                self.best_bids[sender_id] = message.bids
+                self.best_asks[sender_id] = message.asks
+
+        best_bid_ex0, best_bid_ex1 = self.best_bids[0], self.best_bids[1]
+        best_ask_ex0, best_ask_ex1 = self.best_asks[0], self.best_asks[1]
 
         # 0 = fix fee
         #1 = maker taker fee
@@ -193,10 +189,8 @@ class IntermarketSpreadArbitrageMachine(NewTradingAgent):
                         pass
                 self.place_multiple_orders(orders_ex0, 0)
                 self.place_multiple_orders(orders_ex1, 1)
-                best_bid_ex0 = None
-                best_ask_ex0 = None
-                best_bid_ex1 = None
-                best_ask_ex1 = None
+                self.best_bids = {0: None, 1: None}
+                self.best_asks = {0: None, 1: None}
                 return
             # check if arbitrage opportunity exists
             elif best_ask_ex1[0][0] < best_bid_ex0[0][0]:
@@ -245,10 +239,8 @@ class IntermarketSpreadArbitrageMachine(NewTradingAgent):
                         pass
                 self.place_multiple_orders(orders_ex0, 0)
                 self.place_multiple_orders(orders_ex1, 1)
-                best_bid_ex0 = None
-                best_ask_ex0 = None
-                best_bid_ex1 = None
-                best_ask_ex1 = None
+                self.best_bids = {0: None, 1: None}
+                self.best_asks = {0: None, 1: None}
                 return
 
     def get_wake_frequency(self) -> NanosecondTime:
@@ -1,11 +1,11 @@
 import datetime as dt
 import logging
+import os
 import warnings
 from abc import ABC
-from collections import defaultdict
 from copy import deepcopy
 from dataclasses import dataclass
-from typing import Any, DefaultDict, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -24,11 +24,13 @@ from ..messages.marketdata import (
     L1SubReqMsg,
     L2SubReqMsg,
     L3SubReqMsg,
+    L2DeltaSubReqMsg,
     TransactedVolSubReqMsg,
     MarketDataSubReqMsg,
     L1DataMsg,
     L2DataMsg,
     L3DataMsg,
+    L2DeltaDataMsg,
     TransactedVolDataMsg,
     BookImbalanceSubReqMsg,
     MarketDataEventMsg,
@@ -54,8 +56,11 @@ from ..messages.query import (
     QueryTransactedVolMsg,
     QueryTransactedVolResponseMsg,
 )
-from ..orders import Side
+from ..orders import Order, Side
+from ..book_snapshots import BookSnapshotRecorder
+from ..market_data_publisher import MarketDataPublisher
 from ..order_book import OrderBook
+from .exchange_agent import message_event
 from .financial_agent import FinancialAgent
 
 
@@ -72,6 +77,21 @@ class NewExchangeAgent(FinancialAgent):
     of order stream history to maintain per symbol (maintains all orders that led to the
     last N trades), whether to log all order activity to the agent log, and a random
     state object (already seeded) to use for stochasticity.
+
+    The ``price_ladder`` argument selects the structure backing each side of the order
+    books: 'list' (default, linear scan over price levels) or 'sorted' (price-indexed
+    dict plus sorted key array, O(1)/O(log n) level lookup for deep books).
+
+    With ``copy_free_matching`` enabled the exchange takes ownership of the orders it
+    receives instead of deep copying them, and executions are reported with immutable
+    ``Fill`` records instead of cloned orders. Agents must then not modify an order
+    after sending it to the exchange. Logged executions have the same keys in both
+    modes, except for the flags of limit orders (``is_hidden``, ``is_post_only``...)
+    which fills do not carry.
+
+    With ``event_log_dir`` set, each order book streams its history, transactions and
+    book snapshots in chunks of ``event_log_chunk_size`` entries to append-only files in
+    that directory instead of keeping them in memory for the whole simulation.
     """
 
     @dataclass
@@ -119,6 +139,10 @@ class NewExchangeAgent(FinancialAgent):
     class L3DataSubscription(FrequencyBasedSubscription):
         depth: int
 
+    @dataclass
+    class L2DeltaDataSubscription(FrequencyBasedSubscription):
+        pass
+
     @dataclass
     class TransactedVolDataSubscription(FrequencyBasedSubscription):
         lookback: str
@@ -156,6 +180,10 @@ class NewExchangeAgent(FinancialAgent):
         stream_history: int = 0,
         log_orders: bool = False,
         use_metric_tracker: bool = True,
+        price_ladder: str = "list",
+        copy_free_matching: bool = False,
+        event_log_dir: Optional[str] = None,
+        event_log_chunk_size: int = 65536,
     ) -> None:
         super().__init__(id, name, type, random_state)
 
@@ -187,9 +215,25 @@ class NewExchangeAgent(FinancialAgent):
         # Log all order activity?
         self.log_orders: bool = log_orders
 
+        self.copy_free_matching: bool = copy_free_matching
+
+        if event_log_dir is not None:
+            os.makedirs(event_log_dir, exist_ok=True)
+
         # Create an order book for each symbol.
         self.order_books: Dict[str, OrderBook] = {
-            symbol: OrderBook(self, symbol) for symbol in symbols
+            symbol: OrderBook(
+                self,
+                symbol,
+                price_ladder=price_ladder,
+                copy_free_matching=copy_free_matching,
+                book_log_depth=book_log_depth,
+                event_log_path=None
+                if event_log_dir is None
+                else os.path.join(event_log_dir, f"{self.name}_{symbol}"),
+                event_log_chunk_size=event_log_chunk_size,
+            )
+            for symbol in symbols
         }
 
         if use_metric_tracker:
@@ -198,13 +242,9 @@ class NewExchangeAgent(FinancialAgent):
                 symbol: self.MetricTracker() for symbol in symbols
             }
 
-        # The subscription dict is a dictionary with the key = agent ID,
-        # value = dict (key = symbol, value = list [levels (no of levels to recieve updates for),
-        # frequency (min number of ns between messages), last agent update timestamp]
-        # e.g. {101 : {'AAPL' : [1, 10, NanosecondTime(10:00:00)}}
-        self.data_subscriptions: DefaultDict[
-            str, List[NewExchangeAgent.BaseDataSubscription]
-        ] = defaultdict(list)
+        # The market data subscriptions of the agents, published after the order
+        # messages which change the books and on timers for those with a frequency.
+        self.data_publisher: MarketDataPublisher = MarketDataPublisher(self)
 
         # Store a list of agents who have requested market close price information.
         # (this is most likely all agents)
@@ -261,6 +301,7 @@ class NewExchangeAgent(FinancialAgent):
 
         # symbols, write them to disk.
         for symbol in self.symbols:
+            self.order_books[symbol].flush_event_logs()
             self.analyse_order_book(symbol)
         for symbol in self.symbols:
             bid_volume, ask_volume = self.order_books[symbol].get_transacted_volume(
@@ -289,6 +330,9 @@ class NewExchangeAgent(FinancialAgent):
     def wakeup(self, current_time: NanosecondTime):
         super().wakeup(current_time)
 
+        # Publish the market data subscriptions whose timer is due.
+        self.data_publisher.wakeup(current_time)
+
         # If we have reached market close, send market close price messages to all agents
         # that requested them.
         if current_time >= self.mkt_close:
@@ -365,19 +409,21 @@ class NewExchangeAgent(FinancialAgent):
 
         if isinstance(message, OrderMsg):
             # Log order messages only if that option is configured.  Log all other messages.
-            if self.log_orders:
+            if self.log_orders and self.log_enabled(message.type()):
                 if isinstance(message, (ModifyOrderMsg, ReplaceOrderMsg)):
-                    self.logEvent(
+                    self.record_event(
                         message.type(),
                         message.new_order.to_dict(),
                         deepcopy_event=False,
                     )
                 else:
-                    self.logEvent(
+                    self.record_event(
                         message.type(), message.order.to_dict(), deepcopy_event=False
                     )
-        else:
-            self.logEvent(message.type(), message)
+        elif self.log_enabled(message.type()):
+            self.record_event(
+                message.type(), message_event(message), deepcopy_event=False
+            )
 
         if isinstance(message, MarketDataSubReqMsg):
             # Handle the DATA SUBSCRIPTION request and cancellation messages from the agents.
@@ -391,14 +437,7 @@ class NewExchangeAgent(FinancialAgent):
                     )
                 )
 
-                for data_sub in self.data_subscriptions[message.symbol]:
-                    if (
-                        data_sub.agent_id == sender_id
-                        and data_sub.freq == message.freq
-                        and data_sub.depth == message.depth
-                        and data_sub.__class__ == message.__class__
-                    ):
-                        self.data_subscriptions[message.symbol].remove(data_sub)
+                self.data_publisher.cancel(sender_id, message)
 
             else:
                 logger.debug(
@@ -419,6 +458,9 @@ class NewExchangeAgent(FinancialAgent):
                     sub = self.L3DataSubscription(
                         sender_id, current_time, message.freq, message.depth
                     )
+                elif isinstance(message, L2DeltaSubReqMsg):
+                    # Sent after every change of the book.
+                    sub = self.L2DeltaDataSubscription(sender_id, current_time, 0)
                 elif isinstance(message, TransactedVolSubReqMsg):
                     sub = self.TransactedVolDataSubscription(
                         sender_id, current_time, message.freq, message.lookback
@@ -430,7 +472,10 @@ class NewExchangeAgent(FinancialAgent):
                 else:
                     raise Exception
 
-                self.data_subscriptions[message.symbol].append(sub)
+                self.data_publisher.subscribe(sender_id, message, sub)
+
+                if isinstance(message, L2DeltaSubReqMsg):
+                    self.send_l2_delta_snapshot(sender_id, message.symbol)
 
         if isinstance(message, MarketHoursRequestMsg):
             logger.debug(
@@ -492,13 +537,14 @@ class NewExchangeAgent(FinancialAgent):
                 # Return the requested depth on both sides of the order book for
                 # the requested symbol. Returns price levels and aggregated
                 # volume at each level (not individual orders).
+                bids, asks = self.order_books[symbol].get_l2_snapshot(depth)
                 self.send_message(
                     sender_id,
                     QuerySpreadResponseMsg(
                         symbol=symbol,
                         depth=depth,
-                        bids=self.order_books[symbol].get_l2_bid_data(depth),
-                        asks=self.order_books[symbol].get_l2_ask_data(depth),
+                        bids=bids,
+                        asks=asks,
                         last_trade=self.order_books[symbol].last_trade,
                         mkt_closed=current_time > self.mkt_close,
                     ),
@@ -577,9 +623,9 @@ class NewExchangeAgent(FinancialAgent):
             else:
                 # Hand the order to the order book for processing.
                 self.order_books[message.order.symbol].handle_limit_order(
-                    deepcopy(message.order)
+                    self.take_order(message.order)
                 )
-                self.publish_order_book_data()
+                self.publish_order_book_data(message.order.symbol)
 
         elif isinstance(message, MarketOrderMsg):
             logger.debug(
@@ -593,9 +639,9 @@ class NewExchangeAgent(FinancialAgent):
             else:
                 # Hand the market order to the order book for processing.
                 self.order_books[message.order.symbol].handle_market_order(
-                    deepcopy(message.order)
+                    self.take_order(message.order)
                 )
-                self.publish_order_book_data()
+                self.publish_order_book_data(message.order.symbol)
 
         elif isinstance(message, CancelOrderMsg):
             tag = message.tag
@@ -612,9 +658,9 @@ class NewExchangeAgent(FinancialAgent):
             else:
                 # Hand the order to the order book for processing.
                 self.order_books[message.order.symbol].cancel_order(
-                    deepcopy(message.order), tag, metadata
+                    self.take_order(message.order), tag, metadata
                 )
-                self.publish_order_book_data()
+                self.publish_order_book_data(message.order.symbol)
 
         elif isinstance(message, PartialCancelOrderMsg):
             tag = message.tag
@@ -632,9 +678,9 @@ class NewExchangeAgent(FinancialAgent):
                 )
             else:
                 self.order_books[message.order.symbol].partial_cancel_order(
-                    deepcopy(message.order), message.quantity, tag, metadata
+                    self.take_order(message.order), message.quantity, tag, metadata
                 )
-                self.publish_order_book_data()
+                self.publish_order_book_data(message.order.symbol)
 
         elif isinstance(message, ModifyOrderMsg):
             old_order = message.old_order
@@ -652,9 +698,9 @@ class NewExchangeAgent(FinancialAgent):
                 )
             else:
                 self.order_books[old_order.symbol].modify_order(
-                    deepcopy(old_order), deepcopy(new_order)
+                    self.take_order(old_order), self.take_order(new_order)
                 )
-                self.publish_order_book_data()
+                self.publish_order_book_data(old_order.symbol)
 
         elif isinstance(message, ReplaceOrderMsg):
             agent_id = message.agent_id
@@ -673,114 +719,102 @@ class NewExchangeAgent(FinancialAgent):
                 )
             else:
                 self.order_books[order.symbol].replace_order(
-                    agent_id, deepcopy(order), deepcopy(new_order)
+                    agent_id, self.take_order(order), self.take_order(new_order)
                 )
-                self.publish_order_book_data()
+                self.publish_order_book_data(order.symbol)
 
-    def publish_order_book_data(self) -> None:
+    def take_order(self, order: Order) -> Order:
         """
-        The exchange agents sends an order book update to the agents using the
-        subscription API if one of the following conditions are met:
+        Returns the order to hand to an order book for an incoming order message: the
+        order itself when copy-free matching is enabled, else a deep copy of it.
 
-        1) agent requests ALL order book updates (freq == 0)
-        2) order book update timestamp > last time agent was updated AND the orderbook
-           update time stamp is greater than the last agent update time stamp by a
-           period more than that specified in the freq parameter.
+        Arguments:
+            order: The order received in the message.
         """
+        return order if self.copy_free_matching else deepcopy(order)
 
-        for symbol, data_subs in self.data_subscriptions.items():
-            book = self.order_books[symbol]
+    def publish_order_book_data(self, symbol: str) -> None:
+        """
+        The exchange agents sends an order book update to the agents using the
+        subscription API, after an order message for the symbol:
 
-            for data_sub in data_subs:
-                if isinstance(data_sub, self.FrequencyBasedSubscription):
-                    messages = self.handle_frequency_based_data_subscription(
-                        symbol, data_sub
-                    )
-                elif isinstance(data_sub, self.EventBasedSubscription):
-                    messages = self.handle_event_based_data_subscription(
-                        symbol, data_sub
-                    )
-                else:
-                    raise Exception("Got invalid data subscription object")
+        1) agents requesting ALL order book updates (freq == 0) are updated if the
+           order book changed.
+        2) agents requesting updates at a frequency are updated if the order book
+           changed, at most once per period (the last changes of a period being sent
+           at the end of the period).
 
-                for message in messages:
-                    self.send_message(data_sub.agent_id, message)
+        Arguments:
+            symbol: The symbol of the order message.
+        """
 
-                if len(messages) > 0:
-                    data_sub.last_update_ts = book.last_update_ts
+        self.data_publisher.publish(symbol)
 
-    def handle_frequency_based_data_subscription(
+    def build_data_message(
         self, symbol: str, data_sub: "NewExchangeAgent.FrequencyBasedSubscription"
-    ) -> List[Message]:
-        book = self.order_books[symbol]
-
-        if (book.last_update_ts - data_sub.last_update_ts) < data_sub.freq:
-            return []
+    ) -> Message:
+        """
+        Returns the message holding the current data of a frequency based
+        subscription.
 
-        messages = []
+        Arguments:
+            symbol: The symbol subscribed to.
+            data_sub: The subscription.
+        """
+        book = self.order_books[symbol]
 
         if isinstance(data_sub, self.L1DataSubscription):
-            bid = book.get_l1_bid_data()
-            ask = book.get_l1_ask_data()
-            messages.append(
-                L1DataMsg(symbol, book.last_trade, self.current_time, bid, ask)
-            )
+            bid, ask = book.get_l1_snapshot()
+            return L1DataMsg(symbol, book.last_trade, self.current_time, bid, ask)
 
         elif isinstance(data_sub, self.L2DataSubscription):
-            bids = book.get_l2_bid_data(data_sub.depth)
-            asks = book.get_l2_ask_data(data_sub.depth)
-            messages.append(
-                L2DataMsg(
-                    symbol,
-                    book.last_trade,
-                    self.current_time,
-                    bids,
-                    asks,
-                )
-            )
+            bids, asks = book.get_l2_snapshot(data_sub.depth)
+            return L2DataMsg(symbol, book.last_trade, self.current_time, bids, asks)
 
         elif isinstance(data_sub, self.L3DataSubscription):
-            bids = book.get_l3_bid_data(data_sub.depth)
-            asks = book.get_l3_ask_data(data_sub.depth)
-            messages.append(
-                L3DataMsg(
-                    symbol,
-                    book.last_trade,
-                    self.current_time,
-                    bids,
-                    asks,
-                )
-            )
+            bids, asks = book.get_l3_snapshot(data_sub.depth)
+            return L3DataMsg(symbol, book.last_trade, self.current_time, bids, asks)
 
-        elif isinstance(data_sub, self.L3DataSubscription):
-            bids = book.get_l3_bid_data(data_sub.depth)
-            asks = book.get_l3_ask_data(data_sub.depth)
-            messages.append(
-                L3DataMsg(
-                    symbol,
-                    book.last_trade,
-                    self.current_time,
-                    bids,
-                    asks,
-                )
+        elif isinstance(data_sub, self.L2DeltaDataSubscription):
+            sequence_number, bids, asks = book.take_level_changes()
+            return L2DeltaDataMsg(
+                symbol, book.last_trade, self.current_time, sequence_number, bids, asks
             )
 
         elif isinstance(data_sub, self.TransactedVolDataSubscription):
             bid_volume, ask_volume = book.get_transacted_volume(data_sub.lookback)
-            messages.append(
-                TransactedVolDataMsg(
-                    symbol,
-                    book.last_trade,
-                    self.current_time,
-                    bid_volume,
-                    ask_volume,
-                )
+            return TransactedVolDataMsg(
+                symbol, book.last_trade, self.current_time, bid_volume, ask_volume
             )
 
         else:
             raise Exception("Got invalid data subscription object")
 
-        return messages
+    def send_l2_delta_snapshot(self, recipient_id: int, symbol: str) -> None:
+        """
+        Sends the whole L2 book of a symbol to a subscriber of the incremental L2 feed,
+        with the sequence number of the last update it includes.
+
+        Arguments:
+            recipient_id: The subscriber.
+            symbol: The symbol subscribed to.
+        """
+        book = self.order_books[symbol]
+        book.track_level_changes()
+
+        bids, asks = book.get_l2_snapshot()
+        self.send_message(
+            recipient_id,
+            L2DeltaDataMsg(
+                symbol,
+                book.last_trade,
+                self.current_time,
+                book.delta_sequence_number,
+                bids,
+                asks,
+                snapshot=True,
+            ),
+        )
 
     def handle_event_based_data_subscription(
         self, symbol: str, data_sub: "NewExchangeAgent.EventBasedSubscription"
@@ -868,15 +902,11 @@ class NewExchangeAgent(FinancialAgent):
         return messages
 
     def logL2style(self, symbol: str) -> Optional[Tuple[List, List]]:
-        book = self.order_books[symbol]
-        if not book.book_log2:
+        book_log = self.order_books[symbol].book_log2
+        if not book_log:
             return None
-        tmp = book.book_log2
-        times = []
-        booktop = []
-        for t in tmp:
-            times.append(t["QuoteTime"])
-            booktop.append([t["bids"], t["asks"]])
+        times = book_log.times.tolist()
+        booktop = [[bids, asks] for bids, asks in zip(book_log.bids, book_log.asks)]
         return (times, booktop)
 
     def send_message(self, recipient_id: int, message: Message) -> None:
@@ -895,46 +925,44 @@ class NewExchangeAgent(FinancialAgent):
             # Messages that require order book modification (not simple queries) incur the additional
             # parallel processing delay as configured.
             super().send_message(recipient_id, message, delay=self.pipeline_delay)
-            if self.log_orders:
-                self.logEvent(message.type(), message.order.to_dict())
+            if self.log_orders and self.log_enabled(message.type()):
+                self.record_event(message.type(), message.order.to_dict())
         else:
             # Other message types incur only the currently-configured computation delay for this agent.
             super().send_message(recipient_id, message)
 
+    @staticmethod
+    def get_null_liquidity_time(times: np.ndarray, is_null: np.ndarray) -> int:
+        """
+        Returns the total time spent in periods with no liquidity, each period running
+        from its first empty snapshot to the next non-empty one. A period still open at
+        the last snapshot is not counted.
+
+        Arguments:
+            times: Snapshot times.
+            is_null: For each snapshot, whether the side of the book was empty.
+        """
+        previous = np.concatenate([[False], is_null[:-1]])
+        starts = np.flatnonzero(is_null & ~previous)
+        ends = np.flatnonzero(~is_null & previous)
+
+        return int((times[ends] - times[starts[: len(ends)]]).sum())
+
     def analyse_order_book(self, symbol: str):
         # will grow with time
         book = self.order_books[symbol].book_log2
         self.get_time_dropout(book, symbol)
 
-    def get_time_dropout(self, book: List[Dict[str, Any]], symbol: str):
+    def get_time_dropout(self, book: BookSnapshotRecorder, symbol: str):
         if len(book) == 0:
             return
 
-        df = pd.DataFrame(book)
-
-        total_time = df["QuoteTime"].iloc[-1] - df["QuoteTime"].iloc[0]
-        is_null_bids = False
-        t_null_bids_first = 0
-        T_null_bids = 0
-
-        is_null_asks = False
-        t_null_asks_first = 0
-        T_null_asks = 0
-
-        for _, row in df.iterrows():
-            if (len(row["bids"]) == 0) & (is_null_bids == False):
-                t_null_bids_first = row["QuoteTime"]
-                is_null_bids = True
-            elif (len(row["bids"]) != 0) & (is_null_bids == True):
-                T_null_bids += row["QuoteTime"] - t_null_bids_first
-                is_null_bids = False
-
-            if (len(row["asks"]) == 0) & (is_null_asks == False):
-                t_null_asks_first = row["QuoteTime"]
-                is_null_asks = True
-            elif (len(row["asks"]) != 0) & (is_null_asks == True):
-                T_null_asks += row["QuoteTime"] - t_null_asks_first
-                is_null_asks = False
+        times = book.times
+
+        total_time = times[-1] - times[0]
+        # A side had no liquidity whenever its best level has no quantity.
+        T_null_bids = self.get_null_liquidity_time(times, book.bids[:, 0, 1] == 0)
+        T_null_asks = self.get_null_liquidity_time(times, book.asks[:, 0, 1] == 0)
 
         self.metric_trackers[symbol] = self.MetricTracker(
             total_time_no_liquidity_asks=T_null_asks / 1e9,
@@ -16,7 +16,13 @@ from ..messages.market import (
     MarketHoursRequestMsg,
     MarketHoursMsg,
 )
-from ..messages.marketdata import MarketDataSubReqMsg, MarketDataMsg, L2DataMsg
+from ..messages.marketdata import (
+    MarketDataSubReqMsg,
+    MarketDataMsg,
+    L2DataMsg,
+    NBBODataMsg,
+    NBBOSubReqMsg,
+)
 from ..messages.order import (
     LimitOrderMsg,
     MarketOrderMsg,
@@ -45,6 +51,7 @@ from ..messages.query import (
 )
 from ..orders import Order, LimitOrder, MarketOrder, Side
 from .financial_agent import FinancialAgent
+from .consolidated_quote_agent import ConsolidatedQuoteAgent
 from .exchange_agent import ExchangeAgent
 from .new_exchange_agent import NewExchangeAgent
 
@@ -128,6 +135,15 @@ class NewTradingAgent(FinancialAgent):
         self.known_bids: Dict = {}
         self.known_asks: Dict = {}
 
+        # The last known bids and asks of each exchange, by symbol then exchange ID,
+        # from spread queries, L2 data subscriptions or consolidated quotes.
+        self.exchange_bids: Dict[str, Dict[int, List[Tuple[int, int]]]] = {}
+        self.exchange_asks: Dict[str, Dict[int, List[Tuple[int, int]]]] = {}
+
+        # The last consolidated quotes received from the consolidated quote agent, by
+        # symbol.
+        self.nbbo: Dict[str, NBBODataMsg] = {}
+
         # The agent remembers the order history communicated by the exchange
         # when such is requested by an agent (for example, a heuristic belief
         # learning agent).
@@ -166,6 +182,10 @@ class NewTradingAgent(FinancialAgent):
         self.exchange_id: int = self.kernel.find_agents_by_type(ExchangeAgent)[0]
         self.exchange_id_beta: int = 1
 
+        # The consolidated quote agent (SIP) of the simulation, if there is one.
+        sip_ids = self.kernel.find_agents_by_type(ConsolidatedQuoteAgent)
+        self.sip_id: Optional[int] = sip_ids[0] if sip_ids else None
+
         logger.debug(
             f"Agent {self.id} requested agent of type Agent.ExchangeAgent.  Given Agent ID: {self.exchange_id}",
         )
@@ -279,6 +299,37 @@ class NewTradingAgent(FinancialAgent):
 
         self.send_message(recipient_id=self.exchange_id, message=subscription_message)
 
+    def request_nbbo_subscription(
+        self, symbol: str, depth: int = 1, freq: int = 0
+    ) -> None:
+        """
+        Used by any Trading Agent subclass to subscribe to the consolidated quotes of
+        all the exchanges, pushed by the consolidated quote agent whenever they
+        change. Requires a ``ConsolidatedQuoteAgent`` in the simulation.
+
+        Arguments:
+            symbol: The symbol to subscribe to.
+            depth: The number of price levels to receive.
+            freq: The minimum time in nanoseconds between two updates.
+        """
+
+        self.send_message(
+            self.sip_id, NBBOSubReqMsg(symbol=symbol, depth=depth, freq=freq)
+        )
+
+    def cancel_nbbo_subscription(self, symbol: str, depth: int = 1) -> None:
+        """
+        Used by any Trading Agent subclass to cancel a subscription to consolidated
+        quotes.
+
+        Arguments:
+            symbol: The symbol subscribed to.
+            depth: The number of price levels of the subscription.
+        """
+
+        self.send_message(
+            self.sip_id, NBBOSubReqMsg(symbol=symbol, cancel=True, depth=depth)
+        )
 
     def receive_message(
         self, current_time: NanosecondTime, sender_id: int, message: Message
@@ -377,6 +428,11 @@ class NewTradingAgent(FinancialAgent):
             )
 
         elif isinstance(message, MarketDataMsg):
+            if isinstance(message, L2DataMsg):
+                symbol = message.symbol
+                self.exchange_bids.setdefault(symbol, {})[sender_id] = message.bids
+                self.exchange_asks.setdefault(symbol, {})[sender_id] = message.asks
+
             self.handle_market_data(message)
 
         # Now do we know the market hours?
@@ -582,12 +638,12 @@ class NewTradingAgent(FinancialAgent):
         if order is not None:
             self.orders[order.order_id] = deepcopy(order)
             self.send_message(exchange_id, LimitOrderMsg(order))
-            __order = order.to_dict()
-            __order["exchange_id"] = exchange_id
             order.tag = exchange_id
             self.executed_orders.append(order)
-            if self.log_orders:
-                self.logEvent("ORDER_SUBMITTED", __order, deepcopy_event=False)
+            if self.log_orders and self.log_enabled("ORDER_SUBMITTED"):
+                __order = order.to_dict()
+                __order["exchange_id"] = exchange_id
+                self.record_event("ORDER_SUBMITTED", __order, deepcopy_event=False)
 
     def place_market_order(
         self,
@@ -644,8 +700,10 @@ class NewTradingAgent(FinancialAgent):
             self.send_message(exchange_id, MarketOrderMsg(order))
              # Add order to the executed_orders list log
             self.executed_orders.append(order)
-            if self.log_orders:
-                self.logEvent("ORDER_SUBMITTED", order.to_dict(), deepcopy_event=False)
+            if self.log_orders and self.log_enabled("ORDER_SUBMITTED"):
+                self.record_event(
+                    "ORDER_SUBMITTED", order.to_dict(), deepcopy_event=False
+                )
 
         else:
             warnings.warn(
@@ -680,8 +738,10 @@ class NewTradingAgent(FinancialAgent):
             # these copies.
             self.orders[order.order_id] = deepcopy(order)
             self.executed_orders.append(order)
-            if self.log_orders:
-                self.logEvent("ORDER_SUBMITTED", order.to_dict(), deepcopy_event=False)
+            if self.log_orders and self.log_enabled("ORDER_SUBMITTED"):
+                self.record_event(
+                    "ORDER_SUBMITTED", order.to_dict(), deepcopy_event=False
+                )
 
         if len(messages) > 0:
             self.send_message_batch(exchange_id, messages)
@@ -706,8 +766,10 @@ class NewTradingAgent(FinancialAgent):
 
         if isinstance(order, LimitOrder):
             self.send_message(exchange_id, CancelOrderMsg(order, tag, metadata))
-            if self.log_orders:
-                self.logEvent("CANCEL_SUBMITTED", order.to_dict(), deepcopy_event=False)
+            if self.log_orders and self.log_enabled("CANCEL_SUBMITTED"):
+                self.record_event(
+                    "CANCEL_SUBMITTED", order.to_dict(), deepcopy_event=False
+                )
         else:
             warnings.warn(f"Order {order} of type, {type(order)} cannot be cancelled")
 
@@ -742,8 +804,10 @@ class NewTradingAgent(FinancialAgent):
             self.exchange_id, PartialCancelOrderMsg(order, quantity, tag, metadata)
         )
 
-        if self.log_orders:
-            self.logEvent("CANCEL_PARTIAL_ORDER", order.to_dict(), deepcopy_event=False)
+        if self.log_orders and self.log_enabled("CANCEL_PARTIAL_ORDER"):
+            self.record_event(
+                "CANCEL_PARTIAL_ORDER", order.to_dict(), deepcopy_event=False
+            )
 
     def modify_order(self, order: LimitOrder, new_order: LimitOrder) -> None:
         """
@@ -760,8 +824,8 @@ class NewTradingAgent(FinancialAgent):
 
         self.send_message(self.exchange_id, ModifyOrderMsg(order, new_order))
 
-        if self.log_orders:
-            self.logEvent("MODIFY_ORDER", order.to_dict(), deepcopy_event=False)
+        if self.log_orders and self.log_enabled("MODIFY_ORDER"):
+            self.record_event("MODIFY_ORDER", order.to_dict(), deepcopy_event=False)
 
     def replace_order(self, order: LimitOrder, new_order: LimitOrder) -> None:
         """
@@ -778,8 +842,8 @@ class NewTradingAgent(FinancialAgent):
 
         self.send_message(self.exchange_id, ReplaceOrderMsg(self.id, order, new_order))
 
-        if self.log_orders:
-            self.logEvent("REPLACE_ORDER", order.to_dict(), deepcopy_event=False)
+        if self.log_orders and self.log_enabled("REPLACE_ORDER"):
+            self.record_event("REPLACE_ORDER", order.to_dict(), deepcopy_event=False)
 
     def order_executed(self, order: Order) -> None:
         """
@@ -794,14 +858,14 @@ class NewTradingAgent(FinancialAgent):
 
         logger.debug(f"Received notification of execution for: {order}")
 
-        if self.log_orders:
+        if self.log_orders and self.log_enabled("ORDER_EXECUTED"):
             """
             Logging order execution and calulating market fee for stock exchange
             """
             __order = order.to_dict()
             __order["time_executed"] = self.current_time
             __order["exchange_id"] = order.tag
-            self.logEvent("ORDER_EXECUTED", __order, deepcopy_event=False)
+            self.record_event("ORDER_EXECUTED", __order, deepcopy_event=False)
 
         # At the very least, we must update CASH and holdings at execution time.
         qty = order.quantity if order.side.is_bid() else -1 * order.quantity
@@ -853,8 +917,8 @@ class NewTradingAgent(FinancialAgent):
 
         logger.debug(f"Received notification of acceptance for: {order}")
 
-        if self.log_orders:
-            self.logEvent("ORDER_ACCEPTED", order.to_dict(), deepcopy_event=False)
+        if self.log_orders and self.log_enabled("ORDER_ACCEPTED"):
+            self.record_event("ORDER_ACCEPTED", order.to_dict(), deepcopy_event=False)
 
         # We may later wish to add a status to the open orders so an agent can tell whether
         # a given order has been accepted or not (instead of needing to override this method).
@@ -871,8 +935,8 @@ class NewTradingAgent(FinancialAgent):
 
         logger.debug(f"Received notification of cancellation for: {order}")
 
-        if self.log_orders:
-            self.logEvent("ORDER_CANCELLED", order.to_dict(), deepcopy_event=False)
+        if self.log_orders and self.log_enabled("ORDER_CANCELLED"):
+            self.record_event("ORDER_CANCELLED", order.to_dict(), deepcopy_event=False)
 
         # Remove the cancelled order from the open orders list.  We may of course wish to have
         # additional logic here later, so agents can easily "look for" cancelled orders.  Of
@@ -896,8 +960,8 @@ class NewTradingAgent(FinancialAgent):
 
         logger.debug(f"Received notification of partial cancellation for: {order}")
 
-        if self.log_orders:
-            self.logEvent("PARTIAL_CANCELLED", order.to_dict())
+        if self.log_orders and self.log_enabled("PARTIAL_CANCELLED"):
+            self.record_event("PARTIAL_CANCELLED", order.to_dict())
 
         # if orders still in the list of agent's order update agent's knowledge of
         # current state of the order
@@ -927,8 +991,8 @@ class NewTradingAgent(FinancialAgent):
 
         logger.debug(f"Received notification of modification for: {order}")
 
-        if self.log_orders:
-            self.logEvent("ORDER_MODIFIED", order.to_dict())
+        if self.log_orders and self.log_enabled("ORDER_MODIFIED"):
+            self.record_event("ORDER_MODIFIED", order.to_dict())
 
         # if orders still in the list of agent's order update agent's knowledge of
         # current state of the order
@@ -954,8 +1018,8 @@ class NewTradingAgent(FinancialAgent):
 
         logger.debug(f"Received notification of replacement for: {old_order}")
 
-        if self.log_orders:
-            self.logEvent("ORDER_REPLACED", old_order.to_dict())
+        if self.log_orders and self.log_enabled("ORDER_REPLACED"):
+            self.record_event("ORDER_REPLACED", old_order.to_dict())
 
         # if orders still in the list of agent's order update agent's knowledge of
         # current state of the order
@@ -1040,6 +1104,8 @@ class NewTradingAgent(FinancialAgent):
 
         self.known_bids[symbol] = bids
         self.known_asks[symbol] = asks
+        self.exchange_bids.setdefault(symbol, {})[exchange_id] = bids
+        self.exchange_asks.setdefault(symbol, {})[exchange_id] = asks
 
         if bids:
             best_bid, best_bid_qty = (bids[0][0], bids[0][1])
@@ -1080,6 +1146,15 @@ class NewTradingAgent(FinancialAgent):
             self.last_trade[symbol] = message.last_transaction
             self.exchange_ts[symbol] = message.exchange_ts
 
+        elif isinstance(message, NBBODataMsg):
+            symbol = message.symbol
+            self.nbbo[symbol] = message
+            self.exchange_bids[symbol] = dict(message.exchange_bids)
+            self.exchange_asks[symbol] = dict(message.exchange_asks)
+            if message.last_transaction is not None:
+                self.last_trade[symbol] = message.last_transaction
+            self.exchange_ts[symbol] = message.exchange_ts
+
     def query_order_stream(self, symbol: str, orders) -> None:
         """
         Handles QueryOrderStreamResponseMsg messages from an exchange agent.
@@ -1135,6 +1210,41 @@ class NewTradingAgent(FinancialAgent):
             asks = self.known_asks[symbol] if self.known_asks[symbol] else None
             return bids, asks
 
+    def get_nbbo(self, symbol: str) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Returns the last known national best bid and offer, from the consolidated
+        quotes subscription (None for an unknown or empty side).
+
+        This does NOT request new information.
+
+        Arguments:
+            symbol: The symbol to query.
+        """
+
+        if symbol not in self.nbbo:
+            return None, None
+
+        return self.nbbo[symbol].best_bid_ask()
+
+    def get_exchange_bid_ask(
+        self, symbol: str, exchange_id: int
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Returns the last known best bid and ask of one exchange (None for an unknown
+        or empty side).
+
+        This does NOT request new information.
+
+        Arguments:
+            symbol: The symbol to query.
+            exchange_id: The exchange agent ID.
+        """
+
+        bids = self.exchange_bids.get(symbol, {}).get(exchange_id)
+        asks = self.exchange_asks.get(symbol, {}).get(exchange_id)
+
+        return (bids[0][0] if bids else None, asks[0][0] if asks else None)
+
     def get_known_liquidity(self, symbol: str, within: float = 0.00) -> Tuple[int, int]:
         """
         Extract the current bid and ask liquidity within a certain proportion of the
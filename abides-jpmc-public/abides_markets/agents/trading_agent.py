@@ -16,7 +16,13 @@ from ..messages.market import (
     MarketHoursRequestMsg,
     MarketHoursMsg,
 )
-from ..messages.marketdata import MarketDataSubReqMsg, MarketDataMsg, L2DataMsg
+from ..messages.marketdata import (
+    MarketDataSubReqMsg,
+    MarketDataMsg,
+    L2DataMsg,
+    L2DeltaDataMsg,
+    L2DeltaSubReqMsg,
+)
 from ..messages.order import (
     LimitOrderMsg,
     MarketOrderMsg,
@@ -43,6 +49,7 @@ from ..messages.query import (
     QueryTransactedVolMsg,
     QueryTransactedVolResponseMsg,
 )
+from ..local_book_mirror import LocalBookMirror
 from ..orders import Order, LimitOrder, MarketOrder, Side
 from .financial_agent import FinancialAgent
 from .exchange_agent import ExchangeAgent
@@ -127,6 +134,10 @@ class TradingAgent(FinancialAgent):
         self.known_bids: Dict = {}
         self.known_asks: Dict = {}
 
+        # Books maintained from the incremental L2 feed (see L2DeltaSubReqMsg), by
+        # symbol.
+        self.book_mirrors: Dict[str, LocalBookMirror] = {}
+
         # The agent remembers the order history communicated by the exchange
         # when such is requested by an agent (for example, a heuristic belief
         # learning agent).
@@ -567,13 +578,13 @@ class TradingAgent(FinancialAgent):
         if order is not None:
             self.orders[order.order_id] = deepcopy(order)
             self.send_message(self.exchange_id, LimitOrderMsg(order))
-            __order = order.to_dict()
-            __order["exchange_id"] = 0
             order.tag = 0
             # Add order to the executed_orders list log
             self.executed_orders.append(order)
-            if self.log_orders:
-                self.logEvent("ORDER_SUBMITTED", __order, deepcopy_event=False)
+            if self.log_orders and self.log_enabled("ORDER_SUBMITTED"):
+                __order = order.to_dict()
+                __order["exchange_id"] = 0
+                self.record_event("ORDER_SUBMITTED", __order, deepcopy_event=False)
 
     def place_market_order(
         self,
@@ -627,8 +638,10 @@ class TradingAgent(FinancialAgent):
             self.orders[order.order_id] = deepcopy(order)
             self.send_message(self.exchange_id, MarketOrderMsg(order))
             self.executed_orders.append(order)
-            if self.log_orders:
-                self.logEvent("ORDER_SUBMITTED", order.to_dict(), deepcopy_event=False)
+            if self.log_orders and self.log_enabled("ORDER_SUBMITTED"):
+                self.record_event(
+                    "ORDER_SUBMITTED", order.to_dict(), deepcopy_event=False
+                )
 
         else:
             warnings.warn(
@@ -664,8 +677,10 @@ class TradingAgent(FinancialAgent):
             self.orders[order.order_id] = deepcopy(order)
             # Add order to the executed_orders list log
             self.executed_orders.append(order)
-            if self.log_orders:
-                self.logEvent("ORDER_SUBMITTED", order.to_dict(), deepcopy_event=False)
+            if self.log_orders and self.log_enabled("ORDER_SUBMITTED"):
+                self.record_event(
+                    "ORDER_SUBMITTED", order.to_dict(), deepcopy_event=False
+                )
 
         if len(messages) > 0:
             self.send_message_batch(self.exchange_id, messages)
@@ -686,8 +701,10 @@ class TradingAgent(FinancialAgent):
 
         if isinstance(order, LimitOrder):
             self.send_message(self.exchange_id, CancelOrderMsg(order, tag, metadata))
-            if self.log_orders:
-                self.logEvent("CANCEL_SUBMITTED", order.to_dict(), deepcopy_event=False)
+            if self.log_orders and self.log_enabled("CANCEL_SUBMITTED"):
+                self.record_event(
+                    "CANCEL_SUBMITTED", order.to_dict(), deepcopy_event=False
+                )
         else:
             warnings.warn(f"Order {order} of type, {type(order)} cannot be cancelled")
 
@@ -722,8 +739,10 @@ class TradingAgent(FinancialAgent):
             self.exchange_id, PartialCancelOrderMsg(order, quantity, tag, metadata)
         )
 
-        if self.log_orders:
-            self.logEvent("CANCEL_PARTIAL_ORDER", order.to_dict(), deepcopy_event=False)
+        if self.log_orders and self.log_enabled("CANCEL_PARTIAL_ORDER"):
+            self.record_event(
+                "CANCEL_PARTIAL_ORDER", order.to_dict(), deepcopy_event=False
+            )
 
     def modify_order(self, order: LimitOrder, new_order: LimitOrder) -> None:
         """
@@ -740,8 +759,8 @@ class TradingAgent(FinancialAgent):
 
         self.send_message(self.exchange_id, ModifyOrderMsg(order, new_order))
 
-        if self.log_orders:
-            self.logEvent("MODIFY_ORDER", order.to_dict(), deepcopy_event=False)
+        if self.log_orders and self.log_enabled("MODIFY_ORDER"):
+            self.record_event("MODIFY_ORDER", order.to_dict(), deepcopy_event=False)
 
     def replace_order(self, order: LimitOrder, new_order: LimitOrder) -> None:
         """
@@ -758,8 +777,8 @@ class TradingAgent(FinancialAgent):
 
         self.send_message(self.exchange_id, ReplaceOrderMsg(self.id, order, new_order))
 
-        if self.log_orders:
-            self.logEvent("REPLACE_ORDER", order.to_dict(), deepcopy_event=False)
+        if self.log_orders and self.log_enabled("REPLACE_ORDER"):
+            self.record_event("REPLACE_ORDER", order.to_dict(), deepcopy_event=False)
 
     def order_executed(self, order: Order) -> None:
         """
@@ -774,7 +793,7 @@ class TradingAgent(FinancialAgent):
 
         logger.debug(f"Received notification of execution for: {order}")
 
-        if self.log_orders:
+        if self.log_orders and self.log_enabled("ORDER_EXECUTED"):
             """
             Logging order execution and calulating market fee for stock exchange
             """
@@ -782,7 +801,7 @@ class TradingAgent(FinancialAgent):
             # get the current time
             __order["time_executed"] = self.current_time
             
-            self.logEvent("ORDER_EXECUTED", __order, deepcopy_event=False)
+            self.record_event("ORDER_EXECUTED", __order, deepcopy_event=False)
 
         # At the very least, we must update CASH and holdings at execution time.
         qty = order.quantity if order.side.is_bid() else -1 * order.quantity
@@ -834,8 +853,8 @@ class TradingAgent(FinancialAgent):
 
         logger.debug(f"Received notification of acceptance for: {order}")
 
-        if self.log_orders:
-            self.logEvent("ORDER_ACCEPTED", order.to_dict(), deepcopy_event=False)
+        if self.log_orders and self.log_enabled("ORDER_ACCEPTED"):
+            self.record_event("ORDER_ACCEPTED", order.to_dict(), deepcopy_event=False)
 
         # We may later wish to add a status to the open orders so an agent can tell whether
         # a given order has been accepted or not (instead of needing to override this method).
@@ -852,8 +871,8 @@ class TradingAgent(FinancialAgent):
 
         logger.debug(f"Received notification of cancellation for: {order}")
 
-        if self.log_orders:
-            self.logEvent("ORDER_CANCELLED", order.to_dict(), deepcopy_event=False)
+        if self.log_orders and self.log_enabled("ORDER_CANCELLED"):
+            self.record_event("ORDER_CANCELLED", order.to_dict(), deepcopy_event=False)
 
         # Remove the cancelled order from the open orders list.  We may of course wish to have
         # additional logic here later, so agents can easily "look for" cancelled orders.  Of
@@ -877,8 +896,8 @@ class TradingAgent(FinancialAgent):
 
         logger.debug(f"Received notification of partial cancellation for: {order}")
 
-        if self.log_orders:
-            self.logEvent("PARTIAL_CANCELLED", order.to_dict())
+        if self.log_orders and self.log_enabled("PARTIAL_CANCELLED"):
+            self.record_event("PARTIAL_CANCELLED", order.to_dict())
 
         # if orders still in the list of agent's order update agent's knowledge of
         # current state of the order
@@ -908,8 +927,8 @@ class TradingAgent(FinancialAgent):
 
         logger.debug(f"Received notification of modification for: {order}")
 
-        if self.log_orders:
-            self.logEvent("ORDER_MODIFIED", order.to_dict())
+        if self.log_orders and self.log_enabled("ORDER_MODIFIED"):
+            self.record_event("ORDER_MODIFIED", order.to_dict())
 
         # if orders still in the list of agent's order update agent's knowledge of
         # current state of the order
@@ -935,8 +954,8 @@ class TradingAgent(FinancialAgent):
 
         logger.debug(f"Received notification of replacement for: {old_order}")
 
-        if self.log_orders:
-            self.logEvent("ORDER_REPLACED", old_order.to_dict())
+        if self.log_orders and self.log_enabled("ORDER_REPLACED"):
+            self.record_event("ORDER_REPLACED", old_order.to_dict())
 
         # if orders still in the list of agent's order update agent's knowledge of
         # current state of the order
@@ -1060,6 +1079,19 @@ class TradingAgent(FinancialAgent):
             self.last_trade[symbol] = message.last_transaction
             self.exchange_ts[symbol] = message.exchange_ts
 
+        elif isinstance(message, L2DeltaDataMsg):
+            symbol = message.symbol
+            if symbol not in self.book_mirrors:
+                self.book_mirrors[symbol] = LocalBookMirror(symbol)
+
+            if not self.book_mirrors[symbol].update(message):
+                # Updates were lost: requesting the subscription again resends a
+                # snapshot of the book.
+                self.send_message(self.exchange_id, L2DeltaSubReqMsg(symbol))
+
+            self.last_trade[symbol] = message.last_transaction
+            self.exchange_ts[symbol] = message.exchange_ts
+
     def query_order_stream(self, symbol: str, orders) -> None:
         """
         Handles QueryOrderStreamResponseMsg messages from an exchange agent.
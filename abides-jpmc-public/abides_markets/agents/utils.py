@@ -1,4 +1,3 @@
-from copy import deepcopy
 from typing import Any, Dict, List, Optional, Tuple
 from ..price_level import PriceLevel
 
@@ -51,12 +50,11 @@ def ignore_mkt_data_buffer_decorator(func):
     """
 
     def wrapper_mkt_data_buffer_decorator(self, raw_state):
-        raw_state_copy = deepcopy(raw_state)
+        # the raw state may be read-only: shallow copies are modified instead
+        raw_state = [dict(raw_state_i) for raw_state_i in raw_state]
         for i in range(len(raw_state)):
-            raw_state[i]["parsed_mkt_data"] = raw_state_copy[i]["parsed_mkt_data"][-1]
-            raw_state[i]["parsed_volume_data"] = raw_state_copy[i][
-                "parsed_volume_data"
-            ][-1]
+            raw_state[i]["parsed_mkt_data"] = raw_state[i]["parsed_mkt_data"][-1]
+            raw_state[i]["parsed_volume_data"] = raw_state[i]["parsed_volume_data"][-1]
         raw_state2 = list_dict_flip(raw_state)
         flipped = dict((k, list_dict_flip(v)) for (k, v) in raw_state2.items())
         return func(self, flipped)
@@ -76,7 +74,8 @@ def ignore_buffers_decorator(func):
     """
 
     def wrapper_ignore_buffers_decorator(self, raw_state):
-        raw_state = raw_state[-1]
+        # the raw state may be read-only: a shallow copy is modified instead
+        raw_state = dict(raw_state[-1])
         if len(raw_state["parsed_mkt_data"]) == 0:
             pass
         else:
@@ -124,7 +123,7 @@ def get_val(book: List[PriceLevel], level: int) -> Tuple[int, int]:
     Returns:
         - tuple price, volume for the i-th value
     """
-    if book == []:
+    if len(book) == 0:
         return 0, 0
     else:
         try:
@@ -146,7 +145,7 @@ def get_last_val(book: List[PriceLevel], mid_price: int) -> int:
     Returns:
         - mid price value
     """
-    if book == []:
+    if len(book) == 0:
         return mid_price
     else:
         return book[-1][0]
@@ -188,14 +187,14 @@ def get_imbalance(
         - imbalance
     """
     # None corresponds to the whole book depth
-    if (bids == []) and (asks == []):
+    if len(bids) == 0 and len(asks) == 0:
         return 0.5
-    elif bids == []:
+    elif len(bids) == 0:
         if direction == "BUY":
             return 0
         else:
             return 1
-    elif asks == []:
+    elif len(asks) == 0:
         if direction == "BUY":
             return 1
         else:
@@ -0,0 +1,138 @@
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from abides_core import NanosecondTime
+
+from .event_log import ArrayLog
+from .price_level import PriceLevel
+
+
+class BookSnapshotRecorder:
+    """
+    Records fixed-depth L2 snapshots of an order book as rows of a single growable,
+    preallocated int64 buffer (an `ArrayLog`) instead of one dict of freshly allocated
+    arrays per snapshot. The snapshots can instead be streamed in chunks to a file on
+    disk, in which case they are read back through a memory map.
+
+    Each snapshot is one row of ``4 * depth + 1`` columns. The time sits in the middle
+    column, the bid levels are stored to its left running outwards (best bid nearest to
+    the time) and the ask levels to its right, each level as a (price, quantity) pair::
+
+        [..., bid_qty[1], bid_px[1], bid_qty[0], bid_px[0], time, ask_px[0], ask_qty[0], ask_px[1], ...]
+
+    With this layout the L1 (time, price, quantity) and L2 (level, price/quantity)
+    arrays are all strided views of the buffer (or file), so reading them back does not
+    copy or re-pad anything.
+
+    As with the previous ``get_L2_snapshots`` padding, levels with no visible quantity
+    are skipped, missing levels are filled with quantity 0 at prices one tick further
+    away from the last recorded level, and an empty side is stored as all zeros.
+
+    Arguments:
+        depth: Number of levels recorded on each side of the book.
+        chunk_size: Number of snapshots to preallocate room for. The buffer doubles in
+            size whenever it is full, or is flushed to the file when streaming.
+        path: Optional file to stream the snapshots to.
+    """
+
+    def __init__(
+        self, depth: int = 10, chunk_size: int = 1024, path: Optional[str] = None
+    ) -> None:
+        if depth <= 0:
+            raise ValueError(
+                "Snapshot depth must be a positive number of levels.", "depth:", depth
+            )
+
+        self.depth: int = depth
+
+        # Column holding the snapshot time.
+        self.time_column: int = 2 * depth
+
+        self.log: ArrayLog = ArrayLog(4 * depth + 1, path, chunk_size)
+
+    def record(
+        self,
+        time: NanosecondTime,
+        bids: Sequence[PriceLevel],
+        asks: Sequence[PriceLevel],
+    ) -> None:
+        """
+        Appends a snapshot of the given book sides.
+
+        Arguments:
+            time: The time of the snapshot.
+            bids: Bid price levels, best first. Only the first ``depth`` are recorded.
+            asks: Ask price levels, best first. Only the first ``depth`` are recorded.
+        """
+        row = [0] * self.log.width
+        row[self.time_column] = time
+
+        self._write_side(row, bids[: self.depth], self.time_column - 1, -1)
+        self._write_side(row, asks[: self.depth], self.time_column + 1, 1)
+
+        self.log.append(row)
+
+    def _write_side(
+        self, row: List[int], price_levels: Iterable[PriceLevel], column: int, step: int
+    ) -> None:
+        # Writes (price, quantity) pairs starting at the given column, moving away from
+        # the time column by `step` (-1 for bids, +1 for asks) - which is also the
+        # direction prices move in when padding.
+        n_levels = 0
+        for price_level in price_levels:
+            quantity = price_level.total_quantity
+            if quantity > 0:
+                row[column] = price_level.price
+                row[column + step] = quantity
+                column += 2 * step
+                n_levels += 1
+
+        if 0 < n_levels < self.depth:
+            price = row[column - 2 * step]
+            for _ in range(self.depth - n_levels):
+                price += step
+                row[column] = price
+                column += 2 * step
+
+    @property
+    def data(self) -> np.ndarray:
+        """All recorded snapshot rows, shape (n, 4 * depth + 1)."""
+        return self.log.rows
+
+    @property
+    def times(self) -> np.ndarray:
+        """View of the snapshot times, shape (n,)."""
+        return self.data[:, self.time_column]
+
+    @property
+    def bids(self) -> np.ndarray:
+        """View of the bid levels, shape (n, depth, 2) with [price, quantity] pairs."""
+        data = self.data
+        return data[:, self.time_column - 1 :: -1].reshape(len(data), self.depth, 2)
+
+    @property
+    def asks(self) -> np.ndarray:
+        """View of the ask levels, shape (n, depth, 2) with [price, quantity] pairs."""
+        data = self.data
+        return data[:, self.time_column + 1 :].reshape(len(data), self.depth, 2)
+
+    @property
+    def best_bids(self) -> np.ndarray:
+        """View of the best bids, shape (n, 3) with [time, price, quantity] rows."""
+        column = self.time_column
+        stop = column - 3 if column >= 3 else None
+        return self.data[:, column:stop:-1]
+
+    @property
+    def best_asks(self) -> np.ndarray:
+        """View of the best asks, shape (n, 3) with [time, price, quantity] rows."""
+        column = self.time_column
+        return self.data[:, column : column + 3]
+
+    def flush(self) -> None:
+        """Writes the buffered snapshots to the file, when streaming."""
+        self.log.flush()
+
+    def __len__(self) -> int:
+        return len(self.log)
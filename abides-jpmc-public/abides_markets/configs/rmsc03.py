@@ -32,6 +32,7 @@ def build_config(
     end_time="16:00:00",
     exchange_log_orders=True,
     log_orders=True,
+    log_policy=None,  # LogPolicy (or dict of its arguments), see abides_core.log_policy
     book_logging=True,
     book_log_depth=10,
     #   seed=int(NanosecondTime.now().timestamp() * 1000000) % (2 ** 32 - 1),
@@ -292,4 +293,5 @@ def build_config(
         "custom_properties": {"oracle": oracle},
         "random_state_kernel": random_state_kernel,
         "stdout_log_level": stdout_log_level,
+        "log_policy": log_policy,
     }
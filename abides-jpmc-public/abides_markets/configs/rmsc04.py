@@ -36,6 +36,7 @@ def build_config(
     ticker="ABM",
     starting_cash=10_000_000,  # Cash in this simulator is always in CENTS.
     log_orders=True,  # if True log everything
+    log_policy=None,  # LogPolicy (or dict of its arguments), see abides_core.log_policy
     # 1) Exchange Agent
     book_logging=True,
     book_log_depth=10,
@@ -287,4 +288,5 @@ def build_config(
         "custom_properties": {"oracle": oracle},
         "random_state_kernel": random_state_kernel,
         "stdout_log_level": stdout_log_level,
+        "log_policy": log_policy,
     }
@@ -21,6 +21,7 @@ from abides_markets.agents import (
     NoiseAgent_0, #x
     NoiseAgent_1, #x
     IntermarketSpreadArbitrageMachine, #x
+    ConsolidatedQuoteAgent,
 )
 from abides_markets.models import OrderSizeModel
 from abides_markets.oracles import SparseMeanRevertingOracle
@@ -40,6 +41,7 @@ def build_config(
     ticker="ABM",
     starting_cash=10_000_000,  # Cash in this simulator is always in CENTS.
     log_orders=True,  # if True log everything
+    log_policy=None,  # LogPolicy (or dict of its arguments), see abides_core.log_policy
     # 1) Exchange Agent
     book_logging=True,
     book_log_depth=10,
@@ -74,6 +76,12 @@ def build_config(
     mm_cancel_limit_delay=50,  # 50 nanoseconds
     # 5) Momentum Agents
     num_momentum_agents=10,
+    # 6) Consolidated quotes (SIP): if False the agents query both exchanges instead.
+    # Off by default, so that runs with a given seed reproduce earlier results.
+    consolidated_quotes=False,
+    sip_latency="500us",
+    sip_depth=10,
+    sip_freq="0s",  # Minimum time between two updates of the quotes of an agent
 ):
     """
     create the background configuration for rmsc04
@@ -255,6 +263,7 @@ def build_config(
                 lambda_a=lambda_a,
                 log_orders=log_orders,
                 order_size_model=ORDER_SIZE_MODEL,
+                nbbo_freq=str_to_ns(sip_freq),
                 random_state=np.random.RandomState(
                     seed=np.random.randint(low=0, high=2 ** 32, dtype="uint64")
                 ),
@@ -342,6 +351,7 @@ def build_config(
                 poisson_arrival=True,
                 log_orders=log_orders,
                 order_size_model=ORDER_SIZE_MODEL,
+                nbbo_freq=str_to_ns(sip_freq),
                 random_state=np.random.RandomState(
                     seed=np.random.randint(low=0, high=2 ** 32, dtype="uint64")
                 ),
@@ -377,6 +387,24 @@ def build_config(
     agent_count += 1
     agent_types.extend("InterMarketSpreadArbitrageAgent")
 
+    if consolidated_quotes:
+        agents.append(
+            ConsolidatedQuoteAgent(
+                id=agent_count,
+                name="CONSOLIDATED_QUOTE_AGENT",
+                type="ConsolidatedQuoteAgent",
+                symbols=[ticker],
+                exchange_ids=[0, 1],
+                depth=sip_depth,
+                sip_latency=str_to_ns(sip_latency),
+                random_state=np.random.RandomState(
+                    seed=np.random.randint(low=0, high=2 ** 32, dtype="uint64")
+                ),
+            )
+        )
+        agent_count += 1
+        agent_types.append("ConsolidatedQuoteAgent")
+
 
     # extract kernel seed here to reproduce the state of random generator in old version
     random_state_kernel = np.random.RandomState(
@@ -401,4 +429,5 @@ def build_config(
         "custom_properties": {"oracle": oracle},
         "random_state_kernel": random_state_kernel,
         "stdout_log_level": stdout_log_level,
+        "log_policy": log_policy,
     }
@@ -0,0 +1,213 @@
+import pickle
+from itertools import chain, islice
+from typing import Any, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+
+class ArrayLog:
+    """
+    Append-only log of fixed-width int64 rows.
+
+    Without a path the rows are held in a growable in-memory buffer. With a path only
+    the last `chunk_size` rows are kept in memory: whenever the buffer is full it is
+    appended to the file and emptied, and the rows already on disk are read back
+    through a read-only memory map instead of being loaded whole.
+
+    Arguments:
+        width: Number of int64 values per row.
+        path: Optional file to stream the rows to. Any existing file is truncated.
+        chunk_size: Number of rows buffered in memory (initial buffer size when not
+            streaming to a file).
+    """
+
+    def __init__(
+        self, width: int, path: Optional[str] = None, chunk_size: int = 65536
+    ) -> None:
+        if chunk_size <= 0:
+            raise ValueError(
+                "Chunk size must be a positive number of rows.",
+                "chunk_size:",
+                chunk_size,
+            )
+
+        self.width: int = width
+        self.path: Optional[str] = path
+
+        self.buffer: np.ndarray = np.zeros((chunk_size, width), dtype=np.int64)
+        self.n_buffered: int = 0
+        self.n_flushed: int = 0
+
+        if path is not None:
+            open(path, "wb").close()
+
+    def append(self, row: Sequence[int]) -> None:
+        """
+        Appends a row to the log.
+
+        Arguments:
+            row: The `width` values of the row.
+        """
+        if self.n_buffered == len(self.buffer):
+            if self.path is None:
+                self._grow()
+            else:
+                self.flush()
+
+        self.buffer[self.n_buffered] = row
+        self.n_buffered += 1
+
+    def flush(self) -> None:
+        """Appends the buffered rows to the file. Does nothing if not streaming."""
+        if self.path is None or self.n_buffered == 0:
+            return
+
+        with open(self.path, "ab") as f:
+            f.write(self.buffer[: self.n_buffered].tobytes())
+
+        self.n_flushed += self.n_buffered
+        self.n_buffered = 0
+
+    def _grow(self) -> None:
+        buffer = np.zeros((2 * len(self.buffer), self.width), dtype=np.int64)
+        buffer[: self.n_buffered] = self.buffer[: self.n_buffered]
+        self.buffer = buffer
+
+    def _flushed_rows(self) -> np.ndarray:
+        if self.n_flushed == 0:
+            return np.zeros((0, self.width), dtype=np.int64)
+
+        return np.memmap(
+            self.path, dtype=np.int64, mode="r", shape=(self.n_flushed, self.width)
+        )
+
+    @property
+    def rows(self) -> np.ndarray:
+        """
+        All rows, shape (n, width). A view of the in-memory buffer, or when streaming a
+        memory map of the file (the buffered rows are flushed first).
+        """
+        if self.path is None:
+            return self.buffer[: self.n_buffered]
+
+        self.flush()
+        return self._flushed_rows()
+
+    @property
+    def head(self) -> np.ndarray:
+        """Rows already written to the file, as a read-only memory map."""
+        return self._flushed_rows()
+
+    @property
+    def tail(self) -> np.ndarray:
+        """View of the rows still held in memory."""
+        return self.buffer[: self.n_buffered]
+
+    def __len__(self) -> int:
+        return self.n_flushed + self.n_buffered
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return chain(self._flushed_rows(), self.tail)
+
+    def __reversed__(self) -> Iterator[np.ndarray]:
+        return chain(self.tail[::-1], self._flushed_rows()[::-1])
+
+
+class RecordLog:
+    """
+    Append-only log of arbitrary Python records (e.g. the dicts of an order book's
+    history).
+
+    Without a path this is a plain in-memory list. With a path only the last
+    `chunk_size` records are kept in memory: whenever that many have accumulated they
+    are pickled as one chunk and appended to the file. Reading iterates over the
+    chunks on disk one at a time, followed by the in-memory tail, so the whole log
+    never has to be loaded at once.
+
+    Arguments:
+        path: Optional file to stream the records to. Any existing file is truncated.
+        chunk_size: Number of records per chunk.
+    """
+
+    def __init__(self, path: Optional[str] = None, chunk_size: int = 65536) -> None:
+        if chunk_size <= 0:
+            raise ValueError(
+                "Chunk size must be a positive number of records.",
+                "chunk_size:",
+                chunk_size,
+            )
+
+        self.path: Optional[str] = path
+        self.chunk_size: int = chunk_size
+
+        self.tail: List[Any] = []
+        self.n_flushed: int = 0
+
+        if path is not None:
+            open(path, "wb").close()
+
+    def append(self, record: Any) -> None:
+        """
+        Appends a record to the log.
+
+        Arguments:
+            record: The record to append, must be picklable when streaming.
+        """
+        self.tail.append(record)
+
+        if self.path is not None and len(self.tail) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Appends the in-memory records to the file. Does nothing if not streaming."""
+        if self.path is None or len(self.tail) == 0:
+            return
+
+        with open(self.path, "ab") as f:
+            pickle.dump(self.tail, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self.n_flushed += len(self.tail)
+        self.tail = []
+
+    def iter_chunks(self) -> Iterator[List[Any]]:
+        """Yields the records as lists, one per chunk on disk, then the in-memory tail."""
+        if self.n_flushed > 0:
+            with open(self.path, "rb") as f:
+                n_read = 0
+                while n_read < self.n_flushed:
+                    chunk = pickle.load(f)
+                    n_read += len(chunk)
+                    yield chunk
+
+        if self.tail:
+            yield self.tail
+
+    def __len__(self) -> int:
+        return self.n_flushed + len(self.tail)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[Any]:
+        for chunk in self.iter_chunks():
+            yield from chunk
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Any, List[Any]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step < 0:
+                return list(self)[index]
+
+            return list(islice(self, start, stop, step))
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("RecordLog index out of range")
+        if index >= self.n_flushed:
+            return self.tail[index - self.n_flushed]
+
+        return next(islice(self, index, None))
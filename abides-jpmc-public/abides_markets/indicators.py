@@ -0,0 +1,270 @@
+"""
+Rolling statistics over a stream of observations (e.g. the mid prices seen by a
+trading agent), updated in O(1) per observation and with bounded memory: the
+windowed statistics only keep their last ``window`` observations, in a fixed-size
+ring buffer.
+"""
+
+import math
+from typing import Optional
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-size buffer of the last ``capacity`` values appended, oldest first.
+
+    Arguments:
+        capacity: The maximum number of values kept.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError(
+                "Config error: ring buffer capacity must be >= 1.",
+                "capacity:",
+                capacity,
+            )
+
+        self.capacity: int = capacity
+        self.values: np.ndarray = np.zeros(capacity, dtype=float)
+        # Position of the next value to write, i.e. of the oldest value once full.
+        self.position: int = 0
+        self.size: int = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> float:
+        if not -self.size <= index < self.size:
+            raise IndexError("Ring buffer index out of range.", "index:", index)
+
+        if index < 0:
+            index += self.size
+        return self.values[(self.position - self.size + index) % self.capacity]
+
+    @property
+    def full(self) -> bool:
+        """Whether the buffer holds ``capacity`` values."""
+        return self.size == self.capacity
+
+    def append(self, value: float) -> Optional[float]:
+        """
+        Appends a value, and returns the value evicted to make room for it, if any.
+
+        Arguments:
+            value: The value to append.
+        """
+        evicted = self.values[self.position] if self.full else None
+
+        self.values[self.position] = value
+        self.position = (self.position + 1) % self.capacity
+        if not self.full:
+            self.size += 1
+
+        return evicted
+
+    def to_array(self) -> np.ndarray:
+        """Returns a copy of the values, oldest first."""
+        if not self.full:
+            return self.values[: self.size].copy()
+
+        return np.roll(self.values, -self.position)
+
+
+class SimpleMovingAverage:
+    """
+    Mean of the last ``window`` observations, kept as a running sum.
+
+    The running sum is recomputed from the buffer every ``window`` observations so
+    that floating point errors do not accumulate over the day (amortized O(1)). It is
+    exact for values such as prices in cents or mid prices in half cents.
+
+    Arguments:
+        window: The number of observations averaged.
+    """
+
+    def __init__(self, window: int) -> None:
+        self.window: int = window
+        self.buffer: RingBuffer = RingBuffer(window)
+        self.total: float = 0.0
+        # Total number of observations seen.
+        self.count: int = 0
+
+    @property
+    def ready(self) -> bool:
+        """Whether ``window`` observations were seen."""
+        return self.buffer.full
+
+    @property
+    def value(self) -> Optional[float]:
+        """The moving average, None until ``window`` observations were seen."""
+        return self.total / self.window if self.ready else None
+
+    def update(self, x: float) -> Optional[float]:
+        """
+        Adds an observation and returns the updated moving average.
+
+        Arguments:
+            x: The observation.
+        """
+        evicted = self.buffer.append(x)
+        self.count += 1
+
+        if self.buffer.position == 0:
+            self.total = math.fsum(self.buffer.values)
+        else:
+            self.total += x - (evicted or 0.0)
+
+        return self.value
+
+
+class ExponentialMovingAverage:
+    """
+    Exponentially weighted moving average, seeded with the first observation (as
+    ``pandas.Series.ewm(adjust=False)``). Either ``span`` or ``alpha`` is given.
+
+    Arguments:
+        span: Span of the average, alpha being 2 / (span + 1).
+        alpha: Weight of the latest observation, between 0 and 1.
+    """
+
+    def __init__(
+        self, span: Optional[float] = None, alpha: Optional[float] = None
+    ) -> None:
+        if (span is None) == (alpha is None):
+            raise ValueError("Config error: give either span or alpha.")
+
+        if alpha is None:
+            alpha = 2 / (span + 1)
+
+        if not 0 < alpha <= 1:
+            raise ValueError("Config error: alpha must be in (0, 1].", "alpha:", alpha)
+
+        self.alpha: float = alpha
+        self.value: Optional[float] = None
+        self.count: int = 0
+
+    @property
+    def ready(self) -> bool:
+        """Whether an observation was seen."""
+        return self.value is not None
+
+    def update(self, x: float) -> float:
+        """
+        Adds an observation and returns the updated moving average.
+
+        Arguments:
+            x: The observation.
+        """
+        if self.value is None:
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        self.count += 1
+
+        return self.value
+
+
+class RollingVariance:
+    """
+    Mean and variance of the last ``window`` observations, updated with Welford's
+    algorithm (adding the new observation and removing the evicted one).
+
+    Arguments:
+        window: The number of observations.
+        ddof: Delta degrees of freedom, 1 for the sample variance as pandas' rolling
+            ``var``, 0 for the population variance.
+    """
+
+    def __init__(self, window: int, ddof: int = 1) -> None:
+        if window <= ddof:
+            raise ValueError(
+                "Config error: rolling variance window must be > ddof.",
+                "window:",
+                window,
+            )
+
+        self.window: int = window
+        self.ddof: int = ddof
+        self.buffer: RingBuffer = RingBuffer(window)
+        self.mean: float = 0.0
+        # Sum of the squared deviations from the mean.
+        self.m2: float = 0.0
+        self.count: int = 0
+
+    @property
+    def ready(self) -> bool:
+        """Whether ``window`` observations were seen."""
+        return self.buffer.full
+
+    @property
+    def value(self) -> Optional[float]:
+        """The variance, None until ``window`` observations were seen."""
+        return self.m2 / (self.window - self.ddof) if self.ready else None
+
+    @property
+    def std(self) -> Optional[float]:
+        """The standard deviation, None until ``window`` observations were seen."""
+        return math.sqrt(self.value) if self.ready else None
+
+    def update(self, x: float) -> Optional[float]:
+        """
+        Adds an observation and returns the updated variance.
+
+        Arguments:
+            x: The observation.
+        """
+        evicted = self.buffer.append(x)
+        self.count += 1
+
+        if self.buffer.position == 0:
+            # Resynchronized once per window against rounding errors.
+            values = self.buffer.values
+            self.mean = math.fsum(values) / self.window
+            self.m2 = math.fsum((values - self.mean) ** 2)
+        elif evicted is None:
+            mean = self.mean + (x - self.mean) / len(self.buffer)
+            self.m2 += (x - self.mean) * (x - mean)
+            self.mean = mean
+        else:
+            mean = self.mean + (x - evicted) / self.window
+            self.m2 += (x - evicted) * (x - mean + evicted - self.mean)
+            self.mean = mean
+
+        # Rounding errors can make it slightly negative for constant observations.
+        self.m2 = max(self.m2, 0.0)
+
+        return self.value
+
+
+class Crossover:
+    """
+    Detects the crossings of a fast and a slow series, e.g. of a short and a long
+    moving average: the fast series crosses above when it becomes >= the slow one,
+    and below when it becomes < the slow one.
+    """
+
+    def __init__(self) -> None:
+        # Whether the fast series was >= the slow one at the last update.
+        self.above: Optional[bool] = None
+
+    def update(self, fast: float, slow: float) -> int:
+        """
+        Compares the latest values of the two series, and returns 1 if the fast series
+        crossed above the slow one, -1 if it crossed below, 0 otherwise (including at
+        the first update).
+
+        Arguments:
+            fast: The latest value of the fast series.
+            slow: The latest value of the slow series.
+        """
+        above = fast >= slow
+        crossed = self.above is not None and above != self.above
+        self.above = above
+
+        if not crossed:
+            return 0
+
+        return 1 if above else -1
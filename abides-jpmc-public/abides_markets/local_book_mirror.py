@@ -0,0 +1,179 @@
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+from abides_core import NanosecondTime
+
+from .messages.marketdata import L2DeltaDataMsg
+
+
+class LocalBookMirror:
+    """
+    Agent-side copy of the L2 order book of a symbol, maintained from the incremental
+    feed of an exchange (``L2DeltaDataMsg`` messages, see ``L2DeltaSubReqMsg``).
+
+    Each side is a dict of quantities indexed by price plus a sorted array of the
+    prices, as ``SortedPriceLadder``: updating the quantity of a level is O(1),
+    creating or removing a level needs a single ``bisect``, and the best bid and ask
+    are read in O(1).
+
+    Updates are applied in sequence. Updates received ahead of the next expected
+    sequence number (e.g. delivered out of order) are held until the missing ones
+    arrive, as are the updates received before the first snapshot. If more than
+    ``max_pending`` updates are held, an update was lost: ``update`` then returns False
+    once to ask for a new snapshot, which is obtained by requesting the subscription
+    again.
+
+    Arguments:
+        symbol: The symbol of the book.
+        max_pending: The number of updates held before asking for a new snapshot.
+    """
+
+    def __init__(self, symbol: str, max_pending: int = 100) -> None:
+        self.symbol: str = symbol
+        self.max_pending: int = max_pending
+
+        self.bids: Dict[int, int] = {}
+        self.asks: Dict[int, int] = {}
+        # Prices of each side, ascending.
+        self.bid_prices: List[int] = []
+        self.ask_prices: List[int] = []
+
+        # Sequence number of the last update applied, None until a snapshot is
+        # received.
+        self.sequence_number: Optional[int] = None
+        self.pending: Dict[int, L2DeltaDataMsg] = {}
+        self.resync_requested: bool = False
+
+        self.last_trade: Optional[int] = None
+        self.exchange_ts: Optional[NanosecondTime] = None
+
+    @property
+    def synced(self) -> bool:
+        """Whether the mirror holds a snapshot and all the updates since."""
+        return self.sequence_number is not None and not self.resync_requested
+
+    def update(self, message: L2DeltaDataMsg) -> bool:
+        """
+        Applies a snapshot or an incremental update, or holds it until the updates
+        preceding it are received. Returns False if a new snapshot is needed.
+
+        Arguments:
+            message: The update.
+        """
+        if message.snapshot:
+            if (
+                self.sequence_number is None
+                or self.resync_requested
+                or message.sequence_number > self.sequence_number
+            ):
+                self.reset(message)
+
+        elif (
+            self.sequence_number is None
+            or message.sequence_number > self.sequence_number
+        ):
+            self.pending[message.sequence_number] = message
+
+        if self.sequence_number is not None:
+            while self.sequence_number + 1 in self.pending:
+                self.apply(self.pending.pop(self.sequence_number + 1))
+
+        if self.resync_requested or len(self.pending) <= self.max_pending:
+            return True
+
+        self.resync_requested = True
+        return False
+
+    def reset(self, message: L2DeltaDataMsg) -> None:
+        """
+        Replaces the book with a snapshot, dropping the updates it includes.
+
+        Arguments:
+            message: The snapshot.
+        """
+        self.bids = dict(message.bids)
+        self.asks = dict(message.asks)
+        self.bid_prices = sorted(self.bids)
+        self.ask_prices = sorted(self.asks)
+
+        self.sequence_number = message.sequence_number
+        self.pending = {
+            sequence_number: pending
+            for sequence_number, pending in self.pending.items()
+            if sequence_number > message.sequence_number
+        }
+        self.resync_requested = False
+
+        self.last_trade = message.last_transaction
+        self.exchange_ts = message.exchange_ts
+
+    def apply(self, message: L2DeltaDataMsg) -> None:
+        """
+        Applies the next incremental update.
+
+        Arguments:
+            message: The update.
+        """
+        for price, quantity in message.bids:
+            self._set_level(self.bids, self.bid_prices, price, quantity)
+
+        for price, quantity in message.asks:
+            self._set_level(self.asks, self.ask_prices, price, quantity)
+
+        self.sequence_number = message.sequence_number
+        self.last_trade = message.last_transaction
+        self.exchange_ts = message.exchange_ts
+
+    @staticmethod
+    def _set_level(
+        levels: Dict[int, int], prices: List[int], price: int, quantity: int
+    ) -> None:
+        if quantity > 0:
+            if price not in levels:
+                insort(prices, price)
+            levels[price] = quantity
+
+        elif levels.pop(price, None) is not None:
+            del prices[bisect_left(prices, price)]
+
+    @property
+    def best_bid(self) -> Optional[Tuple[int, int]]:
+        """The price and quantity of the best bid, None if there is no bid."""
+        if not self.bid_prices:
+            return None
+
+        price = self.bid_prices[-1]
+        return price, self.bids[price]
+
+    @property
+    def best_ask(self) -> Optional[Tuple[int, int]]:
+        """The price and quantity of the best ask, None if there is no ask."""
+        if not self.ask_prices:
+            return None
+
+        price = self.ask_prices[0]
+        return price, self.asks[price]
+
+    def get_bids(self, depth: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Returns the (price, quantity) of the bid levels, best first.
+
+        Arguments:
+            depth: If given, only the first N levels are returned.
+        """
+        if depth is None:
+            prices = self.bid_prices
+        else:
+            # Bids are stored in increasing price order: the best are at the end.
+            prices = self.bid_prices[max(len(self.bid_prices) - depth, 0) :]
+        return [(price, self.bids[price]) for price in reversed(prices)]
+
+    def get_asks(self, depth: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Returns the (price, quantity) of the ask levels, best first.
+
+        Arguments:
+            depth: If given, only the first N levels are returned.
+        """
+        prices = self.ask_prices if depth is None else self.ask_prices[:depth]
+        return [(price, self.asks[price]) for price in prices]
@@ -0,0 +1,284 @@
+"""
+Publication of the market data subscriptions registered with an exchange agent.
+
+Subscriptions are indexed by symbol, subscriber and request, so that they are created
+and cancelled in O(1), and only the subscriptions of the symbol whose book changed are
+visited after an order message:
+
+- Subscriptions with ``freq == 0`` (and event based subscriptions) are published after
+  every order message which changed the book.
+- Subscriptions with ``freq > 0`` are grouped in one bucket per (symbol, freq). A
+  bucket is published when the book changes if it was last published at least ``freq``
+  ago. Otherwise a timer is set at the end of the period, at which time the bucket is
+  published if the book changed in between.
+
+Each distinct payload (e.g. the L2 data at a given depth) is built once per
+publication and the same message is sent to all the subscribers of the payload.
+"""
+
+import heapq
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from abides_core import Agent, Message, NanosecondTime
+
+from .messages.marketdata import MarketDataSubReqMsg
+
+# Fields of the subscription requests and of the subscriptions which do not identify
+# a subscription or a payload.
+_REQUEST_STATE_FIELDS = ("message_id", "symbol", "cancel")
+_SUBSCRIPTION_STATE_FIELDS = ("agent_id", "last_update_ts", "freq")
+
+
+def request_key(message: MarketDataSubReqMsg) -> Tuple[Hashable, ...]:
+    """
+    Returns the key identifying the subscription created (or cancelled) by a
+    subscription request of an agent: the type and the parameters of the request.
+
+    Arguments:
+        message: The subscription request.
+    """
+    return (type(message),) + tuple(
+        getattr(message, f.name)
+        for f in fields(message)
+        if f.name not in _REQUEST_STATE_FIELDS
+    )
+
+
+def payload_key(subscription: Any) -> Tuple[Hashable, ...]:
+    """
+    Returns the key identifying the data sent for a frequency based subscription: its
+    type and parameters (e.g. the depth), but not its subscriber or frequency.
+
+    Arguments:
+        subscription: The subscription.
+    """
+    return (type(subscription),) + tuple(
+        getattr(subscription, f.name)
+        for f in fields(subscription)
+        if f.name not in _SUBSCRIPTION_STATE_FIELDS
+    )
+
+
+@dataclass
+class PublicationBucket:
+    """
+    The subscriptions of a symbol sharing the same frequency, published together.
+    """
+
+    symbol: str
+    freq: int
+    subscriptions: Dict[Tuple[int, Tuple], Any] = field(default_factory=dict)
+    # State:
+    last_publication_ts: Optional[NanosecondTime] = None
+    published_version: Optional[int] = None
+    timer_ts: Optional[NanosecondTime] = None
+
+
+class MarketDataPublisher:
+    """
+    Holds the market data subscriptions of an exchange agent and sends their data.
+
+    The owner must have ``order_books`` (whose ``version`` tells whether a book
+    changed), ``mkt_close``, the ``EventBasedSubscription`` class and the methods
+    ``build_data_message(symbol, subscription)`` returning the data message of a
+    frequency based subscription, and ``handle_event_based_data_subscription(symbol,
+    subscription)`` returning the messages of an event based subscription. It must
+    call ``wakeup`` from its own wakeup method.
+
+    Arguments:
+        owner: The exchange agent the subscriptions are registered with.
+    """
+
+    def __init__(self, owner: Agent) -> None:
+        self.owner: Agent = owner
+
+        # Subscriptions sent after every change of the book, by symbol then
+        # (agent ID, request key).
+        self.immediate: Dict[str, Dict[Tuple[int, Tuple], Any]] = {}
+        self.event_based: Dict[str, Dict[Tuple[int, Tuple], Any]] = {}
+        # Version of each book when the subscriptions above were last published.
+        self.published_versions: Dict[str, int] = {}
+
+        # Buckets of the subscriptions with a frequency, by symbol then frequency.
+        self.buckets: Dict[str, Dict[int, PublicationBucket]] = {}
+        # Buckets to publish at each timer, and heap of the timer times.
+        self.timers: Dict[NanosecondTime, List[PublicationBucket]] = {}
+        self.timer_times: List[NanosecondTime] = []
+
+    def __len__(self) -> int:
+        return (
+            sum(len(subscriptions) for subscriptions in self.immediate.values())
+            + sum(len(subscriptions) for subscriptions in self.event_based.values())
+            + sum(
+                len(bucket.subscriptions)
+                for buckets in self.buckets.values()
+                for bucket in buckets.values()
+            )
+        )
+
+    def subscribe(
+        self, agent_id: int, message: MarketDataSubReqMsg, subscription: Any
+    ) -> None:
+        """
+        Registers a subscription, replacing the identical subscription of the agent if
+        any.
+
+        Arguments:
+            agent_id: The subscriber.
+            message: The subscription request.
+            subscription: The subscription created for the request.
+        """
+        self.cancel(agent_id, message)
+
+        key = (agent_id, request_key(message))
+
+        if isinstance(subscription, self.owner.EventBasedSubscription):
+            self.event_based.setdefault(message.symbol, {})[key] = subscription
+        elif subscription.freq <= 0:
+            self.immediate.setdefault(message.symbol, {})[key] = subscription
+        else:
+            # Frequencies are sometimes given as floats (e.g. 10e9).
+            freq = int(subscription.freq)
+            buckets = self.buckets.setdefault(message.symbol, {})
+            if freq not in buckets:
+                buckets[freq] = PublicationBucket(message.symbol, freq)
+            buckets[freq].subscriptions[key] = subscription
+
+    def cancel(self, agent_id: int, message: MarketDataSubReqMsg) -> bool:
+        """
+        Cancels the subscription of an agent matching a request, and returns whether
+        one was found.
+
+        Arguments:
+            agent_id: The subscriber.
+            message: The subscription request (or cancellation request).
+        """
+        key = (agent_id, request_key(message))
+        symbol = message.symbol
+
+        for subscriptions in (self.immediate, self.event_based):
+            if subscriptions.get(symbol, {}).pop(key, None) is not None:
+                return True
+
+        if not hasattr(message, "freq"):
+            return False
+
+        buckets = self.buckets.get(symbol, {})
+        freq = int(message.freq)
+        bucket = buckets.get(freq)
+        if bucket is not None and bucket.subscriptions.pop(key, None) is not None:
+            if not bucket.subscriptions:
+                # Pending timers of the bucket are ignored.
+                del buckets[freq]
+            return True
+
+        return False
+
+    def publish(self, symbol: str) -> None:
+        """
+        Publishes the data of a symbol after an order message: to the subscriptions
+        without frequency if the book changed, and to the buckets whose period is over.
+
+        Arguments:
+            symbol: The symbol of the order message.
+        """
+        version = self.owner.order_books[symbol].version
+        current_time = self.owner.current_time
+
+        if self.published_versions.get(symbol) != version:
+            self.published_versions[symbol] = version
+
+            if self.immediate.get(symbol):
+                self.send(symbol, self.immediate[symbol].values())
+
+            for subscription in self.event_based.get(symbol, {}).values():
+                messages = self.owner.handle_event_based_data_subscription(
+                    symbol, subscription
+                )
+                for message in messages:
+                    self.owner.send_message(subscription.agent_id, message)
+                if len(messages) > 0:
+                    subscription.last_update_ts = current_time
+
+        for bucket in self.buckets.get(symbol, {}).values():
+            if bucket.published_version == version:
+                continue
+
+            if (
+                bucket.last_publication_ts is None
+                or current_time - bucket.last_publication_ts >= bucket.freq
+            ):
+                self.publish_bucket(bucket)
+            elif bucket.timer_ts is None:
+                self.set_timer(bucket, bucket.last_publication_ts + bucket.freq)
+
+    def wakeup(self, current_time: NanosecondTime) -> None:
+        """
+        Publishes the buckets whose timer is due, if their book changed since they were
+        last published. The wakeups of the owner can be delivered later than requested
+        (e.g. if it was busy), so all the timers until the current time are due.
+
+        Arguments:
+            current_time: The time of the wakeup.
+        """
+        while self.timer_times and self.timer_times[0] <= current_time:
+            for bucket in self.timers.pop(heapq.heappop(self.timer_times)):
+                bucket.timer_ts = None
+
+                if not bucket.subscriptions:
+                    continue
+
+                version = self.owner.order_books[bucket.symbol].version
+                if bucket.published_version != version:
+                    self.publish_bucket(bucket)
+
+    def set_timer(self, bucket: PublicationBucket, timer_ts: NanosecondTime) -> None:
+        """
+        Requests a wakeup of the owner to publish a bucket, unless the market is closed
+        by then.
+
+        Arguments:
+            bucket: The bucket.
+            timer_ts: The time of the publication.
+        """
+        if timer_ts >= self.owner.mkt_close:
+            return
+
+        bucket.timer_ts = timer_ts
+        if timer_ts not in self.timers:
+            self.timers[timer_ts] = []
+            heapq.heappush(self.timer_times, timer_ts)
+            self.owner.set_wakeup(timer_ts)
+        self.timers[timer_ts].append(bucket)
+
+    def publish_bucket(self, bucket: PublicationBucket) -> None:
+        """
+        Sends the current data of a bucket to all its subscribers.
+
+        Arguments:
+            bucket: The bucket.
+        """
+        bucket.last_publication_ts = self.owner.current_time
+        bucket.published_version = self.owner.order_books[bucket.symbol].version
+
+        self.send(bucket.symbol, bucket.subscriptions.values())
+
+    def send(self, symbol: str, subscriptions: Iterable[Any]) -> None:
+        """
+        Sends the current data of a symbol to frequency based subscriptions, building
+        each distinct payload once.
+
+        Arguments:
+            symbol: The symbol.
+            subscriptions: The subscriptions.
+        """
+        messages: Dict[Tuple[Hashable, ...], Message] = {}
+
+        for subscription in list(subscriptions):
+            key = payload_key(subscription)
+            if key not in messages:
+                messages[key] = self.owner.build_data_message(symbol, subscription)
+
+            self.owner.send_message(subscription.agent_id, messages[key])
+            subscription.last_update_ts = self.owner.current_time
@@ -2,7 +2,7 @@ import sys
 from abc import ABC
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from abides_core import Message, NanosecondTime
 
@@ -125,6 +125,26 @@ class L3SubReqMsg(MarketDataFreqBasedSubReqMsg):
     depth: int = sys.maxsize
 
 
+@dataclass
+class L2DeltaSubReqMsg(MarketDataEventBasedSubReqMsg):
+    """
+    This message requests the creation or cancellation of a subscription to the
+    incremental L2 feed of an ``ExchangeAgent``: a snapshot of the whole book, then the
+    price levels changed by every order (see ``L2DeltaDataMsg``). Requesting the
+    subscription again resends a snapshot, to resynchronise a ``LocalBookMirror``.
+
+    Attributes:
+        symbol: The symbol of the security to request a data subscription for.
+        cancel: If True attempts to create a new subscription, if False attempts to
+            cancel an existing subscription.
+    """
+
+    # Inherited Fields:
+    # symbol: str
+    # cancel: bool = False
+    pass
+
+
 @dataclass
 class TransactedVolSubReqMsg(MarketDataFreqBasedSubReqMsg):
     """
@@ -169,6 +189,30 @@ class BookImbalanceSubReqMsg(MarketDataEventBasedSubReqMsg):
     min_imbalance: float = 1.0
 
 
+@dataclass
+class NBBOSubReqMsg(MarketDataSubReqMsg):
+    """
+    This message requests the creation or cancellation of a subscription to the
+    consolidated quotes of a ``ConsolidatedQuoteAgent``, which are pushed to the
+    subscriber every time the best prices or the depth of any exchange change.
+
+    Attributes:
+        symbol: The symbol of the security to request a data subscription for.
+        cancel: If True attempts to create a new subscription, if False attempts to
+            cancel an existing subscription.
+        depth: The maximum number of price levels on both sides of the consolidated
+            book and of the book of each exchange to return data for.
+        freq: The minimum time in nanoseconds between two updates, the changes in
+            between being conflated into the next update.
+    """
+
+    # Inherited Fields:
+    # symbol: str
+    # cancel: bool = False
+    depth: int = 1
+    freq: int = 0
+
+
 @dataclass
 class MarketDataMsg(Message, ABC):
     """
@@ -240,18 +284,18 @@ class L2DataMsg(MarketDataMsg):
         symbol: The symbol of the security this data is for.
         last_transaction: The time of the last transaction that happened on the exchange.
         exchange_ts: The time that the message was sent from the exchange.
-        bids: A list of tuples containing the price and available volume at each bid
-            price level.
-        asks: A list of tuples containing the price and available volume at each ask
-            price level.
+        bids: A sequence of tuples containing the price and available volume at each
+            bid price level (an immutable snapshot shared with the other subscribers).
+        asks: A sequence of tuples containing the price and available volume at each
+            ask price level (an immutable snapshot shared with the other subscribers).
     """
 
     # Inherited Fields:
     # symbol: str
     # last_transaction: int
     # exchange_ts: NanosecondTime
-    bids: List[Tuple[int, int]]
-    asks: List[Tuple[int, int]]
+    bids: Sequence[Tuple[int, int]]
+    asks: Sequence[Tuple[int, int]]
 
     # TODO: include requested depth
 
@@ -265,22 +309,53 @@ class L3DataMsg(MarketDataMsg):
         symbol: The symbol of the security this data is for.
         last_transaction: The time of the last transaction that happened on the exchange.
         exchange_ts: The time that the message was sent from the exchange.
-        bids: A list of tuples containing the price and a list of order sizes at each
-            bid price level.
-        asks: A list of tuples containing the price and a list of order sizes at each
-            ask price level.
+        bids: A sequence of tuples containing the price and the order sizes at each
+            bid price level (an immutable snapshot shared with the other subscribers).
+        asks: A sequence of tuples containing the price and the order sizes at each
+            ask price level (an immutable snapshot shared with the other subscribers).
     """
 
     # Inherited Fields:
     # symbol: str
     # last_transaction: int
     # exchange_ts: NanosecondTime
-    bids: List[Tuple[int, List[int]]]
-    asks: List[Tuple[int, List[int]]]
+    bids: Sequence[Tuple[int, Sequence[int]]]
+    asks: Sequence[Tuple[int, Sequence[int]]]
 
     # TODO: include requested depth
 
 
+@dataclass
+class L2DeltaDataMsg(MarketDataMsg):
+    """
+    This message returns an update of the incremental L2 feed of an exchange, as part
+    of an L2 delta data subscription.
+
+    Attributes:
+        symbol: The symbol of the security this data is for.
+        last_transaction: The time of the last transaction that happened on the exchange.
+        exchange_ts: The time that the message was sent from the exchange.
+        sequence_number: The sequence number of the update. Updates are numbered
+            consecutively, a snapshot carrying the number of the last update it
+            includes.
+        bids: The bid price levels changed since the previous update, as (price,
+            quantity) tuples, a quantity of 0 meaning the level was removed. All the
+            bid levels for a snapshot.
+        asks: The ask price levels changed since the previous update, or all the ask
+            levels for a snapshot.
+        snapshot: Whether the message holds the whole book instead of changes.
+    """
+
+    # Inherited Fields:
+    # symbol: str
+    # last_transaction: int
+    # exchange_ts: NanosecondTime
+    sequence_number: int
+    bids: Sequence[Tuple[int, int]]
+    asks: Sequence[Tuple[int, int]]
+    snapshot: bool = False
+
+
 @dataclass
 class TransactedVolDataMsg(MarketDataMsg):
     """
@@ -327,3 +402,50 @@ class BookImbalanceDataMsg(MarketDataEventMsg):
     # stage: MarketDataEventMsg.Stage
     imbalance: float
     side: Side
+
+
+@dataclass
+class NBBODataMsg(MarketDataMsg):
+    """
+    This message returns the consolidated quotes of all the exchanges as part of an
+    NBBO data subscription to a ``ConsolidatedQuoteAgent``.
+
+    Attributes:
+        symbol: The symbol of the security this data is for.
+        last_transaction: The last transaction price reported by an exchange.
+        exchange_ts: The time that the message was sent from the consolidated quote
+            agent.
+        bids: The consolidated bids: the price and the volume available on all the
+            exchanges at each bid price level, best first.
+        asks: The consolidated asks: the price and the volume available on all the
+            exchanges at each ask price level, best first.
+        exchange_bids: The bids of each exchange, by exchange agent ID.
+        exchange_asks: The asks of each exchange, by exchange agent ID.
+    """
+
+    # Inherited Fields:
+    # symbol: str
+    # last_transaction: int
+    # exchange_ts: NanosecondTime
+    bids: List[Tuple[int, int]]
+    asks: List[Tuple[int, int]]
+    exchange_bids: Dict[int, List[Tuple[int, int]]]
+    exchange_asks: Dict[int, List[Tuple[int, int]]]
+
+    def best_bid_ask(
+        self, exchange_id: Optional[int] = None
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Returns the best bid and ask prices of an exchange, or the national best bid
+        and offer if no exchange is given (None for an empty side).
+
+        Arguments:
+            exchange_id: The exchange agent ID.
+        """
+        if exchange_id is None:
+            bids, asks = self.bids, self.asks
+        else:
+            bids = self.exchange_bids.get(exchange_id)
+            asks = self.exchange_asks.get(exchange_id)
+
+        return (bids[0][0] if bids else None, asks[0][0] if asks else None)
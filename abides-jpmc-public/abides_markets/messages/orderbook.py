@@ -1,9 +1,10 @@
 from abc import ABC
 from dataclasses import dataclass
+from typing import Union
 
 from abides_core import Message
 
-from ..orders import LimitOrder, Order
+from ..orders import Fill, LimitOrder, Order
 
 
 @dataclass
@@ -18,7 +19,7 @@ class OrderAcceptedMsg(OrderBookMsg):
 
 @dataclass
 class OrderExecutedMsg(OrderBookMsg):
-    order: Order
+    order: Union[Order, Fill]
 
 
 @dataclass
@@ -1,6 +1,6 @@
 from abc import ABC
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from abides_core import Message
 
@@ -44,8 +44,9 @@ class QuerySpreadResponseMsg(QueryResponseMsg):
     # symbol: str
     # mkt_closed: bool
     depth: int
-    bids: List[Tuple[int, int]]
-    asks: List[Tuple[int, int]]
+    # Immutable snapshots of the book shared with the other recipients.
+    bids: Sequence[Tuple[int, int]]
+    asks: Sequence[Tuple[int, int]]
     last_trade: Optional[int]
 
 
@@ -1,19 +1,182 @@
 import datetime as dt
 import logging
-from math import sqrt
-from typing import Any, Dict, Optional
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from math import exp, expm1, log1p, sqrt
+from typing import Any, Dict, List, Optional
 
 import numpy as np
-import pandas as pd
+from scipy.signal import lfilter
 
 from abides_core import NanosecondTime
 
 from .oracle import Oracle
 
-
 logger = logging.getLogger(__name__)
 
 
+class MeanRevertingSeries:
+    """A mean reverting fundamental value series with one AR(1) step per nanosecond,
+    ``r[t] = kappa * r_bar + (1 - kappa) * r[t - 1] + shock[t]``, generated lazily.
+
+    The series is split into chunks of ``chunk_size`` nanoseconds. The value at the
+    start of each chunk (its boundary) is drawn only when needed, from the exact
+    multi-step AR(1) transition from the nearest earlier known boundary, or from the
+    AR(1) bridge between the known boundaries around it. The values inside a chunk are
+    only generated when a time in the chunk is looked up: a free AR(1) path is run
+    from the chunk's boundary with ``scipy.signal.lfilter`` and then corrected
+    linearly so that it ends exactly on the next boundary, which conditions it on both
+    ends. Only the most recently used chunks are kept; the boundaries are kept for
+    good and the values inside a chunk are drawn from a random state seeded by the
+    chunk index, so a chunk generated again has exactly the same values.
+
+    Values are rounded to integer cents and floored at zero. Unlike the original
+    step-by-step loop, the floor is not fed back into the recurrence, which only
+    matters when the series actually approaches zero.
+
+    Arguments:
+        start: Time of the first value of the series, which is ``r_bar``.
+        r_bar: The mean fundamental value.
+        kappa: The mean reversion coefficient per nanosecond.
+        sigma_s: The shock variance per nanosecond.  (Note: NOT STANDARD DEVIATION)
+        seed: Seed of the random states used to draw the series.
+        chunk_size: Number of nanoseconds in each chunk.
+        max_cached_chunks: Number of generated chunks to keep in memory.
+    """
+
+    def __init__(
+        self,
+        start: NanosecondTime,
+        r_bar: int,
+        kappa: float,
+        sigma_s: float,
+        seed: int,
+        chunk_size: int = 65536,
+        max_cached_chunks: int = 16,
+    ) -> None:
+        if not 0 <= kappa < 1:
+            raise ValueError("Config error: kappa must be in [0, 1).", "kappa:", kappa)
+
+        self.start: NanosecondTime = start
+        self.r_bar: int = r_bar
+        self.kappa: float = kappa
+        self.sigma_s: float = sigma_s
+        self.seed: int = int(seed)
+        self.random_state: np.random.RandomState = np.random.RandomState(seed)
+        self.chunk_size: int = chunk_size
+        self.max_cached_chunks: int = max_cached_chunks
+
+        # log(1 - kappa), so that (1 - kappa) ** n == exp(n * log_phi) for large n.
+        self.log_phi: float = log1p(-kappa)
+
+        # Known chunk boundaries as deviations from r_bar, by chunk index.
+        self.boundaries: Dict[int, float] = {0: 0.0}
+        self.boundary_chunks: List[int] = [0]
+
+        self.chunks: "OrderedDict[int, np.ndarray]" = OrderedDict()
+
+    def value_at(self, time: NanosecondTime) -> int:
+        """
+        Returns the fundamental value at the given time.
+
+        Arguments:
+            time: The time to look up, not before the start of the series.
+        """
+        if time < self.start:
+            raise ValueError(
+                "Requested a fundamental value before the start of the series.",
+                "time:",
+                time,
+            )
+
+        chunk, offset = divmod(time - self.start, self.chunk_size)
+        return int(self.get_chunk(chunk)[offset])
+
+    def get_chunk(self, chunk: int) -> np.ndarray:
+        """
+        Returns the values of a chunk, generating it if it is not cached.
+
+        Arguments:
+            chunk: The index of the chunk from the start of the series.
+        """
+        values = self.chunks.get(chunk)
+
+        if values is not None:
+            self.chunks.move_to_end(chunk)
+            return values
+
+        x0 = self.get_boundary(chunk)
+        x1 = self.get_boundary(chunk + 1)
+
+        n = self.chunk_size
+        phi = 1 - self.kappa
+
+        # Free AR(1) path x[1..n] from x[0] = x0.
+        random_state = np.random.RandomState([self.seed, chunk])
+        shocks = random_state.normal(scale=sqrt(self.sigma_s), size=n)
+        x = lfilter([1.0], [1.0, -phi], shocks, zi=[phi * x0])[0]
+
+        # Condition on x[n] = x1: each x[t] moves by Cov(x[t], x[n]) / Var(x[n]) times
+        # the miss at the end.
+        t = np.arange(n)
+        weights = np.exp((n - t) * self.log_phi) * self._variance(t) / self._variance(n)
+        x = np.concatenate([[x0], x[:-1] + weights[1:] * (x1 - x[-1])])
+
+        values = np.maximum(0, np.rint(self.r_bar + x)).astype(np.int64)
+
+        self.chunks[chunk] = values
+        if len(self.chunks) > self.max_cached_chunks:
+            self.chunks.popitem(last=False)
+
+        return values
+
+    def get_boundary(self, chunk: int) -> float:
+        """
+        Returns the deviation from r_bar at the start of a chunk, drawing it given the
+        known boundaries around it if needed.
+
+        Arguments:
+            chunk: The index of the chunk from the start of the series.
+        """
+        x = self.boundaries.get(chunk)
+        if x is not None:
+            return x
+
+        i = bisect_left(self.boundary_chunks, chunk)
+        left = self.boundary_chunks[i - 1]
+
+        a = exp((chunk - left) * self.chunk_size * self.log_phi)
+        s0 = self._variance((chunk - left) * self.chunk_size)
+
+        if i == len(self.boundary_chunks):
+            mean = a * self.boundaries[left]
+            variance = s0
+        else:
+            right = self.boundary_chunks[i]
+            b = exp((right - chunk) * self.chunk_size * self.log_phi)
+            s1 = self._variance((right - chunk) * self.chunk_size)
+
+            # Gaussian conditioning on the boundaries on both sides.
+            mean = (
+                a * self.boundaries[left] * s1 + b * self.boundaries[right] * s0
+            ) / (s1 + b**2 * s0)
+            variance = s0 * s1 / (s1 + b**2 * s0)
+
+        x = self.random_state.normal(loc=mean, scale=sqrt(variance))
+
+        self.boundaries[chunk] = x
+        insort(self.boundary_chunks, chunk)
+
+        return x
+
+    def _variance(self, n):
+        # Variance of the sum of n AR(1) steps' shocks: sigma_s * sum_{k < n} phi ** 2k.
+        if self.kappa == 0:
+            return self.sigma_s * n
+
+        return self.sigma_s * np.expm1(2 * n * self.log_phi) / expm1(2 * self.log_phi)
+
+
 class MeanRevertingOracle(Oracle):
     """The MeanRevertingOracle requires three parameters: a mean fundamental value,
     a mean reversion coefficient, and a shock variance.  It constructs and retains
@@ -28,22 +191,30 @@ class MeanRevertingOracle(Oracle):
     This oracle uses the nanoseconds portion of the current simulation time as
     discrete "time steps".  A suggestion: to keep wallclock runtime reasonable,
     have the agents operate for only ~1000 nanoseconds, but interpret nanoseconds
-    as seconds or minutes."""
+    as seconds or minutes.
+
+    The series are generated lazily in chunks of ``chunk_size`` nanoseconds (see
+    ``MeanRevertingSeries``), so the length of the trading day does not matter, only
+    the parts of it that are observed."""
 
     def __init__(
         self,
         mkt_open: NanosecondTime,
         mkt_close: NanosecondTime,
         symbols: Dict[str, Dict[str, Any]],
+        chunk_size: int = 65536,
+        max_cached_chunks: int = 16,
     ) -> None:
         # Symbols must be a dictionary of dictionaries with outer keys as symbol names and
         # inner keys: r_bar, kappa, sigma_s.
         self.mkt_open: NanosecondTime = mkt_open
         self.mkt_close: NanosecondTime = mkt_close
         self.symbols: Dict[str, Dict[str, Any]] = symbols
+        self.chunk_size: int = chunk_size
+        self.max_cached_chunks: int = max_cached_chunks
 
         # The dictionary r holds the fundamenal value series for each symbol.
-        self.r: Dict[str, pd.Series] = {}
+        self.r: Dict[str, MeanRevertingSeries] = {}
 
         then = dt.datetime.now()
 
@@ -61,7 +232,7 @@ class MeanRevertingOracle(Oracle):
 
     def generate_fundamental_value_series(
         self, symbol: str, r_bar: int, kappa: float, sigma_s: float
-    ) -> pd.Series:
+    ) -> MeanRevertingSeries:
         """Generates the fundamental value series for a single stock symbol.
 
         Arguments:
@@ -70,38 +241,21 @@ class MeanRevertingOracle(Oracle):
             kappa: The mean reversion coefficient.
             sigma_s: The shock variance.  (Note: NOT STANDARD DEVIATION)
 
-        Because the oracle uses the global np.random PRNG to create the
-        fundamental value series, it is important to create the oracle BEFORE
-        the agents.  In this way the addition of a new agent will not affect the
-        sequence created.  (Observations using the oracle will use an agent's
-        PRNG and thus not cause a problem.)
+        Because the oracle seeds the series from the global np.random PRNG, it is
+        important to create the oracle BEFORE the agents.  In this way the addition
+        of a new agent will not affect the sequence created.  (Observations using
+        the oracle will use an agent's PRNG and thus not cause a problem.)
         """
-
-        # Turn variance into std.
-        sigma_s = sqrt(sigma_s)
-
-        # Create the time series into which values will be projected and initialize the first value.
-        date_range = pd.date_range(
-            self.mkt_open, self.mkt_close, closed="left", freq="N"
+        return MeanRevertingSeries(
+            self.mkt_open,
+            r_bar,
+            kappa,
+            sigma_s,
+            np.random.randint(low=0, high=2**32, dtype="uint64"),
+            self.chunk_size,
+            self.max_cached_chunks,
         )
 
-        s = pd.Series(index=date_range)
-        r = np.zeros(len(s.index))
-        r[0] = r_bar
-
-        # Predetermine the random shocks for all time steps (at once, for computation speed).
-        shock = np.random.normal(scale=sigma_s, size=(r.shape[0]))
-
-        # Compute the mean reverting fundamental value series.
-        for t in range(1, r.shape[0]):
-            r[t] = max(0, (kappa * r_bar) + ((1 - kappa) * r[t - 1]) + shock[t])
-
-        # Replace the series values with the fundamental value series.  Round and convert to
-        # integer cents.
-        s[:] = np.round(r)
-
-        return s.astype(int)
-
     def get_daily_open_price(
         self, symbol: str, mkt_open: NanosecondTime, cents: bool = True
     ) -> int:
@@ -120,7 +274,7 @@ class MeanRevertingOracle(Oracle):
             "Oracle: client requested {symbol} at market open: {}", self.mkt_open
         )
 
-        open_price = self.r[symbol].loc[self.mkt_open]
+        open_price = self.r[symbol].value_at(self.mkt_open)
         logger.debug("Oracle: market open price was was {}", open_price)
 
         return open_price
@@ -149,9 +303,9 @@ class MeanRevertingOracle(Oracle):
 
         # If the request is made after market close, return the close price.
         if current_time >= self.mkt_close:
-            r_t = self.r[symbol].loc[self.mkt_close - 1]
+            r_t = self.r[symbol].value_at(self.mkt_close - 1)
         else:
-            r_t = self.r[symbol].loc[current_time]
+            r_t = self.r[symbol].value_at(current_time)
 
         # Generate a noisy observation of fundamental value at the current time.
         if sigma_n == 0:
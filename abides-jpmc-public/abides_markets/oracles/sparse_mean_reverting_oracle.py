@@ -1,7 +1,8 @@
 import datetime as dt
+from bisect import bisect_right
 import logging
-from math import exp, sqrt
-from typing import Any, Dict, List
+from math import exp, expm1, sqrt
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -35,6 +36,17 @@ class SparseMeanRevertingOracle(MeanRevertingOracle):
     across a large amount of time, with relatively sparse activity.  That is,
     agents each acting at realistic "retail" intervals, on the order of seconds
     or minutes, spread out across the day.
+
+    If ``precompute_grid`` (in nanoseconds) is given, the whole day is instead
+    generated when the oracle is created: the megashock arrival times and values,
+    and the OU process sampled on a grid with that spacing plus the megashock times,
+    all drawn with vectorized numpy operations. Observations between two grid points
+    are then sampled from the exact OU bridge between them (conditioned on the last
+    observation in the same interval), found with a binary search. In this mode
+    ``fund_vol`` is the variance rate of the OU process, so the distribution of the
+    path does not depend on the grid or on when agents observe it, the path is only
+    floored at zero when observed, and ``f_log`` holds the grid path as two int64
+    arrays instead of a dict per observation.
     """
 
     def __init__(
@@ -42,6 +54,7 @@ class SparseMeanRevertingOracle(MeanRevertingOracle):
         mkt_open: NanosecondTime,
         mkt_close: NanosecondTime,
         symbols: Dict[str, Dict[str, Any]],
+        precompute_grid: Optional[NanosecondTime] = None,
     ) -> None:
         # Symbols must be a dictionary of dictionaries with outer keys as symbol names and
         # inner keys: r_bar, kappa, sigma_s.
@@ -50,7 +63,25 @@ class SparseMeanRevertingOracle(MeanRevertingOracle):
 
         self.symbols: Dict[str, Dict[str, Any]] = symbols
 
-        self.f_log: Dict[str, List[Dict[str, Any]]] = {}
+        if precompute_grid is not None and precompute_grid <= 0:
+            raise ValueError(
+                "Config error: oracle precompute grid must be a positive number of ns.",
+                "precompute_grid:",
+                precompute_grid,
+            )
+
+        self.precompute_grid: Optional[NanosecondTime] = precompute_grid
+
+        # Precomputed mode only: per symbol the path times, the OU deviation from
+        # r_bar arriving at each time and the deviation after applying any megashock
+        # at that time, and the last observed (time, deviation). The path is kept in
+        # python lists as it is only read one element at a time.
+        self.path_times: Dict[str, List[NanosecondTime]] = {}
+        self.path_before: Dict[str, List[float]] = {}
+        self.path_after: Dict[str, List[float]] = {}
+        self.last_observed: Dict[str, Tuple[NanosecondTime, float]] = {}
+
+        self.f_log: Dict[str, Any] = {}
 
         # The dictionary r holds the most recent fundamental values for each symbol.
         self.r: Dict[str, pd.Series] = {}
@@ -61,13 +92,17 @@ class SparseMeanRevertingOracle(MeanRevertingOracle):
         # Without these, the OU process just makes a noisy return to the mean and then stays there
         # with relatively minor noise.  Here we want them to follow a Poisson process, so we sample
         # from an exponential distribution for the separation intervals.
-        self.megashocks: Dict[str, List[Dict[str, Any]]] = {}
+        self.megashocks: Dict[str, Any] = {}
 
         then = dt.datetime.now()
 
         # Note that each value in the self.r dictionary is a 2-tuple of the timestamp at
         # which the series was computed and the true fundamental value at that time.
         for symbol in symbols:
+            if precompute_grid is not None:
+                self.precompute_fundamental_value_series(symbol)
+                continue
+
             s = symbols[symbol]
             logger.debug(
                 "SparseMeanRevertingOracle computing initial fundamental value for {}".format(
@@ -100,6 +135,165 @@ class SparseMeanRevertingOracle(MeanRevertingOracle):
             "SparseMeanRevertingOracle initialization took {}".format(now - then)
         )
 
+    def precompute_fundamental_value_series(self, symbol: str) -> None:
+        """Generates the megashocks and the OU path on the grid for the whole day for
+        a single symbol, using the symbol's random state."""
+        s = self.symbols[symbol]
+        random_state = s["random_state"]
+        gamma = s["kappa"]
+
+        # Megashock arrival times follow a Poisson process: draw exponential gaps in
+        # blocks until they pass the market close.
+        span = self.mkt_close - self.mkt_open
+        block_size = int(2 * span * s["megashock_lambda_a"]) + 16
+        gaps = np.zeros(0, dtype=np.int64)
+        while gaps.sum() < span:
+            gaps = np.concatenate(
+                [
+                    gaps,
+                    random_state.exponential(
+                        scale=1.0 / s["megashock_lambda_a"], size=block_size
+                    ).astype(np.int64),
+                ]
+            )
+        shock_times = self.mkt_open + np.cumsum(gaps)
+        shock_times = shock_times[shock_times < self.mkt_close]
+
+        # Bimodal megashock values, as in the sparse mode.
+        shock_values = random_state.normal(
+            loc=s["megashock_mean"],
+            scale=sqrt(s["megashock_var"]),
+            size=len(shock_times),
+        )
+        shock_values[random_state.randint(2, size=len(shock_times)) == 1] *= -1
+
+        self.megashocks[symbol] = {
+            "MegashockTime": shock_times,
+            "MegashockValue": shock_values,
+        }
+
+        times = np.union1d(
+            np.append(
+                np.arange(self.mkt_open, self.mkt_close, self.precompute_grid),
+                self.mkt_close,
+            ),
+            shock_times,
+        ).astype(np.int64)
+
+        jumps = np.zeros(len(times))
+        np.add.at(jumps, np.searchsorted(times, shock_times), shock_values)
+
+        # Exact OU transitions between consecutive path times.
+        steps = gamma * np.diff(times).astype(float)
+        noise = random_state.normal(
+            scale=np.sqrt(s["fund_vol"] / (2 * gamma) * -np.expm1(-2 * steps))
+        )
+
+        after = self._ou_recursion(jumps[0], steps, noise + jumps[1:])
+
+        self.path_times[symbol] = times.tolist()
+        self.path_after[symbol] = after.tolist()
+        self.path_before[symbol] = (after - jumps).tolist()
+
+        self.last_observed[symbol] = (self.mkt_open, 0.0)
+        self.r[symbol] = (self.mkt_open, s["r_bar"])
+
+        self.f_log[symbol] = {
+            "FundamentalTime": times,
+            "FundamentalValue": np.rint(np.maximum(0, s["r_bar"] + after)).astype(
+                np.int64
+            ),
+        }
+
+    @staticmethod
+    def _ou_recursion(
+        x0: float, steps: np.ndarray, innovations: np.ndarray
+    ) -> np.ndarray:
+        """Solves x[0] = x0, x[k + 1] = exp(-steps[k]) * x[k] + innovations[k] without a
+        python loop over k, as x[k] = D[k] * sum_{i < k} innovations[i] / D[i + 1]
+        with D[k] = exp(-sum_{i < k} steps[i]). The sum is restarted in blocks over
+        which D decays by at most exp(-50) to stay within floating point range."""
+        decay = np.concatenate([[0.0], np.cumsum(steps)])
+        x = np.zeros(len(decay))
+        x[0] = x0
+
+        start = 0
+        while start < len(steps):
+            stop = max(
+                np.searchsorted(decay, decay[start] + 50, side="right"), start + 2
+            )
+            if stop == start + 2:
+                x[start + 1] = exp(-steps[start]) * x[start] + innovations[start]
+            else:
+                block = decay[start:stop] - decay[start]
+                x[start + 1 : stop] = np.exp(-block[1:]) * (
+                    x[start]
+                    + np.cumsum(innovations[start : stop - 1] * np.exp(block[1:]))
+                )
+            start = stop - 1
+
+        return x
+
+    def sample_ou_bridge(
+        self,
+        symbol: str,
+        t: NanosecondTime,
+        t0: NanosecondTime,
+        x0: float,
+        t1: NanosecondTime,
+        x1: float,
+    ) -> float:
+        """Samples the OU deviation from r_bar at time t given its values x0 at t0 and x1
+        at t1, with t0 < t < t1."""
+        s = self.symbols[symbol]
+        gamma = s["kappa"]
+
+        # 1 - exp(-2 * gamma * d) for the two sub-intervals and the whole interval.
+        v0 = -expm1(-2 * gamma * (t - t0))
+        v1 = -expm1(-2 * gamma * (t1 - t))
+        v = -expm1(-2 * gamma * (t1 - t0))
+
+        mean = (x0 * exp(-gamma * (t - t0)) * v1 + x1 * exp(-gamma * (t1 - t)) * v0) / v
+        variance = s["fund_vol"] / (2 * gamma) * v0 * v1 / v
+
+        return s["random_state"].normal(loc=mean, scale=sqrt(variance))
+
+    def advance_precomputed_fundamental(
+        self, current_time: NanosecondTime, symbol: str
+    ) -> int:
+        """Returns the fundamental value at the given time from the precomputed path,
+        sampling the OU bridge between the surrounding path points if needed."""
+        pt, px = self.last_observed[symbol]
+
+        if current_time <= pt:
+            return self.r[symbol][1]
+
+        times = self.path_times[symbol]
+        k = bisect_right(times, current_time) - 1
+
+        if times[k] == current_time:
+            x = self.path_after[symbol][k]
+        else:
+            # The last observation is only informative if it lies in the same interval.
+            if pt < times[k]:
+                pt, px = times[k], self.path_after[symbol][k]
+
+            x = self.sample_ou_bridge(
+                symbol,
+                current_time,
+                pt,
+                px,
+                times[k + 1],
+                self.path_before[symbol][k + 1],
+            )
+
+        v = int(round(max(0, self.symbols[symbol]["r_bar"] + x)))
+
+        self.last_observed[symbol] = (current_time, x)
+        self.r[symbol] = (current_time, v)
+
+        return v
+
     def compute_fundamental_at_timestamp(
         self, ts: NanosecondTime, v_adj, symbol: str, pt: NanosecondTime, pv
     ) -> int:
@@ -165,6 +359,8 @@ class SparseMeanRevertingOracle(MeanRevertingOracle):
         using the OU process.  It may proceed in several steps due to our periodic
         application of "megashocks" to push the stock price around, simulating
         exogenous forces."""
+        if self.precompute_grid is not None:
+            return self.advance_precomputed_fundamental(current_time, symbol)
 
         # Generation of the fundamental value series uses a separate random state object
         # per symbol, which is part of the dictionary we maintain for each symbol.
@@ -1,15 +1,20 @@
 import logging
+import os
 import sys
 import warnings
 from copy import deepcopy
-from typing import Any, Dict, List, Optional, Set, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
 from abides_core import Agent, NanosecondTime
+from abides_core.agent_log import register_event_schema
 from abides_core.utils import str_to_ns, ns_date
 
+from .book_snapshots import BookSnapshotRecorder
+from .event_log import RecordLog
 from .messages.orderbook import (
     OrderAcceptedMsg,
     OrderExecutedMsg,
@@ -18,13 +23,62 @@ from .messages.orderbook import (
     OrderModifiedMsg,
     OrderReplacedMsg,
 )
-from .orders import LimitOrder, MarketOrder, Order, Side
+from .orders import Fill, LimitOrder, MarketOrder, Order, Side
+from .price_ladder import PRICE_LADDERS, PriceLadder
 from .price_level import PriceLevel
+from .transaction_tape import TransactionTape
 
 
 logger = logging.getLogger(__name__)
 
 
+# Suffixes of the files of the streamed event logs (book snapshots, history, buy and
+# sell transactions) of an order book.
+EVENT_LOG_SUFFIXES = [
+    "_book_snapshots.bin",
+    "_history.pkl",
+    "_buy_transactions.bin",
+    "_sell_transactions.bin",
+]
+
+# The events logged by the exchange for every order are stored in typed columns of
+# its log rather than as strings and dicts (see abides_core.agent_log).
+register_event_schema(
+    "BEST_BID", ("symbol", "price", "quantity"), ("code", "int", "int"), "{},{},{}"
+)
+register_event_schema(
+    "BEST_ASK", ("symbol", "price", "quantity"), ("code", "int", "int"), "{},{},{}"
+)
+register_event_schema(
+    "LAST_TRADE", ("quantity", "price"), ("int", "int"), "{},${:0.4f}"
+)
+register_event_schema(
+    "EXECUTION_SPREAD",
+    (
+        "order_id",
+        "time",
+        "realized_spread",
+        "effective_spread",
+        "price_impact",
+        "quoted_spread",
+        "exchange_id",
+    ),
+    ("int", "int", "float", "float", "float", "float", "int"),
+)
+
+
+@lru_cache(maxsize=None)
+def lookback_to_ns(lookback_period: Union[str, int]) -> NanosecondTime:
+    """Converts a lookback period (e.g. "10min", or a number of nanoseconds) into
+    nanoseconds. Cached, as the same few periods are parsed by pandas on every query.
+
+    Arguments:
+        lookback_period: The lookback period.
+    """
+
+    return int(str_to_ns(lookback_period))
+
+
 class OrderBook:
     """Basic class for an order book for one symbol, in the style of the major US Stock Exchanges.
 
@@ -35,42 +89,134 @@ class OrderBook:
     Attributes:
         owner: The agent this order book belongs to.
         symbol: The symbol of the stock or security that is traded on this order book.
-        bids: List of bid price levels (index zero is best bid), stored as a PriceLevel object.
-        asks: List of ask price levels (index zero is best ask), stored as a PriceLevel object.
+        bids: Ladder of bid price levels (index zero is best bid), stored as PriceLevel objects.
+        asks: Ladder of ask price levels (index zero is best ask), stored as PriceLevel objects.
+        order_index: Price level of every resting order, keyed by (order ID, limit price).
+            The two halves of a price to comply order share an ID but rest at different
+            prices, hence the compound key.
         last_trade: The price that the last trade was made at.
         book_log: Log of the full order book depth (price and volume) each time it changes.
-        book_log2: TODO
+        book_log2: Fixed-depth L2 snapshots of the book, recorded each time it changes
+            while the owner has book logging enabled.
         quotes_seen: TODO
         history: A truncated history of previous trades.
         last_update_ts: The last timestamp the order book was updated.
-        buy_transactions: An ordered list of all previous buy transaction timestamps and quantities.
-        sell_transactions: An ordered list of all previous sell transaction timestamps and quantities.
+        version: Counter incremented every time the resting orders change, used to
+            reuse the L1/L2/L3 snapshots of the book between changes.
+        level_changes: The price levels changed since the last incremental update,
+            by (side, price), or None if the incremental feed is not tracked.
+        delta_sequence_number: Sequence number of the last incremental update.
+        buy_transactions: Tape of all previous buy transactions, answering the volume and
+            VWAP of any time window with a binary search (see `TransactionTape`).
+        sell_transactions: Tape of all previous sell transactions.
     """
 
-    def __init__(self, owner: Agent, symbol: str) -> None:
+    def __init__(
+        self,
+        owner: Agent,
+        symbol: str,
+        price_ladder: str = "list",
+        copy_free_matching: bool = False,
+        book_log_depth: int = 10,
+        event_log_path: Optional[str] = None,
+        event_log_chunk_size: int = 65536,
+    ) -> None:
         """Creates a new OrderBook class instance for a single symbol.
 
         Arguments:
             owner: The agent this order book belongs to, usually an `ExchangeAgent`.
             symbol: The symbol of the stock or security that is traded on this order book.
+            price_ladder: Structure used for each side of the book, either 'list'
+                (linear scan over a list of price levels) or 'sorted' (price-indexed
+                dict plus bisected sorted key array).
+            copy_free_matching: If True the order book takes ownership of the orders
+                handed to it instead of working on copies, and executions are reported
+                with immutable `Fill` records rather than cloned orders.
+            book_log_depth: Number of levels per side recorded in each book snapshot.
+            event_log_path: If given, the history, transactions and book snapshots are
+                streamed to append-only files whose names start with this path, and
+                only the last `event_log_chunk_size` entries of each are kept in memory.
+            event_log_chunk_size: Number of entries per chunk written to disk.
         """
+        if price_ladder not in PRICE_LADDERS:
+            raise ValueError(
+                f"Config error: unknown price ladder requested ({price_ladder})"
+            )
+
         self.owner: Agent = owner
         self.symbol: str = symbol
-        self.bids: List[PriceLevel] = []
-        self.asks: List[PriceLevel] = []
+        self.bids: PriceLadder = PRICE_LADDERS[price_ladder](Side.BID)
+        self.asks: PriceLadder = PRICE_LADDERS[price_ladder](Side.ASK)
+        self.order_index: Dict[Tuple[int, int], PriceLevel] = {}
+        self.copy_free_matching: bool = copy_free_matching
         self.last_trade: Optional[int] = None
 
-        # Create an empty list of dictionaries to log the full order book depth (price and volume) each time it changes.
-        self.book_log2: List[Dict[str, Any]] = []
         self.quotes_seen: Set[int] = set()
 
-        # Create an order history for the exchange to report to certain agent types.
-        self.history: List[Dict[str, Any]] = []
-
         self.last_update_ts: Optional[NanosecondTime] = self.owner.mkt_open
 
-        self.buy_transactions: List[Tuple[NanosecondTime, int]] = []
-        self.sell_transactions: List[Tuple[NanosecondTime, int]] = []
+        self.version: int = 0
+        # Snapshots of the current version of the book, by (level, depth).
+        self.snapshots: Dict[Tuple[str, int], Any] = {}
+        self.snapshots_version: int = 0
+
+        self.level_changes: Optional[Dict[Tuple[Side, int], None]] = None
+        self.delta_sequence_number: int = 0
+
+        self.book_log_depth: int = book_log_depth
+        self.event_log_chunk_size: int = event_log_chunk_size
+        self.event_log_files: List[str] = []
+        self.set_event_log_path(event_log_path)
+
+    def set_event_log_path(self, event_log_path: Optional[str]) -> None:
+        """
+        Replaces the event logs (history, transactions and book snapshots) with new,
+        empty, logs streamed to files whose names start with `event_log_path`, or held
+        in memory if it is None. The files of the replaced logs are deleted.
+
+        Arguments:
+            event_log_path: Prefix of the files the logs are streamed to, or None.
+        """
+        for path in self.event_log_files:
+            os.remove(path)
+
+        if event_log_path is None:
+            # Log the order book depth (price and volume) each time it changes.
+            self.book_log2: BookSnapshotRecorder = BookSnapshotRecorder(
+                self.book_log_depth
+            )
+
+            # Create an order history for the exchange to report to certain agent types.
+            self.history: List[Dict[str, Any]] = []
+
+            self.buy_transactions: TransactionTape = TransactionTape()
+            self.sell_transactions: TransactionTape = TransactionTape()
+
+            self.streamed_logs: List[Any] = []
+            self.event_log_files = []
+        else:
+            self.event_log_files = [
+                event_log_path + suffix for suffix in EVENT_LOG_SUFFIXES
+            ]
+            book_log_path, history_path, buy_path, sell_path = self.event_log_files
+
+            self.book_log2 = BookSnapshotRecorder(
+                self.book_log_depth, self.event_log_chunk_size, book_log_path
+            )
+            self.history = RecordLog(history_path, self.event_log_chunk_size)
+            self.buy_transactions = TransactionTape(
+                buy_path, self.event_log_chunk_size
+            )
+            self.sell_transactions = TransactionTape(
+                sell_path, self.event_log_chunk_size
+            )
+
+            self.streamed_logs = [
+                self.book_log2,
+                self.history,
+                self.buy_transactions,
+                self.sell_transactions,
+            ]
 
     def handle_limit_order(self, order: LimitOrder, quiet: bool = False) -> None:
         """Matches a limit order or adds it to the order book.
@@ -119,6 +265,8 @@ class OrderBook:
 
             else:
                 # No matching order was found, so the new order enters the order book.  Notify the agent.
+                # The book always rests its own copy (even with copy-free matching) so that the
+                # accepted order sent back does not change as the resting order gets executed.
                 self.enter_order(deepcopy(order), quiet=quiet)
 
                 logger.debug("ACCEPTED: new order {}", order)
@@ -135,19 +283,13 @@ class OrderBook:
 
         # Now that we are done executing or accepting this order, log the new best bid and ask.
         if self.bids:
-            self.owner.logEvent(
-                "BEST_BID",
-                "{},{},{}".format(
-                    self.symbol, self.bids[0].price, self.bids[0].total_quantity
-                ),
+            self.owner.log_event_values(
+                "BEST_BID", self.symbol, self.bids[0].price, self.bids[0].total_quantity
             )
 
         if self.asks:
-            self.owner.logEvent(
-                "BEST_ASK",
-                "{},{},{}".format(
-                    self.symbol, self.asks[0].price, self.asks[0].total_quantity
-                ),
+            self.owner.log_event_values(
+                "BEST_ASK", self.symbol, self.asks[0].price, self.asks[0].total_quantity
             )
 
         # Also log the last trade (total share quantity, average share price).
@@ -161,7 +303,7 @@ class OrderBook:
 
             avg_price = int(round(trade_price / trade_qty))
             logger.debug(f"Avg: {trade_qty} @ ${avg_price:0.4f}")
-            self.owner.logEvent("LAST_TRADE", f"{trade_qty},${avg_price:0.4f}")
+            self.owner.log_event_values("LAST_TRADE", trade_qty, avg_price)
 
             self.last_trade = avg_price
 
@@ -185,16 +327,18 @@ class OrderBook:
             )
             return
 
-        order = deepcopy(order)
+        if not self.copy_free_matching:
+            order = deepcopy(order)
 
         while order.quantity > 0:
             if self.execute_order(order) is None:
                 break
 
-    def execute_order(self, order: Order) -> Optional[Order]:
+    def execute_order(self, order: Order) -> Optional[Union[Order, Fill]]:
         """Finds a single best match for this order, without regard for quantity.
 
-        Returns the matched order or None if no match found.  DOES remove,
+        Returns the matched order (a `Fill` record when copy-free matching is
+        enabled) or None if no match found.  DOES remove,
         or decrement quantity from, the matched order from the order book
         (i.e. executes at least a partial trade, if possible).
 
@@ -227,11 +371,15 @@ class OrderBook:
             # somewhere within them.  We can/will only match against the oldest order
             # among those with the best price.  (i.e. best price, then FIFO)
 
+            self.version += 1
+            self._record_level_change(book.side, book[0].price)
+
             # The matched order might be only partially filled. (i.e. new order is smaller)
             is_ptc_exec = False
             if order.quantity >= book[0].peek()[0].quantity:
                 # Consume entire matched order.
                 matched_order, matched_order_metadata = book[0].pop()
+                del self.order_index[(matched_order.order_id, book[0].price)]
 
                 # If the order is a part of a price to comply pair, also remove the other
                 # half of the order from the book.
@@ -243,6 +391,8 @@ class OrderBook:
                         )
 
                     assert book[1].remove_order(matched_order.order_id) is not None
+                    self._record_level_change(book.side, book[1].price)
+                    del self.order_index[(matched_order.order_id, book[1].price)]
 
                     if book[1].is_empty:
                         del book[1]
@@ -250,14 +400,32 @@ class OrderBook:
                 # If the matched price now has no orders, remove it completely.
                 if book[0].is_empty:
                     del book[0]
+
+                if self.copy_free_matching:
+                    matched_order = Fill.from_order(
+                        matched_order,
+                        matched_order.quantity,
+                        matched_order.limit_price,
+                        self.owner.current_time,
+                    )
             else:
                 # Consume only part of matched order.
                 book_order, book_order_metadata = book[0].peek()
 
-                matched_order = deepcopy(book_order)
-                matched_order.quantity = order.quantity
+                if self.copy_free_matching:
+                    matched_order = Fill.from_order(
+                        book_order,
+                        order.quantity,
+                        book_order.limit_price,
+                        self.owner.current_time,
+                    )
+                else:
+                    matched_order = deepcopy(book_order)
+                    matched_order.quantity = order.quantity
 
-                book_order.quantity -= matched_order.quantity
+                book[0].update_order_quantity(
+                    book_order.order_id, book_order.quantity - matched_order.quantity
+                )
 
                 # If the order is a part of a price to comply pair, also adjust the
                 # quantity of the other half of the pair.
@@ -268,21 +436,32 @@ class OrderBook:
                             "Should not be executing on the visible half of a price to comply order!"
                         )
 
-                    book_order_metadata[
-                        "ptc_other_half"
-                    ].quantity -= matched_order.quantity
+                    other_half = book_order_metadata["ptc_other_half"]
+                    other_level = self.order_index[
+                        (other_half.order_id, other_half.limit_price)
+                    ]
+                    other_level.update_order_quantity(
+                        other_half.order_id,
+                        other_half.quantity - matched_order.quantity,
+                    )
+                    self._record_level_change(book.side, other_half.limit_price)
 
             # When two limit orders are matched, they execute at the price that
             # was being "advertised" in the order book.
-            matched_order.fill_price = matched_order.limit_price
+            if not self.copy_free_matching:
+                matched_order.fill_price = matched_order.limit_price
 
             if order.side.is_bid():
                 self.buy_transactions.append(
-                    (self.owner.current_time, matched_order.quantity)
+                    self.owner.current_time,
+                    matched_order.quantity,
+                    matched_order.fill_price,
                 )
             else:
                 self.sell_transactions.append(
-                    (self.owner.current_time, matched_order.quantity)
+                    self.owner.current_time,
+                    matched_order.quantity,
+                    matched_order.fill_price,
                 )
 
             self.history.append(
@@ -297,7 +476,7 @@ class OrderBook:
                     if order.side.is_bid()
                     else "BUY",  # by def exec if from point of view of passive order being exec
                     quantity=matched_order.quantity,
-                    price=matched_order.limit_price if is_ptc_exec else None,
+                    price=matched_order.fill_price if is_ptc_exec else None,
                 )
             )
 
@@ -347,9 +526,17 @@ class OrderBook:
                 "exchange_id": 0 if self.owner.name == "EXCHANGE_AGENT" else 1}
                 self.owner.logEvent("EXECUTION_SPREAD", exec_spreads)
                         
-            filled_order = deepcopy(order)
-            filled_order.quantity = matched_order.quantity
-            filled_order.fill_price = matched_order.fill_price
+            if self.copy_free_matching:
+                filled_order = Fill.from_order(
+                    order,
+                    matched_order.quantity,
+                    matched_order.fill_price,
+                    self.owner.current_time,
+                )
+            else:
+                filled_order = deepcopy(order)
+                filled_order.quantity = matched_order.quantity
+                filled_order.fill_price = matched_order.fill_price
 
             order.quantity -= filled_order.quantity
 
@@ -420,23 +607,11 @@ class OrderBook:
 
         book = self.bids if order.side.is_bid() else self.asks
 
-        if len(book) == 0:
-            # There were no orders on this side of the book.
-            book.append(PriceLevel([(order, metadata or {})]))
-        elif book[-1].order_has_worse_price(order):
-            # There were orders on this side, but this order is worse than all of them.
-            # (New lowest bid or highest ask.)
-            book.append(PriceLevel([(order, metadata or {})]))
-        else:
-            # There are orders on this side.  Insert this order in the correct position in the list.
-            # Note that o is a LIST of all orders (oldest at index 0) at this same price.
-            for i, price_level in enumerate(book):
-                if price_level.order_has_better_price(order):
-                    book.insert(i, PriceLevel([(order, metadata or {})]))
-                    break
-                elif price_level.order_has_equal_price(order):
-                    book[i].add_order(order, metadata or {})
-                    break
+        self.order_index[(order.order_id, order.limit_price)] = book.add_order(
+            order, metadata or {}
+        )
+        self.version += 1
+        self._record_level_change(order.side, order.limit_price)
 
         if quiet == False:
             self.history.append(
@@ -482,25 +657,23 @@ class OrderBook:
 
         book = self.bids if order.side.is_bid() else self.asks
 
-        # If there are no orders on this side of the book, there is nothing to do.
-        if not book:
-            return False
-
-        # There are orders on this side.  Find the price level of the order to cancel,
-        # then find the exact order and cancel it.
-        for i, price_level in enumerate(book):
-            if not price_level.order_has_equal_price(order):
-                continue
+        # Find the price level of the order to cancel, then find the exact order and
+        # cancel it.
+        price_level = self.order_index.get((order.order_id, order.limit_price))
 
+        if price_level is not None and price_level.side == order.side:
             # cancelled_order, metadata = (lambda x: x if x!=None else (None,None))(price_level.remove_order(order.order_id))
             cancelled_order_result = price_level.remove_order(order.order_id)
 
             if cancelled_order_result is not None:
                 cancelled_order, metadata = cancelled_order_result
+                del self.order_index[(order.order_id, order.limit_price)]
+                self.version += 1
+                self._record_level_change(price_level.side, price_level.price)
 
                 # If the cancelled price now has no orders, remove it completely.
                 if price_level.is_empty:
-                    del book[i]
+                    book.remove_level(price_level.price)
 
                 logger.debug("CANCELLED: order {}", order)
                 logger.debug(
@@ -552,13 +725,12 @@ class OrderBook:
         if order.order_id != new_order.order_id:
             return
 
-        book = self.bids if order.side.is_bid() else self.asks
-
-        for price_level in book:
-            if not price_level.order_has_equal_price(order):
-                continue
+        price_level = self.order_index.get((order.order_id, order.limit_price))
 
+        if price_level is not None and price_level.side == order.side:
             if price_level.update_order_quantity(order.order_id, new_order.quantity):
+                self.version += 1
+                self._record_level_change(price_level.side, price_level.price)
                 self.history.append(
                     dict(
                         time=self.owner.current_time,
@@ -599,16 +771,15 @@ class OrderBook:
 
         if order.order_id == 19653081:
             print("inside OB partialCancel")
-        book = self.bids if order.side.is_bid() else self.asks
-
         new_order = deepcopy(order)
         new_order.quantity -= quantity
 
-        for price_level in book:
-            if not price_level.order_has_equal_price(order):
-                continue
+        price_level = self.order_index.get((order.order_id, order.limit_price))
 
+        if price_level is not None and price_level.side == order.side:
             if price_level.update_order_quantity(order.order_id, new_order.quantity):
+                self.version += 1
+                self._record_level_change(price_level.side, price_level.price)
                 self.history.append(
                     dict(
                         time=self.owner.current_time,
@@ -682,13 +853,7 @@ class OrderBook:
             self.append_book_log2()
 
     def append_book_log2(self):
-        row = {
-            "QuoteTime": self.owner.current_time,
-            "bids": np.array(self.get_l2_bid_data(depth=self.owner.book_log_depth)),
-            "asks": np.array(self.get_l2_ask_data(depth=self.owner.book_log_depth)),
-        }
-        # if (row["bids"][0][0]>=row["asks"][0][0]): print("WARNING: THIS IS A REAL PROBLEM: an order book contains bids and asks at the same quote price!")
-        self.book_log2.append(row)
+        self.book_log2.record(self.owner.current_time, self.bids, self.asks)
 
     def get_l1_bid_data(self) -> Optional[Tuple[int, int]]:
         """Returns the current best bid price and of the book and the volume at this price."""
@@ -800,7 +965,133 @@ class OrderBook:
             for price_level in self.asks[:depth]
         ]
 
-    def get_transacted_volume(self, lookback_period: str = "10min") -> Tuple[int, int]:
+    def get_l1_snapshot(
+        self,
+    ) -> Tuple[Optional[Tuple[int, int]], Optional[Tuple[int, int]]]:
+        """Returns the L1 data of both sides of the book, see `get_l1_bid_data`.
+
+        The snapshot is computed once per version of the book and shared by all the
+        callers until the book changes.
+        """
+
+        return self._get_snapshot(
+            "L1", 1, lambda: (self.get_l1_bid_data(), self.get_l1_ask_data())
+        )
+
+    def get_l2_snapshot(
+        self, depth: int = sys.maxsize
+    ) -> Tuple[Tuple[Tuple[int, int], ...], Tuple[Tuple[int, int], ...]]:
+        """Returns the L2 data of both sides of the book as immutable tuples, see
+        `get_l2_bid_data`.
+
+        The snapshot is computed once per version of the book and depth, and shared by
+        all the callers until the book changes.
+
+        Arguments:
+            depth: If given, will only return data for the first N levels of each side.
+        """
+
+        return self._get_snapshot(
+            "L2",
+            depth,
+            lambda: (
+                tuple(self.get_l2_bid_data(depth)),
+                tuple(self.get_l2_ask_data(depth)),
+            ),
+        )
+
+    def get_l3_snapshot(
+        self, depth: int = sys.maxsize
+    ) -> Tuple[
+        Tuple[Tuple[int, Tuple[int, ...]], ...], Tuple[Tuple[int, Tuple[int, ...]], ...]
+    ]:
+        """Returns the L3 data of both sides of the book as immutable tuples, see
+        `get_l3_bid_data`.
+
+        The snapshot is computed once per version of the book and depth, and shared by
+        all the callers until the book changes.
+
+        Arguments:
+            depth: If given, will only return data for the first N levels of each side.
+        """
+
+        return self._get_snapshot(
+            "L3",
+            depth,
+            lambda: (
+                tuple(
+                    (price, tuple(quantities))
+                    for price, quantities in self.get_l3_bid_data(depth)
+                ),
+                tuple(
+                    (price, tuple(quantities))
+                    for price, quantities in self.get_l3_ask_data(depth)
+                ),
+            ),
+        )
+
+    def _get_snapshot(self, level: str, depth: int, build: Callable[[], Any]) -> Any:
+        if self.snapshots_version != self.version:
+            self.snapshots.clear()
+            self.snapshots_version = self.version
+
+        # Depths beyond the number of levels of the book share the same snapshot.
+        depth = min(depth, max(len(self.bids), len(self.asks)))
+
+        key = (level, depth)
+        if key not in self.snapshots:
+            self.snapshots[key] = build()
+
+        return self.snapshots[key]
+
+    def track_level_changes(self) -> None:
+        """Starts recording the price levels changed by each order, for the incremental
+        L2 feed (see `take_level_changes`)."""
+
+        if self.level_changes is None:
+            self.level_changes = {}
+
+    def take_level_changes(
+        self,
+    ) -> Tuple[int, Tuple[Tuple[int, int], ...], Tuple[Tuple[int, int], ...]]:
+        """Returns the next incremental L2 update of the book: the new quantity of each
+        price level changed since the previous update (0 for removed levels), bids then
+        asks, and increments the sequence number of the updates.
+
+        Returns:
+            A tuple of the sequence number of the update, the changed bid levels and
+            the changed ask levels as (price, quantity) tuples.
+        """
+
+        bids = []
+        asks = []
+
+        for side, price in self.level_changes or ():
+            if side.is_bid():
+                price_level = self.bids.get_level(price)
+                levels = bids
+            else:
+                price_level = self.asks.get_level(price)
+                levels = asks
+
+            levels.append(
+                (price, price_level.total_quantity if price_level is not None else 0)
+            )
+
+        if self.level_changes:
+            self.level_changes.clear()
+
+        self.delta_sequence_number += 1
+
+        return self.delta_sequence_number, tuple(bids), tuple(asks)
+
+    def _record_level_change(self, side: Side, price: int) -> None:
+        if self.level_changes is not None:
+            self.level_changes[(side, price)] = None
+
+    def get_transacted_volume(
+        self, lookback_period: Union[str, int] = "10min"
+    ) -> Tuple[int, int]:
         """Method retrieves the total transacted volume for a symbol over a lookback
         period finishing at the current simulation time.
 
@@ -809,24 +1100,48 @@ class OrderBook:
                 transacted volume for.
         """
 
-        window_start = self.owner.current_time - str_to_ns(lookback_period)
+        window_start = self.owner.current_time - lookback_to_ns(lookback_period)
 
-        buy_transacted_volume = 0
-        sell_transacted_volume = 0
+        return (
+            self.buy_transactions.volume(window_start),
+            self.sell_transactions.volume(window_start),
+        )
 
-        for time, volume in reversed(self.buy_transactions):
-            if time < window_start:
-                break
+    def get_vwap(self, lookback_period: Union[str, int] = "10min") -> Optional[float]:
+        """Returns the volume weighted average price of the transactions of both sides
+        over a lookback period finishing at the current simulation time, or None if
+        there were none.
 
-            buy_transacted_volume += volume
+        Arguments:
+            lookback_period: The period in time from the current time to calculate the
+                VWAP for.
+        """
 
-        for time, volume in reversed(self.sell_transactions):
-            if time < window_start:
-                break
+        window_start = self.owner.current_time - lookback_to_ns(lookback_period)
+
+        buy_volume, buy_notional = self.buy_transactions.window(window_start)
+        sell_volume, sell_notional = self.sell_transactions.window(window_start)
+        volume = buy_volume + sell_volume
+
+        return (buy_notional + sell_notional) / volume if volume > 0 else None
 
-            sell_transacted_volume += volume
+    def check_quantities(self) -> None:
+        """Debug check that the quantities maintained by every price level and by both
+        sides of the book match the resting orders. Raises an AssertionError if they do
+        not."""
 
-        return (buy_transacted_volume, sell_transacted_volume)
+        for book in (self.bids, self.asks):
+            for price_level in book:
+                price_level.check_quantities()
+
+            quantities = book.quantities
+            visible = sum(price_level.visible_quantity for price_level in book)
+            hidden = sum(price_level.hidden_quantity for price_level in book)
+            if (visible, hidden) != (quantities.visible, quantities.hidden):
+                raise AssertionError(
+                    f"{book.side} side holds {visible} visible and {hidden} hidden "
+                    f"shares, not {quantities.visible} and {quantities.hidden}"
+                )
 
     def get_imbalance(self) -> Tuple[float, Optional[Side]]:
         """Returns a measure of book side total volume imbalance.
@@ -842,8 +1157,8 @@ class OrderBook:
             - Ask has no volume                             --> (1.0, Side.BID)
             - Bid has no volume                             --> (1.0, Side.ASK)
         """
-        bid_vol = sum(price_level.total_quantity for price_level in self.bids)
-        ask_vol = sum(price_level.total_quantity for price_level in self.asks)
+        bid_vol = self.bids.quantities.visible
+        ask_vol = self.asks.quantities.visible
 
         if bid_vol == ask_vol:
             return (0, None)
@@ -860,77 +1175,59 @@ class OrderBook:
         else:
             return (1 - ask_vol / bid_vol, Side.BID)
 
-    def get_L1_snapshots(self):
-        best_bids = []
-        best_asks = []
-
-        def safe_first(x):
-            return x[0] if len(x) > 0 else np.array([None, None])
-
-        for d in self.book_log2:
-            best_bids.append([d["QuoteTime"]] + safe_first(d["bids"]).tolist())
-            best_asks.append([d["QuoteTime"]] + safe_first(d["asks"]).tolist())
-        best_bids = np.array(best_bids)
-        best_asks = np.array(best_asks)
-        return {"best_bids": best_bids, "best_asks": best_asks}
-
-    ## take a bids matrix [[pi,qi]] and adds next lower prices and 0 qty levels to make it nlevels format
-    def bids_padding(self, book, nlevels):
-        n = book.shape[0]
-        if n == 0:
-            return np.zeros((nlevels, 2), dtype=int)
-        if n >= nlevels:
-            return book[:nlevels, :]
-        else:
-            lowestprice = book[-1, 0] if len(book.shape) == 2 else book[0]
-            npad = nlevels - n
-            pad = np.transpose(
-                np.array(
-                    [
-                        -1 + np.arange(lowestprice, lowestprice - npad, -1, dtype=int),
-                        np.zeros(npad, dtype=int),
-                    ]
-                )
-            )
-            if len(pad.shape) == 1:
-                pad = pad.reshape(1, 2)
-            return np.concatenate([book, pad])
-
-    ## take a asks matrix [[pi,qi]] and adds next higher prices and 0 qty levels to make it nlevels format
-    def asks_padding(self, book, nlevels):
-        n = book.shape[0]
-        if n == 0:
-            return np.zeros((nlevels, 2), dtype=int)
-        if n >= nlevels:
-            return book[:nlevels, :]
-        else:
-            highestprice = book[-1, 0] if len(book.shape) == 2 else book[0]
-            npad = nlevels - n
-            pad = np.transpose(
-                np.array(
-                    [
-                        1 + np.arange(highestprice, highestprice + npad, 1, dtype=int),
-                        np.zeros(npad, dtype=int),
-                    ]
-                )
-            )
-            if len(pad.shape) == 1:
-                pad = pad.reshape(1, 2)
-            return np.concatenate([book, pad])
-
-    def get_L2_snapshots(self, nlevels):
-        times, bids, asks = [], [], []
-        for x in self.book_log2:
-            times.append(x["QuoteTime"])
-            bids.append(self.bids_padding(x["bids"], nlevels))
-            asks.append(self.asks_padding(x["asks"], nlevels))
-        bids = np.array(bids)
-        asks = np.array(asks)
-        times = np.array(times)
-        return {"times": times, "bids": bids, "asks": asks}
+    def get_L1_snapshots(self) -> Dict[str, np.ndarray]:
+        """Returns the best bid and ask of every book snapshot.
+
+        The arrays are views of the snapshot buffer, with [time, price, quantity] rows.
+        A side of the book that was empty is recorded with price and quantity 0.
+        """
+        return {
+            "best_bids": self.book_log2.best_bids,
+            "best_asks": self.book_log2.best_asks,
+        }
+
+    def get_L2_snapshots(self, nlevels: int) -> Dict[str, np.ndarray]:
+        """Returns the first `nlevels` levels of each side of every book snapshot.
+
+        Bids and asks have shape (snapshots, nlevels, 2) with [price, quantity] pairs.
+        Missing levels have quantity 0 and prices one tick further away from the last
+        level, and an empty side is all zeros. The arrays are views of the snapshot
+        buffer unless more levels are requested than were recorded, in which case they
+        are padded copies.
+
+        Arguments:
+            nlevels: Number of levels to return for each side.
+        """
+        return {
+            "times": self.book_log2.times,
+            "bids": self._pad_levels(self.book_log2.bids, nlevels, -1),
+            "asks": self._pad_levels(self.book_log2.asks, nlevels, 1),
+        }
+
+    @staticmethod
+    def _pad_levels(levels: np.ndarray, nlevels: int, step: int) -> np.ndarray:
+        depth = levels.shape[1]
+        if nlevels <= depth:
+            return levels[:, :nlevels]
+
+        # Continue the price ladder one tick at a time from the last recorded level,
+        # except for empty sides which stay all zeros.
+        offsets = step * np.arange(1, nlevels - depth + 1)
+        pad = np.zeros((len(levels), nlevels - depth, 2), dtype=levels.dtype)
+        pad[:, :, 0] = levels[:, -1:, 0] + offsets
+        pad[levels[:, 0, 1] == 0] = 0
+
+        return np.concatenate([levels, pad], axis=1)
+
+    def flush_event_logs(self) -> None:
+        """Writes the in-memory tail of the event logs to disk, when streaming them."""
+        for log in self.streamed_logs:
+            log.flush()
 
     def get_l3_itch(self):
-        history_l3 = pd.DataFrame(self.history)
+        # A streamed history is read back from its file here.
+        history_l3 = pd.DataFrame(list(self.history))
+
         history_l3.loc[history_l3.tag == "auctionFill", "type"] = "EXEC"
         history_l3.loc[history_l3.tag == "auctionFill", "quantity"] = history_l3.loc[
             history_l3.tag == "auctionFill", "metadata"
@@ -1,6 +1,7 @@
 import sys
 from abc import ABC, abstractmethod
 from copy import deepcopy
+from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, Optional
 
@@ -223,3 +224,96 @@ class MarketOrder(Order):
         order.fill_price = self.fill_price
 
         return order
+
+
+@dataclass(frozen=True)
+class Fill:
+    """
+    Immutable record of a single execution against one order.
+
+    Sent instead of a cloned order in `OrderExecutedMsg` when an exchange uses
+    copy-free matching. It exposes the order fields agents read when handling an
+    execution (ID, owner, symbol, side, executed quantity, fill price and fee), so it
+    can be handled like an executed order. ``to_dict`` also returns the limit price
+    and placement time, so that executions are logged with the same keys as with
+    cloned orders.
+
+    Attributes:
+        order_id: The ID of the order that was (partially) executed.
+        agent_id: The ID of the agent that placed the order.
+        time_executed: Time at which the execution took place.
+        symbol: Equity symbol of the order.
+        side: The side of the executed order.
+        quantity: The quantity executed.
+        fill_price: The price the quantity was executed at.
+        tag: The tag of the executed order.
+        limit_price: The limit price of the executed order, None for a market order.
+        time_placed: Time at which the executed order was placed.
+        order_fee: The fee of the executed order.
+    """
+
+    order_id: int
+    agent_id: int
+    time_executed: NanosecondTime
+    symbol: str
+    side: Side
+    quantity: int
+    fill_price: int
+    tag: Optional[Any] = None
+    limit_price: Optional[int] = None
+    time_placed: Optional[NanosecondTime] = None
+    order_fee: Optional[Any] = None
+
+    @classmethod
+    def from_order(
+        cls,
+        order: Order,
+        quantity: int,
+        fill_price: int,
+        time_executed: NanosecondTime,
+    ) -> "Fill":
+        """
+        Arguments:
+            order: The order that was executed.
+            quantity: The quantity executed.
+            fill_price: The price the quantity was executed at.
+            time_executed: Time at which the execution took place.
+        """
+        return cls(
+            order.order_id,
+            order.agent_id,
+            time_executed,
+            order.symbol,
+            order.side,
+            quantity,
+            fill_price,
+            order.tag,
+            getattr(order, "limit_price", None),
+            order.time_placed,
+            order.order_fee,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "order_id": self.order_id,
+            "agent_id": self.agent_id,
+            "time_executed": fmt_ts(self.time_executed),
+            "symbol": self.symbol,
+            "side": self.side,
+            "quantity": self.quantity,
+            "fill_price": self.fill_price,
+            "tag": self.tag,
+            "limit_price": self.limit_price,
+            "time_placed": fmt_ts(self.time_placed),
+            "order_fee": self.order_fee,
+        }
+
+    def __str__(self) -> str:
+        return "(Agent {} @ {}) : FILL {} {} {} @ {}".format(
+            self.agent_id,
+            fmt_ts(self.time_executed),
+            self.side.value,
+            self.quantity,
+            self.symbol,
+            dollarize(self.fill_price),
+        )
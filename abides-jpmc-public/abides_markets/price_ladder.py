@@ -0,0 +1,206 @@
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Union
+
+from .orders import LimitOrder, Side
+from .price_level import PriceLevel, SideQuantities
+
+
+class PriceLadder(list):
+    """
+    The default structure holding one side of an ``OrderBook``: a plain list of
+    ``PriceLevel`` objects where index zero is the best price (highest bid or lowest
+    ask).
+
+    Price levels are located by linearly scanning the list, so every lookup is
+    O(levels) and inserting or removing a level shifts the list.
+
+    The ladder keeps the total visible and hidden quantities of its price levels in
+    ``quantities``, updated by the levels it creates.
+
+    Arguments:
+        side: The side of the market this ladder represents.
+    """
+
+    def __init__(self, side: Side) -> None:
+        super().__init__()
+        self.side: Side = side
+        self.quantities: SideQuantities = SideQuantities()
+
+    def get_level(self, price: int) -> Optional[PriceLevel]:
+        """
+        Returns the price level at the given price, or None if no orders rest there.
+
+        Arguments:
+            price: The price to look up.
+        """
+        for price_level in self:
+            if price_level.price == price:
+                return price_level
+
+        return None
+
+    def add_order(self, order: LimitOrder, metadata: Dict) -> PriceLevel:
+        """
+        Adds a limit order to the ladder, either in an existing price level or in a
+        newly created one at the correct position.
+
+        Arguments:
+            order: The limit order to add.
+            metadata: Dict of metadata values to associate with the order.
+
+        Returns:
+            The price level the order was added to.
+        """
+        if len(self) == 0:
+            # There were no orders on this side of the book.
+            price_level = PriceLevel([(order, metadata)], self.quantities)
+            self.append(price_level)
+        elif self[-1].order_has_worse_price(order):
+            # There were orders on this side, but this order is worse than all of them.
+            # (New lowest bid or highest ask.)
+            price_level = PriceLevel([(order, metadata)], self.quantities)
+            self.append(price_level)
+        else:
+            # There are orders on this side.  Insert this order in the correct position in the list.
+            # Note that o is a LIST of all orders (oldest at index 0) at this same price.
+            for i, price_level in enumerate(self):
+                if price_level.order_has_better_price(order):
+                    price_level = PriceLevel(
+                        [(order, metadata)], self.quantities
+                    )
+                    self.insert(i, price_level)
+                    break
+                elif price_level.order_has_equal_price(order):
+                    price_level.add_order(order, metadata)
+                    break
+
+        return price_level
+
+    def remove_level(self, price: int) -> None:
+        """
+        Removes the price level at the given price from the ladder.
+
+        Arguments:
+            price: The price of the level to remove.
+        """
+        for i, price_level in enumerate(self):
+            if price_level.price == price:
+                del self[i]
+                return
+
+
+class SortedPriceLadder:
+    """
+    Alternative structure holding one side of an ``OrderBook``: a dict of
+    ``PriceLevel`` objects indexed by price plus a sorted array of price keys.
+
+    Finding the level for a price is an O(1) dict lookup and creating or removing a
+    level needs a single ``bisect`` (O(log n)) on the key array. Only the key array
+    has to be shifted on insertion/removal, which is a memmove of integers rather than
+    a Python-level loop over price levels.
+
+    The class behaves like the list used by ``PriceLadder`` (indexing, slicing,
+    iteration, ``len``, ``del`` and equality to lists of ``PriceLevel``), index zero
+    always being the best price, so it can be used as a drop-in replacement. It keeps
+    the total quantities of its levels in ``quantities`` in the same way.
+
+    Arguments:
+        side: The side of the market this ladder represents.
+    """
+
+    def __init__(self, side: Side) -> None:
+        self.side: Side = side
+        self.quantities: SideQuantities = SideQuantities()
+
+        # Keys are sorted ascending with the best price first: bids are stored under
+        # their negated price, asks under their price.
+        self.keys: List[int] = []
+        self.levels: Dict[int, PriceLevel] = {}
+
+    def _key(self, price: int) -> int:
+        return -price if self.side.is_bid() else price
+
+    def get_level(self, price: int) -> Optional[PriceLevel]:
+        """
+        Returns the price level at the given price, or None if no orders rest there.
+
+        Arguments:
+            price: The price to look up.
+        """
+        return self.levels.get(self._key(price))
+
+    def add_order(self, order: LimitOrder, metadata: Dict) -> PriceLevel:
+        """
+        Adds a limit order to the ladder, either in an existing price level or in a
+        newly created one at the correct position.
+
+        Arguments:
+            order: The limit order to add.
+            metadata: Dict of metadata values to associate with the order.
+
+        Returns:
+            The price level the order was added to.
+        """
+        if order.side != self.side:
+            raise ValueError("Attempted to add order on wrong side of book")
+
+        key = self._key(order.limit_price)
+        price_level = self.levels.get(key)
+
+        if price_level is not None:
+            price_level.add_order(order, metadata)
+        else:
+            price_level = PriceLevel([(order, metadata)], self.quantities)
+            self.levels[key] = price_level
+            self.keys.insert(bisect_left(self.keys, key), key)
+
+        return price_level
+
+    def remove_level(self, price: int) -> None:
+        """
+        Removes the price level at the given price from the ladder.
+
+        Arguments:
+            price: The price of the level to remove.
+        """
+        key = self._key(price)
+
+        if self.levels.pop(key, None) is not None:
+            del self.keys[bisect_left(self.keys, key)]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __bool__(self) -> bool:
+        return len(self.keys) > 0
+
+    def __iter__(self) -> Iterator[PriceLevel]:
+        levels = self.levels
+        return (levels[key] for key in self.keys)
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[PriceLevel, List[PriceLevel]]:
+        if isinstance(index, slice):
+            levels = self.levels
+            return [levels[key] for key in self.keys[index]]
+
+        return self.levels[self.keys[index]]
+
+    def __delitem__(self, index: int) -> None:
+        del self.levels[self.keys.pop(index)]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, SortedPriceLadder)):
+            return list(self) == list(other)
+
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+PRICE_LADDERS = {
+    "list": PriceLadder,
+    "sorted": SortedPriceLadder,
+}
@@ -1,8 +1,180 @@
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from .orders import LimitOrder, Side
 
 
+class OrderNode:
+    """
+    A single entry of an `OrderQueue`, linking an (order, metadata) pair to its
+    neighbours in the queue.
+    """
+
+    __slots__ = ("entry", "prev", "next")
+
+    def __init__(self, entry: Optional[Tuple[LimitOrder, Dict]] = None) -> None:
+        self.entry: Optional[Tuple[LimitOrder, Dict]] = entry
+        self.prev: "OrderNode" = self
+        self.next: "OrderNode" = self
+
+
+class OrderQueue:
+    """
+    A FIFO queue of (order, metadata) pairs backed by an intrusive doubly-linked list
+    and an index of the list nodes by order ID.
+
+    Appending, popping the front and removing or re-queueing an order by its ID are all
+    O(1) regardless of the depth of the queue. The queue can otherwise be used like
+    the list it replaces: it supports ``len``, iteration, indexing (O(1) for the first
+    and last entries) and equality with lists of (order, metadata) pairs.
+
+    Arguments:
+        entries: Optional (order, metadata) pairs to initialise the queue with.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[LimitOrder, Dict]] = ()) -> None:
+        # Sentinel node: head.next is the front of the queue, head.prev the back.
+        self.head: OrderNode = OrderNode()
+        self.nodes: Dict[int, OrderNode] = {}
+
+        for entry in entries:
+            self.append(entry)
+
+    def append(self, entry: Tuple[LimitOrder, Dict]) -> None:
+        """
+        Adds an entry to the back of the queue.
+
+        Arguments:
+            entry: The (order, metadata) pair to add.
+        """
+        self._link(OrderNode(entry), self.head)
+
+    def insert_by_id(self, entry: Tuple[LimitOrder, Dict]) -> None:
+        """
+        Adds an entry in front of the first queued order with a greater order ID.
+
+        Arguments:
+            entry: The (order, metadata) pair to add.
+        """
+        order_id = entry[0].order_id
+
+        node = self.head.next
+        while node is not self.head and node.entry[0].order_id <= order_id:
+            node = node.next
+
+        self._link(OrderNode(entry), node)
+
+    def popleft(self) -> Tuple[LimitOrder, Dict]:
+        """
+        Removes and returns the entry at the front of the queue.
+        """
+        node = self.head.next
+        if node is self.head:
+            raise IndexError("pop from an empty OrderQueue")
+
+        self._unlink(node)
+        return node.entry
+
+    def get(self, order_id: int) -> Optional[Tuple[LimitOrder, Dict]]:
+        """
+        Returns the entry for the given order ID, or None if it is not queued.
+
+        Arguments:
+            order_id: The ID of the order to look up.
+        """
+        node = self.nodes.get(order_id)
+        return None if node is None else node.entry
+
+    def remove(self, order_id: int) -> Optional[Tuple[LimitOrder, Dict]]:
+        """
+        Removes and returns the entry for the given order ID, or None if it is not
+        queued.
+
+        Arguments:
+            order_id: The ID of the order to remove.
+        """
+        node = self.nodes.get(order_id)
+        if node is None:
+            return None
+
+        self._unlink(node)
+        return node.entry
+
+    def move_to_back(self, order_id: int) -> None:
+        """
+        Moves the entry for the given order ID to the back of the queue.
+
+        Arguments:
+            order_id: The ID of the order to move.
+        """
+        node = self.nodes[order_id]
+        self._unlink(node)
+        self._link(node, self.head)
+
+    def _link(self, node: OrderNode, before: OrderNode) -> None:
+        node.prev = before.prev
+        node.next = before
+        before.prev.next = node
+        before.prev = node
+        self.nodes[node.entry[0].order_id] = node
+
+    def _unlink(self, node: OrderNode) -> None:
+        node.prev.next = node.next
+        node.next.prev = node.prev
+        del self.nodes[node.entry[0].order_id]
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __bool__(self) -> bool:
+        return self.head.next is not self.head
+
+    def __iter__(self) -> Iterator[Tuple[LimitOrder, Dict]]:
+        node = self.head.next
+        while node is not self.head:
+            # Read the next node first so the current entry can be removed while iterating.
+            next_node = node.next
+            yield node.entry
+            node = next_node
+
+    def __getitem__(self, index: int) -> Tuple[LimitOrder, Dict]:
+        if index == 0 and self:
+            return self.head.next.entry
+        if index == -1 and self:
+            return self.head.prev.entry
+
+        return list(self)[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, OrderQueue)):
+            return list(self) == list(other)
+
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    # The linked list is pickled/copied as a flat list of entries, avoiding deep
+    # recursion through the node links for long queues.
+    def __getstate__(self) -> List[Tuple[LimitOrder, Dict]]:
+        return list(self)
+
+    def __setstate__(self, state: List[Tuple[LimitOrder, Dict]]) -> None:
+        self.__init__(state)
+
+
+class SideQuantities:
+    """
+    Running totals of the visible and hidden quantities of all the price levels of one
+    side of an order book, kept up to date by the price levels themselves.
+    """
+
+    __slots__ = ("visible", "hidden")
+
+    def __init__(self) -> None:
+        self.visible: int = 0
+        self.hidden: int = 0
+
+
 class PriceLevel:
     """
     A class that represents a single price level containing multiple orders for one
@@ -13,35 +185,78 @@ class PriceLevel:
     Visible orders are consumed first, followed by any hidden orders.
 
     Attributes:
-        visible_orders: A list of visible orders, where the order with index=0 is first
+        visible_orders: A queue of visible orders, where the order at index=0 is first
             in the queue and will be exexcuted first.
-        hidden_orders: A list of hidden orders, where the order with index=0 is first
+        hidden_orders: A queue of hidden orders, where the order at index=0 is first
             in the queue and will be exexcuted first.
         price: The price this PriceLevel represents.
         side: The side of the market this PriceLevel represents.
+        visible_quantity: The total quantity of the visible orders.
+        hidden_quantity: The total quantity of the hidden orders.
+        side_quantities: Optional totals of the side of the book, updated along with
+            the quantities of this price level.
+
+    The quantities are maintained as orders are added, removed and updated, so the
+    quantities of resting orders must only be changed through this class.
     """
 
-    def __init__(self, orders: List[Tuple[LimitOrder, Dict]]) -> None:
+    def __init__(
+        self,
+        orders: List[Tuple[LimitOrder, Dict]],
+        side_quantities: Optional[SideQuantities] = None,
+    ) -> None:
         """
         Arguments:
             orders: A list of orders, containing both visible and hidden orders that
                 will be correctly allocated on initialisation. At least one order must
                 be given.
+            side_quantities: Optional totals of the side of the book this price level
+                belongs to.
         """
         if len(orders) == 0:
             raise ValueError(
                 "At least one LimitOrder must be given when initialising a PriceLevel."
             )
 
-        self.visible_orders: List[Tuple[LimitOrder, Dict]] = []
-        self.hidden_orders: List[Tuple[LimitOrder, Dict]] = []
+        self._visible_orders: OrderQueue = OrderQueue()
+        self._hidden_orders: OrderQueue = OrderQueue()
 
         self.price: int = orders[0][0].limit_price
         self.side: Side = orders[0][0].side
 
+        self.visible_quantity: int = 0
+        self.hidden_quantity: int = 0
+        self.side_quantities: Optional[SideQuantities] = side_quantities
+
         for order, metadata in orders:
             self.add_order(order, metadata)
 
+    @property
+    def visible_orders(self) -> OrderQueue:
+        return self._visible_orders
+
+    @visible_orders.setter
+    def visible_orders(self, orders: Iterable[Tuple[LimitOrder, Dict]]) -> None:
+        self._visible_orders = OrderQueue(orders)
+        self._adjust_quantity(
+            False,
+            sum(order.quantity for order, _ in self._visible_orders)
+            - self.visible_quantity,
+        )
+
+    @property
+    def hidden_orders(self) -> OrderQueue:
+        return self._hidden_orders
+
+    @hidden_orders.setter
+    def hidden_orders(self, orders: Iterable[Tuple[LimitOrder, Dict]]) -> None:
+        self._hidden_orders = OrderQueue(orders)
+        self._adjust_quantity(
+            True,
+            sum(order.quantity for order, _ in self._hidden_orders)
+            - self.hidden_quantity,
+        )
+
     def add_order(self, order: LimitOrder, metadata: Optional[Dict] = None) -> None:
         """
         Adds an order to the correct queue in the price level.
@@ -56,15 +271,12 @@ class PriceLevel:
         if order.is_hidden:
             self.hidden_orders.append((order, metadata or {}))
         elif order.insert_by_id:
-            insert_index = 0
-            for (order2, _) in self.visible_orders:
-                if order2.order_id > order.order_id:
-                    break
-                insert_index += 1
-            self.visible_orders.insert(insert_index, (order, metadata or {}))
+            self.visible_orders.insert_by_id((order, metadata or {}))
         else:
             self.visible_orders.append((order, metadata or {}))
 
+        self._adjust_quantity(order.is_hidden, order.quantity)
+
     def update_order_quantity(self, order_id: int, new_quantity: int) -> bool:
         """
         Updates the quantity of an order.
@@ -89,25 +301,18 @@ class PriceLevel:
         if new_quantity == 0:
             return False
 
-        for i, (order, metadata) in enumerate(self.visible_orders):
-            if order.order_id == order_id:
-                if new_quantity <= order.quantity:
-                    order.quantity = new_quantity
-                else:
-                    self.visible_orders.pop(i)
-                    order.quantity = new_quantity
-                    self.visible_orders.append((order, metadata))
-
-                return True
+        for queue, hidden in (
+            (self.visible_orders, False),
+            (self.hidden_orders, True),
+        ):
+            entry = queue.get(order_id)
 
-        for i, (order, metadata) in enumerate(self.hidden_orders):
-            if order.order_id == order_id:
-                if new_quantity <= order.quantity:
-                    order.quantity = new_quantity
-                else:
-                    self.hidden_orders.pop(i)
-                    order.quantity = new_quantity
-                    self.hidden_orders.append((order, metadata))
+            if entry is not None:
+                order = entry[0]
+                if new_quantity > order.quantity:
+                    queue.move_to_back(order_id)
+                self._adjust_quantity(hidden, new_quantity - order.quantity)
+                order.quantity = new_quantity
 
                 return True
 
@@ -123,15 +328,16 @@ class PriceLevel:
         Returns:
             The order object if the order was found and removed, else None.
         """
-        for i, (book_order, _) in enumerate(self.visible_orders):
-            if book_order.order_id == order_id:
-                return self.visible_orders.pop(i)
+        entry = self.visible_orders.remove(order_id)
+        if entry is not None:
+            self._adjust_quantity(False, -entry[0].quantity)
+            return entry
 
-        for i, (book_order, _) in enumerate(self.hidden_orders):
-            if book_order.order_id == order_id:
-                return self.hidden_orders.pop(i)
+        entry = self.hidden_orders.remove(order_id)
+        if entry is not None:
+            self._adjust_quantity(True, -entry[0].quantity)
 
-        return None
+        return entry
 
     def peek(self) -> Tuple[LimitOrder, Dict]:
         """
@@ -140,9 +346,9 @@ class PriceLevel:
 
         Raises a ValueError exception if the price level has no orders.
         """
-        if len(self.visible_orders) > 0:
+        if self.visible_orders:
             return self.visible_orders[0]
-        elif len(self.hidden_orders) > 0:
+        elif self.hidden_orders:
             return self.hidden_orders[0]
         else:
             raise ValueError(
@@ -156,15 +362,44 @@ class PriceLevel:
 
         Raises a ValueError exception if the price level has no orders.
         """
-        if len(self.visible_orders) > 0:
-            return self.visible_orders.pop(0)
-        elif len(self.hidden_orders) > 0:
-            return self.hidden_orders.pop(0)
+        if self.visible_orders:
+            entry = self.visible_orders.popleft()
+            self._adjust_quantity(False, -entry[0].quantity)
+        elif self.hidden_orders:
+            entry = self.hidden_orders.popleft()
+            self._adjust_quantity(True, -entry[0].quantity)
         else:
             raise ValueError(
                 "Can't pop LimitOrder from PriceLevel as it contains no orders"
             )
 
+        return entry
+
+    def _adjust_quantity(self, hidden: bool, quantity: int) -> None:
+        if hidden:
+            self.hidden_quantity += quantity
+            if self.side_quantities is not None:
+                self.side_quantities.hidden += quantity
+        else:
+            self.visible_quantity += quantity
+            if self.side_quantities is not None:
+                self.side_quantities.visible += quantity
+
+    def check_quantities(self) -> None:
+        """
+        Debug check that the maintained quantities match the queued orders. Raises an
+        AssertionError if they do not.
+        """
+        for queue, quantity in (
+            (self.visible_orders, self.visible_quantity),
+            (self.hidden_orders, self.hidden_quantity),
+        ):
+            actual = sum(order.quantity for order, _ in queue)
+            if actual != quantity:
+                raise AssertionError(
+                    f"Price level {self.price} holds {actual} shares, not {quantity}"
+                )
+
     def order_is_match(self, order: LimitOrder) -> bool:
         """
         Checks if an order on the opposite side of the book is a match with this price
@@ -262,14 +497,14 @@ class PriceLevel:
         """
         Returns the total visible order quantity of this price level.
         """
-        return sum(order.quantity for order, _ in self.visible_orders)
+        return self.visible_quantity
 
     @property
     def is_empty(self) -> bool:
         """
         Returns True if this price level has no orders.
         """
-        return len(self.visible_orders) == 0 and len(self.hidden_orders) == 0
+        return not self.visible_orders and not self.hidden_orders
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, PriceLevel):
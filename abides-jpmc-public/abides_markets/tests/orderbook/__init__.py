@@ -1,8 +1,11 @@
+from copy import deepcopy
 from typing import List, Tuple
 
+import numpy as np
+
 from abides_core import Message
 from abides_markets.order_book import OrderBook
-from abides_markets.orders import LimitOrder, Side
+from abides_markets.orders import LimitOrder, MarketOrder, Side
 
 
 SYMBOL = "X"
@@ -12,6 +15,7 @@ TIME = 0
 class FakeExchangeAgent:
     def __init__(self):
         self.messages = []
+        self.name = "EXCHANGE_AGENT"
         self.current_time = TIME
         self.mkt_open = TIME
         self.book_logging = None
@@ -26,12 +30,18 @@ class FakeExchangeAgent:
     def logEvent(self, *args, **kwargs):
         pass
 
+    def log_event_values(self, *args, **kwargs):
+        pass
+
 
 def setup_book_with_orders(
-    bids: List[Tuple[int, List[int]]] = [], asks: List[Tuple[int, List[int]]] = []
+    bids: List[Tuple[int, List[int]]] = [],
+    asks: List[Tuple[int, List[int]]] = [],
+    price_ladder: str = "list",
+    **book_kwargs,
 ) -> Tuple[OrderBook, FakeExchangeAgent, List[LimitOrder]]:
     agent = FakeExchangeAgent()
-    book = OrderBook(agent, SYMBOL)
+    book = OrderBook(agent, SYMBOL, price_ladder, **book_kwargs)
     orders = []
 
     for price, quantities in bids:
@@ -49,3 +59,109 @@ def setup_book_with_orders(
     agent.reset()
 
     return book, agent, orders
+
+
+def run_random_order_flow(
+    price_ladder: str = "list",
+    copy_free_matching: bool = False,
+    seed: int = 1,
+    n_steps: int = 3000,
+    book_logging: bool = False,
+    **book_kwargs,
+):
+    random_state = np.random.RandomState(seed=seed)
+
+    agent = FakeExchangeAgent()
+    agent.book_logging = book_logging
+    book = OrderBook(agent, SYMBOL, price_ladder, copy_free_matching, **book_kwargs)
+
+    resting = []
+    states = []
+
+    for step in range(n_steps):
+        agent.current_time = TIME + step
+        action = random_state.rand()
+        side = Side.BID if random_state.rand() < 0.5 else Side.ASK
+
+        if action < 0.55 or not resting:
+            offset = int(random_state.randint(-5, 30))
+            price = 1000 - offset if side.is_bid() else 1000 + offset
+            order = LimitOrder(
+                1,
+                agent.current_time,
+                SYMBOL,
+                int(random_state.randint(1, 50)),
+                side,
+                price,
+                is_hidden=bool(random_state.rand() < 0.1),
+                order_id=step,
+            )
+            book.handle_limit_order(deepcopy(order))
+            resting.append(order)
+        elif action < 0.65:
+            book.handle_market_order(
+                MarketOrder(
+                    1,
+                    agent.current_time,
+                    SYMBOL,
+                    int(random_state.randint(1, 80)),
+                    side,
+                    order_id=step,
+                )
+            )
+        else:
+            order = resting[int(random_state.randint(len(resting)))]
+            if action < 0.85:
+                book.cancel_order(order)
+            elif action < 0.95:
+                new_order = deepcopy(order)
+                new_order.quantity = int(random_state.randint(1, 50))
+                book.modify_order(order, new_order)
+            else:
+                book.partial_cancel_order(order, 1)
+
+        book.check_quantities()
+
+        states.append(
+            (
+                book.get_l1_bid_data(),
+                book.get_l1_ask_data(),
+                book.get_l2_bid_data(),
+                book.get_l2_ask_data(),
+                book.get_l3_bid_data(),
+                book.get_l3_ask_data(),
+            )
+        )
+
+    messages = []
+    for recipient_id, message in agent.messages:
+        order = getattr(message, "order", None) or message.new_order
+        messages.append(
+            (
+                recipient_id,
+                type(message).__name__,
+                order.order_id,
+                order.side,
+                order.quantity,
+                order.fill_price,
+            )
+        )
+
+    # Every resting order, and only those, must be present in the order index.
+    resting_keys = {
+        (order.order_id, price_level.price): price_level
+        for price_level in list(book.bids) + list(book.asks)
+        for order, _ in list(price_level.visible_orders)
+        + list(price_level.hidden_orders)
+    }
+    assert book.order_index == resting_keys
+
+    return (
+        states,
+        messages,
+        list(book.history),
+        [(int(time), int(quantity)) for time, quantity in book.buy_transactions],
+        [(int(time), int(quantity)) for time, quantity in book.sell_transactions],
+        book.get_transacted_volume("1us"),
+        book.book_log2.data.tolist(),
+    )
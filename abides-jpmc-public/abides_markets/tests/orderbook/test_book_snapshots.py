@@ -0,0 +1,134 @@
+import numpy as np
+import pytest
+
+from abides_markets.agents import ExchangeAgent
+from abides_markets.book_snapshots import BookSnapshotRecorder
+from abides_markets.order_book import OrderBook
+from abides_markets.orders import LimitOrder, MarketOrder, Side
+
+from . import FakeExchangeAgent, SYMBOL, TIME
+
+
+def pad(levels, nlevels, step):
+    # Reference padding, as previously done by OrderBook.bids_padding/asks_padding.
+    if len(levels) == 0:
+        return [[0, 0]] * nlevels
+
+    levels = [list(level) for level in levels[:nlevels]]
+    price = levels[-1][0]
+    while len(levels) < nlevels:
+        price += step
+        levels.append([price, 0])
+
+    return levels
+
+
+def run_with_book_logging(depth, n_steps=500):
+    random_state = np.random.RandomState(seed=3)
+
+    agent = FakeExchangeAgent()
+    agent.book_logging = True
+    book = OrderBook(agent, SYMBOL, book_log_depth=depth)
+    book.book_log2 = BookSnapshotRecorder(depth, chunk_size=4)
+
+    expected = []
+    record = book.append_book_log2
+
+    def append_book_log2():
+        expected.append(
+            (
+                agent.current_time,
+                book.get_l2_bid_data(depth=depth),
+                book.get_l2_ask_data(depth=depth),
+            )
+        )
+        record()
+
+    book.append_book_log2 = append_book_log2
+
+    resting = []
+    for step in range(n_steps):
+        agent.current_time = TIME + step
+        side = Side.BID if random_state.rand() < 0.5 else Side.ASK
+        action = random_state.rand()
+
+        if action < 0.6 or not resting:
+            offset = int(random_state.randint(-2, 15))
+            order = LimitOrder(
+                1,
+                agent.current_time,
+                SYMBOL,
+                int(random_state.randint(1, 20)),
+                side,
+                1000 - offset if side.is_bid() else 1000 + offset,
+                is_hidden=bool(random_state.rand() < 0.1),
+            )
+            book.handle_limit_order(order)
+            resting.append(order)
+        elif action < 0.7:
+            book.handle_market_order(
+                MarketOrder(
+                    1,
+                    agent.current_time,
+                    SYMBOL,
+                    int(random_state.randint(1, 40)),
+                    side,
+                )
+            )
+        else:
+            book.cancel_order(resting.pop(int(random_state.randint(len(resting)))))
+
+    return book, expected
+
+
+@pytest.mark.parametrize("depth", [1, 3, 10])
+def test_snapshots_same_as_padded_l2_data(depth):
+    book, expected = run_with_book_logging(depth)
+
+    assert len(book.book_log2) == len(expected) > 4
+
+    for nlevels in [1, depth, depth + 4]:
+        snapshots = book.get_L2_snapshots(nlevels=nlevels)
+
+        assert snapshots["times"].tolist() == [time for time, _, _ in expected]
+        assert snapshots["bids"].tolist() == [
+            pad(bids, nlevels, -1) for _, bids, _ in expected
+        ]
+        assert snapshots["asks"].tolist() == [
+            pad(asks, nlevels, 1) for _, _, asks in expected
+        ]
+
+    l1 = book.get_L1_snapshots()
+
+    assert l1["best_bids"].tolist() == [
+        [time] + pad(bids, 1, -1)[0] for time, bids, _ in expected
+    ]
+    assert l1["best_asks"].tolist() == [
+        [time] + pad(asks, 1, 1)[0] for time, _, asks in expected
+    ]
+
+
+def test_snapshots_are_views():
+    book, _ = run_with_book_logging(depth=5)
+
+    l1 = book.get_L1_snapshots()
+    l2 = book.get_L2_snapshots(nlevels=5)
+
+    for array in [l1["best_bids"], l1["best_asks"], l2["times"], l2["bids"]]:
+        assert np.shares_memory(array, book.book_log2.data)
+
+    assert np.shares_memory(l2["asks"], book.book_log2.data)
+
+
+def test_bad_depth():
+    with pytest.raises(ValueError):
+        BookSnapshotRecorder(depth=0)
+
+
+def test_null_liquidity_time():
+    times = np.array([0, 5, 7, 10, 20, 21, 30, 42])
+    is_null = np.array([True, True, False, True, True, False, False, True])
+
+    # Empty from 0 to 7 and from 10 to 21, the period opened at 42 is never closed.
+    assert ExchangeAgent.get_null_liquidity_time(times, is_null) == 7 + 11
+    assert ExchangeAgent.get_null_liquidity_time(times, ~is_null) == 3 + 21
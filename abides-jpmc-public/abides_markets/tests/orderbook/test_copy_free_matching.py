@@ -0,0 +1,53 @@
+from copy import deepcopy
+
+from abides_markets.messages.orderbook import OrderExecutedMsg
+from abides_markets.order_book import OrderBook
+from abides_markets.orders import Fill, LimitOrder, MarketOrder, Side
+
+from . import FakeExchangeAgent, SYMBOL, TIME, run_random_order_flow
+
+
+def test_copy_free_fills():
+    agent = FakeExchangeAgent()
+    book = OrderBook(agent, SYMBOL, copy_free_matching=True)
+
+    ask = LimitOrder(1, TIME, SYMBOL, 30, Side.ASK, 100)
+    book.handle_limit_order(deepcopy(ask))
+    agent.reset()
+
+    bid = MarketOrder(2, TIME, SYMBOL, 10, Side.BID)
+    book.handle_market_order(bid)
+
+    # The book takes ownership of the market order instead of working on a copy.
+    assert bid.quantity == 0
+
+    assert len(agent.messages) == 2
+    assert all(isinstance(message, OrderExecutedMsg) for _, message in agent.messages)
+
+    matched, filled = [message.order for _, message in agent.messages]
+
+    assert matched == Fill(
+        ask.order_id, 1, TIME, SYMBOL, Side.ASK, 10, 100, None, 100, TIME, None
+    )
+    assert filled == Fill(
+        bid.order_id, 2, TIME, SYMBOL, Side.BID, 10, 100, None, None, TIME, None
+    )
+
+    # Fills are logged with the keys of executed orders.
+    executed = deepcopy(ask)
+    executed.fill_price = 100
+    assert set(executed.to_dict()) - set(matched.to_dict()) == {
+        "is_hidden",
+        "is_price_to_comply",
+        "insert_by_id",
+        "is_post_only",
+    }
+    assert book.get_l3_ask_data() == [(100, [20])]
+
+
+def test_copy_free_same_results():
+    reference = run_random_order_flow(copy_free_matching=False)
+
+    assert len(reference[1]) > 0
+    assert run_random_order_flow(copy_free_matching=True) == reference
+    assert run_random_order_flow("sorted", copy_free_matching=True) == reference
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from abides_markets.event_log import ArrayLog, RecordLog
+from abides_markets.orders import LimitOrder, MarketOrder, Order, Side
+
+from . import SYMBOL, TIME, run_random_order_flow, setup_book_with_orders
+
+
+def test_array_log_streaming(tmp_path):
+    path = str(tmp_path / "rows.bin")
+    log = ArrayLog(2, path, chunk_size=3)
+
+    for i in range(10):
+        log.append((i, 10 * i))
+        assert log.n_buffered <= 3
+
+    expected = [[i, 10 * i] for i in range(10)]
+
+    assert len(log) == 10
+    assert [row.tolist() for row in log] == expected
+    assert [row.tolist() for row in reversed(log)] == expected[::-1]
+
+    rows = log.rows
+    assert isinstance(rows, np.memmap)
+    assert rows.tolist() == expected
+    assert log.n_buffered == 0
+
+    log.append((10, 100))
+    assert log.rows.tolist() == expected + [[10, 100]]
+
+
+def test_array_log_in_memory():
+    log = ArrayLog(2, chunk_size=2)
+
+    for i in range(5):
+        log.append((i, i))
+
+    assert log.rows.tolist() == [[i, i] for i in range(5)]
+
+    with pytest.raises(ValueError):
+        ArrayLog(2, chunk_size=0)
+
+
+def test_record_log_streaming(tmp_path):
+    log = RecordLog(str(tmp_path / "records.pkl"), chunk_size=4)
+
+    records = [dict(order_id=i, tag=None if i % 2 else "x") for i in range(10)]
+    for record in records:
+        log.append(record)
+        assert len(log.tail) < 4
+
+    assert len(log) == 10
+    assert list(log) == records
+    assert [len(chunk) for chunk in log.iter_chunks()] == [4, 4, 2]
+    assert log[1:6] == records[1:6]
+    assert log[2] == records[2]
+    assert log[-1] == records[-1]
+
+    with pytest.raises(IndexError):
+        log[10]
+
+
+def test_streamed_book_same_results(tmp_path):
+    reference = run_random_order_flow(book_logging=True, n_steps=1000)
+    streamed = run_random_order_flow(
+        book_logging=True,
+        n_steps=1000,
+        event_log_path=str(tmp_path / "X"),
+        event_log_chunk_size=50,
+    )
+
+    assert len(reference[2]) > 100
+    assert streamed == reference
+
+
+def test_streamed_l3_itch(tmp_path):
+    results = []
+
+    for book_kwargs in [
+        {},
+        dict(event_log_path=str(tmp_path / "X"), event_log_chunk_size=2),
+    ]:
+        Order._order_id_counter = 0
+
+        book, _, _ = setup_book_with_orders(
+            bids=[(100, [10, 20])], asks=[(110, [5])], **book_kwargs
+        )
+        book.handle_limit_order(LimitOrder(2, TIME, SYMBOL, 7, Side.ASK, 100))
+        book.handle_market_order(MarketOrder(2, TIME, SYMBOL, 3, Side.BID))
+        book.handle_limit_order(LimitOrder(2, TIME, SYMBOL, 4, Side.BID, 90))
+        book.cancel_order(book.bids[0].visible_orders[-1][0])
+        book.flush_event_logs()
+
+        results.append(book.get_l3_itch())
+
+    assert book.history.n_flushed == 7
+    pd.testing.assert_frame_equal(results[1], results[0])
+
+
+def test_event_logs_kept_in_memory(tmp_path):
+    book, _, _ = setup_book_with_orders(
+        bids=[(100, [10])], event_log_path=str(tmp_path / "X"), event_log_chunk_size=1
+    )
+    assert len(book.streamed_logs) == 4
+    assert len(list(tmp_path.iterdir())) == 4
+
+    # The files of the streamed logs are deleted.
+    book.set_event_log_path(None)
+    assert not list(tmp_path.iterdir())
+    book.handle_limit_order(LimitOrder(2, TIME, SYMBOL, 7, Side.ASK, 100))
+
+    assert not book.streamed_logs
+    assert isinstance(book.history, list) and len(book.history) == 1
+    assert book.buy_transactions.log.path is None
+    assert book.book_log2.log.path is None
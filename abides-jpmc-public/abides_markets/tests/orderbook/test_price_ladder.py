@@ -0,0 +1,83 @@
+import pytest
+
+from abides_markets.order_book import OrderBook
+from abides_markets.orders import LimitOrder, Side
+from abides_markets.price_ladder import PriceLadder, SortedPriceLadder
+from abides_markets.price_level import PriceLevel
+
+from . import (
+    FakeExchangeAgent,
+    SYMBOL,
+    TIME,
+    run_random_order_flow,
+    setup_book_with_orders,
+)
+
+
+def test_sorted_ladder_ordering():
+    bids = SortedPriceLadder(Side.BID)
+    asks = SortedPriceLadder(Side.ASK)
+
+    for price in [100, 300, 200, 300]:
+        bids.add_order(LimitOrder(1, TIME, SYMBOL, 10, Side.BID, price), {})
+        asks.add_order(LimitOrder(1, TIME, SYMBOL, 10, Side.ASK, price), {})
+
+    assert [level.price for level in bids] == [300, 200, 100]
+    assert [level.price for level in asks] == [100, 200, 300]
+    assert bids[0].total_quantity == 20
+    assert [level.price for level in bids[1:]] == [200, 100]
+
+    assert bids.get_level(200) is bids[1]
+    assert bids.get_level(150) is None
+
+    bids.remove_level(200)
+    del asks[0]
+
+    assert [level.price for level in bids] == [300, 100]
+    assert [level.price for level in asks] == [200, 300]
+    assert len(bids) == 2
+    assert SortedPriceLadder(Side.BID) == []
+    assert not SortedPriceLadder(Side.BID)
+
+    with pytest.raises(ValueError):
+        bids.add_order(LimitOrder(1, TIME, SYMBOL, 10, Side.ASK, 100), {})
+
+
+def test_sorted_ladder_equals_list():
+    book, _, _ = setup_book_with_orders(
+        bids=[(100, [40, 10]), (200, [10])],
+        asks=[(300, [10, 50])],
+        price_ladder="sorted",
+    )
+
+    assert isinstance(book.bids, SortedPriceLadder)
+    assert book.bids == [
+        PriceLevel([(book.bids[0].visible_orders[0][0], {})]),
+        PriceLevel(
+            [
+                (book.bids[1].visible_orders[0][0], {}),
+                (book.bids[1].visible_orders[1][0], {}),
+            ]
+        ),
+    ]
+
+    reference, _, _ = setup_book_with_orders(
+        bids=[(100, [40, 10]), (200, [10])],
+        asks=[(300, [10, 50])],
+    )
+
+    assert isinstance(reference.bids, PriceLadder)
+    assert reference.get_l3_bid_data() == book.get_l3_bid_data()
+    assert reference.get_l3_ask_data() == book.get_l3_ask_data()
+
+
+def test_unknown_price_ladder():
+    with pytest.raises(ValueError):
+        OrderBook(FakeExchangeAgent(), SYMBOL, "unknown")
+
+
+def test_sorted_ladder_same_results_as_list():
+    reference = run_random_order_flow("list")
+
+    assert len(reference[1]) > 0
+    assert run_random_order_flow("sorted") == reference
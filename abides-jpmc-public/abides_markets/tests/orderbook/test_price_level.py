@@ -1,7 +1,9 @@
+from copy import deepcopy
+
 import pytest
 
 from abides_markets.orders import LimitOrder, Side
-from abides_markets.price_level import PriceLevel
+from abides_markets.price_level import OrderQueue, PriceLevel
 
 from .. import reset_env
 
@@ -227,6 +229,12 @@ def test_order_has_equal_price(price_level):
 
 def test_total_quantity(price_level):
     assert price_level.total_quantity == 30
+    assert price_level.hidden_quantity == 20
+
+    price_level.update_order_quantity(price_level.hidden_orders[0][0].order_id, 5)
+    price_level.pop()
+    assert (price_level.visible_quantity, price_level.hidden_quantity) == (20, 15)
+    price_level.check_quantities()
 
     # Test with empty price level:
     price_level.visible_orders = []
@@ -251,3 +259,37 @@ def test_eq(price_level):
     lo = LimitOrder(0, 0, "", 10, Side.BID, 90, is_hidden=False)
 
     assert PriceLevel([(lo, {})]) != price_level
+
+
+def test_order_queue():
+    orders = [LimitOrder(0, 0, "", 10, Side.BID, 100, order_id=i) for i in range(5)]
+
+    queue = OrderQueue((order, {}) for order in orders)
+
+    # Remove from the middle, front and back:
+    assert queue.remove(2) == (orders[2], {})
+    assert queue.remove(0) == (orders[0], {})
+    assert queue.remove(4) == (orders[4], {})
+    assert queue.remove(4) == None
+    assert queue == [(orders[1], {}), (orders[3], {})]
+
+    queue.move_to_back(1)
+    assert queue == [(orders[3], {}), (orders[1], {})]
+
+    queue.insert_by_id((orders[2], {}))
+    assert [order.order_id for order, _ in queue] == [2, 3, 1]
+
+    copied = deepcopy(queue)
+    assert copied == queue
+    assert copied.get(3) is not queue.get(3)
+
+    assert queue.popleft() == (orders[2], {})
+    assert queue.get(2) == None
+    assert len(queue) == 2
+
+    queue.popleft()
+    queue.popleft()
+    assert not queue
+
+    with pytest.raises(IndexError):
+        queue.popleft()
@@ -75,6 +75,7 @@ def test_fill_price_to_comply_order():
 
     assert len(book.asks) == 0
     assert len(book.bids) == 0
+    assert book.order_index == {}
 
     assert len(agent.messages) == 3
 
@@ -114,10 +115,13 @@ def test_cancel_price_to_comply_order():
     book = OrderBook(agent, SYMBOL)
     book.handle_limit_order(order)
 
+    assert set(book.order_index) == {(order.order_id, 100), (order.order_id, 101)}
+
     assert book.cancel_order(order) == True
 
     assert len(book.asks) == 0
     assert len(book.bids) == 0
+    assert book.order_index == {}
 
 
 def test_modify_price_to_comply_order():
@@ -158,3 +162,4 @@ def test_replace_price_to_comply_order():
 
     assert len(book.asks) == 1
     assert len(book.bids) == 0
+    assert list(book.order_index) == [(new_order.order_id, 100)]
@@ -0,0 +1,44 @@
+import pytest
+
+from abides_markets.orders import LimitOrder, MarketOrder, Side
+
+from . import SYMBOL, TIME, setup_book_with_orders
+
+
+def test_side_quantities_follow_orders():
+    book, _, orders = setup_book_with_orders(
+        bids=[(100, [40, 10]), (200, [10, 30])],
+        asks=[(300, [10, 50]), (400, [40])],
+    )
+
+    # A price to comply order rests hidden at 299 and visible at 300.
+    book.handle_limit_order(
+        LimitOrder(1, TIME, SYMBOL, 20, Side.ASK, 300, is_price_to_comply=True)
+    )
+    book.check_quantities()
+    assert (book.bids.quantities.visible, book.bids.quantities.hidden) == (90, 0)
+    assert (book.asks.quantities.visible, book.asks.quantities.hidden) == (120, 20)
+
+    # Partially executing the hidden half also reduces the visible half.
+    book.handle_market_order(MarketOrder(2, TIME, SYMBOL, 5, Side.BID))
+    book.check_quantities()
+    assert (book.asks.quantities.visible, book.asks.quantities.hidden) == (115, 15)
+    assert book.get_l2_ask_data(2) == [(300, 75)]
+
+    book.handle_market_order(MarketOrder(2, TIME, SYMBOL, 50, Side.ASK))
+    book.cancel_order(orders[0])
+    book.check_quantities()
+    assert book.bids.quantities.visible == 10
+    assert book.get_imbalance() == (1 - 10 / 115, Side.ASK)
+
+
+@pytest.mark.parametrize("price_ladder", ["list", "sorted"])
+def test_check_quantities_detects_direct_changes(price_ladder):
+    book, _, orders = setup_book_with_orders(
+        bids=[(100, [40, 10])], price_ladder=price_ladder
+    )
+    book.check_quantities()
+
+    book.bids[0].visible_orders[0][0].quantity = 30
+    with pytest.raises(AssertionError):
+        book.check_quantities()
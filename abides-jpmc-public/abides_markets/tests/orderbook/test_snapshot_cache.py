@@ -0,0 +1,104 @@
+from copy import deepcopy
+
+import numpy as np
+
+from abides_markets.order_book import OrderBook
+from abides_markets.orders import LimitOrder, MarketOrder, Side
+
+from . import FakeExchangeAgent, SYMBOL, TIME, setup_book_with_orders
+
+
+def fresh_snapshots(book):
+    return (
+        (book.get_l1_bid_data(), book.get_l1_ask_data()),
+        (tuple(book.get_l2_bid_data(2)), tuple(book.get_l2_ask_data(2))),
+        (
+            tuple((p, tuple(q)) for p, q in book.get_l3_bid_data()),
+            tuple((p, tuple(q)) for p, q in book.get_l3_ask_data()),
+        ),
+    )
+
+
+def test_snapshots_are_shared_until_the_book_changes():
+    book, _, orders = setup_book_with_orders(
+        bids=[(100, [40, 10]), (200, [10, 30])],
+        asks=[(300, [10, 50]), (400, [40])],
+    )
+
+    version = book.version
+    l2 = book.get_l2_snapshot(1)
+
+    assert l2 == (((200, 40),), ((300, 60),))
+    assert book.get_l2_snapshot(1) is l2
+    assert book.get_l3_snapshot() == (
+        ((200, (10, 30)), (100, (40, 10))),
+        ((300, (10, 50)), (400, (40,))),
+    )
+    # Depths beyond the number of levels share the full depth snapshot.
+    assert book.get_l2_snapshot(10) is book.get_l2_snapshot()
+
+    # Failed cancellations do not change the book.
+    book.cancel_order(LimitOrder(1, TIME, SYMBOL, 10, Side.BID, 150, order_id=-1))
+    assert book.version == version
+    assert book.get_l2_snapshot(1) is l2
+
+    book.cancel_order(orders[2])
+    assert book.version > version
+    assert book.get_l2_snapshot(1) == (((200, 30),), ((300, 60),))
+    assert book.get_l1_snapshot() == ((200, 30), (300, 60))
+
+
+def test_snapshots_match_book_data_on_random_order_flow():
+    random_state = np.random.RandomState(seed=2)
+
+    agent = FakeExchangeAgent()
+    book = OrderBook(agent, SYMBOL)
+
+    resting = []
+    for step in range(2000):
+        agent.current_time = TIME + step
+        action = random_state.rand()
+        side = Side.BID if random_state.rand() < 0.5 else Side.ASK
+
+        if action < 0.55 or not resting:
+            offset = int(random_state.randint(-5, 30))
+            price = 1000 - offset if side.is_bid() else 1000 + offset
+            order = LimitOrder(
+                1,
+                agent.current_time,
+                SYMBOL,
+                int(random_state.randint(1, 50)),
+                side,
+                price,
+                order_id=step,
+            )
+            book.handle_limit_order(deepcopy(order))
+            resting.append(order)
+        elif action < 0.65:
+            book.handle_market_order(
+                MarketOrder(
+                    1,
+                    agent.current_time,
+                    SYMBOL,
+                    int(random_state.randint(1, 80)),
+                    side,
+                    order_id=step,
+                )
+            )
+        else:
+            order = resting[int(random_state.randint(len(resting)))]
+            if action < 0.85:
+                book.cancel_order(order)
+            elif action < 0.95:
+                new_order = deepcopy(order)
+                new_order.quantity = int(random_state.randint(1, 50))
+                book.modify_order(order, new_order)
+            else:
+                book.partial_cancel_order(order, 1)
+
+        snapshots = (
+            book.get_l1_snapshot(),
+            book.get_l2_snapshot(2),
+            book.get_l3_snapshot(),
+        )
+        assert snapshots == fresh_snapshots(book)
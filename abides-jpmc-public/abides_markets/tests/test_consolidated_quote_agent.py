@@ -0,0 +1,170 @@
+from abides_markets.agents import ConsolidatedQuoteAgent
+from abides_markets.messages.marketdata import (
+    L2DataMsg,
+    L2SubReqMsg,
+    NBBODataMsg,
+    NBBOSubReqMsg,
+)
+
+SYMBOL = "X"
+SIP_ID = 10
+
+
+class FakeKernel:
+    def __init__(self):
+        self.messages = []
+        self.wakeups = []
+
+    def send_message(self, sender_id, recipient_id, message, delay=0):
+        self.messages.append((recipient_id, message))
+
+    def set_wakeup(self, sender_id, requested_time):
+        self.wakeups.append(requested_time)
+
+    def reset(self):
+        self.messages = []
+        self.wakeups = []
+
+
+def setup_sip(sip_latency=100):
+    sip = ConsolidatedQuoteAgent(
+        SIP_ID, [SYMBOL], exchange_ids=[0, 1], depth=2, sip_latency=sip_latency
+    )
+    sip.kernel = FakeKernel()
+    sip.wakeup(0)
+
+    assert [recipient for recipient, _ in sip.kernel.messages] == [0, 1]
+    for _, message in sip.kernel.messages:
+        assert isinstance(message, L2SubReqMsg)
+        assert (message.symbol, message.freq, message.depth) == (SYMBOL, 0, 2)
+    sip.kernel.reset()
+
+    return sip
+
+
+def l2(bids, asks, time=0):
+    return L2DataMsg(SYMBOL, 100, time, bids, asks)
+
+
+def test_consolidated_quotes():
+    sip = setup_sip()
+
+    sip.receive_message(1, 20, NBBOSubReqMsg(SYMBOL, depth=1))
+    sip.receive_message(1, 21, NBBOSubReqMsg(SYMBOL, depth=5))
+    assert sip.kernel.messages == []
+
+    sip.receive_message(10, 0, l2([(100, 5), (99, 10)], [(102, 5), (103, 1)]))
+    sip.receive_message(20, 1, l2([(101, 3), (100, 2)], [(103, 4)]))
+    # A single publication, after the SIP latency of the first update.
+    assert sip.kernel.wakeups == [110]
+    assert sip.kernel.messages == []
+
+    sip.wakeup(110)
+
+    (agent_20, top), (agent_21, depth) = sip.kernel.messages
+    assert (agent_20, agent_21) == (20, 21)
+    assert isinstance(top, NBBODataMsg)
+    assert top.bids == [(101, 3)] and top.asks == [(102, 5)]
+    assert top.best_bid_ask() == (101, 102)
+    assert top.best_bid_ask(exchange_id=0) == (100, 102)
+    assert top.exchange_bids == {0: [(100, 5)], 1: [(101, 3)]}
+    # The depth is capped to the depth of the SIP.
+    assert depth.bids == [(101, 3), (100, 7)]
+    assert depth.asks == [(102, 5), (103, 5)]
+
+
+def test_unchanged_views_are_not_published():
+    sip = setup_sip()
+    sip.receive_message(1, 20, NBBOSubReqMsg(SYMBOL, depth=1))
+    sip.receive_message(1, 21, NBBOSubReqMsg(SYMBOL, depth=2))
+    sip.receive_message(10, 0, l2([(100, 5), (99, 10)], [(102, 5)]))
+    sip.wakeup(110)
+    sip.kernel.reset()
+
+    # Identical data is ignored.
+    sip.receive_message(200, 0, l2([(100, 5), (99, 10)], [(102, 5)]))
+    assert sip.kernel.wakeups == []
+
+    # Only the second level changed: only the depth 2 subscriber is updated.
+    sip.receive_message(300, 0, l2([(100, 5), (99, 4)], [(102, 5)]))
+    sip.wakeup(400)
+    assert [recipient for recipient, _ in sip.kernel.messages] == [21]
+
+
+def test_subscription_freq_and_cancel():
+    sip = setup_sip(sip_latency=0)
+    sip.receive_message(10, 0, l2([(100, 5)], [(102, 5)]))
+    sip.wakeup(10)
+
+    # New subscribers receive the current quotes straight away.
+    sip.receive_message(20, 20, NBBOSubReqMsg(SYMBOL, freq=1000))
+    assert [recipient for recipient, _ in sip.kernel.messages] == [20]
+    sip.kernel.reset()
+
+    # Updates within the period are conflated into one update at the end of it.
+    sip.receive_message(100, 0, l2([(101, 5)], [(102, 5)]))
+    sip.wakeup(100)
+    sip.receive_message(200, 0, l2([(101, 5)], [(103, 5)]))
+    sip.wakeup(200)
+    assert sip.kernel.messages == []
+    assert sip.kernel.wakeups == [100, 1020, 200]
+
+    sip.wakeup(1020)
+    ((recipient, message),) = sip.kernel.messages
+    assert recipient == 20
+    assert message.best_bid_ask() == (101, 103)
+    sip.kernel.reset()
+
+    sip.receive_message(2000, 20, NBBOSubReqMsg(SYMBOL, cancel=True))
+    sip.receive_message(3000, 0, l2([(99, 5)], [(103, 5)]))
+    sip.wakeup(3000)
+    assert sip.kernel.messages == []
+
+
+def test_late_wakeups():
+    sip = setup_sip()
+    sip.receive_message(1, 20, NBBOSubReqMsg(SYMBOL))
+
+    sip.receive_message(0, 0, l2([(100, 5)], [(102, 5)]))
+    assert sip.kernel.wakeups == [100]
+
+    # The wakeup is delivered late, e.g. as the agent was busy.
+    sip.wakeup(103)
+    assert [recipient for recipient, _ in sip.kernel.messages] == [20]
+    sip.kernel.reset()
+
+    # Later changes are still published.
+    sip.receive_message(500, 0, l2([(101, 5)], [(102, 5)]))
+    assert sip.kernel.wakeups == [600]
+    sip.wakeup(600)
+    assert [recipient for recipient, _ in sip.kernel.messages] == [20]
+
+
+def test_publications_wait_for_the_sip_latency():
+    sip = ConsolidatedQuoteAgent(
+        SIP_ID, [SYMBOL, "Y"], exchange_ids=[0], sip_latency=100
+    )
+    sip.kernel = FakeKernel()
+    sip.wakeup(0)
+    sip.kernel.reset()
+
+    sip.receive_message(1, 20, NBBOSubReqMsg(SYMBOL, freq=1000))
+    sip.receive_message(1, 21, NBBOSubReqMsg("Y"))
+
+    sip.receive_message(10, 0, l2([(100, 5)], [(102, 5)]))
+    sip.wakeup(110)
+    sip.receive_message(200, 0, l2([(101, 5)], [(102, 5)]))
+    sip.wakeup(300)
+    # The update of the subscriber with a freq is deferred to the end of its period.
+    assert sip.kernel.wakeups == [110, 300, 1110]
+    sip.kernel.reset()
+
+    # A change of another symbol just before the deferred update is not published
+    # with it, but after the SIP latency.
+    sip.receive_message(1100, 0, L2DataMsg("Y", 100, 1100, [(50, 1)], [(52, 1)]))
+    sip.wakeup(1110)
+    assert [recipient for recipient, _ in sip.kernel.messages] == [20]
+    assert sip.kernel.wakeups == [1200]
+
+    sip.wakeup(1200)
+    assert [recipient for recipient, _ in sip.kernel.messages] == [20, 21]
@@ -1,8 +1,10 @@
 import gym
+import pytest
 from tqdm import tqdm
 
 # Import to register environments
 import abides_gym
+from abides_gym.envs import make_vector_env
 
 
 def test_gym_runner_markets_execution():
@@ -39,3 +41,41 @@ def test_gym_runner_markets_daily_investor():
     env.seed()
     env.reset()
     env.close()
+
+
+@pytest.mark.parametrize("warm_start", ["snapshot", "fork"])
+def test_gym_runner_warm_start(warm_start):
+
+    env = gym.make(
+        "markets-daily_investor-v0",
+        background_config="rmsc04",
+        warm_start=warm_start,
+        warm_start_buckets=2,
+    )
+
+    env.seed(0)
+    for episode in range(3):
+        state = env.reset()
+        for i in range(3):
+            state, reward, done, info = env.step(i % 3)
+    env.close()
+
+
+def test_vector_env():
+
+    env = make_vector_env("markets-execution-v0", 2, background_config="rmsc04")
+
+    env.seed(0)
+    states = env.reset()
+    assert states.shape[0] == 2
+    for i in range(3):
+        states, rewards, dones, infos = env.step([0, 1])
+    assert rewards.shape == dones.shape == (2,)
+
+    env.send([0, 1])
+    states, rewards, dones, infos, env_ids = env.recv(1)
+    assert len(env_ids) == 1
+    env.send([2], env_ids)
+    states, rewards, dones, infos, env_ids = env.recv()
+    assert sorted(env_ids) == [0, 1]
+    env.close()
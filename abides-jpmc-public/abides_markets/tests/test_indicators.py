@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from abides_markets.indicators import (
+    Crossover,
+    ExponentialMovingAverage,
+    RingBuffer,
+    RollingVariance,
+    SimpleMovingAverage,
+)
+
+
+def cumsum_ma(a, n):
+    # The full history moving average the momentum agents used to compute.
+    ret = np.cumsum(a, dtype=float)
+    ret[n:] = ret[n:] - ret[:-n]
+    return ret[n - 1 :] / n
+
+
+def mid_prices(size, seed=0):
+    random_state = np.random.RandomState(seed)
+    bids = 100_000 + np.cumsum(random_state.randint(-50, 51, size))
+    asks = bids + random_state.randint(1, 10, size)
+    return (bids + asks) / 2
+
+
+def test_ring_buffer():
+    buffer = RingBuffer(3)
+
+    assert [buffer.append(x) for x in [1, 2, 3]] == [None, None, None]
+    assert buffer.full
+    assert buffer.append(4) == 1
+    assert len(buffer) == 3
+    assert list(buffer.to_array()) == [2, 3, 4]
+    assert buffer[0] == 2 and buffer[-1] == 4
+
+    with pytest.raises(IndexError):
+        buffer[3]
+
+
+def test_simple_moving_average_matches_full_history():
+    mids = mid_prices(1000)
+
+    for window in [1, 20, 50]:
+        sma = SimpleMovingAverage(window)
+        values = [sma.update(mid) for mid in mids]
+
+        assert values[: window - 1] == [None] * (window - 1)
+        # Half cent mid prices are summed exactly, so the values are identical.
+        assert values[window - 1 :] == list(cumsum_ma(mids, window))
+        assert len(sma.buffer) == window
+
+
+def test_exponential_moving_average():
+    mids = mid_prices(500)
+    ema = ExponentialMovingAverage(span=20)
+
+    values = [ema.update(mid) for mid in mids]
+    expected = pd.Series(mids).ewm(span=20, adjust=False).mean()
+
+    np.testing.assert_allclose(values, expected, rtol=1e-12)
+
+    with pytest.raises(ValueError):
+        ExponentialMovingAverage(span=20, alpha=0.1)
+
+
+@pytest.mark.parametrize("ddof", [0, 1])
+def test_rolling_variance(ddof):
+    mids = mid_prices(1000)
+    variance = RollingVariance(30, ddof=ddof)
+
+    values = [variance.update(mid) for mid in mids]
+    expected = pd.Series(mids).rolling(30).var(ddof=ddof)
+
+    assert values[:29] == [None] * 29
+    np.testing.assert_allclose(values[29:], expected[29:], rtol=1e-9, atol=1e-9)
+
+    for x in [5.0] * 30:
+        variance.update(x)
+    assert variance.value == pytest.approx(0, abs=1e-6)
+
+
+def test_crossover():
+    crossover = Crossover()
+
+    fast = [1, 3, 2, 1, 1, 3]
+    slow = [2, 2, 2, 2, 2, 2]
+
+    assert [crossover.update(f, s) for f, s in zip(fast, slow)] == [0, 1, 0, -1, 0, 1]
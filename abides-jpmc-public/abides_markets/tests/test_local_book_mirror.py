@@ -0,0 +1,166 @@
+from copy import deepcopy
+
+import numpy as np
+
+from abides_markets.agents import ExchangeAgent
+from abides_markets.local_book_mirror import LocalBookMirror
+from abides_markets.messages.marketdata import L2DeltaDataMsg, L2DeltaSubReqMsg
+from abides_markets.messages.order import CancelOrderMsg, LimitOrderMsg
+from abides_markets.order_book import OrderBook
+from abides_markets.orders import LimitOrder, MarketOrder, Side
+
+from .orderbook import FakeExchangeAgent, SYMBOL, TIME
+
+
+class FakeKernel:
+    def __init__(self):
+        self.messages = []
+
+    def send_message(self, sender_id, recipient_id, message, delay=0):
+        self.messages.append((recipient_id, message))
+
+    def set_wakeup(self, sender_id, requested_time):
+        pass
+
+    def set_agent_compute_delay(self, sender_id, requested_delay):
+        pass
+
+
+def delta(sequence_number, bids=(), asks=(), snapshot=False):
+    return L2DeltaDataMsg(SYMBOL, 100, TIME, sequence_number, bids, asks, snapshot)
+
+
+def test_mirror_follows_random_order_flow():
+    random_state = np.random.RandomState(seed=3)
+
+    agent = FakeExchangeAgent()
+    book = OrderBook(agent, SYMBOL)
+    book.track_level_changes()
+
+    mirror = LocalBookMirror(SYMBOL)
+    assert mirror.update(delta(book.delta_sequence_number, snapshot=True))
+
+    resting = []
+    for step in range(2000):
+        agent.current_time = TIME + step
+        action = random_state.rand()
+        side = Side.BID if random_state.rand() < 0.5 else Side.ASK
+
+        if action < 0.55 or not resting:
+            offset = int(random_state.randint(-5, 30))
+            price = 1000 - offset if side.is_bid() else 1000 + offset
+            order = LimitOrder(
+                1,
+                agent.current_time,
+                SYMBOL,
+                int(random_state.randint(1, 50)),
+                side,
+                price,
+                order_id=step,
+            )
+            book.handle_limit_order(deepcopy(order))
+            resting.append(order)
+        elif action < 0.65:
+            book.handle_market_order(
+                MarketOrder(
+                    1,
+                    agent.current_time,
+                    SYMBOL,
+                    int(random_state.randint(1, 80)),
+                    side,
+                    order_id=step,
+                )
+            )
+        else:
+            order = resting[int(random_state.randint(len(resting)))]
+            if action < 0.85:
+                book.cancel_order(order)
+            elif action < 0.95:
+                new_order = deepcopy(order)
+                new_order.quantity = int(random_state.randint(1, 50))
+                book.modify_order(order, new_order)
+            else:
+                book.partial_cancel_order(order, 1)
+
+        # Updates are sent after a few orders at once from time to time.
+        if random_state.rand() < 0.5:
+            assert mirror.update(delta(*book.take_level_changes()))
+
+            assert mirror.get_bids() == book.get_l2_bid_data()
+            assert mirror.get_asks() == book.get_l2_ask_data()
+            assert mirror.get_bids(3) == book.get_l2_bid_data(3)
+            assert mirror.get_bids(0) == mirror.get_asks(0) == []
+            assert mirror.best_bid == (book.get_l1_bid_data() or None)
+            assert mirror.best_ask == (book.get_l1_ask_data() or None)
+
+
+def test_mirror_sequencing_and_resync():
+    mirror = LocalBookMirror(SYMBOL, max_pending=2)
+
+    # Updates are held until a snapshot is received.
+    assert mirror.update(delta(6, bids=[(100, 5)]))
+    assert not mirror.synced
+    assert mirror.update(delta(5, bids=[(101, 1)], asks=[(103, 4)], snapshot=True))
+    assert mirror.synced
+    assert mirror.sequence_number == 6
+    assert mirror.get_bids() == [(101, 1), (100, 5)]
+    assert mirror.get_bids(0) == []
+    assert mirror.get_bids(1) == [(101, 1)]
+    assert mirror.get_bids(3) == [(101, 1), (100, 5)]
+
+    # Updates delivered out of order are applied in sequence.
+    assert mirror.update(delta(8, bids=[(101, 0)]))
+    assert mirror.best_bid == (101, 1)
+    assert mirror.update(delta(7, bids=[(101, 2)], asks=[(102, 3)]))
+    assert mirror.sequence_number == 8
+    assert mirror.best_bid == (100, 5)
+    assert mirror.best_ask == (102, 3)
+    # Outdated updates are ignored.
+    assert mirror.update(delta(7, bids=[(101, 2)]))
+    assert mirror.best_bid == (100, 5)
+
+    # A lost update: a new snapshot is requested once.
+    for sequence_number in [10, 11]:
+        assert mirror.update(delta(sequence_number, asks=[(102, 0)]))
+    assert not mirror.update(delta(12, asks=[(104, 1)]))
+    assert not mirror.synced
+    assert mirror.update(delta(13, asks=[(104, 2)]))
+
+    # The snapshot replaces the book, and the updates after it are applied.
+    assert mirror.update(delta(12, bids=[(99, 1)], asks=[(103, 1)], snapshot=True))
+    assert mirror.synced
+    assert mirror.sequence_number == 13
+    assert mirror.get_bids() == [(99, 1)]
+    assert mirror.get_asks() == [(103, 1), (104, 2)]
+
+
+def test_exchange_incremental_feed():
+    exchange = ExchangeAgent(
+        0, 0, 1_000_000, [SYMBOL], book_logging=False, log_orders=False
+    )
+    exchange.kernel = FakeKernel()
+
+    order = LimitOrder(1, 10, SYMBOL, 10, Side.BID, 100, order_id=1)
+    exchange.receive_message(10, 1, LimitOrderMsg(order))
+
+    exchange.receive_message(20, 5, L2DeltaSubReqMsg(SYMBOL))
+    exchange.receive_message(
+        30, 1, LimitOrderMsg(LimitOrder(1, 30, SYMBOL, 5, Side.ASK, 102, order_id=2))
+    )
+    exchange.receive_message(40, 1, CancelOrderMsg(order, None, None))
+
+    messages = [
+        message
+        for recipient, message in exchange.kernel.messages
+        if isinstance(message, L2DeltaDataMsg)
+    ]
+    assert [message.sequence_number for message in messages] == [0, 1, 2]
+    assert messages[0].snapshot and messages[0].bids == ((100, 10),)
+    assert messages[1].asks == ((102, 5),)
+    assert messages[2].bids == ((100, 0),)
+
+    mirror = LocalBookMirror(SYMBOL)
+    for message in messages:
+        assert mirror.update(message)
+    assert mirror.get_bids() == []
+    assert mirror.best_ask == (102, 5)
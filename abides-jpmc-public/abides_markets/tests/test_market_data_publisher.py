@@ -0,0 +1,163 @@
+from abides_markets.agents import ExchangeAgent
+from abides_markets.messages.marketdata import (
+    L1DataMsg,
+    L1SubReqMsg,
+    L2DataMsg,
+    L2SubReqMsg,
+)
+from abides_markets.messages.order import CancelOrderMsg, LimitOrderMsg
+from abides_markets.messages.query import QuerySpreadMsg
+from abides_markets.orders import LimitOrder, Side
+
+SYMBOL = "X"
+MKT_OPEN = 0
+MKT_CLOSE = 1_000_000
+
+
+class FakeKernel:
+    def __init__(self):
+        self.messages = []
+        self.wakeups = []
+
+    def send_message(self, sender_id, recipient_id, message, delay=0):
+        self.messages.append((recipient_id, message))
+
+    def set_wakeup(self, sender_id, requested_time):
+        self.wakeups.append(requested_time)
+
+    def set_agent_compute_delay(self, sender_id, requested_delay):
+        pass
+
+    def data_messages(self):
+        return [
+            (recipient, message)
+            for recipient, message in self.messages
+            if isinstance(message, (L1DataMsg, L2DataMsg))
+        ]
+
+    def reset(self):
+        self.messages = []
+        self.wakeups = []
+
+
+def setup_exchange():
+    exchange = ExchangeAgent(
+        0, MKT_OPEN, MKT_CLOSE, [SYMBOL], book_logging=False, log_orders=False
+    )
+    exchange.kernel = FakeKernel()
+    return exchange
+
+
+def limit_order(exchange, time, price, order_id, side=Side.BID):
+    order = LimitOrder(1, time, SYMBOL, 10, side, price, order_id=order_id)
+    exchange.receive_message(time, 1, LimitOrderMsg(order))
+    return order
+
+
+def test_immediate_subscriptions_share_payloads():
+    exchange = setup_exchange()
+
+    for agent_id in [10, 11]:
+        exchange.receive_message(1, agent_id, L2SubReqMsg(SYMBOL, freq=0, depth=1))
+    exchange.receive_message(1, 12, L2SubReqMsg(SYMBOL, freq=0, depth=5))
+    exchange.receive_message(1, 13, L1SubReqMsg(SYMBOL, freq=0))
+
+    order = limit_order(exchange, 10, 100, 1)
+    limit_order(exchange, 10, 99, 2)
+
+    messages = exchange.kernel.data_messages()
+    assert [recipient for recipient, _ in messages] == [10, 11, 12, 13] * 2
+    # One message per payload and publication.
+    assert messages[4][1] is messages[5][1]
+    assert messages[4][1] is not messages[6][1]
+    assert messages[6][1].bids == ((100, 10), (99, 10))
+    assert messages[7][1].bid == (100, 10)
+
+    # A cancellation of an unknown order does not change the book.
+    exchange.kernel.reset()
+    unknown_order = LimitOrder(1, 20, SYMBOL, 10, Side.BID, 98, order_id=9)
+    exchange.receive_message(20, 1, CancelOrderMsg(unknown_order, None, None))
+    assert exchange.kernel.data_messages() == []
+
+    # Cancelled subscriptions are no longer published.
+    exchange.receive_message(30, 11, L2SubReqMsg(SYMBOL, cancel=True, freq=0, depth=1))
+    exchange.receive_message(30, 13, L1SubReqMsg(SYMBOL, cancel=True, freq=0))
+    exchange.receive_message(30, 1, CancelOrderMsg(order, None, None))
+    assert [recipient for recipient, _ in exchange.kernel.data_messages()] == [10, 12]
+    assert len(exchange.data_publisher) == 2
+
+
+def test_frequency_buckets_publish_on_timers():
+    exchange = setup_exchange()
+
+    exchange.receive_message(1, 10, L2SubReqMsg(SYMBOL, freq=1000, depth=1))
+    exchange.receive_message(2, 11, L2SubReqMsg(SYMBOL, freq=1000, depth=1))
+
+    # The first change is published straight away.
+    limit_order(exchange, 10, 100, 1)
+    assert [recipient for recipient, _ in exchange.kernel.data_messages()] == [10, 11]
+    exchange.kernel.reset()
+
+    # Changes within the period are published once, at the end of the period.
+    limit_order(exchange, 20, 101, 2)
+    limit_order(exchange, 30, 102, 3)
+    assert exchange.kernel.data_messages() == []
+    assert exchange.kernel.wakeups == [1010]
+
+    exchange.wakeup(1010)
+    messages = exchange.kernel.data_messages()
+    assert [recipient for recipient, _ in messages] == [10, 11]
+    assert messages[0][1].bids == ((102, 10),)
+    exchange.kernel.reset()
+
+    # The changes of the next period are published at its end too.
+    limit_order(exchange, 1500, 50, 4)
+    assert exchange.kernel.wakeups == [2010]
+    exchange.wakeup(2010)
+    assert [recipient for recipient, _ in exchange.kernel.data_messages()] == [10, 11]
+    exchange.kernel.reset()
+
+    # Timers are not set past the market close.
+    limit_order(exchange, MKT_CLOSE - 600, 103, 5)
+    limit_order(exchange, MKT_CLOSE - 10, 104, 6)
+    assert [recipient for recipient, _ in exchange.kernel.data_messages()] == [10, 11]
+    assert exchange.kernel.wakeups == []
+
+
+def test_late_timers():
+    exchange = setup_exchange()
+    exchange.receive_message(1, 10, L2SubReqMsg(SYMBOL, freq=100, depth=1))
+
+    limit_order(exchange, 5, 100, 1)
+    limit_order(exchange, 10, 101, 2)
+    assert exchange.kernel.wakeups == [105]
+    exchange.kernel.reset()
+
+    # The wakeup is delivered late, e.g. as the exchange was busy.
+    exchange.wakeup(108)
+    messages = exchange.kernel.data_messages()
+    assert [recipient for recipient, _ in messages] == [10]
+    assert messages[0][1].bids == ((101, 10),)
+    exchange.kernel.reset()
+
+    # Later changes still set timers.
+    limit_order(exchange, 150, 102, 3)
+    limit_order(exchange, 160, 103, 4)
+    assert exchange.kernel.wakeups == [208]
+    exchange.wakeup(208)
+    assert [recipient for recipient, _ in exchange.kernel.data_messages()] == [10]
+
+
+def test_requests_are_logged_in_columns():
+    exchange = setup_exchange()
+    n_objects = len(exchange.log.objects)
+
+    exchange.receive_message(1, 10, L2SubReqMsg(SYMBOL, freq=100, depth=5))
+    exchange.receive_message(2, 10, QuerySpreadMsg(SYMBOL, depth=3))
+
+    # The requests are stored in typed columns, not as (copied) objects.
+    assert len(exchange.log.objects) == n_objects
+    assert list(exchange.log)[-2:] == [
+        (1, "L2SubReqMsg", dict(symbol=SYMBOL, cancel=False, freq=100, depth=5)),
+        (2, "QuerySpreadMsg", dict(symbol=SYMBOL, depth=3)),
+    ]
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from abides_core.utils import str_to_ns
+from abides_markets.oracles import MeanRevertingOracle
+from abides_markets.oracles.mean_reverting_oracle import MeanRevertingSeries
+
+R_BAR = 100_000
+
+
+def test_series_is_consistent():
+    series = MeanRevertingSeries(
+        0, R_BAR, 0.01, 25, seed=1, chunk_size=50, max_cached_chunks=2
+    )
+
+    times = np.random.RandomState(0).randint(0, 10_000, size=300)
+    values = [series.value_at(t) for t in times]
+
+    assert series.value_at(0) == R_BAR
+    assert len(series.chunks) == 2
+
+    # Evicted chunks are regenerated with the same values, in any order.
+    assert [series.value_at(t) for t in times[::-1]] == values[::-1]
+
+    with pytest.raises(ValueError):
+        series.value_at(-1)
+
+
+@pytest.mark.parametrize("kappa", [0.0, 0.05])
+def test_series_distribution(kappa):
+    sigma_s = 4.0
+    n_series = 2000
+
+    # Value at time 130 and 131 of many independent series, looking up a later
+    # chunk first so that the value is drawn from the bridge between boundaries.
+    values = []
+    for seed in range(n_series):
+        series = MeanRevertingSeries(0, R_BAR, kappa, sigma_s, seed, chunk_size=40)
+        series.value_at(300)
+        values.append([series.value_at(130), series.value_at(131)])
+    x = np.array(values, dtype=float) - R_BAR
+
+    phi = 1 - kappa
+    variance = sigma_s * sum(phi ** (2 * k) for k in range(130))
+
+    assert x[:, 0].mean() == pytest.approx(0, abs=4 * np.sqrt(variance / n_series))
+    assert x[:, 0].var() == pytest.approx(variance, rel=0.1)
+
+    # One AR(1) step between consecutive times (values are rounded to integers).
+    slope, intercept = np.polyfit(x[:, 0], x[:, 1], 1)
+    residuals = x[:, 1] - (slope * x[:, 0] + intercept)
+    assert slope == pytest.approx(phi, abs=0.01)
+    assert residuals.var() == pytest.approx(sigma_s + 1 / 6, rel=0.1)
+
+
+def test_oracle_full_session():
+    mkt_open = str_to_ns("09:30:00")
+    mkt_close = str_to_ns("16:00:00")
+
+    np.random.seed(0)
+    oracle = MeanRevertingOracle(
+        mkt_open,
+        mkt_close,
+        {"ABM": dict(r_bar=R_BAR, kappa=1e-9, sigma_s=1e-3)},
+    )
+
+    assert oracle.get_daily_open_price("ABM", mkt_open) == R_BAR
+    assert oracle.observe_price("ABM", mkt_open, None, sigma_n=0) == R_BAR
+
+    random_state = np.random.RandomState(1)
+    for time in np.linspace(mkt_open, mkt_close + 10, 50, dtype=np.int64):
+        assert oracle.observe_price("ABM", time, random_state) > 0
+
+    assert oracle.observe_price(
+        "ABM", mkt_close + 10, None, sigma_n=0
+    ) == oracle.observe_price("ABM", mkt_close - 1, None, sigma_n=0)
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from abides_core.utils import str_to_ns
+from abides_markets.oracles import SparseMeanRevertingOracle
+
+MKT_OPEN = str_to_ns("09:30:00")
+MKT_CLOSE = str_to_ns("16:00:00")
+
+
+def make_oracle(seed=1, precompute_grid=str_to_ns("1s"), **params):
+    symbols = {
+        "ABM": dict(
+            dict(
+                r_bar=100_000,
+                kappa=1.67e-16,
+                sigma_s=0,
+                fund_vol=5e-5,
+                megashock_lambda_a=2.77778e-13,
+                megashock_mean=1000,
+                megashock_var=50_000,
+                random_state=np.random.RandomState(seed),
+            ),
+            **params,
+        )
+    }
+    return SparseMeanRevertingOracle(MKT_OPEN, MKT_CLOSE, symbols, precompute_grid)
+
+
+def test_precomputed_path():
+    oracle = make_oracle()
+
+    times = np.array(oracle.path_times["ABM"])
+    f_log = oracle.f_log["ABM"]
+
+    assert times[0] == MKT_OPEN and times[-1] == MKT_CLOSE
+    assert (np.diff(times) > 0).all()
+    assert f_log["FundamentalTime"].dtype == np.int64
+    assert f_log["FundamentalValue"].dtype == np.int64
+    assert len(pd.DataFrame(f_log)) == len(times)
+
+    # Megashocks are part of the path and jump its value.
+    shocks = oracle.megashocks["ABM"]
+    assert len(shocks["MegashockTime"]) > 0
+    k = np.searchsorted(times, shocks["MegashockTime"])
+    assert (times[k] == shocks["MegashockTime"]).all()
+    np.testing.assert_allclose(
+        np.subtract(oracle.path_after["ABM"], oracle.path_before["ABM"])[k],
+        shocks["MegashockValue"],
+    )
+
+    # Path points are returned exactly.
+    for i in [1, 100, len(times) - 2]:
+        assert (
+            oracle.observe_price("ABM", times[i], None, sigma_n=0)
+            == f_log["FundamentalValue"][i]
+        )
+
+
+def test_ou_recursion():
+    random_state = np.random.RandomState(3)
+    steps = random_state.exponential(5, size=200)
+    innovations = random_state.normal(size=200)
+
+    x = [0.5]
+    for step, innovation in zip(steps, innovations):
+        x.append(np.exp(-step) * x[-1] + innovation)
+
+    np.testing.assert_allclose(
+        SparseMeanRevertingOracle._ou_recursion(0.5, steps, innovations), x
+    )
+
+
+def test_observations():
+    oracle = make_oracle()
+    random_state = np.random.RandomState(0)
+
+    t = MKT_OPEN + str_to_ns("00:10:00.5")
+    value = oracle.observe_price("ABM", t, random_state, sigma_n=0)
+
+    # Same time, same fundamental; earlier times do not rewind it.
+    assert oracle.observe_price("ABM", t, random_state, sigma_n=0) == value
+    assert oracle.observe_price("ABM", t - 10, random_state, sigma_n=0) == value
+    assert oracle.r["ABM"] == (t, value)
+
+    # After the close the value at the close is returned.
+    assert oracle.observe_price("ABM", MKT_CLOSE + 10, random_state, sigma_n=0) > 0
+
+    # Same seed, same observations.
+    observe = lambda o: [
+        o.observe_price("ABM", MKT_OPEN + i * 333_333_333, random_state, sigma_n=0)
+        for i in range(1, 1000)
+    ]
+    assert observe(make_oracle(seed=5)) == observe(make_oracle(seed=5))
+
+
+def test_bridge_distribution():
+    oracle = make_oracle(kappa=1e-10, fund_vol=1e-6)
+    gamma = 1e-10
+    t0, t, t1 = 0, 4_000_000_000, 10_000_000_000
+
+    samples = np.array(
+        [oracle.sample_ou_bridge("ABM", t, t0, 10.0, t1, -20.0) for _ in range(20_000)]
+    )
+
+    # Gaussian conditioning of X_t on X_t0 and X_t1 for the OU process.
+    a, b = np.exp(-gamma * (t - t0)), np.exp(-gamma * (t1 - t))
+    s0 = 1e-6 / (2 * gamma) * (1 - a**2)
+    s1 = 1e-6 / (2 * gamma) * (1 - b**2)
+    variance = 1 / (1 / s0 + b**2 / s1)
+    mean = variance * (a * 10.0 / s0 + b * -20.0 / s1)
+
+    assert samples.mean() == pytest.approx(mean, abs=4 * np.sqrt(variance / 20_000))
+    assert samples.var() == pytest.approx(variance, rel=0.05)
+
+
+def test_invalid_grid():
+    with pytest.raises(ValueError):
+        make_oracle(precompute_grid=0)
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from abides_markets.transaction_tape import TransactionTape
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_windows_match_transactions(tmp_path, streamed):
+    random_state = np.random.RandomState(seed=4)
+
+    if streamed:
+        tape = TransactionTape(str(tmp_path / "tape.bin"), chunk_size=16)
+    else:
+        tape = TransactionTape(chunk_size=4)
+
+    transactions = []
+    time = 0
+    for _ in range(200):
+        # Several transactions can happen at the same time.
+        time += int(random_state.randint(0, 3))
+        quantity = int(random_state.randint(1, 100))
+        price = int(random_state.randint(90, 110))
+        tape.append(time, quantity, price)
+        transactions.append((time, quantity, price))
+
+    assert len(tape) == 200
+    assert list(tape) == [(t, q) for t, q, _ in transactions]
+
+    for start in range(-1, time + 2, 7):
+        for end in [None, start, start + 1, start + 20, time + 5]:
+            window = [
+                (q, q * p)
+                for t, q, p in transactions
+                if t >= start and (end is None or t < end)
+            ]
+            volume = sum(q for q, _ in window)
+            notional = sum(n for _, n in window)
+
+            assert tape.window(start, end) == (volume, notional)
+            assert tape.volume(start, end) == volume
+            assert tape.vwap(start, end) == (notional / volume if volume else None)
+
+    bounds = list(range(0, time + 10, 10))
+    assert tape.volume_profile(bounds).tolist() == [
+        sum(q for t, q, _ in transactions if low <= t < high)
+        for low, high in zip(bounds[:-1], bounds[1:])
+    ]
+
+
+def test_empty_tape():
+    tape = TransactionTape()
+
+    assert not tape
+    assert tape.volume(0) == 0
+    assert tape.vwap(0) is None
+    assert tape.volume_profile([0, 10, 20]).tolist() == [0, 0]
@@ -0,0 +1,152 @@
+from typing import Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from abides_core import NanosecondTime
+
+from .event_log import ArrayLog
+
+
+class TransactionTape:
+    """
+    Append-only tape of the transactions of one side of an order book.
+
+    Each transaction is stored as a row (time, cumulative volume, cumulative notional)
+    of an ``ArrayLog``, the cumulative values including the transaction. The volume or
+    notional of any time window is then the difference of the cumulative values at
+    its bounds, found with a binary search (``np.searchsorted``) instead of a scan of
+    the transactions in the window.
+
+    Iterating over the tape yields the (time, quantity) of each transaction, as the
+    lists of transactions it replaces.
+
+    Arguments:
+        path: Optional file to stream the rows to (see ``ArrayLog``).
+        chunk_size: Number of rows buffered in memory (initial buffer size when not
+            streaming to a file).
+    """
+
+    def __init__(self, path: Optional[str] = None, chunk_size: int = 1024) -> None:
+        self.log: ArrayLog = ArrayLog(3, path, chunk_size)
+
+        self.total_volume: int = 0
+        self.total_notional: int = 0
+
+    def append(self, time: NanosecondTime, quantity: int, price: int) -> None:
+        """
+        Records a transaction. Transactions must be appended in time order.
+
+        Arguments:
+            time: The time of the transaction.
+            quantity: The quantity transacted.
+            price: The price of the transaction.
+        """
+        self.total_volume += quantity
+        self.total_notional += quantity * price
+
+        self.log.append((time, self.total_volume, self.total_notional))
+
+    def flush(self) -> None:
+        """Writes the in-memory rows to the file, when streaming them."""
+        self.log.flush()
+
+    def __len__(self) -> int:
+        return len(self.log)
+
+    def __bool__(self) -> bool:
+        return len(self.log) > 0
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        previous_volume = 0
+        for time, volume, _ in self.log:
+            yield int(time), int(volume - previous_volume)
+            previous_volume = volume
+
+    def cumulative(self, times: Union[int, Sequence[int], np.ndarray]) -> np.ndarray:
+        """
+        Returns the cumulative volume and notional of the transactions strictly before
+        each of the given times, as an array of shape (n, 2).
+
+        When streaming, the rows on disk are only searched for times before the rows
+        held in memory.
+
+        Arguments:
+            times: The times.
+        """
+        times = np.atleast_1d(np.asarray(times, dtype=np.int64))
+        result = np.zeros((len(times), 2), dtype=np.int64)
+
+        tail = self.log.tail
+        in_tail = (
+            times > tail[0, 0] if len(tail) > 0 else np.zeros(len(times), dtype=bool)
+        )
+        if in_tail.any():
+            index = np.searchsorted(tail[:, 0], times[in_tail], side="left")
+            result[in_tail] = tail[index - 1, 1:]
+
+        in_head = ~in_tail
+        if self.log.n_flushed > 0 and in_head.any():
+            head = self.log.head
+            index = np.searchsorted(head[:, 0], times[in_head], side="left")
+            values = head[np.maximum(index - 1, 0), 1:]
+            values[index == 0] = 0
+            result[in_head] = values
+
+        return result
+
+    def window(
+        self, start: NanosecondTime, end: Optional[NanosecondTime] = None
+    ) -> Tuple[int, int]:
+        """
+        Returns the volume and notional of the transactions in ``[start, end)``.
+
+        Arguments:
+            start: The start of the window.
+            end: The end of the window, all the transactions from ``start`` if None.
+        """
+        if end is None:
+            ((start_volume, start_notional),) = self.cumulative(start)
+            end_volume, end_notional = self.total_volume, self.total_notional
+        else:
+            (start_volume, start_notional), (end_volume, end_notional) = (
+                self.cumulative([start, end])
+            )
+
+        return int(end_volume - start_volume), int(end_notional - start_notional)
+
+    def volume(
+        self, start: NanosecondTime, end: Optional[NanosecondTime] = None
+    ) -> int:
+        """
+        Returns the volume transacted in ``[start, end)``.
+
+        Arguments:
+            start: The start of the window.
+            end: The end of the window, all the transactions from ``start`` if None.
+        """
+        return self.window(start, end)[0]
+
+    def vwap(
+        self, start: NanosecondTime, end: Optional[NanosecondTime] = None
+    ) -> Optional[float]:
+        """
+        Returns the volume weighted average price of the transactions in ``[start,
+        end)``, or None if there were none.
+
+        Arguments:
+            start: The start of the window.
+            end: The end of the window, all the transactions from ``start`` if None.
+        """
+        volume, notional = self.window(start, end)
+
+        return notional / volume if volume > 0 else None
+
+    def volume_profile(self, bounds: Sequence[NanosecondTime]) -> np.ndarray:
+        """
+        Returns the volume transacted in each of the consecutive windows
+        ``[bounds[i], bounds[i + 1])``.
+
+        Arguments:
+            bounds: The increasing bounds of the windows.
+        """
+        return np.diff(self.cumulative(bounds)[:, 0])